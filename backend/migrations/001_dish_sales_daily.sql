@@ -0,0 +1,41 @@
+-- Per-restaurant, per-day dish sales rollup read by GET /api/dashboard/top-dishes.
+-- OrderService.updateOrderStatus adds an order's dishes when it moves into
+-- approved/ready/dispatched/completed and removes them when it leaves that set.
+
+CREATE TABLE IF NOT EXISTS dish_sales_daily (
+  restaurant_id INT NOT NULL,
+  sales_date DATE NOT NULL,
+  dish_name VARCHAR(255) NOT NULL,
+  quantity INT NOT NULL DEFAULT 0,
+  revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (restaurant_id, sales_date, dish_name),
+  KEY idx_dish_sales_daily_top (restaurant_id, sales_date, quantity)
+);
+
+-- Seed today's rollup from orders that are already in a counted status.
+-- Requires MySQL 8.0 (JSON_TABLE). Safe to re-run: it overwrites today's rows.
+INSERT INTO dish_sales_daily (restaurant_id, sales_date, dish_name, quantity, revenue)
+SELECT
+  o.restaurant_id,
+  DATE(o.created_at),
+  COALESCE(NULLIF(items.dish_name, ''), NULLIF(items.name, ''), 'Unknown'),
+  SUM(COALESCE(NULLIF(items.quantity, 0), 1)),
+  SUM(COALESCE(NULLIF(items.selling_price, 0), NULLIF(items.unit_price, 0), items.price, 0)
+      * COALESCE(NULLIF(items.quantity, 0), 1))
+FROM order_management o,
+  JSON_TABLE(o.product_details, '$[*]' COLUMNS (
+    dish_name VARCHAR(255) PATH '$.dish_name',
+    name VARCHAR(255) PATH '$.name',
+    quantity INT PATH '$.quantity' DEFAULT '0' ON ERROR,
+    selling_price DECIMAL(10, 2) PATH '$.selling_price' DEFAULT '0' ON ERROR,
+    unit_price DECIMAL(10, 2) PATH '$.unit_price' DEFAULT '0' ON ERROR,
+    price DECIMAL(10, 2) PATH '$.price' DEFAULT '0' ON ERROR
+  )) AS items
+WHERE o.fulfillment_status IN ('approved', 'ready', 'dispatched', 'completed')
+  AND o.created_at >= CURDATE()
+  AND JSON_VALID(o.product_details)
+GROUP BY o.restaurant_id, DATE(o.created_at), 3
+ON DUPLICATE KEY UPDATE
+  quantity = VALUES(quantity),
+  revenue = VALUES(revenue);
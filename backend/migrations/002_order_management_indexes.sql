@@ -0,0 +1,21 @@
+-- Composite indexes for the order_management access paths the services use.
+-- Every query filters on restaurant_id first; InnoDB appends the primary key
+-- (order_id) to each secondary index, so "created_at DESC, order_id DESC"
+-- keyset pages are read straight off these indexes without a filesort.
+-- Check the plans with: python3 query_advisor.py --before-after
+
+-- /orders/list?status=all, keyset pages, /dashboard/stats date ranges
+ALTER TABLE order_management
+  ADD INDEX idx_om_restaurant_created (restaurant_id, created_at);
+
+-- /orders/list?status=..., status pages, frequent customers (completed orders)
+ALTER TABLE order_management
+  ADD INDEX idx_om_restaurant_status_created (restaurant_id, fulfillment_status, created_at);
+
+-- /orders/detail/:orderNumber, status updates and batch status updates
+ALTER TABLE order_management
+  ADD INDEX idx_om_restaurant_order_number (restaurant_id, order_number);
+
+-- /menu/items
+ALTER TABLE dishes
+  ADD INDEX idx_dishes_restaurant_menu (restaurant_id, is_deleted, menu_section, name);
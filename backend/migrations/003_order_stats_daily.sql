@@ -0,0 +1,39 @@
+-- Per-restaurant, per-day order rollup read by GET /api/dashboard/stats and
+-- /api/dashboard/stats/daily, so a date range costs one row per day instead
+-- of a scan of every order in it. Days are the restaurant's local calendar
+-- days (restaurants.timezone), not the database server's.
+--
+-- Maintained by DailyStatsService:
+--   * new orders are rolled up in order_id order past the rollup_state
+--     watermark, counted in whatever status they have at that point;
+--   * status changes of orders at or below the watermark move revenue,
+--     active and completed counts (and dish sales) between buckets.
+--
+-- After running this migration, fill both rollups from existing orders with:
+--   npm run backfill:daily-stats
+
+ALTER TABLE restaurants
+  ADD COLUMN timezone VARCHAR(64) NOT NULL DEFAULT 'UTC';
+
+CREATE TABLE IF NOT EXISTS order_stats_daily (
+  restaurant_id INT NOT NULL,
+  stats_date DATE NOT NULL,
+  total_orders INT NOT NULL DEFAULT 0,
+  revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  active_orders INT NOT NULL DEFAULT 0,
+  completed_orders INT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (restaurant_id, stats_date)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_state (
+  name VARCHAR(64) NOT NULL PRIMARY KEY,
+  last_order_id BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO rollup_state (name, last_order_id) VALUES ('daily_stats', 0);
+
+-- dish_sales_daily was keyed by the server's DATE(created_at); the backfill
+-- rebuilds it by restaurant-local day from the same watermark
+TRUNCATE TABLE dish_sales_daily;
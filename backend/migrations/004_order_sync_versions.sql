@@ -0,0 +1,24 @@
+-- Delta sync for tablets: GET /api/orders/changes?since=<version> returns the
+-- orders that changed after a version instead of the whole list.
+--
+-- A version is "<sync_version>.<order_id>":
+--   * sync_version: per-restaurant sequence in order_sync_versions, stamped on
+--     an order by every status change the API makes. The counter row is
+--     locked until the change commits, so versions commit in order and a
+--     range scan past the client's version misses nothing;
+--   * order_id: the highest order the client has seen. New orders are
+--     inserted by the storefront and carry sync_version 0 until their first
+--     status change.
+--
+-- status_changed_at is the server time of the last status change. Replayed
+-- offline changes that conflict with a newer one on the server lose to it.
+
+ALTER TABLE order_management
+  ADD COLUMN sync_version BIGINT NOT NULL DEFAULT 0,
+  ADD COLUMN status_changed_at TIMESTAMP(3) NULL,
+  ADD INDEX idx_om_restaurant_sync_version (restaurant_id, sync_version);
+
+CREATE TABLE IF NOT EXISTS order_sync_versions (
+  restaurant_id INT NOT NULL PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+);
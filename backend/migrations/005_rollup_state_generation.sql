@@ -0,0 +1,10 @@
+-- Rollup rebuilds are visible to every server process.
+--
+-- The daily stats rollups bucket orders by each restaurant's local day, and
+-- servers cache restaurant timezones between passes. The backfill job's
+-- --rebuild (run after a timezone change) bumps generation together with
+-- rewinding the watermark; a server that reads a generation other than the
+-- one its cache was filled under drops the cache before rolling up again.
+
+ALTER TABLE rollup_state
+  ADD COLUMN generation INT NOT NULL DEFAULT 0;
@@ -1,8 +1,11 @@
 import mysql from 'mysql2/promise';
 import dotenv from 'dotenv';
+import { timeAsync } from '../utils/request-timing';
 
 dotenv.config();
 
+const CONNECTION_LIMIT = 10;
+
 const pool = mysql.createPool({
   host: process.env.MYSQL_HOST,
   user: process.env.MYSQL_USER,
@@ -10,12 +13,30 @@ const pool = mysql.createPool({
   database: process.env.MYSQL_DATABASE,
   port: parseInt(process.env.MYSQL_PORT || '3306'),
   waitForConnections: true,
-  connectionLimit: 10,
+  connectionLimit: CONNECTION_LIMIT,
   queueLimit: 0,
   enableKeepAlive: true,
   keepAliveInitialDelay: 0
 });
 
+// Every query counts towards the current request's db span, and waiting for
+// a pooled connection towards its pool span (see Server-Timing)
+const timedTargets = new WeakSet<object>();
+
+const timeQueries = <T extends object>(target: T): T => {
+  if (timedTargets.has(target)) return target;
+  timedTargets.add(target);
+  for (const method of ['execute', 'query']) {
+    const original = (target as any)[method].bind(target);
+    (target as any)[method] = (...args: any[]) => timeAsync('db', () => original(...args));
+  }
+  return target;
+};
+
+timeQueries(pool);
+const getConnection = pool.getConnection.bind(pool);
+pool.getConnection = async () => timeQueries(await timeAsync('pool', getConnection));
+
 export const testConnection = async () => {
   try {
     const connection = await pool.getConnection();
@@ -28,4 +49,19 @@ export const testConnection = async () => {
   }
 };
 
+// mysql2 keeps its pool bookkeeping on the wrapped callback pool and does not
+// expose it, so read the internal lists directly
+export const getPoolStats = () => {
+  const inner = (pool as any).pool;
+  const total = inner._allConnections.length;
+  const idle = inner._freeConnections.length;
+  return {
+    limit: CONNECTION_LIMIT,
+    total,
+    active: total - idle,
+    idle,
+    queued: inner._connectionQueue.length
+  };
+};
+
 export default pool;
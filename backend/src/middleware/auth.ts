@@ -1,45 +1,89 @@
 import { Request, Response, NextFunction } from 'express';
+import { timingSafeEqual } from 'crypto';
 import jwt from 'jsonwebtoken';
 import { jwtConfig } from '../config/jwt';
-import pool from '../config/database';
+import { getRestaurantPrincipal } from '../services/principal-cache.service';
 import { Restaurant } from '../types';
+import { timeAsync } from '../utils/request-timing';
 
 export interface AuthRequest extends Request {
   restaurant?: Restaurant;
 }
 
-export const authenticateToken = async (
+const authenticate = async (
+  token: string | undefined,
   req: AuthRequest,
   res: Response,
   next: NextFunction
 ): Promise<void> => {
   try {
-    const authHeader = req.headers['authorization'];
-    const token = authHeader && authHeader.split(' ')[1];
-
     if (!token) {
       res.status(401).json({ error: 'Access token required' });
       return;
     }
 
-    const decoded = jwt.verify(token, jwtConfig.secret) as { restaurant_id: number };
-
-    const [rows] = await pool.execute(
-      'SELECT id, username, email, status, is_active FROM restaurants WHERE id = ?',
-      [decoded.restaurant_id]
-    );
-
-    const restaurants = rows as Restaurant[];
+    const restaurant = await timeAsync('auth', async () => {
+      const decoded = jwt.verify(token, jwtConfig.secret) as { restaurant_id: number };
+      return getRestaurantPrincipal(decoded.restaurant_id);
+    });
 
-    if (restaurants.length === 0) {
+    if (!restaurant) {
       res.status(401).json({ error: 'Invalid token' });
       return;
     }
 
-    req.restaurant = restaurants[0];
+    req.restaurant = restaurant;
     next();
   } catch (error) {
     console.error('Auth error:', error);
     res.status(403).json({ error: 'Invalid or expired token' });
   }
 };
+
+const headerToken = (req: Request): string | undefined => {
+  const authHeader = req.headers['authorization'];
+  return authHeader && authHeader.split(' ')[1];
+};
+
+export const authenticateToken = (
+  req: AuthRequest,
+  res: Response,
+  next: NextFunction
+): Promise<void> => authenticate(headerToken(req), req, res, next);
+
+// EventSource cannot set headers, so the order stream alone also takes the
+// token from the query. Everywhere else a token in a URL would end up in
+// access logs and browser history.
+export const authenticateStreamToken = (
+  req: AuthRequest,
+  res: Response,
+  next: NextFunction
+): Promise<void> => authenticate(
+  headerToken(req) || (typeof req.query.access_token === 'string' ? req.query.access_token : undefined),
+  req,
+  res,
+  next
+);
+
+// Process stats and metrics are for operators, not restaurants: they take a
+// separate OPS_TOKEN bearer token and are switched off while it is unset
+const OPS_TOKEN = process.env.OPS_TOKEN || '';
+
+export const authenticateOpsToken = (req: Request, res: Response, next: NextFunction): void => {
+  if (!OPS_TOKEN) {
+    res.status(403).json({ error: 'Ops endpoints are disabled' });
+    return;
+  }
+  const token = headerToken(req);
+  if (!token) {
+    res.status(401).json({ error: 'Access token required' });
+    return;
+  }
+  const given = Buffer.from(token);
+  const expected = Buffer.from(OPS_TOKEN);
+  if (given.length !== expected.length || !timingSafeEqual(given, expected)) {
+    res.status(403).json({ error: 'Invalid ops token' });
+    return;
+  }
+  next();
+};
@@ -0,0 +1,109 @@
+import { Request, Response, NextFunction } from 'express';
+import zlib from 'zlib';
+
+// Bodies below this size cost more to compress than they save on the wire
+const MIN_COMPRESS_BYTES = 1024;
+const COMPRESSIBLE_TYPES = /^(application\/(json|x-ndjson)|text\/(plain|html|csv))\b/i;
+
+const toBuffer = (chunk: any, encoding?: BufferEncoding): Buffer =>
+  Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, encoding);
+
+// gzip/br response compression on zlib, negotiated from Accept-Encoding.
+// Streamed responses (no Content-Length, e.g. NDJSON) are compressed as they
+// are written; call flushResponse() after each batch so the client is not
+// left waiting on zlib's internal buffer. Server-Sent Events pass through.
+// write() keeps its backpressure contract: it returns false while the
+// compressor or the socket behind it is full, and 'drain' follows.
+export const compressResponses = (req: Request, res: Response, next: NextFunction): void => {
+  const encoding = req.acceptsEncodings('br', 'gzip', 'identity');
+  res.vary('Accept-Encoding');
+  if (encoding !== 'br' && encoding !== 'gzip') {
+    next();
+    return;
+  }
+
+  const write = res.write.bind(res) as (...args: any[]) => boolean;
+  const end = res.end.bind(res) as (...args: any[]) => Response;
+  let compressor: zlib.Gzip | zlib.BrotliCompress | null = null;
+  let decided = false;
+
+  const start = (length: number): void => {
+    decided = true;
+    const type = String(res.getHeader('Content-Type') || '');
+    if (req.method === 'HEAD' || res.statusCode === 204 || res.statusCode === 304
+      || res.getHeader('Content-Encoding') || !COMPRESSIBLE_TYPES.test(type) || length < MIN_COMPRESS_BYTES) {
+      return;
+    }
+
+    compressor = encoding === 'br'
+      ? zlib.createBrotliCompress({
+        params: {
+          // Quality 4 is close to gzip -6 in speed and still smaller on JSON
+          [zlib.constants.BROTLI_PARAM_QUALITY]: 4,
+          ...(Number.isFinite(length) ? { [zlib.constants.BROTLI_PARAM_SIZE_HINT]: length } : {})
+        }
+      })
+      : zlib.createGzip();
+    res.setHeader('Content-Encoding', encoding);
+    res.removeHeader('Content-Length');
+    // Stop compressing while the socket is full, and pass the compressor's own
+    // 'drain' on to callers waiting on the response
+    compressor.on('data', chunk => {
+      if (!write(chunk) && !compressor!.isPaused()) {
+        compressor!.pause();
+        res.once('drain', () => compressor!.resume());
+      }
+    });
+    compressor.on('drain', () => res.emit('drain'));
+    compressor.on('end', () => end());
+    res.locals.flushCompression = () => compressor!.flush();
+  };
+
+  (res as any).write = (chunk: any, chunkEncoding?: any, callback?: any): boolean => {
+    if (typeof chunkEncoding === 'function') {
+      callback = chunkEncoding;
+      chunkEncoding = undefined;
+    }
+    if (!decided) start(Infinity);
+    if (!compressor) return write(chunk, chunkEncoding, callback);
+    return compressor.write(toBuffer(chunk, chunkEncoding), callback);
+  };
+
+  (res as any).end = (chunk?: any, chunkEncoding?: any, callback?: any): Response => {
+    if (typeof chunk === 'function') {
+      callback = chunk;
+      chunk = undefined;
+    } else if (typeof chunkEncoding === 'function') {
+      callback = chunkEncoding;
+      chunkEncoding = undefined;
+    }
+    if (!decided) start(chunk ? toBuffer(chunk, chunkEncoding).length : 0);
+    if (!compressor) return end(chunk, chunkEncoding, callback);
+    if (callback) res.once('finish', callback);
+    compressor.end(chunk ? toBuffer(chunk, chunkEncoding) : undefined);
+    return res;
+  };
+
+  next();
+};
+
+// Push whatever a streaming response has compressed so far to the client
+export const flushResponse = (res: Response): void => {
+  if (res.locals.flushCompression) res.locals.flushCompression();
+};
+
+// Resolves once a response whose write() returned false can take more, or
+// once the client has gone
+export const waitForDrain = (res: Response): Promise<void> => new Promise(resolve => {
+  if (res.destroyed) {
+    resolve();
+    return;
+  }
+  const done = (): void => {
+    res.off('drain', done);
+    res.off('close', done);
+    resolve();
+  };
+  res.on('drain', done);
+  res.on('close', done);
+});
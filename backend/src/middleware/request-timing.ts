@@ -0,0 +1,47 @@
+import { Request, Response, NextFunction } from 'express';
+import { observeRequest } from '../services/metrics.service';
+import { RequestTimer, runWithTimer, timeSync } from '../utils/request-timing';
+
+// Set SERVER_TIMING=0 to keep the spans out of response headers; /api/metrics
+// still records them
+export const SERVER_TIMING = process.env.SERVER_TIMING !== '0';
+
+const routeLabel = (req: Request): string =>
+  req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+
+// Times every request: spans recorded with timeSync/timeAsync go out in a
+// Server-Timing header when the headers are written (streamed responses only
+// report what happened before their first write) and into the /api/metrics
+// histograms once the response finishes. Install first so total covers the
+// other middleware too.
+export const timeRequests = (req: Request, res: Response, next: NextFunction): void => {
+  const timer = new RequestTimer();
+
+  // Express' res.json, with JSON.stringify timed as the serialize span
+  res.json = (body: any): Response => {
+    const json = timeSync('serialize', () => JSON.stringify(body));
+    if (!res.get('Content-Type')) {
+      res.type('json');
+    }
+    return res.send(json);
+  };
+
+  const writeHead = res.writeHead;
+  (res as any).writeHead = function (this: Response, ...args: any[]) {
+    if (SERVER_TIMING && !res.headersSent) {
+      res.setHeader('Server-Timing', timer.header());
+    }
+    return (writeHead as any).apply(this, args);
+  };
+
+  let recorded = false;
+  const record = () => {
+    if (recorded) return;
+    recorded = true;
+    observeRequest(req.method, routeLabel(req), res.statusCode, timer);
+  };
+  res.on('finish', record);
+  res.on('close', record);
+
+  runWithTimer(timer, next);
+};
@@ -0,0 +1,104 @@
+import { Request, Response, NextFunction } from 'express';
+import fs from 'fs';
+
+// Appends one JSON line per request to TRAFFIC_CAPTURE_FILE so
+// traffic_replay.py can re-issue real restaurant traffic against any
+// deployment. Off unless the variable is set. Each line holds:
+//   t   start, ms since the epoch     m   method
+//   p   URL with secrets stripped     s   status
+//   ms  latency to the last byte      b   response bytes on the wire
+//   body  sanitized JSON body of writes (absent for reads)
+//   a   1 when the client went away before the response finished
+// Tokens, passwords and anything personal in bodies are never written.
+export const TRAFFIC_CAPTURE_FILE = process.env.TRAFFIC_CAPTURE_FILE || '';
+
+const SECRET_QUERY_PARAMS = ['access_token', 'token'];
+const SECRET_BODY_FIELDS = /pass(word)?|token|secret|authorization/i;
+const PERSONAL_BODY_FIELDS = /^(name|phone|mobile(_number)?|email|address|customer(_name)?)$/i;
+const REDACTED = '[redacted]';
+
+const sanitizeUrl = (url: string): string => {
+  const queryStart = url.indexOf('?');
+  if (queryStart < 0) return url;
+  const params = new URLSearchParams(url.slice(queryStart + 1));
+  SECRET_QUERY_PARAMS.forEach(name => params.delete(name));
+  const query = params.toString();
+  return url.slice(0, queryStart) + (query ? `?${query}` : '');
+};
+
+// Keeps the shape (and every field a replay needs, such as status or
+// orderNumber) but replaces secrets and personal values
+export const sanitizeBody = (value: any, key: string = ''): any => {
+  if (Array.isArray(value)) return value.map(item => sanitizeBody(item, key));
+  if (value && typeof value === 'object') {
+    return Object.fromEntries(Object.entries(value).map(([field, item]) => [field, sanitizeBody(item, field)]));
+  }
+  if (SECRET_BODY_FIELDS.test(key) || PERSONAL_BODY_FIELDS.test(key)) return REDACTED;
+  return value;
+};
+
+let captureEnabled = Boolean(TRAFFIC_CAPTURE_FILE);
+let stream: fs.WriteStream | null = null;
+
+const captureStream = (): fs.WriteStream => {
+  if (!stream) {
+    stream = fs.createWriteStream(TRAFFIC_CAPTURE_FILE, { flags: 'a' });
+    stream.on('error', error => {
+      console.error('Traffic capture disabled:', error);
+      stream = null;
+      captureEnabled = false;
+    });
+  }
+  return stream;
+};
+
+// Install before compressResponses so the byte count is what went on the wire
+export const captureTraffic = (req: Request, res: Response, next: NextFunction): void => {
+  if (!captureEnabled || req.method === 'OPTIONS') {
+    next();
+    return;
+  }
+
+  const startedAt = Date.now();
+  const started = process.hrtime.bigint();
+  let bytes = 0;
+  const write = res.write.bind(res) as (...args: any[]) => boolean;
+  const end = res.end.bind(res) as (...args: any[]) => Response;
+  const count = (chunk: any, encoding?: any) => {
+    if (!chunk || typeof chunk === 'function') return;
+    bytes += Buffer.isBuffer(chunk)
+      ? chunk.length
+      : Buffer.byteLength(chunk, typeof encoding === 'string' ? encoding : 'utf8');
+  };
+  (res as any).write = (chunk: any, encoding?: any, callback?: any): boolean => {
+    count(chunk, encoding);
+    return write(chunk, encoding, callback);
+  };
+  (res as any).end = (chunk?: any, encoding?: any, callback?: any): Response => {
+    count(chunk, encoding);
+    return end(chunk, encoding, callback);
+  };
+
+  let recorded = false;
+  const record = (aborted: boolean) => {
+    if (recorded || !captureEnabled) return;
+    recorded = true;
+    const entry: Record<string, any> = {
+      t: startedAt,
+      m: req.method,
+      p: sanitizeUrl(req.originalUrl),
+      s: res.statusCode,
+      ms: Math.round(Number(process.hrtime.bigint() - started) / 1e3) / 1e3,
+      b: bytes
+    };
+    if (req.method !== 'GET' && req.body && Object.keys(req.body).length > 0) {
+      entry.body = sanitizeBody(req.body);
+    }
+    if (aborted) entry.a = 1;
+    captureStream().write(JSON.stringify(entry) + '\n');
+  };
+  res.on('finish', () => record(false));
+  res.on('close', () => record(!res.writableFinished));
+
+  next();
+};
@@ -8,7 +8,7 @@ router.post('/login', async (req: Request, res: Response): Promise<void> => {
   try {
     const { username, password } = req.body;
 
-    if (!username || !password) {
+    if (!username || !password || typeof username !== 'string' || typeof password !== 'string') {
       res.status(400).json({ error: 'Username and password are required' });
       return;
     }
@@ -1,29 +1,119 @@
 import { Router, Response } from 'express';
 import { DashboardService } from '../services/dashboard.service';
+import { DashboardCache, dashboardCache } from '../services/dashboard-cache.service';
 import { authenticateToken, AuthRequest } from '../middleware/auth';
+import {
+  daysBetween,
+  isLocalDate,
+  localDate,
+  MAX_DAILY_RANGE_DAYS,
+  restaurantTimezone
+} from '../services/daily-stats.service';
 
 const router = Router();
 const dashboardService = new DashboardService();
 
+// Serve from the per-restaurant cache, answering 304 when the client already
+// has the current ETag. Clients must revalidate on every poll (no-cache).
+const sendCached = async (
+  req: AuthRequest,
+  res: Response,
+  key: string,
+  load: () => Promise<any>
+): Promise<void> => {
+  const restaurantId = req.restaurant!.id;
+  let entry = dashboardCache.get(restaurantId, key);
+  res.set('X-Cache', entry ? 'HIT' : 'MISS');
+  if (!entry) {
+    const generation = dashboardCache.generation(restaurantId);
+    entry = dashboardCache.set(restaurantId, key, await load(), generation);
+  }
+
+  res.set('Cache-Control', 'private, no-cache');
+  res.set('ETag', entry.etag);
+  if (req.fresh) {
+    res.status(304).end();
+    return;
+  }
+  res.type('json').send(entry.body);
+};
+
+// startDate/endDate are inclusive YYYY-MM-DD days in the restaurant's
+// timezone. Returns the error message for an unusable range, if any.
+const localRangeError = (startDate: unknown, endDate: unknown): string | null => {
+  if (!isLocalDate(startDate) || !isLocalDate(endDate)) {
+    return 'startDate and endDate must be YYYY-MM-DD dates';
+  }
+  if (startDate > endDate) {
+    return 'startDate must not be after endDate';
+  }
+  return null;
+};
+
 router.get('/stats', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
   try {
     const { startDate, endDate } = req.query;
-    const stats = await dashboardService.getStats(
-      req.restaurant!.id,
-      startDate as string,
-      endDate as string
+    if (isLocalDate(startDate) && isLocalDate(endDate) && startDate > endDate) {
+      res.status(400).json({ error: 'startDate must not be after endDate' });
+      return;
+    }
+
+    const key = DashboardCache.key('stats', startDate as string, endDate as string);
+    await sendCached(req, res, key, () =>
+      dashboardService.getStats(
+        req.restaurant!.id,
+        startDate as string,
+        endDate as string,
+        restaurantTimezone(req.restaurant!)
+      )
     );
-    res.json(stats);
   } catch (error) {
     console.error('Get stats error:', error);
     res.status(500).json({ error: 'Failed to fetch dashboard stats' });
   }
 });
 
+router.get('/stats/daily', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
+  try {
+    const { startDate, endDate } = req.query;
+    const rangeError = localRangeError(startDate, endDate);
+    if (rangeError) {
+      res.status(400).json({ error: rangeError });
+      return;
+    }
+    if (daysBetween(startDate as string, endDate as string).length > MAX_DAILY_RANGE_DAYS) {
+      res.status(400).json({ error: `Ranges are limited to ${MAX_DAILY_RANGE_DAYS} days` });
+      return;
+    }
+
+    const key = DashboardCache.key('stats', 'daily', startDate as string, endDate as string);
+    await sendCached(req, res, key, async () => ({
+      timezone: restaurantTimezone(req.restaurant!),
+      days: await dashboardService.getDailyStats(req.restaurant!.id, startDate as string, endDate as string)
+    }));
+  } catch (error) {
+    console.error('Get daily stats error:', error);
+    res.status(500).json({ error: 'Failed to fetch daily stats' });
+  }
+});
+
 router.get('/top-dishes', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
   try {
-    const dishes = await dashboardService.getTopDishes(req.restaurant!.id);
-    res.json(dishes);
+    const timeZone = restaurantTimezone(req.restaurant!);
+    let { startDate, endDate } = req.query;
+    if (startDate === undefined && endDate === undefined) {
+      // Resolved here so the cache key rolls over at the restaurant's midnight
+      startDate = endDate = localDate(new Date(), timeZone);
+    }
+    const rangeError = localRangeError(startDate, endDate);
+    if (rangeError) {
+      res.status(400).json({ error: rangeError });
+      return;
+    }
+
+    await sendCached(req, res, DashboardCache.key('top-dishes', startDate as string, endDate as string), () =>
+      dashboardService.getTopDishes(req.restaurant!.id, timeZone, startDate as string, endDate as string)
+    );
   } catch (error) {
     console.error('Get top dishes error:', error);
     res.status(500).json({ error: 'Failed to fetch top dishes' });
@@ -32,8 +122,9 @@ router.get('/top-dishes', authenticateToken, async (req: AuthRequest, res: Respo
 
 router.get('/frequent-customers', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
   try {
-    const customers = await dashboardService.getFrequentCustomers(req.restaurant!.id);
-    res.json(customers);
+    await sendCached(req, res, DashboardCache.key('frequent-customers'), () =>
+      dashboardService.getFrequentCustomers(req.restaurant!.id)
+    );
   } catch (error) {
     console.error('Get frequent customers error:', error);
     res.status(500).json({ error: 'Failed to fetch frequent customers' });
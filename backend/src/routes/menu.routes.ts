@@ -1,6 +1,8 @@
 import { Router, Response } from 'express';
-import { MenuService } from '../services/menu.service';
+import { MenuService, MAX_MENU_IMPORT_ROWS } from '../services/menu.service';
 import { authenticateToken, AuthRequest } from '../middleware/auth';
+import { parseCsvRecords } from '../utils/csv';
+import { MenuItemInput, MenuImportResult } from '../types';
 
 const router = Router();
 const menuService = new MenuService();
@@ -40,4 +42,62 @@ router.put('/item/:itemId', authenticateToken, async (req: AuthRequest, res: Res
   }
 });
 
+// Dishes of a bulk request: {"items": [...]} as JSON, or a CSV upload
+// (Content-Type: text/csv) whose header row names the fields
+const importItems = (req: AuthRequest): MenuItemInput[] | string => {
+  if (req.is('text/csv')) {
+    if (typeof req.body !== 'string') return 'CSV body is required';
+    try {
+      return parseCsvRecords(req.body);
+    } catch (error) {
+      return `Invalid CSV: ${(error as Error).message}`;
+    }
+  }
+  const items = req.body?.items;
+  return Array.isArray(items) ? items : 'items must be a non-empty array';
+};
+
+const sendImport = async (
+  req: AuthRequest,
+  res: Response,
+  apply: (restaurantId: number, items: MenuItemInput[]) => Promise<MenuImportResult[]>,
+  succeeded: string
+): Promise<void> => {
+  const items = importItems(req);
+  if (typeof items === 'string') {
+    res.status(400).json({ error: items });
+    return;
+  }
+  if (items.length === 0) {
+    res.status(400).json({ error: 'items must be a non-empty array' });
+    return;
+  }
+  if (items.length > MAX_MENU_IMPORT_ROWS) {
+    res.status(400).json({ error: `At most ${MAX_MENU_IMPORT_ROWS} items per import` });
+    return;
+  }
+
+  const results = await apply(req.restaurant!.id, items);
+  const count = results.filter(result => result.success).length;
+  res.json({ [succeeded]: count, failed: results.length - count, results });
+};
+
+router.post('/items/bulk', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
+  try {
+    await sendImport(req, res, (restaurantId, items) => menuService.createMenuItems(restaurantId, items), 'created');
+  } catch (error) {
+    console.error('Bulk add menu items error:', error);
+    res.status(500).json({ error: 'Failed to import menu items' });
+  }
+});
+
+router.patch('/items/bulk', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
+  try {
+    await sendImport(req, res, (restaurantId, items) => menuService.updateMenuItems(restaurantId, items), 'updated');
+  } catch (error) {
+    console.error('Bulk update menu items error:', error);
+    res.status(500).json({ error: 'Failed to update menu items' });
+  }
+});
+
 export default router;
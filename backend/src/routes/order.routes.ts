@@ -1,24 +1,134 @@
 import { Router, Response } from 'express';
-import { OrderService } from '../services/order.service';
-import { authenticateToken, AuthRequest } from '../middleware/auth';
+import { OrderService, MAX_ORDER_PAGE_SIZE, MAX_STATUS_BATCH_SIZE, parseOrderFields } from '../services/order.service';
+import { orderStream } from '../services/order-stream.service';
+import { receiptService, RECEIPT_KINDS, ReceiptKind } from '../services/receipt.service';
+import { authenticateStreamToken, authenticateToken, AuthRequest } from '../middleware/auth';
+import { flushResponse, waitForDrain } from '../middleware/compression';
+import { decodeOrderCursor, decodeSyncVersion } from '../utils/helpers';
+import { timeSync } from '../utils/request-timing';
 
 const router = Router();
 const orderService = new OrderService();
 
+const DEFAULT_ORDER_PAGE_SIZE = 50;
+const NDJSON = 'application/x-ndjson';
+
+// Waits for a slow client to catch up before the caller fetches the next page,
+// so a stream never holds more than a page or so in memory
+const writeNdjson = async (res: Response, orders: any[]): Promise<void> => {
+  if (orders.length > 0) {
+    const ready = res.write(timeSync('serialize', () => orders.map(order => JSON.stringify(order)).join('\n') + '\n'));
+    flushResponse(res);
+    if (!ready) await waitForDrain(res);
+  }
+};
+
+// Optional query parameters:
+//   fields=orderNumber,status,...  only these order fields (and their columns)
+//   format=ndjson (or Accept: application/x-ndjson)  one order per line,
+//     streamed a page at a time instead of built as one array
 router.get('/list', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
   try {
-    const { status } = req.query;
+    const { status, limit, cursor } = req.query;
+    const { fields, unknown } = parseOrderFields(req.query.fields as string | undefined);
+    if (unknown.length > 0 || fields.length === 0) {
+      res.status(400).json({ error: `Unknown order field(s): ${unknown.join(', ') || '(none requested)'}` });
+      return;
+    }
+    const ndjson = req.query.format === 'ndjson' || req.accepts(['application/json', NDJSON]) === NDJSON;
+
+    // Paginated mode: same array body, next page cursor in X-Next-Cursor
+    if (limit !== undefined || cursor !== undefined) {
+      const after = cursor ? decodeOrderCursor(cursor as string) : undefined;
+      if (after === null) {
+        res.status(400).json({ error: 'Invalid cursor' });
+        return;
+      }
+
+      const page = await orderService.getOrdersPage(
+        req.restaurant!.id,
+        status as string,
+        limit !== undefined ? parseInt(limit as string, 10) : DEFAULT_ORDER_PAGE_SIZE,
+        after,
+        fields
+      );
+      if (page.nextCursor) {
+        res.setHeader('X-Next-Cursor', page.nextCursor);
+      }
+      if (ndjson) {
+        res.type(NDJSON);
+        await writeNdjson(res, page.orders);
+        res.end();
+        return;
+      }
+      res.json(page.orders);
+      return;
+    }
+
+    if (ndjson) {
+      res.status(200).type(NDJSON);
+      for await (const orders of orderService.streamOrders(req.restaurant!.id, status as string, fields)) {
+        if (res.destroyed) return;
+        await writeNdjson(res, orders);
+      }
+      res.end();
+      return;
+    }
+
     const orders = await orderService.getOrders(
       req.restaurant!.id,
-      status as string
+      status as string,
+      fields
     );
     res.json(orders);
   } catch (error) {
     console.error('Get orders error:', error);
+    if (res.headersSent) {
+      // Mid-stream: cut the response short so the client sees it as incomplete
+      res.destroy();
+      return;
+    }
     res.status(500).json({ error: 'Failed to fetch orders' });
   }
 });
 
+// Delta sync: orders created or changed after ?since=<version>, and the
+// version to pass next time ({ orders, version, serverTime, hasMore }). Without
+// since, just the current version. Optional limit and fields as for /list.
+router.get('/changes', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
+  try {
+    const { since, limit } = req.query;
+    const { fields, unknown } = parseOrderFields(req.query.fields as string | undefined);
+    if (unknown.length > 0 || fields.length === 0) {
+      res.status(400).json({ error: `Unknown order field(s): ${unknown.join(', ') || '(none requested)'}` });
+      return;
+    }
+    const version = since ? decodeSyncVersion(since as string) : null;
+    if (since && !version) {
+      res.status(400).json({ error: 'Invalid version' });
+      return;
+    }
+
+    const changes = await orderService.getOrderChanges(
+      req.restaurant!.id,
+      version,
+      limit !== undefined ? parseInt(limit as string, 10) : MAX_ORDER_PAGE_SIZE,
+      [...new Set(['orderNumber', ...fields])]
+    );
+    res.json(changes);
+  } catch (error) {
+    console.error('Get order changes error:', error);
+    res.status(500).json({ error: 'Failed to fetch order changes' });
+  }
+});
+
+// Server-Sent Events feed of new orders and status changes for this restaurant.
+// EventSource resends the last id it saw as Last-Event-ID when it reconnects.
+router.get('/stream', authenticateStreamToken, (req: AuthRequest, res: Response): void => {
+  const lastEventId = req.get('Last-Event-ID') || (req.query.lastEventId as string | undefined);
+  orderStream.subscribe(req.restaurant!.id, res, lastEventId);
+});
+
 router.get('/detail/:orderNumber', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
   try {
     const { orderNumber } = req.params;
@@ -39,6 +149,68 @@ router.get('/detail/:orderNumber', authenticateToken, async (req: AuthRequest, r
   }
 });
 
+// Printer-ready receipt lines, laid out when the order last changed status.
+// ?kind=kitchen,bag returns just those receipts (all three by default);
+// revalidate with the ETag.
+router.get('/:orderNumber/receipt', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
+  try {
+    const kinds = String(req.query.kind || '').split(',').map(kind => kind.trim()).filter(Boolean);
+    const unknown = kinds.filter(kind => !(RECEIPT_KINDS as readonly string[]).includes(kind));
+    if (unknown.length > 0) {
+      res.status(400).json({ error: `Unknown receipt kind(s): ${unknown.join(', ')}` });
+      return;
+    }
+
+    const receipt = await receiptService.getReceipt(
+      req.restaurant!.id,
+      req.params.orderNumber,
+      kinds as ReceiptKind[]
+    );
+    if (!receipt) {
+      res.status(404).json({ error: 'Order not found' });
+      return;
+    }
+
+    res.set('Cache-Control', 'private, no-cache');
+    res.set('ETag', receipt.etag);
+    if (req.fresh) {
+      res.status(304).end();
+      return;
+    }
+    res.type('json').send(receipt.body);
+  } catch (error) {
+    console.error('Get order receipt error:', error);
+    res.status(500).json({ error: 'Failed to fetch order receipt' });
+  }
+});
+
+// Batch status update: { updates: [{ orderNumber, status, cancellationReason? }] }.
+// Applied in one transaction; per-item results report orders that were skipped.
+// Offline replays add fromStatus and changedAt, and may come back unchanged
+// (already applied) or as a conflict carrying the server's order.
+router.patch('/status', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
+  try {
+    const { updates } = req.body;
+
+    if (!Array.isArray(updates) || updates.length === 0) {
+      res.status(400).json({ error: 'updates must be a non-empty array' });
+      return;
+    }
+    if (updates.length > MAX_STATUS_BATCH_SIZE) {
+      res.status(400).json({ error: `At most ${MAX_STATUS_BATCH_SIZE} updates per batch` });
+      return;
+    }
+
+    const results = await orderService.updateOrderStatuses(req.restaurant!.id, updates);
+    const updated = results.filter(result => result.success).length;
+
+    res.json({ updated, failed: results.length - updated, results });
+  } catch (error) {
+    console.error('Batch update order status error:', error);
+    res.status(500).json({ error: 'Failed to update order statuses' });
+  }
+});
+
 router.patch('/:orderNumber/status', authenticateToken, async (req: AuthRequest, res: Response): Promise<void> => {
   try {
     const { orderNumber } = req.params;
@@ -2,6 +2,18 @@ import express, { Request, Response } from 'express';
 import cors from 'cors';
 import dotenv from 'dotenv';
 import { testConnection } from './config/database';
+import { compressResponses } from './middleware/compression';
+import { captureTraffic, TRAFFIC_CAPTURE_FILE } from './middleware/traffic-capture';
+import { timeRequests } from './middleware/request-timing';
+import { authenticateOpsToken } from './middleware/auth';
+import { orderEvents } from './services/order-events.service';
+import { dashboardCache } from './services/dashboard-cache.service';
+import { receiptService } from './services/receipt.service';
+import { principalCache, startPrincipalRefresh } from './services/principal-cache.service';
+import { dailyStatsService } from './services/daily-stats.service';
+import { getRuntimeStats } from './services/runtime-stats.service';
+import { renderMetrics } from './services/metrics.service';
+import { MENU_IMPORT_BODY_LIMIT } from './services/menu.service';
 
 // Import routes
 import authRoutes from './routes/auth.routes';
@@ -40,16 +52,29 @@ const corsOptions = {
   credentials: true,
   methods: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
   allowedHeaders: ['Content-Type', 'Authorization', 'X-Requested-With', 'Accept', 'Origin'],
-  exposedHeaders: ['Content-Length', 'X-Request-Id'],
+  exposedHeaders: [
+    'Content-Length', 'Content-Encoding', 'X-Request-Id', 'X-Next-Cursor', 'ETag', 'X-Cache', 'Server-Timing'
+  ],
   maxAge: 3600, // Cache preflight for 1 hour
   optionsSuccessStatus: 204 // For legacy browsers
 };
 
+// Per-request spans for Server-Timing and /api/metrics; first, so it times everything after it
+app.use(timeRequests);
 app.use(cors(corsOptions));
 
 // Handle preflight requests explicitly
 app.options('*', cors(corsOptions));
 
+// Request traces for traffic_replay.py when TRAFFIC_CAPTURE_FILE is set
+app.use(captureTraffic);
+app.use(compressResponses);
+// Bulk menu imports carry thousands of dishes, as JSON or a CSV upload
+app.use(
+  '/api/menu/items/bulk',
+  express.json({ limit: MENU_IMPORT_BODY_LIMIT }),
+  express.text({ type: 'text/csv', limit: MENU_IMPORT_BODY_LIMIT })
+);
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
 
@@ -61,7 +86,25 @@ app.use((req: Request, res: Response, next) => {
 
 // Health check
 app.get('/api/health', (req: Request, res: Response) => {
-  res.json({ status: 'ok', timestamp: new Date().toISOString() });
+  res.json({
+    status: 'ok',
+    timestamp: new Date().toISOString(),
+    caches: {
+      auth: principalCache.stats(),
+      dashboard: dashboardCache.stats(),
+      receipts: receiptService.stats()
+    }
+  });
+});
+
+// Process and connection pool gauges, sampled by the soak test
+app.get('/api/stats', authenticateOpsToken, (req: Request, res: Response) => {
+  res.json(getRuntimeStats());
+});
+
+// Prometheus scrape endpoint: per-route request and span histograms
+app.get('/api/metrics', authenticateOpsToken, (req: Request, res: Response) => {
+  res.type('text/plain; version=0.0.4').send(renderMetrics());
 });
 
 // API Routes
@@ -91,10 +134,22 @@ const startServer = async () => {
       process.exit(1);
     }
 
+    // New orders invalidate cached dashboard responses
+    await orderEvents.startNewOrderWatcher(parseInt(process.env.NEW_ORDER_POLL_MS || '2000', 10));
+
+    // Roll newly inserted orders into the daily dashboard stats
+    dailyStatsService.startRollup(parseInt(process.env.DAILY_STATS_ROLLUP_MS || '2000', 10));
+
+    // Evict cached restaurant principals that were deactivated
+    startPrincipalRefresh(parseInt(process.env.AUTH_CACHE_REFRESH_MS || '15000', 10));
+
     app.listen(PORT, '0.0.0.0', () => {
       console.log(`🚀 Server running on http://0.0.0.0:${PORT}`);
       console.log(`📊 Environment: ${process.env.NODE_ENV || 'development'}`);
       console.log(`🔗 API Base: http://0.0.0.0:${PORT}/api`);
+      if (TRAFFIC_CAPTURE_FILE) {
+        console.log(`🎥 Capturing request traces to ${TRAFFIC_CAPTURE_FILE}`);
+      }
     });
   } catch (error) {
     console.error('❌ Failed to start server:', error);
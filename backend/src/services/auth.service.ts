@@ -1,35 +1,43 @@
-import crypto from 'crypto';
 import jwt from 'jsonwebtoken';
 import pool from '../config/database';
 import { jwtConfig } from '../config/jwt';
 import { Restaurant } from '../types';
+import { hashPassword, rejectUnknownUser, verifyPassword } from '../utils/password';
+import { evictRestaurantPrincipal } from './principal-cache.service';
 
 export class AuthService {
   async login(username: string, password: string): Promise<{ token: string; user: any } | null> {
     try {
       const [rows] = await pool.execute(
-        'SELECT * FROM restaurants WHERE username = ?',
+        'SELECT id, username, email, password_hash, status, is_active FROM restaurants WHERE username = ?',
         [username]
       );
 
       const restaurants = rows as Restaurant[];
 
       if (restaurants.length === 0) {
+        await rejectUnknownUser(password);
         return null;
       }
 
       const restaurant = restaurants[0];
 
       if (restaurant.status !== 'approved' || !restaurant.is_active) {
+        evictRestaurantPrincipal(restaurant.id);
         throw new Error('Restaurant account is not active or approved');
       }
 
-      const passwordHash = crypto.createHash('sha256').update(password).digest('hex');
+      const { valid, needsRehash } = await verifyPassword(password, restaurant.password_hash);
 
-      if (passwordHash !== restaurant.password_hash) {
+      if (!valid) {
         return null;
       }
 
+      if (needsRehash) {
+        // Off the response path; a failed upgrade is retried on the next login
+        this.rehash(restaurant, password).catch(error => console.error('Password rehash error:', error));
+      }
+
       const token = jwt.sign(
         { restaurant_id: restaurant.id },
         jwtConfig.secret
@@ -50,4 +58,14 @@ export class AuthService {
       throw error;
     }
   }
+
+  // Upgrade a legacy SHA-256 (or outdated cost) hash to bcrypt at BCRYPT_COST.
+  // Only replaces the hash that was verified, so a password changed meanwhile wins.
+  private async rehash(restaurant: Restaurant, password: string): Promise<void> {
+    const upgraded = await hashPassword(password);
+    await pool.execute(
+      'UPDATE restaurants SET password_hash = ? WHERE id = ? AND password_hash = ?',
+      [upgraded, restaurant.id, restaurant.password_hash]
+    );
+  }
 }
@@ -0,0 +1,395 @@
+import { PoolConnection } from 'mysql2/promise';
+import pool from '../config/database';
+import { DishSalesDelta, DishSalesService, SALES_STATUSES, SalesOrder } from './dish-sales.service';
+import { dashboardCache } from './dashboard-cache.service';
+
+export const DEFAULT_TIMEZONE = process.env.DEFAULT_TIMEZONE || 'UTC';
+// Longest range GET /dashboard/stats/daily returns day by day
+export const MAX_DAILY_RANGE_DAYS = 366;
+
+const ROLLUP_NAME = 'daily_stats';
+const ACTIVE_STATUSES = ['approved', 'ready', 'dispatched'];
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+export interface RollupOrder extends SalesOrder {
+  order_id: number;
+  total_amount: any;
+}
+
+export interface DailyStats {
+  date: string;
+  totalOrders: number;
+  revenue: number;
+  activeOrders: number;
+  completedOrders: number;
+}
+
+interface StatsDelta {
+  restaurantId: number;
+  statsDate: string;
+  totalOrders: number;
+  revenue: number;
+  activeOrders: number;
+  completedOrders: number;
+}
+
+const dateFormatters = new Map<string, Intl.DateTimeFormat>();
+
+// YYYY-MM-DD of an instant on the wall calendar of an IANA timezone
+export const localDate = (instant: Date, timeZone: string): string => {
+  let formatter = dateFormatters.get(timeZone);
+  if (!formatter) {
+    formatter = new Intl.DateTimeFormat('en-CA', { timeZone, year: 'numeric', month: '2-digit', day: '2-digit' });
+    dateFormatters.set(timeZone, formatter);
+  }
+  return formatter.format(instant);
+};
+
+export const isValidTimezone = (timeZone: string): boolean => {
+  try {
+    localDate(new Date(), timeZone);
+    return true;
+  } catch {
+    return false;
+  }
+};
+
+export const restaurantTimezone = (restaurant: { timezone?: string }): string =>
+  restaurant.timezone && isValidTimezone(restaurant.timezone) ? restaurant.timezone : DEFAULT_TIMEZONE;
+
+export const isLocalDate = (value: unknown): value is string =>
+  typeof value === 'string' && /^\d{4}-\d{2}-\d{2}$/.test(value) && !isNaN(Date.parse(`${value}T00:00:00Z`));
+
+// Inclusive YYYY-MM-DD days from start to end
+export const daysBetween = (startDate: string, endDate: string): string[] => {
+  const days: string[] = [];
+  const end = Date.parse(`${endDate}T00:00:00Z`);
+  for (let day = Date.parse(`${startDate}T00:00:00Z`); day <= end; day += DAY_MS) {
+    days.push(new Date(day).toISOString().slice(0, 10));
+  }
+  return days;
+};
+
+// How one order in a given status counts towards its day
+const counted = (status: string, amount: number) => ({
+  revenue: status === 'cancelled' ? 0 : amount,
+  active: ACTIVE_STATUSES.includes(status) ? 1 : 0,
+  completed: status === 'completed' ? 1 : 0
+});
+
+// Accumulates deltas per (restaurant, day) so a batch is one upsert
+class StatsDeltas {
+  private byDay = new Map<string, StatsDelta>();
+
+  add(restaurantId: number, statsDate: string, delta: Omit<StatsDelta, 'restaurantId' | 'statsDate'>): void {
+    const key = `${restaurantId}|${statsDate}`;
+    const row = this.byDay.get(key)
+      || { restaurantId, statsDate, totalOrders: 0, revenue: 0, activeOrders: 0, completedOrders: 0 };
+    row.totalOrders += delta.totalOrders;
+    row.revenue += delta.revenue;
+    row.activeOrders += delta.activeOrders;
+    row.completedOrders += delta.completedOrders;
+    this.byDay.set(key, row);
+  }
+
+  async write(connection: PoolConnection): Promise<void> {
+    const rows = [...this.byDay.values()].filter(row =>
+      row.totalOrders || row.revenue || row.activeOrders || row.completedOrders
+    );
+    if (rows.length === 0) {
+      return;
+    }
+
+    await connection.execute(
+      `INSERT INTO order_stats_daily
+        (restaurant_id, stats_date, total_orders, revenue, active_orders, completed_orders)
+      VALUES ${rows.map(() => '(?, ?, ?, ?, ?, ?)').join(', ')}
+      ON DUPLICATE KEY UPDATE
+        total_orders = total_orders + VALUES(total_orders),
+        revenue = revenue + VALUES(revenue),
+        active_orders = active_orders + VALUES(active_orders),
+        completed_orders = completed_orders + VALUES(completed_orders)`,
+      rows.flatMap(row => [
+        row.restaurantId, row.statsDate, row.totalOrders,
+        row.revenue.toFixed(2), row.activeOrders, row.completedOrders
+      ])
+    );
+  }
+}
+
+// Maintains order_stats_daily and dish_sales_daily, bucketed by each
+// restaurant's local day. Orders are inserted by the storefront, so they are
+// rolled up by a background pass over order_id; everything after that is a
+// delta applied in the same transaction as the status change.
+export class DailyStatsService {
+  private dishSalesService = new DishSalesService();
+  // A restaurant's timezone only changes together with a rebuild, so it is
+  // cached until rollup_state.generation shows that a rebuild has happened,
+  // in this process or any other (see migrations/005_rollup_state_generation.sql)
+  private timezones = new Map<number, string>();
+  private timezonesGeneration = 0;
+  private timer: NodeJS.Timeout | null = null;
+  private running = false;
+
+  async timezonesOf(connection: PoolConnection, restaurantIds: number[]): Promise<Map<number, string>> {
+    const missing = [...new Set(restaurantIds)].filter(id => !this.timezones.has(id));
+    if (missing.length > 0) {
+      const [rows] = await connection.execute(
+        `SELECT id, timezone FROM restaurants WHERE id IN (${missing.map(() => '?').join(', ')})`,
+        missing
+      );
+      for (const row of rows as any[]) {
+        this.timezones.set(row.id, restaurantTimezone(row));
+      }
+    }
+    return new Map(restaurantIds.map(id => [id, this.timezones.get(id) || DEFAULT_TIMEZONE]));
+  }
+
+  // Called with every read of the rollup_state row, before any timezone lookup
+  private checkGeneration(state: any): void {
+    const generation = Number(state?.generation) || 0;
+    if (generation !== this.timezonesGeneration) {
+      this.timezones.clear();
+      this.timezonesGeneration = generation;
+    }
+  }
+
+  // Orders up to this id have been rolled up. Status-change transactions read
+  // it before locking any order, the same lock order rollUpNewOrders uses, so
+  // the two cannot deadlock; the shared lock holds the rollup off until commit.
+  async readWatermark(connection: PoolConnection): Promise<number> {
+    const [stateRows] = await connection.execute(
+      'SELECT last_order_id, generation FROM rollup_state WHERE name = ? FOR SHARE',
+      [ROLLUP_NAME]
+    );
+    const state = (stateRows as any[])[0];
+    this.checkGeneration(state);
+    return Number(state?.last_order_id) || 0;
+  }
+
+  // Move already rolled-up orders between buckets for their status changes,
+  // inside the transaction that holds the orders' row locks. Orders past the
+  // watermark are skipped: the rollup counts them later in their status then.
+  async applyStatusChanges(
+    connection: PoolConnection,
+    restaurantId: number,
+    watermark: number,
+    changes: { order: RollupOrder; newStatus: string }[]
+  ): Promise<void> {
+    const rolledUp = changes.filter(({ order }) => order.order_id <= watermark);
+    if (rolledUp.length === 0) {
+      return;
+    }
+
+    const timeZone = (await this.timezonesOf(connection, [restaurantId])).get(restaurantId)!;
+    const stats = new StatsDeltas();
+    const dishes: DishSalesDelta[] = [];
+
+    for (const { order, newStatus } of rolledUp) {
+      const previousStatus = order.fulfillment_status;
+      if (previousStatus === newStatus) {
+        continue;
+      }
+
+      const day = localDate(new Date(order.created_at), timeZone);
+      const amount = parseFloat(order.total_amount) || 0;
+      const before = counted(previousStatus, amount);
+      const after = counted(newStatus, amount);
+      stats.add(restaurantId, day, {
+        totalOrders: 0,
+        revenue: after.revenue - before.revenue,
+        activeOrders: after.active - before.active,
+        completedOrders: after.completed - before.completed
+      });
+
+      // Only moves into or out of SALES_STATUSES touch dish sales, so
+      // approved -> ready -> dispatched -> completed counts the order once
+      const wasCounted = SALES_STATUSES.includes(previousStatus);
+      const isCounted = SALES_STATUSES.includes(newStatus);
+      if (wasCounted !== isCounted) {
+        dishes.push(...this.dishSalesService.deltasFor(restaurantId, day, order.product_details, isCounted ? 1 : -1));
+      }
+    }
+
+    await stats.write(connection);
+    await this.dishSalesService.writeDeltas(connection, dishes);
+  }
+
+  // Count the next batch of orders past the watermark in their current status
+  // and advance it. Returns how many orders were rolled up.
+  async rollUpNewOrders(batchSize: number = 500): Promise<number> {
+    const connection = await pool.getConnection();
+    try {
+      await connection.beginTransaction();
+
+      const [stateRows] = await connection.execute(
+        'SELECT last_order_id, generation FROM rollup_state WHERE name = ? FOR UPDATE',
+        [ROLLUP_NAME]
+      );
+      const state = (stateRows as any[])[0];
+      if (!state) {
+        throw new Error(`rollup_state has no '${ROLLUP_NAME}' row; run migrations/003_order_stats_daily.sql`);
+      }
+      this.checkGeneration(state);
+
+      // In-flight status changes hold the watermark in share mode, so by now
+      // each order is read in a status whose delta will not also be applied
+      const [rows] = await connection.execute(
+        `SELECT order_id, restaurant_id, fulfillment_status, total_amount, product_details, created_at
+        FROM order_management
+        WHERE order_id > ?
+        ORDER BY order_id
+        LIMIT ${Math.max(Math.floor(batchSize), 1)}`,
+        [Number(state.last_order_id) || 0]
+      );
+      const orders = rows as any[];
+      if (orders.length === 0) {
+        await connection.commit();
+        return 0;
+      }
+
+      const timezones = await this.timezonesOf(connection, orders.map(order => order.restaurant_id));
+      const stats = new StatsDeltas();
+      const dishes: DishSalesDelta[] = [];
+
+      for (const order of orders) {
+        const day = localDate(new Date(order.created_at), timezones.get(order.restaurant_id)!);
+        const now = counted(order.fulfillment_status, parseFloat(order.total_amount) || 0);
+        stats.add(order.restaurant_id, day, {
+          totalOrders: 1,
+          revenue: now.revenue,
+          activeOrders: now.active,
+          completedOrders: now.completed
+        });
+        if (SALES_STATUSES.includes(order.fulfillment_status)) {
+          dishes.push(...this.dishSalesService.deltasFor(order.restaurant_id, day, order.product_details, 1));
+        }
+      }
+
+      await stats.write(connection);
+      await this.dishSalesService.writeDeltas(connection, dishes);
+      await connection.execute(
+        'UPDATE rollup_state SET last_order_id = ? WHERE name = ?',
+        [orders[orders.length - 1].order_id, ROLLUP_NAME]
+      );
+
+      await connection.commit();
+
+      // The new-order watcher runs on its own timer and may already have
+      // cleared these before the orders were counted here
+      for (const restaurantId of new Set(orders.map(order => order.restaurant_id as number))) {
+        dashboardCache.invalidate(restaurantId, ['stats', 'top-dishes']);
+      }
+      return orders.length;
+    } catch (error) {
+      await connection.rollback();
+      throw error;
+    } finally {
+      connection.release();
+    }
+  }
+
+  // Empty both rollups, rewind the watermark and bump the generation so the
+  // next passes, in every process, recount every order in the current
+  // timezones (used by the backfill job after a timezone change)
+  async resetRollup(): Promise<void> {
+    const connection = await pool.getConnection();
+    try {
+      await connection.beginTransaction();
+      await connection.execute('SELECT last_order_id FROM rollup_state WHERE name = ? FOR UPDATE', [ROLLUP_NAME]);
+      await connection.execute('DELETE FROM order_stats_daily');
+      await connection.execute('DELETE FROM dish_sales_daily');
+      await connection.execute(
+        'UPDATE rollup_state SET last_order_id = 0, generation = generation + 1 WHERE name = ?',
+        [ROLLUP_NAME]
+      );
+      await connection.commit();
+      this.timezones.clear();
+    } catch (error) {
+      await connection.rollback();
+      throw error;
+    } finally {
+      connection.release();
+    }
+  }
+
+  // Roll up new orders every interval, draining back-to-back while batches are full
+  startRollup(intervalMs: number, batchSize: number = 500): void {
+    if (this.timer || intervalMs <= 0) return;
+    this.timer = setInterval(async () => {
+      if (this.running) return;
+      this.running = true;
+      try {
+        while (await this.rollUpNewOrders(batchSize) === batchSize) {
+          // keep going until caught up
+        }
+      } catch (error) {
+        console.error('Daily stats rollup error:', error);
+      } finally {
+        this.running = false;
+      }
+    }, intervalMs);
+    this.timer.unref();
+  }
+
+  stopRollup(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  // Totals over an inclusive range of local days, or over every day when
+  // no range is given
+  async getTotals(restaurantId: number, startDate?: string, endDate?: string): Promise<Omit<DailyStats, 'date'>> {
+    const params: any[] = [restaurantId];
+    let dateFilter = '';
+    if (startDate && endDate) {
+      dateFilter = ' AND stats_date BETWEEN ? AND ?';
+      params.push(startDate, endDate);
+    }
+
+    const [rows] = await pool.execute(
+      `SELECT
+        COALESCE(SUM(total_orders), 0) AS totalOrders,
+        COALESCE(SUM(revenue), 0) AS revenue,
+        COALESCE(SUM(active_orders), 0) AS activeOrders,
+        COALESCE(SUM(completed_orders), 0) AS completedOrders
+      FROM order_stats_daily
+      WHERE restaurant_id = ?${dateFilter}`,
+      params
+    );
+    const totals = (rows as any[])[0];
+
+    return {
+      totalOrders: parseInt(totals.totalOrders) || 0,
+      revenue: parseFloat(totals.revenue) || 0,
+      activeOrders: parseInt(totals.activeOrders) || 0,
+      completedOrders: parseInt(totals.completedOrders) || 0
+    };
+  }
+
+  // One entry per local day in the range, zero-filled for days without orders
+  async getDaily(restaurantId: number, startDate: string, endDate: string): Promise<DailyStats[]> {
+    const [rows] = await pool.execute(
+      `SELECT DATE_FORMAT(stats_date, '%Y-%m-%d') AS date, total_orders, revenue, active_orders, completed_orders
+      FROM order_stats_daily
+      WHERE restaurant_id = ? AND stats_date BETWEEN ? AND ?`,
+      [restaurantId, startDate, endDate]
+    );
+    const byDate = new Map((rows as any[]).map(row => [row.date, row]));
+
+    return daysBetween(startDate, endDate).map(date => {
+      const row = byDate.get(date);
+      return {
+        date,
+        totalOrders: parseInt(row?.total_orders) || 0,
+        revenue: parseFloat(row?.revenue) || 0,
+        activeOrders: parseInt(row?.active_orders) || 0,
+        completedOrders: parseInt(row?.completed_orders) || 0
+      };
+    });
+  }
+}
+
+export const dailyStatsService = new DailyStatsService();
@@ -0,0 +1,89 @@
+import { createHash } from 'crypto';
+import { orderEvents, OrderEvent } from './order-events.service';
+import { SALES_STATUSES } from './dish-sales.service';
+import { LruCache } from '../utils/lru-cache';
+import { timeSync } from '../utils/request-timing';
+
+export type DashboardCacheKind = 'stats' | 'top-dishes' | 'frequent-customers';
+
+export interface CachedResponse {
+  body: string;
+  etag: string;
+}
+
+// Which cached dashboard responses an order event can change. Stats count every
+// order; top dishes only counted statuses; frequent customers only completed ones.
+export const affectedKinds = (event: OrderEvent): DashboardCacheKind[] => {
+  const touches = (statuses: string[]) =>
+    statuses.includes(event.status) || (event.previousStatus !== null && statuses.includes(event.previousStatus));
+  const kinds: DashboardCacheKind[] = ['stats'];
+  if (touches(SALES_STATUSES)) kinds.push('top-dishes');
+  if (touches(['completed'])) kinds.push('frequent-customers');
+  return kinds;
+};
+
+// Per-restaurant cache of serialized dashboard responses, bounded and LRU
+// like the other caches since keys include client-supplied date ranges.
+// Entries expire after the TTL and are dropped as soon as an order event can
+// change them.
+export class DashboardCache {
+  // `${restaurantId}|${key}`
+  private cache: LruCache<string, CachedResponse>;
+  // Bumped by every invalidation of a restaurant; a load only lands if it is
+  // unchanged, so data read before an invalidation is never cached after it
+  private generations = new Map<number, number>();
+  private unsubscribe: (() => void) | null = null;
+  invalidations = 0;
+
+  constructor(maxEntries: number, ttlMs: number) {
+    this.cache = new LruCache(maxEntries, ttlMs);
+  }
+
+  static key(kind: DashboardCacheKind, ...parts: (string | undefined)[]): string {
+    return [kind, ...parts.map(part => part || '')].join('|');
+  }
+
+  // Read before loading and pass to set
+  generation(restaurantId: number): number {
+    return this.generations.get(restaurantId) || 0;
+  }
+
+  get(restaurantId: number, key: string): CachedResponse | null {
+    return this.cache.get(`${restaurantId}|${key}`) || null;
+  }
+
+  set(restaurantId: number, key: string, value: any, generation: number): CachedResponse {
+    const body = timeSync('serialize', () => JSON.stringify(value));
+    const entry = { body, etag: `W/"${createHash('sha1').update(body).digest('base64url')}"` };
+    if (this.generation(restaurantId) === generation) {
+      this.cache.set(`${restaurantId}|${key}`, entry);
+    }
+    return entry;
+  }
+
+  invalidate(restaurantId: number, kinds?: DashboardCacheKind[]): void {
+    this.generations.set(restaurantId, this.generation(restaurantId) + 1);
+    const prefix = `${restaurantId}|`;
+    for (const key of this.cache.keys()) {
+      if (key.startsWith(prefix) && (!kinds || kinds.some(kind => key.startsWith(`${prefix}${kind}|`)))) {
+        this.cache.delete(key);
+        this.invalidations++;
+      }
+    }
+  }
+
+  listen(): void {
+    if (this.unsubscribe) return;
+    this.unsubscribe = orderEvents.subscribe(event => this.invalidate(event.restaurantId, affectedKinds(event)));
+  }
+
+  stats() {
+    return { ...this.cache.stats(), invalidations: this.invalidations };
+  }
+}
+
+export const dashboardCache = new DashboardCache(
+  parseInt(process.env.DASHBOARD_CACHE_MAX || '1000', 10),
+  parseInt(process.env.DASHBOARD_CACHE_TTL_MS || '30000', 10)
+);
+dashboardCache.listen();
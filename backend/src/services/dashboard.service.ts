@@ -1,38 +1,33 @@
 import pool from '../config/database';
 import { DashboardStats } from '../types';
 import { parseJsonField } from '../utils/helpers';
+import { DishSalesService } from './dish-sales.service';
+import { DailyStats, dailyStatsService, DEFAULT_TIMEZONE, isLocalDate, localDate } from './daily-stats.service';
+
+const dishSalesService = new DishSalesService();
 
 export class DashboardService {
-  async getStats(restaurantId: number, startDate?: string, endDate?: string): Promise<DashboardStats> {
+  // Local YYYY-MM-DD ranges (and no range at all) are answered from the
+  // order_stats_daily rollup; datetime bounds still scan order_management.
+  async getStats(
+    restaurantId: number,
+    startDate?: string,
+    endDate?: string,
+    timeZone: string = DEFAULT_TIMEZONE
+  ): Promise<DashboardStats> {
     try {
-      let dateFilter = '';
-      const params: any[] = [restaurantId];
-
-      if (startDate && endDate) {
-        dateFilter = ' AND created_at BETWEEN ? AND ?';
-        params.push(startDate, endDate);
-      }
-
-      const [statsRows] = await pool.execute(
-        `SELECT 
-          COUNT(*) as totalOrders,
-          COALESCE(SUM(CASE WHEN fulfillment_status != 'cancelled' THEN total_amount ELSE 0 END), 0) as revenue,
-          COUNT(CASE WHEN fulfillment_status IN ('approved', 'ready', 'dispatched') THEN 1 END) as activeOrders,
-          COUNT(CASE WHEN fulfillment_status = 'completed' THEN 1 END) as completedOrders
-        FROM order_management
-        WHERE restaurant_id = ?${dateFilter}`,
-        params
-      );
-
-      const stats = (statsRows as any[])[0];
+      const ranged = Boolean(startDate && endDate);
+      const totals = !ranged || (isLocalDate(startDate) && isLocalDate(endDate))
+        ? await dailyStatsService.getTotals(restaurantId, startDate, endDate)
+        : await this.scanStats(restaurantId, startDate!, endDate!);
 
       return {
-        totalOrders: parseInt(stats.totalOrders) || 0,
-        revenue: parseFloat(stats.revenue) || 0,
-        activeOrders: parseInt(stats.activeOrders) || 0,
-        completedOrders: parseInt(stats.completedOrders) || 0,
+        ...totals,
         avgPrepTime: 0,
-        avgRating: 4.5
+        avgRating: 4.5,
+        timezone: timeZone,
+        startDate: ranged ? startDate! : null,
+        endDate: ranged ? endDate! : null
       };
     } catch (error) {
       console.error('Get stats error:', error);
@@ -40,47 +35,48 @@ export class DashboardService {
     }
   }
 
-  async getTopDishes(restaurantId: number): Promise<any[]> {
-    try {
-      const [rows] = await pool.execute(
-        `SELECT product_details
-        FROM order_management
-        WHERE restaurant_id = ? 
-          AND fulfillment_status IN ('approved', 'ready', 'dispatched', 'completed')
-          AND DATE(created_at) = CURDATE()
-        ORDER BY created_at DESC`,
-        [restaurantId]
-      );
+  private async scanStats(restaurantId: number, startDate: string, endDate: string) {
+    const [statsRows] = await pool.execute(
+      `SELECT 
+        COUNT(*) as totalOrders,
+        COALESCE(SUM(CASE WHEN fulfillment_status != 'cancelled' THEN total_amount ELSE 0 END), 0) as revenue,
+        COUNT(CASE WHEN fulfillment_status IN ('approved', 'ready', 'dispatched') THEN 1 END) as activeOrders,
+        COUNT(CASE WHEN fulfillment_status = 'completed' THEN 1 END) as completedOrders
+      FROM order_management
+      WHERE restaurant_id = ? AND created_at BETWEEN ? AND ?`,
+      [restaurantId, startDate, endDate]
+    );
 
-      const orders = rows as any[];
-      const dishCount: Record<string, { name: string; count: number; revenue: number }> = {};
+    const stats = (statsRows as any[])[0];
 
-      orders.forEach(order => {
-        const items = parseJsonField(order.product_details);
-        if (Array.isArray(items)) {
-          items.forEach((item: any) => {
-            const dishName = item.dish_name || item.name || 'Unknown';
-            const quantity = parseInt(item.quantity) || 1;
-            const price = parseFloat(item.selling_price || item.unit_price || item.price) || 0;
+    return {
+      totalOrders: parseInt(stats.totalOrders) || 0,
+      revenue: parseFloat(stats.revenue) || 0,
+      activeOrders: parseInt(stats.activeOrders) || 0,
+      completedOrders: parseInt(stats.completedOrders) || 0
+    };
+  }
 
-            if (!dishCount[dishName]) {
-              dishCount[dishName] = { name: dishName, count: 0, revenue: 0 };
-            }
-            dishCount[dishName].count += quantity;
-            dishCount[dishName].revenue += price * quantity;
-          });
-        }
-      });
+  async getDailyStats(restaurantId: number, startDate: string, endDate: string): Promise<DailyStats[]> {
+    try {
+      return await dailyStatsService.getDaily(restaurantId, startDate, endDate);
+    } catch (error) {
+      console.error('Get daily stats error:', error);
+      throw error;
+    }
+  }
 
-      return Object.values(dishCount)
-        .sort((a, b) => b.count - a.count)
-        .slice(0, 5)
-        .map((dish, index) => ({
-          rank: index + 1,
-          name: dish.name,
-          orderCount: dish.count,
-          revenue: dish.revenue
-        }));
+  // Reads the per-day dish_sales_daily rollup, so the cost is O(dishes x days)
+  // instead of a scan of the range's orders. Defaults to the restaurant's today.
+  async getTopDishes(
+    restaurantId: number,
+    timeZone: string = DEFAULT_TIMEZONE,
+    startDate?: string,
+    endDate?: string
+  ): Promise<any[]> {
+    try {
+      const today = localDate(new Date(), timeZone);
+      return await dishSalesService.getTopDishes(restaurantId, startDate || today, endDate || today, 5);
     } catch (error) {
       console.error('Get top dishes error:', error);
       throw error;
@@ -0,0 +1,81 @@
+import { PoolConnection } from 'mysql2/promise';
+import pool from '../config/database';
+import { tallyDishes } from '../utils/helpers';
+
+// Statuses whose orders count towards dish sales (same set the top-dishes
+// query has always used)
+export const SALES_STATUSES = ['approved', 'ready', 'dispatched', 'completed'];
+
+export interface SalesOrder {
+  fulfillment_status: string;
+  product_details: any;
+  created_at: Date;
+}
+
+export interface DishSalesDelta {
+  restaurantId: number;
+  // Restaurant-local YYYY-MM-DD
+  salesDate: string;
+  dishName: string;
+  quantity: number;
+  revenue: number;
+}
+
+// Writes to and reads from dish_sales_daily. Which orders count on which day
+// is decided by DailyStatsService, which keeps this rollup and
+// order_stats_daily in step in the same transaction.
+export class DishSalesService {
+  // Rows adding (sign 1) or removing (sign -1) one order's dishes on its day
+  deltasFor(restaurantId: number, salesDate: string, productDetails: any, sign: 1 | -1): DishSalesDelta[] {
+    const deltas: DishSalesDelta[] = [];
+    tallyDishes(productDetails).forEach((sales, dishName) => {
+      deltas.push({
+        restaurantId,
+        salesDate,
+        dishName,
+        quantity: sign * sales.quantity,
+        revenue: sign * sales.revenue
+      });
+    });
+    return deltas;
+  }
+
+  // All deltas in one multi-row statement
+  async writeDeltas(connection: PoolConnection, deltas: DishSalesDelta[]): Promise<void> {
+    if (deltas.length === 0) {
+      return;
+    }
+
+    await connection.execute(
+      `INSERT INTO dish_sales_daily (restaurant_id, sales_date, dish_name, quantity, revenue)
+      VALUES ${deltas.map(() => '(?, ?, ?, ?, ?)').join(', ')}
+      ON DUPLICATE KEY UPDATE
+        quantity = quantity + VALUES(quantity),
+        revenue = revenue + VALUES(revenue)`,
+      deltas.flatMap(delta => [delta.restaurantId, delta.salesDate, delta.dishName, delta.quantity, delta.revenue])
+    );
+  }
+
+  // Best sellers over an inclusive range of restaurant-local days. A single
+  // day reads idx_dish_sales_daily_top directly; longer ranges sum one row
+  // per dish per day.
+  async getTopDishes(restaurantId: number, startDate: string, endDate: string, limit: number = 5): Promise<any[]> {
+    const [rows] = await pool.execute(
+      `SELECT dish_name, SUM(quantity) AS quantity, SUM(revenue) AS revenue
+      FROM dish_sales_daily
+      WHERE restaurant_id = ? AND sales_date BETWEEN ? AND ?
+      GROUP BY dish_name
+      HAVING quantity > 0
+      ORDER BY quantity DESC, dish_name
+      LIMIT ${Math.max(Math.floor(limit), 1)}`,
+      [restaurantId, startDate, endDate]
+    );
+
+    return (rows as any[]).map((dish, index) => ({
+      rank: index + 1,
+      name: dish.dish_name,
+      orderCount: parseInt(dish.quantity) || 0,
+      revenue: parseFloat(dish.revenue) || 0
+    }));
+  }
+}
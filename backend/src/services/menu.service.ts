@@ -1,5 +1,85 @@
 import pool from '../config/database';
-import { Dish } from '../types';
+import { Dish, MenuItemInput, MenuImportResult } from '../types';
+
+// Dishes per bulk import request, and per multi-row statement (10 placeholders
+// a row keeps a chunk well under MySQL's 65,535)
+export const MAX_MENU_IMPORT_ROWS = parseInt(process.env.MENU_IMPORT_MAX_ROWS || '10000', 10);
+const MENU_IMPORT_CHUNK = parseInt(process.env.MENU_IMPORT_CHUNK || '500', 10);
+// Body size limit of the bulk endpoints; 10k dishes as JSON is about 2 MB
+export const MENU_IMPORT_BODY_LIMIT = process.env.MENU_IMPORT_BODY_LIMIT || '10mb';
+
+const MENU_ITEM_COLUMNS = 'dish_id, name, selling_price, description, primary_image, availability_status, menu_section';
+
+// API field -> dishes column for the text fields an import may set
+const TEXT_FIELDS: Record<string, string> = {
+  description: 'description',
+  imagePath: 'primary_image',
+  category: 'menu_section'
+};
+
+const TRUE_VALUES = ['true', '1', 'yes', 'y'];
+const FALSE_VALUES = ['false', '0', 'no', 'n'];
+
+const mapMenuItem = (dish: any): any => ({
+  id: dish.dish_id,
+  name: dish.name,
+  price: parseFloat(dish.selling_price) || 0,
+  description: dish.description,
+  imagePath: dish.primary_image,
+  isAvailable: dish.availability_status === 'available',
+  category: dish.menu_section
+});
+
+const chunks = <T>(items: T[], size: number = MENU_IMPORT_CHUNK): T[][] => {
+  const result: T[][] = [];
+  for (let start = 0; start < items.length; start += size) {
+    result.push(items.slice(start, start + size));
+  }
+  return result;
+};
+
+// The dishes columns one import row sets, or why it cannot be imported.
+// Empty values (blank CSV cells) leave a field unset.
+const menuItemColumns = (item: MenuItemInput, creating: boolean): { columns: Record<string, any> } | { error: string } => {
+  if (!item || typeof item !== 'object') {
+    return { error: 'Menu item must be an object' };
+  }
+  const isSet = (value: any) => value !== undefined && value !== null && value !== '';
+  const columns: Record<string, any> = {};
+
+  if (isSet(item.name)) {
+    const name = String(item.name).trim();
+    if (!name) return { error: 'Name must not be blank' };
+    if (name.length > 255) return { error: 'Name must be at most 255 characters' };
+    columns.name = name;
+  } else if (creating) {
+    return { error: 'Name is required' };
+  }
+
+  if (isSet(item.price)) {
+    const price = typeof item.price === 'number' ? item.price : Number(String(item.price).trim());
+    if (!Number.isFinite(price) || price < 0) return { error: `Invalid price: ${item.price}` };
+    columns.selling_price = Math.round(price * 100) / 100;
+  }
+
+  for (const [field, column] of Object.entries(TEXT_FIELDS)) {
+    const value = (item as any)[field];
+    if (!isSet(value)) continue;
+    if (typeof value !== 'string' && typeof value !== 'number') return { error: `${field} must be text` };
+    columns[column] = String(value);
+  }
+
+  // New dishes start unavailable, as with POST /item, until the restaurant enables them
+  if (!creating && isSet(item.isAvailable)) {
+    const flag = String(item.isAvailable).trim().toLowerCase();
+    if (!TRUE_VALUES.includes(flag) && !FALSE_VALUES.includes(flag)) {
+      return { error: `Invalid isAvailable: ${item.isAvailable}` };
+    }
+    columns.availability_status = TRUE_VALUES.includes(flag) ? 'available' : 'unavailable';
+  }
+
+  return { columns };
+};
 
 export class MenuService {
   async getMenuItems(restaurantId: number): Promise<any[]> {
@@ -101,6 +181,179 @@ export class MenuService {
     }
   }
 
+  // Create many dishes in one transaction: per chunk, one multi-row INSERT and one
+  // read-back by slug (multi-row inserts need not get consecutive ids). Invalid
+  // rows are reported without failing the others.
+  async createMenuItems(restaurantId: number, items: MenuItemInput[]): Promise<MenuImportResult[]> {
+    try {
+      const results: MenuImportResult[] = items.map((_, index) => ({ row: index + 1, success: false }));
+      const stamp = Date.now();
+      const rows: { index: number; slug: string; params: any[] }[] = [];
+
+      items.forEach((item, index) => {
+        const checked = menuItemColumns(item, true);
+        if ('error' in checked) {
+          results[index].error = checked.error;
+          return;
+        }
+        const { columns } = checked;
+        const slug = `${columns.name.toLowerCase().replace(/[^a-z0-9]+/g, '-')}-${stamp}-${index}`;
+        rows.push({
+          index,
+          slug,
+          params: [
+            restaurantId,
+            columns.name,
+            slug,
+            columns.selling_price || 0,
+            columns.description || '',
+            columns.primary_image || '',
+            'unavailable',
+            columns.menu_section || 'Uncategorized',
+            0,
+            0
+          ]
+        });
+      });
+
+      if (rows.length === 0) {
+        return results;
+      }
+
+      const dishBySlug = new Map<string, any>();
+      const connection = await pool.getConnection();
+      try {
+        await connection.beginTransaction();
+        for (const chunk of chunks(rows)) {
+          await connection.execute(
+            `INSERT INTO dishes
+            (restaurant_id, name, slug, selling_price, description, primary_image, availability_status, menu_section, is_active, is_deleted)
+            VALUES ${chunk.map(() => '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)').join(', ')}`,
+            chunk.flatMap(row => row.params)
+          );
+          const [created] = await connection.execute(
+            `SELECT ${MENU_ITEM_COLUMNS}, slug FROM dishes
+            WHERE restaurant_id = ? AND slug IN (${chunk.map(() => '?').join(', ')})`,
+            [restaurantId, ...chunk.map(row => row.slug)]
+          );
+          for (const dish of created as any[]) {
+            dishBySlug.set(dish.slug, dish);
+          }
+        }
+        await connection.commit();
+      } catch (error) {
+        await connection.rollback();
+        throw error;
+      } finally {
+        connection.release();
+      }
+
+      for (const { index, slug } of rows) {
+        results[index] = { row: index + 1, success: true, item: mapMenuItem(dishBySlug.get(slug)) };
+      }
+      return results;
+    } catch (error) {
+      console.error('Bulk add menu items error:', error);
+      throw error;
+    }
+  }
+
+  // Update many dishes in one transaction: per chunk, one locking read of the
+  // ids, one UPDATE with a CASE per changed column and one read-back.
+  // Invalid rows and unknown dishes are reported without failing the others.
+  async updateMenuItems(restaurantId: number, items: MenuItemInput[]): Promise<MenuImportResult[]> {
+    try {
+      const results: MenuImportResult[] = items.map((_, index) => ({ row: index + 1, success: false }));
+      const seen = new Set<number>();
+      const rows: { index: number; dishId: number; columns: Record<string, any> }[] = [];
+
+      items.forEach((item, index) => {
+        const dishId = Number(typeof item?.id === 'string' ? item.id.trim() : item?.id);
+        if (!Number.isInteger(dishId) || dishId <= 0) {
+          results[index].error = 'A numeric id is required';
+          return;
+        }
+        const checked = menuItemColumns(item, false);
+        if ('error' in checked) {
+          results[index].error = checked.error;
+        } else if (Object.keys(checked.columns).length === 0) {
+          results[index].error = 'No valid fields to update';
+        } else if (seen.has(dishId)) {
+          results[index].error = 'Menu item appears more than once in the import';
+        } else {
+          seen.add(dishId);
+          rows.push({ index, dishId, columns: checked.columns });
+        }
+      });
+
+      if (rows.length === 0) {
+        return results;
+      }
+
+      const dishById = new Map<number, any>();
+      const connection = await pool.getConnection();
+      try {
+        await connection.beginTransaction();
+        for (const chunk of chunks(rows)) {
+          const [existing] = await connection.execute(
+            `SELECT dish_id FROM dishes
+            WHERE restaurant_id = ? AND is_deleted = 0 AND dish_id IN (${chunk.map(() => '?').join(', ')})
+            FOR UPDATE`,
+            [restaurantId, ...chunk.map(row => row.dishId)]
+          );
+          const found = new Set((existing as any[]).map(dish => dish.dish_id));
+          const present = chunk.filter(row => found.has(row.dishId));
+          if (present.length === 0) continue;
+
+          // Each column only changes on the rows that set it
+          const changed = [...new Set(present.flatMap(row => Object.keys(row.columns)))];
+          const assignments: string[] = [];
+          const params: any[] = [];
+          for (const column of changed) {
+            const setting = present.filter(row => column in row.columns);
+            assignments.push(
+              `${column} = CASE dish_id ${setting.map(() => 'WHEN ? THEN ?').join(' ')} ELSE ${column} END`
+            );
+            setting.forEach(row => params.push(row.dishId, row.columns[column]));
+          }
+          const ids = present.map(row => row.dishId);
+          await connection.execute(
+            `UPDATE dishes
+            SET ${assignments.join(', ')}
+            WHERE restaurant_id = ? AND dish_id IN (${ids.map(() => '?').join(', ')})`,
+            [...params, restaurantId, ...ids]
+          );
+
+          const [updated] = await connection.execute(
+            `SELECT ${MENU_ITEM_COLUMNS} FROM dishes
+            WHERE restaurant_id = ? AND dish_id IN (${ids.map(() => '?').join(', ')})`,
+            [restaurantId, ...ids]
+          );
+          for (const dish of updated as any[]) {
+            dishById.set(dish.dish_id, dish);
+          }
+        }
+        await connection.commit();
+      } catch (error) {
+        await connection.rollback();
+        throw error;
+      } finally {
+        connection.release();
+      }
+
+      for (const { index, dishId } of rows) {
+        const dish = dishById.get(dishId);
+        results[index] = dish
+          ? { row: index + 1, success: true, item: mapMenuItem(dish) }
+          : { row: index + 1, success: false, error: 'Menu item not found' };
+      }
+      return results;
+    } catch (error) {
+      console.error('Bulk update menu items error:', error);
+      throw error;
+    }
+  }
+
   async addMenuItem(restaurantId: number, item: any): Promise<any> {
     try {
       const slug = item.name.toLowerCase().replace(/[^a-z0-9]+/g, '-') + '-' + Date.now();
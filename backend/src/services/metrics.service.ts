@@ -0,0 +1,89 @@
+import { getPoolStats } from '../config/database';
+import { RequestTimer } from '../utils/request-timing';
+
+// Prometheus' default buckets, in seconds
+const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+type Labels = Record<string, string | number>;
+
+const escapeLabel = (value: string | number): string =>
+  String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+const formatLabels = (labels: Labels, extra: Labels = {}): string => {
+  const pairs = Object.entries({ ...labels, ...extra }).map(([name, value]) => `${name}="${escapeLabel(value)}"`);
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+};
+
+// Cumulative histogram per label set, rendered in the Prometheus text format
+class Histogram {
+  private series = new Map<string, { labels: Labels; buckets: number[]; sum: number; count: number }>();
+
+  constructor(private name: string, private help: string, private bounds: number[] = DURATION_BUCKETS) {}
+
+  observe(labels: Labels, value: number): void {
+    const key = JSON.stringify(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, buckets: this.bounds.map(() => 0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+    this.bounds.forEach((bound, index) => {
+      if (value <= bound) series!.buckets[index]++;
+    });
+    series.sum += value;
+    series.count++;
+  }
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    for (const { labels, buckets, sum, count } of this.series.values()) {
+      this.bounds.forEach((bound, index) => {
+        lines.push(`${this.name}_bucket${formatLabels(labels, { le: bound })} ${buckets[index]}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels(labels, { le: '+Inf' })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    }
+    return lines;
+  }
+}
+
+const requestDuration = new Histogram(
+  'http_request_duration_seconds',
+  'Time from the request arriving to the last byte of the response'
+);
+const spanDuration = new Histogram(
+  'http_request_span_seconds',
+  'Time one request spent in a span (auth, db, parse, serialize, ...), summed within the request'
+);
+
+// route is the Express route pattern (/api/orders/detail/:orderNumber), so
+// order numbers and ids do not each get their own series
+export const observeRequest = (method: string, route: string, status: number, timer: RequestTimer): void => {
+  requestDuration.observe({ method, route, status }, timer.totalMs() / 1000);
+  for (const [span, total] of timer.spans) {
+    spanDuration.observe({ method, route, span }, total.ms / 1000);
+  }
+};
+
+const gauge = (name: string, help: string, samples: [Labels, number][]): string[] => [
+  `# HELP ${name} ${help}`,
+  `# TYPE ${name} gauge`,
+  ...samples.map(([labels, value]) => `${name}${formatLabels(labels)} ${value}`)
+];
+
+export const renderMetrics = (): string => {
+  const pool = getPoolStats();
+  const memory = process.memoryUsage();
+  return [
+    ...requestDuration.render(),
+    ...spanDuration.render(),
+    ...gauge('db_pool_connections', 'mysql2 pool connections by state', [
+      [{ state: 'active' }, pool.active],
+      [{ state: 'idle' }, pool.idle],
+      [{ state: 'queued' }, pool.queued]
+    ]),
+    ...gauge('process_resident_memory_bytes', 'Resident set size', [[{}, memory.rss]]),
+    ...gauge('nodejs_heap_used_bytes', 'V8 heap in use', [[{}, memory.heapUsed]])
+  ].join('\n') + '\n';
+};
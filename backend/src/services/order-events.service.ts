@@ -0,0 +1,77 @@
+import { EventEmitter } from 'events';
+import pool from '../config/database';
+
+export interface OrderEvent {
+  type: 'created' | 'status';
+  restaurantId: number;
+  orderId: number;
+  orderNumber: string;
+  // fulfillment_status values as stored in order_management
+  previousStatus: string | null;
+  status: string;
+}
+
+const NEW_ORDER_BATCH_SIZE = 500;
+
+// In-process bus for order changes. Status changes are published by
+// OrderService; orders are inserted by the storefront, so new ones are picked
+// up by polling order_management past the highest order_id already seen.
+class OrderEvents extends EventEmitter {
+  private lastOrderId = 0;
+  private timer: NodeJS.Timeout | null = null;
+
+  publish(event: OrderEvent): void {
+    this.emit('order', event);
+  }
+
+  subscribe(listener: (event: OrderEvent) => void): () => void {
+    this.on('order', listener);
+    return () => this.off('order', listener);
+  }
+
+  async startNewOrderWatcher(intervalMs: number): Promise<void> {
+    if (this.timer || intervalMs <= 0) return;
+
+    const [rows] = await pool.execute('SELECT COALESCE(MAX(order_id), 0) AS lastOrderId FROM order_management');
+    this.lastOrderId = Number((rows as any[])[0].lastOrderId) || 0;
+
+    this.timer = setInterval(() => {
+      this.pollNewOrders().catch(error => console.error('New order watcher error:', error));
+    }, intervalMs);
+    this.timer.unref();
+  }
+
+  stopNewOrderWatcher(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  // Range scan on the primary key, so each poll only reads rows inserted since the last one
+  private async pollNewOrders(): Promise<void> {
+    const [rows] = await pool.execute(
+      `SELECT order_id, restaurant_id, order_number, fulfillment_status
+      FROM order_management
+      WHERE order_id > ?
+      ORDER BY order_id
+      LIMIT ${NEW_ORDER_BATCH_SIZE}`,
+      [this.lastOrderId]
+    );
+
+    for (const row of rows as any[]) {
+      this.lastOrderId = row.order_id;
+      this.publish({
+        type: 'created',
+        restaurantId: row.restaurant_id,
+        orderId: row.order_id,
+        orderNumber: row.order_number,
+        previousStatus: null,
+        status: row.fulfillment_status
+      });
+    }
+  }
+}
+
+export const orderEvents = new OrderEvents();
+orderEvents.setMaxListeners(0);
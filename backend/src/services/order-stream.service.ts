@@ -0,0 +1,117 @@
+import { Response } from 'express';
+import { randomBytes } from 'crypto';
+import { orderEvents, OrderEvent } from './order-events.service';
+import { mapOrderStatus } from '../utils/helpers';
+
+const REPLAY_BUFFER_SIZE = 256;
+const HEARTBEAT_MS = 25000;
+
+interface BufferedEvent {
+  seq: number;
+  frame: string;
+}
+
+// Server-Sent Events fan-out of order events, one channel per restaurant.
+// Event ids are "<boot id>.<sequence>"; a reconnecting client sends the last
+// one as Last-Event-ID and gets every buffered event after it, or a "reset"
+// event when the gap cannot be replayed (buffer overrun or server restart).
+export class OrderStream {
+  private readonly bootId = randomBytes(4).toString('hex');
+  private seq = 0;
+  private subscribers = new Map<number, Set<Response>>();
+  private buffers = new Map<number, BufferedEvent[]>();
+  // Sequence of the newest event each restaurant has pushed out of its buffer
+  private evicted = new Map<number, number>();
+  private heartbeat: NodeJS.Timeout | null = null;
+  private unsubscribe: (() => void) | null = null;
+
+  start(): void {
+    if (this.unsubscribe) return;
+    this.unsubscribe = orderEvents.subscribe(event => this.broadcast(event));
+    this.heartbeat = setInterval(() => {
+      for (const clients of this.subscribers.values()) {
+        for (const res of clients) res.write(': ping\n\n');
+      }
+    }, HEARTBEAT_MS);
+    this.heartbeat.unref();
+  }
+
+  subscriberCount(): number {
+    let count = 0;
+    for (const clients of this.subscribers.values()) count += clients.size;
+    return count;
+  }
+
+  subscribe(restaurantId: number, res: Response, lastEventId?: string): void {
+    res.status(200).set({
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+      // Stop nginx from buffering the stream
+      'X-Accel-Buffering': 'no'
+    });
+    res.flushHeaders();
+    res.write('retry: 3000\n\n');
+
+    if (lastEventId) {
+      this.replay(restaurantId, res, lastEventId);
+    }
+
+    let clients = this.subscribers.get(restaurantId);
+    if (!clients) {
+      clients = new Set();
+      this.subscribers.set(restaurantId, clients);
+    }
+    clients.add(res);
+
+    res.on('close', () => {
+      clients!.delete(res);
+      if (clients!.size === 0) this.subscribers.delete(restaurantId);
+    });
+  }
+
+  private replay(restaurantId: number, res: Response, lastEventId: string): void {
+    const [bootId, seqText] = lastEventId.split('.');
+    const lastSeq = parseInt(seqText, 10);
+    const buffer = this.buffers.get(restaurantId) || [];
+
+    if (bootId !== this.bootId || isNaN(lastSeq) || lastSeq < (this.evicted.get(restaurantId) || 0)) {
+      // Events were missed for good; the client must refetch its order list
+      res.write(`event: reset\ndata: {}\n\n`);
+      return;
+    }
+    for (const event of buffer) {
+      if (event.seq > lastSeq) res.write(event.frame);
+    }
+  }
+
+  private broadcast(event: OrderEvent): void {
+    const seq = ++this.seq;
+    const data = JSON.stringify({
+      type: event.type,
+      orderId: event.orderId,
+      orderNumber: event.orderNumber,
+      status: mapOrderStatus(event.status),
+      previousStatus: event.previousStatus ? mapOrderStatus(event.previousStatus) : null,
+      timestamp: new Date().toISOString()
+    });
+    const frame = `id: ${this.bootId}.${seq}\nevent: order\ndata: ${data}\n\n`;
+
+    let buffer = this.buffers.get(event.restaurantId);
+    if (!buffer) {
+      buffer = [];
+      this.buffers.set(event.restaurantId, buffer);
+    }
+    buffer.push({ seq, frame });
+    if (buffer.length > REPLAY_BUFFER_SIZE) {
+      this.evicted.set(event.restaurantId, buffer.shift()!.seq);
+    }
+
+    for (const res of this.subscribers.get(event.restaurantId) || []) {
+      res.write(frame);
+    }
+  }
+}
+
+export const orderStream = new OrderStream();
+orderStream.start();
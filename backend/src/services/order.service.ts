@@ -1,17 +1,87 @@
+import { PoolConnection } from 'mysql2/promise';
 import pool from '../config/database';
-import { Order } from '../types';
-import { mapOrderStatus, reverseMapOrderStatus, parseJsonField } from '../utils/helpers';
+import { Order, OrderChanges, OrderPage, OrderStatusUpdate, OrderStatusResult } from '../types';
+import {
+  ORDER_STATUSES,
+  isOrderStatus,
+  mapOrderStatus,
+  reverseMapOrderStatus,
+  parseJsonField,
+  encodeOrderCursor,
+  decodeOrderCursor,
+  encodeSyncVersion
+} from '../utils/helpers';
+import { dailyStatsService } from './daily-stats.service';
+import { orderEvents } from './order-events.service';
+
+// Each field of an order in API responses, with the order_management columns
+// it is built from, so a ?fields= projection only selects what it returns
+const ORDER_FIELDS: Record<string, { columns: string[]; map: (order: any) => any }> = {
+  orderNumber: { columns: ['order_number'], map: order => order.order_number },
+  status: { columns: ['fulfillment_status'], map: order => mapOrderStatus(order.fulfillment_status) },
+  customer: {
+    columns: ['customer', 'customer_email', 'customer_phone', 'customer_address'],
+    map: order => ({
+      name: order.customer,
+      email: order.customer_email,
+      phone: order.customer_phone,
+      address: order.customer_address
+    })
+  },
+  totalAmount: { columns: ['total_amount'], map: order => parseFloat(order.total_amount) || 0 },
+  createdAt: { columns: ['created_at'], map: order => order.created_at },
+  approvedAt: { columns: ['approved_at'], map: order => order.approved_at },
+  readyAt: { columns: ['ready_at'], map: order => order.ready_at },
+  dispatchedAt: { columns: ['dispatched_at'], map: order => order.dispatched_at },
+  completedAt: { columns: ['delivery_date'], map: order => order.delivery_date },
+  cancelledAt: { columns: ['cancelled_at'], map: order => order.cancelled_at },
+  cancelledBy: { columns: ['cancelled_at'], map: order => order.cancelled_at ? 'restaurant' : null },
+  cancellationReason: { columns: ['cancel_reason'], map: order => order.cancel_reason },
+  notes: { columns: ['kitchen_notes'], map: order => order.kitchen_notes },
+  items: {
+    columns: ['product_details'],
+    map: order => {
+      const items = parseJsonField(order.product_details);
+      return Array.isArray(items) ? items : [];
+    }
+  },
+  deliveryMethod: { columns: ['delivery_method'], map: order => order.delivery_method }
+};
+
+export const ORDER_LIST_FIELDS = Object.keys(ORDER_FIELDS);
+
+// Keyset pagination reads these whatever the projection
+const orderColumns = (fields: string[]): string =>
+  [...new Set(['order_id', 'created_at', ...fields.flatMap(field => ORDER_FIELDS[field].columns)])].join(', ');
+
+// Split a comma-separated ?fields= value into known and unknown field names
+export const parseOrderFields = (value?: string): { fields: string[]; unknown: string[] } => {
+  if (!value) {
+    return { fields: ORDER_LIST_FIELDS, unknown: [] };
+  }
+  const requested = [...new Set(value.split(',').map(field => field.trim()).filter(Boolean))];
+  return {
+    fields: requested.filter(field => field in ORDER_FIELDS),
+    unknown: requested.filter(field => !(field in ORDER_FIELDS))
+  };
+};
+
+const ORDER_LIST_COLUMNS = orderColumns(ORDER_LIST_FIELDS);
+
+const ORDER_DETAIL_COLUMNS = `${ORDER_LIST_COLUMNS}, payment_method, payment_status`;
+
+export const MAX_ORDER_PAGE_SIZE = 500;
+export const MAX_STATUS_BATCH_SIZE = 100;
+
+// Compares a fulfillment_status column with a status from the API
+const sameStatus = (dbStatus: string, status: string): boolean =>
+  mapOrderStatus(dbStatus) === mapOrderStatus(reverseMapOrderStatus(status));
 
 export class OrderService {
-  async getOrders(restaurantId: number, status?: string): Promise<any[]> {
+  async getOrders(restaurantId: number, status?: string, fields: string[] = ORDER_LIST_FIELDS): Promise<any[]> {
     try {
       let query = `
-        SELECT 
-          order_id, order_number, fulfillment_status, customer, customer_email, customer_phone,
-          total_amount, created_at, approved_at, ready_at, 
-          dispatched_at, delivery_date, cancelled_at,
-          cancel_reason, kitchen_notes, product_details,
-          delivery_method, customer_address
+        SELECT ${orderColumns(fields)}
         FROM order_management 
         WHERE restaurant_id = ?
       `;
@@ -28,33 +98,144 @@ export class OrderService {
       const [rows] = await pool.execute(query, params);
       const orders = rows as any[];
 
-      return orders.map(order => {
-        const items = parseJsonField(order.product_details);
+      return orders.map(order => this.mapOrderRow(order, fields));
+    } catch (error) {
+      console.error('Get orders error:', error);
+      throw error;
+    }
+  }
+
+  // One page of orders, newest first. Keyset pagination on (created_at, order_id)
+  // keeps deep pages as cheap as the first one.
+  async getOrdersPage(
+    restaurantId: number,
+    status: string | undefined,
+    limit: number,
+    after?: { createdAt: Date; orderId: number },
+    fields: string[] = ORDER_LIST_FIELDS
+  ): Promise<OrderPage> {
+    try {
+      const pageSize = Math.min(Math.max(Math.floor(limit) || 1, 1), MAX_ORDER_PAGE_SIZE);
+      let query = `
+        SELECT ${orderColumns(fields)}
+        FROM order_management 
+        WHERE restaurant_id = ?
+      `;
+      const params: any[] = [restaurantId];
+
+      if (status && status !== 'all') {
+        query += ' AND fulfillment_status = ?';
+        params.push(reverseMapOrderStatus(status));
+      }
+
+      if (after) {
+        query += ' AND (created_at < ? OR (created_at = ? AND order_id < ?))';
+        params.push(after.createdAt, after.createdAt, after.orderId);
+      }
+
+      // Fetch one extra row to learn whether another page exists. The limit is
+      // inlined because mysqld_stmt_execute rejects numeric LIMIT placeholders.
+      query += ` ORDER BY created_at DESC, order_id DESC LIMIT ${pageSize + 1}`;
+
+      const [rows] = await pool.execute(query, params);
+      const orders = rows as any[];
+      const hasMore = orders.length > pageSize;
+      const page = hasMore ? orders.slice(0, pageSize) : orders;
+      const last = page[page.length - 1];
+
+      return {
+        orders: page.map(order => this.mapOrderRow(order, fields)),
+        nextCursor: hasMore ? encodeOrderCursor(last.created_at, last.order_id) : null
+      };
+    } catch (error) {
+      console.error('Get orders page error:', error);
+      throw error;
+    }
+  }
+
+  // Every matching order, newest first, one keyset page at a time so a caller
+  // streaming the result never holds more than a page in memory
+  async *streamOrders(
+    restaurantId: number,
+    status: string | undefined,
+    fields: string[] = ORDER_LIST_FIELDS
+  ): AsyncGenerator<any[]> {
+    let after: { createdAt: Date; orderId: number } | undefined;
+    while (true) {
+      const page = await this.getOrdersPage(restaurantId, status, MAX_ORDER_PAGE_SIZE, after, fields);
+      yield page.orders;
+      if (!page.nextCursor) return;
+      after = decodeOrderCursor(page.nextCursor)!;
+    }
+  }
+
+  // What changed after a sync version: orders whose status changed since
+  // (by sync_version) and orders created since (by order_id), each scanned in
+  // order up to limit. Without a version, only the current version is returned
+  // so a client can load the full list once and continue from there.
+  async getOrderChanges(
+    restaurantId: number,
+    since: { version: number; orderId: number } | null,
+    limit: number,
+    fields: string[] = ORDER_LIST_FIELDS
+  ): Promise<OrderChanges> {
+    try {
+      if (!since) {
+        const [rows] = await pool.execute(
+          `SELECT
+            (SELECT version FROM order_sync_versions WHERE restaurant_id = ?) AS version,
+            (SELECT MAX(order_id) FROM order_management) AS order_id`,
+          [restaurantId]
+        );
+        const head = (rows as any[])[0] || {};
         return {
-          orderNumber: order.order_number,
-          status: mapOrderStatus(order.fulfillment_status),
-          customer: {
-            name: order.customer,
-            email: order.customer_email,
-            phone: order.customer_phone,
-            address: order.customer_address
-          },
-          totalAmount: parseFloat(order.total_amount) || 0,
-          createdAt: order.created_at,
-          approvedAt: order.approved_at,
-          readyAt: order.ready_at,
-          dispatchedAt: order.dispatched_at,
-          completedAt: order.delivery_date,
-          cancelledAt: order.cancelled_at,
-          cancelledBy: order.cancelled_at ? 'restaurant' : null,
-          cancellationReason: order.cancel_reason,
-          notes: order.kitchen_notes,
-          items: Array.isArray(items) ? items : [],
-          deliveryMethod: order.delivery_method
+          orders: [],
+          version: encodeSyncVersion(Number(head.version) || 0, Number(head.order_id) || 0),
+          serverTime: new Date(),
+          hasMore: false
         };
-      });
+      }
+
+      const pageSize = Math.min(Math.max(Math.floor(limit) || 1, 1), MAX_ORDER_PAGE_SIZE);
+      const columns = `${orderColumns(fields)}, sync_version`;
+      const [[changedRows], [createdRows]] = await Promise.all([
+        pool.execute(
+          `SELECT ${columns}
+          FROM order_management
+          WHERE restaurant_id = ? AND sync_version > ?
+          ORDER BY sync_version LIMIT ${pageSize + 1}`,
+          [restaurantId, since.version]
+        ),
+        pool.execute(
+          `SELECT ${columns}
+          FROM order_management
+          WHERE restaurant_id = ? AND order_id > ?
+          ORDER BY order_id LIMIT ${pageSize + 1}`,
+          [restaurantId, since.orderId]
+        )
+      ]);
+      const changed = (changedRows as any[]).slice(0, pageSize);
+      const created = (createdRows as any[]).slice(0, pageSize);
+      const lastChanged = changed[changed.length - 1];
+      const lastCreated = created[created.length - 1];
+
+      // An order created and then changed since the version comes back once
+      const byId = new Map<number, any>();
+      for (const row of [...created, ...changed]) {
+        byId.set(row.order_id, row);
+      }
+
+      return {
+        orders: [...byId.values()].map(order => this.mapOrderRow(order, fields)),
+        version: encodeSyncVersion(
+          lastChanged ? Number(lastChanged.sync_version) : since.version,
+          lastCreated ? lastCreated.order_id : since.orderId
+        ),
+        serverTime: new Date(),
+        hasMore: (changedRows as any[]).length > pageSize || (createdRows as any[]).length > pageSize
+      };
     } catch (error) {
-      console.error('Get orders error:', error);
+      console.error('Get order changes error:', error);
       throw error;
     }
   }
@@ -62,12 +243,7 @@ export class OrderService {
   async getOrderDetail(restaurantId: number, orderNumber: string): Promise<any | null> {
     try {
       const [rows] = await pool.execute(
-        `SELECT 
-          order_id, order_number, fulfillment_status, customer, customer_email, customer_phone,
-          total_amount, created_at, approved_at, ready_at,
-          dispatched_at, delivery_date, cancelled_at,
-          cancel_reason, kitchen_notes, product_details,
-          delivery_method, customer_address, payment_method, payment_status
+        `SELECT ${ORDER_DETAIL_COLUMNS}
         FROM order_management 
         WHERE restaurant_id = ? AND order_number = ?`,
         [restaurantId, orderNumber]
@@ -79,39 +255,29 @@ export class OrderService {
         return null;
       }
 
-      const order = orders[0];
-      const items = parseJsonField(order.product_details);
-
-      return {
-        orderNumber: order.order_number,
-        status: mapOrderStatus(order.fulfillment_status),
-        customer: {
-          name: order.customer,
-          email: order.customer_email,
-          phone: order.customer_phone,
-          address: order.customer_address
-        },
-        totalAmount: parseFloat(order.total_amount) || 0,
-        createdAt: order.created_at,
-        approvedAt: order.approved_at,
-        readyAt: order.ready_at,
-        dispatchedAt: order.dispatched_at,
-        completedAt: order.delivery_date,
-        cancelledAt: order.cancelled_at,
-        cancelledBy: order.cancelled_at ? 'restaurant' : null,
-        cancellationReason: order.cancel_reason,
-        notes: order.kitchen_notes,
-        items: Array.isArray(items) ? items : [],
-        deliveryMethod: order.delivery_method,
-        paymentMethod: order.payment_method,
-        paymentStatus: order.payment_status
-      };
+      return this.mapOrderDetailRow(orders[0]);
     } catch (error) {
       console.error('Get order detail error:', error);
       throw error;
     }
   }
 
+  private mapOrderDetailRow(order: any): any {
+    return {
+      ...this.mapOrderRow(order),
+      paymentMethod: order.payment_method,
+      paymentStatus: order.payment_status
+    };
+  }
+
+  private mapOrderRow(order: any, fields: string[] = ORDER_LIST_FIELDS): any {
+    const mapped: any = {};
+    for (const field of fields) {
+      mapped[field] = ORDER_FIELDS[field].map(order);
+    }
+    return mapped;
+  }
+
   async updateOrderStatus(
     restaurantId: number,
     orderNumber: string,
@@ -121,34 +287,56 @@ export class OrderService {
   ): Promise<any> {
     try {
       const dbStatus = reverseMapOrderStatus(status);
-      const updates: string[] = ['fulfillment_status = ?'];
-      const params: any[] = [dbStatus];
-
-      if (status === 'accepted') {
-        updates.push('approved_at = NOW()');
-      } else if (status === 'ready') {
-        updates.push('ready_at = NOW()');
-      } else if (status === 'dispatched') {
-        updates.push('dispatched_at = NOW()');
-      } else if (status === 'completed') {
-        updates.push('delivery_date = NOW()');
-      } else if (status === 'cancelled') {
-        updates.push('cancelled_at = NOW()');
-        if (cancellationReason) {
-          updates.push('cancel_reason = ?');
-          params.push(cancellationReason);
-        }
-      }
-
-      params.push(restaurantId, orderNumber);
+      const { updates, params } = this.statusUpdate(status, cancellationReason);
 
       const query = `
         UPDATE order_management 
-        SET ${updates.join(', ')}
+        SET ${updates.join(', ')}, sync_version = ?
         WHERE restaurant_id = ? AND order_number = ?
       `;
 
-      await pool.execute(query, params);
+      // The status change and the daily stats rollups commit together
+      let current: any;
+      const connection = await pool.getConnection();
+      try {
+        await connection.beginTransaction();
+        const watermark = await dailyStatsService.readWatermark(connection);
+
+        const [currentRows] = await connection.execute(
+          `SELECT order_id, fulfillment_status, total_amount, product_details, created_at
+          FROM order_management
+          WHERE restaurant_id = ? AND order_number = ?
+          FOR UPDATE`,
+          [restaurantId, orderNumber]
+        );
+        current = (currentRows as any[])[0];
+
+        if (current) {
+          const [version] = await this.reserveSyncVersions(connection, restaurantId, 1);
+          await connection.execute(query, [...params, version, restaurantId, orderNumber]);
+          await dailyStatsService.applyStatusChanges(
+            connection, restaurantId, watermark, [{ order: current, newStatus: dbStatus }]
+          );
+        }
+
+        await connection.commit();
+      } catch (error) {
+        await connection.rollback();
+        throw error;
+      } finally {
+        connection.release();
+      }
+
+      if (current) {
+        orderEvents.publish({
+          type: 'status',
+          restaurantId,
+          orderId: current.order_id,
+          orderNumber,
+          previousStatus: current.fulfillment_status,
+          status: dbStatus
+        });
+      }
 
       return await this.getOrderDetail(restaurantId, orderNumber);
     } catch (error) {
@@ -157,4 +345,226 @@ export class OrderService {
     }
   }
 
+  // Apply many status changes in one transaction: one locking read, one UPDATE
+  // per distinct status, one write per daily rollup and one read-back of every order.
+  // Items that cannot be applied are reported without failing the others.
+  //
+  // Items carrying fromStatus are replays of changes made offline, and may
+  // arrive more than once or after someone else changed the order: see replayOutcome.
+  async updateOrderStatuses(restaurantId: number, items: OrderStatusUpdate[]): Promise<OrderStatusResult[]> {
+    try {
+      const results: OrderStatusResult[] = items.map(item => ({ orderNumber: item?.orderNumber, success: false }));
+      const seen = new Set<string>();
+      const valid: { index: number; item: OrderStatusUpdate }[] = [];
+
+      items.forEach((item, index) => {
+        if (!item || typeof item.orderNumber !== 'string' || !item.orderNumber) {
+          results[index].error = 'Order number is required';
+        } else if (!item.status) {
+          results[index].error = 'Status is required';
+        } else if (!isOrderStatus(item.status)) {
+          results[index].error = `Status must be one of: ${ORDER_STATUSES.join(', ')}`;
+        } else if (item.fromStatus !== undefined && item.fromStatus !== null && typeof item.fromStatus !== 'string') {
+          results[index].error = 'fromStatus must be a string';
+        } else if (seen.has(item.orderNumber)) {
+          results[index].error = 'Order appears more than once in the batch';
+        } else {
+          seen.add(item.orderNumber);
+          valid.push({ index, item });
+        }
+      });
+
+      if (valid.length === 0) {
+        return results;
+      }
+
+      const orderNumbers = valid.map(({ item }) => item.orderNumber);
+      const inList = orderNumbers.map(() => '?').join(', ');
+      const currentByNumber = new Map<string, any>();
+      const applied: { index: number; item: OrderStatusUpdate }[] = [];
+
+      const connection = await pool.getConnection();
+      try {
+        await connection.beginTransaction();
+        const watermark = await dailyStatsService.readWatermark(connection);
+
+        const [currentRows] = await connection.execute(
+          `SELECT order_id, order_number, fulfillment_status, status_changed_at, total_amount, product_details, created_at
+          FROM order_management
+          WHERE restaurant_id = ? AND order_number IN (${inList})
+          FOR UPDATE`,
+          [restaurantId, ...orderNumbers]
+        );
+        for (const row of currentRows as any[]) {
+          currentByNumber.set(row.order_number, row);
+        }
+
+        // Orders sharing a status (and cancellation reason) are updated together
+        const groups = new Map<string, { status: string; cancellationReason?: string; orderNumbers: string[] }>();
+        for (const entry of valid) {
+          const { item } = entry;
+          const current = currentByNumber.get(item.orderNumber);
+          if (!current) {
+            results[entry.index].error = 'Order not found';
+            continue;
+          }
+          const outcome = this.replayOutcome(current, item);
+          if (outcome === 'unchanged') {
+            results[entry.index] = { orderNumber: item.orderNumber, success: true, unchanged: true };
+            continue;
+          }
+          if (outcome === 'conflict') {
+            results[entry.index] = {
+              orderNumber: item.orderNumber,
+              success: false,
+              conflict: true,
+              error: 'Order status was changed after this update was made'
+            };
+            continue;
+          }
+          applied.push(entry);
+          const groupKey = JSON.stringify([item.status, item.cancellationReason || null]);
+          const group = groups.get(groupKey)
+            || { status: item.status, cancellationReason: item.cancellationReason, orderNumbers: [] };
+          group.orderNumbers.push(item.orderNumber);
+          groups.set(groupKey, group);
+        }
+
+        const versions = await this.reserveSyncVersions(connection, restaurantId, applied.length);
+        const versionByNumber = new Map(applied.map(({ item }, index) => [item.orderNumber, versions[index]]));
+
+        for (const group of groups.values()) {
+          const { updates, params } = this.statusUpdate(group.status, group.cancellationReason);
+          const inGroup = group.orderNumbers.map(() => '?').join(', ');
+          await connection.execute(
+            `UPDATE order_management 
+            SET ${updates.join(', ')},
+              sync_version = CASE order_number ${group.orderNumbers.map(() => 'WHEN ? THEN ?').join(' ')} END
+            WHERE restaurant_id = ? AND order_number IN (${inGroup})`,
+            [
+              ...params,
+              ...group.orderNumbers.flatMap(orderNumber => [orderNumber, versionByNumber.get(orderNumber)]),
+              restaurantId,
+              ...group.orderNumbers
+            ]
+          );
+        }
+
+        await dailyStatsService.applyStatusChanges(
+          connection,
+          restaurantId,
+          watermark,
+          applied.map(({ item }) => ({
+            order: currentByNumber.get(item.orderNumber),
+            newStatus: reverseMapOrderStatus(item.status)
+          }))
+        );
+
+        await connection.commit();
+      } catch (error) {
+        await connection.rollback();
+        throw error;
+      } finally {
+        connection.release();
+      }
+
+      for (const { item } of applied) {
+        const current = currentByNumber.get(item.orderNumber);
+        orderEvents.publish({
+          type: 'status',
+          restaurantId,
+          orderId: current.order_id,
+          orderNumber: item.orderNumber,
+          previousStatus: current.fulfillment_status,
+          status: reverseMapOrderStatus(item.status)
+        });
+      }
+
+      // Applied, unchanged and conflicting items all return the order as it now is
+      const foundNumbers = valid.map(({ item }) => item.orderNumber).filter(orderNumber => currentByNumber.has(orderNumber));
+      if (foundNumbers.length > 0) {
+        const [rows] = await pool.execute(
+          `SELECT ${ORDER_DETAIL_COLUMNS}
+          FROM order_management 
+          WHERE restaurant_id = ? AND order_number IN (${foundNumbers.map(() => '?').join(', ')})`,
+          [restaurantId, ...foundNumbers]
+        );
+        const detailByNumber = new Map((rows as any[]).map(row => [row.order_number, this.mapOrderDetailRow(row)]));
+        for (const { index, item } of applied) {
+          results[index] = { orderNumber: item.orderNumber, success: true, order: detailByNumber.get(item.orderNumber) };
+        }
+        for (const { index, item } of valid) {
+          if (results[index].unchanged || results[index].conflict) {
+            results[index].order = detailByNumber.get(item.orderNumber);
+          }
+        }
+      }
+
+      return results;
+    } catch (error) {
+      console.error('Batch update order status error:', error);
+      throw error;
+    }
+  }
+
+  // A replayed change (fromStatus set) that the order already reflects is
+  // unchanged; one made from the order's current status applies. Otherwise the
+  // order moved on while the client was offline, and the later change wins:
+  // the replay if it was made after the server's last status change, else the
+  // server's (a conflict).
+  private replayOutcome(current: any, item: OrderStatusUpdate): 'apply' | 'unchanged' | 'conflict' {
+    if (item.fromStatus === undefined || item.fromStatus === null) {
+      return 'apply';
+    }
+    if (sameStatus(current.fulfillment_status, item.status)) {
+      return 'unchanged';
+    }
+    if (sameStatus(current.fulfillment_status, item.fromStatus)) {
+      return 'apply';
+    }
+    const changedAt = new Date(item.changedAt as any).getTime();
+    const serverChangedAt = current.status_changed_at ? new Date(current.status_changed_at).getTime() : 0;
+    return Number.isFinite(changedAt) && changedAt > serverChangedAt ? 'apply' : 'conflict';
+  }
+
+  // Reserve count consecutive sync versions for a restaurant's next status changes.
+  // LAST_INSERT_ID(expr) hands the new counter value back as insertId, and the
+  // counter row stays locked until the caller's transaction ends, so versions
+  // become visible in the order they were reserved.
+  private async reserveSyncVersions(connection: PoolConnection, restaurantId: number, count: number): Promise<number[]> {
+    if (count === 0) {
+      return [];
+    }
+    const [result] = await connection.execute(
+      `INSERT INTO order_sync_versions (restaurant_id, version) VALUES (?, LAST_INSERT_ID(?))
+      ON DUPLICATE KEY UPDATE version = LAST_INSERT_ID(version + ?)`,
+      [restaurantId, count, count]
+    );
+    const last = Number((result as any).insertId);
+    return Array.from({ length: count }, (_, index) => last - count + 1 + index);
+  }
+
+  // SET clause for a status change; stamps the matching timestamp column
+  private statusUpdate(status: string, cancellationReason?: string): { updates: string[]; params: any[] } {
+    const updates: string[] = ['fulfillment_status = ?', 'status_changed_at = NOW(3)'];
+    const params: any[] = [reverseMapOrderStatus(status)];
+
+    if (status === 'accepted') {
+      updates.push('approved_at = NOW()');
+    } else if (status === 'ready') {
+      updates.push('ready_at = NOW()');
+    } else if (status === 'dispatched') {
+      updates.push('dispatched_at = NOW()');
+    } else if (status === 'completed') {
+      updates.push('delivery_date = NOW()');
+    } else if (status === 'cancelled') {
+      updates.push('cancelled_at = NOW()');
+      if (cancellationReason) {
+        updates.push('cancel_reason = ?');
+        params.push(cancellationReason);
+      }
+    }
+
+    return { updates, params };
+  }
 }
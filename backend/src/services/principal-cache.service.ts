@@ -0,0 +1,75 @@
+import pool from '../config/database';
+import { Restaurant } from '../types';
+import { LruCache } from '../utils/lru-cache';
+
+// Restaurants resolved by authenticateToken, so an authenticated request does
+// not need its own round-trip to `restaurants`. Entries live for
+// AUTH_CACHE_TTL_MS at most; deactivated restaurants are evicted by the
+// refresh loop (or on a failed login) well before that.
+export const principalCache = new LruCache<number, Restaurant>(
+  parseInt(process.env.AUTH_CACHE_MAX || '1000', 10),
+  parseInt(process.env.AUTH_CACHE_TTL_MS || '60000', 10)
+);
+
+const isActive = (restaurant: Restaurant): boolean =>
+  restaurant.status === 'approved' && Boolean(restaurant.is_active);
+
+export const getRestaurantPrincipal = async (restaurantId: number): Promise<Restaurant | null> => {
+  const cached = principalCache.get(restaurantId);
+  if (cached) {
+    return cached;
+  }
+
+  const [rows] = await pool.execute(
+    'SELECT id, username, email, status, is_active, timezone FROM restaurants WHERE id = ?',
+    [restaurantId]
+  );
+  const restaurant = (rows as Restaurant[])[0];
+  if (!restaurant) {
+    return null;
+  }
+
+  if (isActive(restaurant)) {
+    principalCache.set(restaurantId, restaurant);
+  }
+  return restaurant;
+};
+
+export const evictRestaurantPrincipal = (restaurantId: number): void => {
+  principalCache.delete(restaurantId);
+};
+
+let refreshTimer: NodeJS.Timeout | null = null;
+
+// Re-read the cached restaurants in one query and drop any that were
+// deactivated, unapproved or deleted since they were cached
+export const refreshRestaurantPrincipals = async (): Promise<number> => {
+  const ids = principalCache.keys();
+  if (ids.length === 0) {
+    return 0;
+  }
+
+  const [rows] = await pool.execute(
+    `SELECT id, username, email, status, is_active, timezone FROM restaurants WHERE id IN (${ids.map(() => '?').join(', ')})`,
+    ids
+  );
+  const current = new Map((rows as Restaurant[]).map(restaurant => [restaurant.id, restaurant]));
+
+  let evicted = 0;
+  for (const id of ids) {
+    const restaurant = current.get(id);
+    if (!restaurant || !isActive(restaurant)) {
+      principalCache.delete(id);
+      evicted++;
+    }
+  }
+  return evicted;
+};
+
+export const startPrincipalRefresh = (intervalMs: number): void => {
+  if (refreshTimer || intervalMs <= 0 || !principalCache.enabled) return;
+  refreshTimer = setInterval(() => {
+    refreshRestaurantPrincipals().catch(error => console.error('Principal cache refresh error:', error));
+  }, intervalMs);
+  refreshTimer.unref();
+};
@@ -0,0 +1,285 @@
+import { createHash } from 'crypto';
+import pool from '../config/database';
+import { LruCache } from '../utils/lru-cache';
+import { mapOrderStatus, parseJsonField } from '../utils/helpers';
+import { restaurantTimezone } from './daily-stats.service';
+import { orderEvents, OrderEvent } from './order-events.service';
+
+// Characters per line on 58mm paper at the printer's default font
+export const RECEIPT_WIDTH = 32;
+
+export const RECEIPT_KINDS = ['kitchen', 'bag', 'customer'] as const;
+export type ReceiptKind = typeof RECEIPT_KINDS[number];
+
+// Printed above the restaurant name on customer receipts; lines separated by |
+const RECEIPT_HEADER = (process.env.RECEIPT_HEADER || "GENERAL BILIMORIA'S|20 CANTEEN 23|ESTD LONDON UK")
+  .split('|')
+  .filter(Boolean);
+
+const RECEIPT_COLUMNS = `o.order_number, o.fulfillment_status, o.customer, o.customer_address, o.total_amount,
+  o.created_at, o.kitchen_notes, o.product_details, o.delivery_method, o.payment_method, o.payment_status,
+  r.username AS restaurant_name, r.timezone`;
+
+export interface ReceiptPayload {
+  orderNumber: string;
+  status: string;
+  width: number;
+  receipts: Record<ReceiptKind, string[]>;
+}
+
+interface ReceiptBody {
+  body: string;
+  etag: string;
+}
+
+// A laid-out order and its serialized selections (e.g. 'kitchen,bag'), each
+// serialized the first time it is asked for
+interface CachedReceipt {
+  payload: ReceiptPayload;
+  bodies: Map<string, ReceiptBody>;
+}
+
+interface ReceiptItem {
+  name: string;
+  quantity: number;
+  price: number;
+  notes: string;
+  extras: string[];
+}
+
+const RULE = '-'.repeat(RECEIPT_WIDTH);
+
+const center = (text: string): string => {
+  const line = text.slice(0, RECEIPT_WIDTH);
+  return ' '.repeat(Math.floor((RECEIPT_WIDTH - line.length) / 2)) + line;
+};
+
+// Left text and right-aligned value on one line; the left side is cut short to fit
+const columns = (left: string, right: string): string => {
+  const room = Math.max(RECEIPT_WIDTH - right.length - 1, 0);
+  const cut = left.length > room ? left.slice(0, room) : left;
+  return cut + ' '.repeat(RECEIPT_WIDTH - cut.length - right.length) + right;
+};
+
+// Word-wrap to the paper width: the first line starts with lead, the rest with indent
+const wrap = (text: string, lead: string = '', indent: string = lead): string[] => {
+  const lines: string[] = [];
+  let prefix = lead;
+  let line = '';
+  for (const word of text.split(/\s+/).filter(Boolean)) {
+    if (line && prefix.length + line.length + 1 + word.length > RECEIPT_WIDTH) {
+      lines.push(prefix + line);
+      prefix = indent;
+      line = word;
+    } else {
+      line = line ? `${line} ${word}` : word;
+    }
+    // Words longer than a line are split
+    while (prefix.length + line.length > RECEIPT_WIDTH) {
+      const room = RECEIPT_WIDTH - prefix.length;
+      lines.push(prefix + line.slice(0, room));
+      prefix = indent;
+      line = line.slice(room);
+    }
+  }
+  if (line) lines.push(prefix + line);
+  return lines;
+};
+
+const money = (amount: number): string => `£${amount.toFixed(2)}`;
+
+const timeFormatters = new Map<string, Intl.DateTimeFormat>();
+
+// DD/MM/YYYY HH:MM on the restaurant's wall clock
+const localDateTime = (instant: Date, timeZone: string): string => {
+  let formatter = timeFormatters.get(timeZone);
+  if (!formatter) {
+    formatter = new Intl.DateTimeFormat('en-GB', {
+      timeZone, day: '2-digit', month: '2-digit', year: 'numeric', hour: '2-digit', minute: '2-digit', hour12: false
+    });
+    timeFormatters.set(timeZone, formatter);
+  }
+  return formatter.format(instant).replace(',', '');
+};
+
+// product_details entries, with the same field fallbacks as tallyDishes
+const receiptItems = (productDetails: any): ReceiptItem[] => {
+  const items = parseJsonField(productDetails);
+  if (!Array.isArray(items)) return [];
+  return items.map((item: any) => {
+    const bundle = item.bundle_items || item.bundleItems;
+    return {
+      name: String(item.dish_name || item.name || 'Unknown'),
+      quantity: parseInt(item.quantity) || 1,
+      price: parseFloat(item.selling_price || item.unit_price || item.price) || 0,
+      notes: item.notes || item.special_instructions || '',
+      extras: Array.isArray(bundle)
+        ? bundle.map((extra: any) => `${extra.dish_name || extra.name} x${parseInt(extra.quantity) || 1}`)
+        : []
+    };
+  });
+};
+
+const kitchenReceipt = (order: any, items: ReceiptItem[], placedAt: string): string[] => {
+  const lines = [
+    center('KITCHEN'),
+    center(order.order_number),
+    columns(String(order.delivery_method || '').toUpperCase(), placedAt),
+    RULE
+  ];
+  for (const item of items) {
+    lines.push(...wrap(`${item.quantity} x ${item.name}`, '', '    '));
+    item.extras.forEach(extra => lines.push(...wrap(`+ ${extra}`, '  ', '    ')));
+    if (item.notes) lines.push(...wrap(`! ${item.notes}`, '  ', '    '));
+  }
+  lines.push(RULE);
+  if (order.kitchen_notes) {
+    lines.push(...wrap(`NOTE: ${order.kitchen_notes}`, '', '  '), RULE);
+  }
+  lines.push(columns('Items', String(items.reduce((sum, item) => sum + item.quantity, 0))));
+  return lines;
+};
+
+const bagReceipt = (order: any, items: ReceiptItem[], placedAt: string): string[] => {
+  const lines = [center(order.order_number), center(String(order.customer || 'Guest'))];
+  lines.push(center(String(order.delivery_method || '').toUpperCase()));
+  if (order.delivery_method === 'delivery' && order.customer_address) {
+    lines.push(...wrap(String(order.customer_address)));
+  }
+  lines.push(RULE, columns(`${items.reduce((sum, item) => sum + item.quantity, 0)} items`, placedAt));
+  return lines;
+};
+
+const customerReceipt = (order: any, items: ReceiptItem[], placedAt: string): string[] => {
+  const lines = [...RECEIPT_HEADER.map(center), '', center(String(order.restaurant_name || '')), RULE];
+  lines.push(columns('Order', order.order_number), columns('Date', placedAt), RULE);
+  for (const item of items) {
+    lines.push(columns(`${item.name} x${item.quantity}`, money(item.price * item.quantity)));
+    item.extras.forEach(extra => lines.push(...wrap(`+ ${extra}`, ' ', '   ')));
+  }
+  lines.push(RULE, columns('Total', money(parseFloat(order.total_amount) || 0)));
+  if (order.payment_method) {
+    lines.push(columns('Payment', `${order.payment_method} (${order.payment_status || 'unpaid'})`));
+  }
+  lines.push(RULE, center('Thank you for ordering!'), center('See you again online!'));
+  return lines;
+};
+
+// Lay out every receipt for one order row (joined with its restaurant)
+export const buildReceipts = (order: any): ReceiptPayload => {
+  const items = receiptItems(order.product_details);
+  const placedAt = localDateTime(new Date(order.created_at), restaurantTimezone(order));
+  return {
+    orderNumber: order.order_number,
+    status: mapOrderStatus(order.fulfillment_status),
+    width: RECEIPT_WIDTH,
+    receipts: {
+      kitchen: kitchenReceipt(order, items, placedAt),
+      bag: bagReceipt(order, items, placedAt),
+      customer: customerReceipt(order, items, placedAt)
+    }
+  };
+};
+
+// Same content, same ETag: a rebuild after eviction still answers 304
+const serialize = (value: any): ReceiptBody => {
+  const body = JSON.stringify(value);
+  return { body, etag: `W/"${createHash('sha1').update(body).digest('base64url')}"` };
+};
+
+// Printer-ready receipts per order, laid out once per status change instead of
+// on every print. Order events drop the stale entry and rebuild it in the
+// background, so the print that follows accepting an order is a cache hit.
+export class ReceiptService {
+  private cache: LruCache<string, CachedReceipt>;
+  // Bumped by every event for an order; a build only lands if it is unchanged.
+  // Cleared whenever no build is in flight, as nothing can compare against it then.
+  private generations = new Map<string, number>();
+  private inFlight = 0;
+  private unsubscribe: (() => void) | null = null;
+  builds = 0;
+
+  constructor(maxEntries: number, ttlMs: number) {
+    this.cache = new LruCache(maxEntries, ttlMs);
+  }
+
+  private static key(restaurantId: number, orderNumber: string): string {
+    return `${restaurantId}|${orderNumber}`;
+  }
+
+  // kinds narrows the payload to those receipts; all three when empty
+  async getReceipt(restaurantId: number, orderNumber: string, kinds: ReceiptKind[] = []): Promise<ReceiptBody | null> {
+    const key = ReceiptService.key(restaurantId, orderNumber);
+    const cached = this.cache.get(key) || await this.build(restaurantId, orderNumber);
+    if (!cached) return null;
+
+    const selected = kinds.length > 0 ? RECEIPT_KINDS.filter(kind => kinds.includes(kind)) : [...RECEIPT_KINDS];
+    const selection = selected.join(',');
+    let body = cached.bodies.get(selection);
+    if (!body) {
+      const { receipts, ...order } = cached.payload;
+      body = serialize({ ...order, receipts: Object.fromEntries(selected.map(kind => [kind, receipts[kind]])) });
+      cached.bodies.set(selection, body);
+    }
+    return body;
+  }
+
+  private async build(restaurantId: number, orderNumber: string): Promise<CachedReceipt | null> {
+    const key = ReceiptService.key(restaurantId, orderNumber);
+    const generation = this.generations.get(key) || 0;
+    this.inFlight++;
+    try {
+      return await this.layOut(key, generation, restaurantId, orderNumber);
+    } finally {
+      if (--this.inFlight === 0) this.generations.clear();
+    }
+  }
+
+  private async layOut(
+    key: string,
+    generation: number,
+    restaurantId: number,
+    orderNumber: string
+  ): Promise<CachedReceipt | null> {
+    const [rows] = await pool.execute(
+      `SELECT ${RECEIPT_COLUMNS}
+      FROM order_management o
+      JOIN restaurants r ON r.id = o.restaurant_id
+      WHERE o.restaurant_id = ? AND o.order_number = ?`,
+      [restaurantId, orderNumber]
+    );
+    const order = (rows as any[])[0];
+    if (!order) return null;
+
+    const cached: CachedReceipt = { payload: buildReceipts(order), bodies: new Map() };
+    this.builds++;
+    if ((this.generations.get(key) || 0) === generation) {
+      this.cache.set(key, cached);
+    }
+    return cached;
+  }
+
+  private onOrderEvent(event: OrderEvent): void {
+    const key = ReceiptService.key(event.restaurantId, event.orderNumber);
+    this.generations.set(key, (this.generations.get(key) || 0) + 1);
+    this.cache.delete(key);
+    if (!this.cache.enabled) return;
+    this.build(event.restaurantId, event.orderNumber)
+      .catch(error => console.error('Receipt prebuild error:', error));
+  }
+
+  listen(): void {
+    if (this.unsubscribe) return;
+    this.unsubscribe = orderEvents.subscribe(event => this.onOrderEvent(event));
+  }
+
+  stats() {
+    return { ...this.cache.stats(), builds: this.builds };
+  }
+}
+
+export const receiptService = new ReceiptService(
+  parseInt(process.env.RECEIPT_CACHE_MAX || '2000', 10),
+  parseInt(process.env.RECEIPT_CACHE_TTL_MS || String(12 * 60 * 60 * 1000), 10)
+);
+receiptService.listen();
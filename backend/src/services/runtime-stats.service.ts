@@ -0,0 +1,67 @@
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { getPoolStats } from '../config/database';
+import { getPasswordHashingStats } from '../utils/password';
+import { orderStream } from './order-stream.service';
+
+const NS_PER_MS = 1e6;
+const MB = 1024 * 1024;
+
+// Event-loop delay over the last EVENT_LOOP_WINDOW_MS, kept as one summary per
+// slice so reading the stats never resets what other callers will see
+const EVENT_LOOP_WINDOW_MS = parseInt(process.env.EVENT_LOOP_WINDOW_MS || '60000', 10);
+const EVENT_LOOP_SLICE_MS = 5000;
+const EVENT_LOOP_SLICES = Math.max(1, Math.ceil(EVENT_LOOP_WINDOW_MS / EVENT_LOOP_SLICE_MS));
+
+interface DelaySlice {
+  count: number;
+  meanMs: number;
+  p99Ms: number;
+  maxMs: number;
+}
+
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+eventLoopDelay.enable();
+const slices: DelaySlice[] = [];
+
+const currentSlice = (): DelaySlice => ({
+  count: eventLoopDelay.count,
+  meanMs: eventLoopDelay.count ? eventLoopDelay.mean / NS_PER_MS : 0,
+  p99Ms: eventLoopDelay.count ? eventLoopDelay.percentile(99) / NS_PER_MS : 0,
+  maxMs: eventLoopDelay.count ? eventLoopDelay.max / NS_PER_MS : 0
+});
+
+setInterval(() => {
+  slices.push(currentSlice());
+  if (slices.length > EVENT_LOOP_SLICES) slices.shift();
+  eventLoopDelay.reset();
+}, EVENT_LOOP_SLICE_MS).unref();
+
+// Mean and max are exact over the window; p99 is the worst slice's p99
+const getEventLoopStats = () => {
+  const window = [...slices, currentSlice()].filter(slice => slice.count > 0);
+  const count = window.reduce((sum, slice) => sum + slice.count, 0);
+  return {
+    windowMs: EVENT_LOOP_WINDOW_MS,
+    meanMs: count ? window.reduce((sum, slice) => sum + slice.meanMs * slice.count, 0) / count : 0,
+    p99Ms: Math.max(0, ...window.map(slice => slice.p99Ms)),
+    maxMs: Math.max(0, ...window.map(slice => slice.maxMs))
+  };
+};
+
+export const getRuntimeStats = () => {
+  const memory = process.memoryUsage();
+  return {
+    timestamp: new Date().toISOString(),
+    uptimeSeconds: process.uptime(),
+    memory: {
+      rssMb: memory.rss / MB,
+      heapUsedMb: memory.heapUsed / MB,
+      heapTotalMb: memory.heapTotal / MB,
+      externalMb: memory.external / MB
+    },
+    eventLoop: getEventLoopStats(),
+    pool: getPoolStats(),
+    orderStreamSubscribers: orderStream.subscriberCount(),
+    passwordHashing: getPasswordHashingStats()
+  };
+};
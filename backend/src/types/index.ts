@@ -5,6 +5,8 @@ export interface Restaurant {
   password_hash: string;
   status: 'approved' | 'pending';
   is_active: boolean;
+  // IANA zone whose calendar days the dashboard rollups use
+  timezone?: string;
   created_at?: Date;
 }
 
@@ -40,6 +42,60 @@ export interface Dish {
   created_at?: Date;
 }
 
+export interface OrderPage {
+  orders: any[];
+  nextCursor: string | null;
+}
+
+export interface OrderStatusUpdate {
+  orderNumber: string;
+  status: string;
+  cancellationReason?: string;
+  prepTimeMinutes?: number;
+  // Set by clients replaying changes made offline: the status the order had on
+  // the tablet, and when the change was made (server clock, ISO or epoch ms)
+  fromStatus?: string;
+  changedAt?: string | number;
+}
+
+export interface OrderStatusResult {
+  orderNumber: string;
+  success: boolean;
+  order?: any;
+  error?: string;
+  // Replays only: the order already had the status, so nothing was written
+  unchanged?: boolean;
+  // Replays only: a newer change on the server won; order is its current state
+  conflict?: boolean;
+}
+
+export interface OrderChanges {
+  orders: any[];
+  // Where the next /orders/changes call continues from
+  version: string;
+  serverTime: Date;
+  hasMore: boolean;
+}
+
+// One dish of a bulk menu import, as JSON or a CSV row (where every value is a string)
+export interface MenuItemInput {
+  id?: number | string;
+  name?: string;
+  price?: number | string;
+  description?: string;
+  imagePath?: string;
+  category?: string;
+  isAvailable?: boolean | string;
+}
+
+export interface MenuImportResult {
+  // 1-based position of the dish in the request (the CSV data row)
+  row: number;
+  success: boolean;
+  item?: any;
+  error?: string;
+}
+
 export interface DashboardStats {
   totalOrders: number;
   revenue: number;
@@ -47,6 +103,9 @@ export interface DashboardStats {
   completedOrders: number;
   avgPrepTime: number;
   avgRating: number;
+  timezone?: string;
+  startDate?: string | null;
+  endDate?: string | null;
 }
 
 export interface AuthRequest extends Request {
@@ -0,0 +1,53 @@
+// RFC 4180 CSV: quoted fields may contain commas, doubled quotes and line
+// breaks. A leading byte-order mark (Excel's "CSV UTF-8") is dropped.
+export const parseCsv = (text: string): string[][] => {
+  const rows: string[][] = [];
+  let row: string[] = [];
+  let field = '';
+  let quoted = false;
+  let index = text.charCodeAt(0) === 0xfeff ? 1 : 0;
+
+  for (; index < text.length; index++) {
+    const char = text[index];
+    if (quoted) {
+      if (char === '"' && text[index + 1] === '"') {
+        field += '"';
+        index++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"' && field === '') {
+      quoted = true;
+    } else if (char === ',') {
+      row.push(field);
+      field = '';
+    } else if (char === '\n' || char === '\r') {
+      if (char === '\r' && text[index + 1] === '\n') index++;
+      row.push(field);
+      rows.push(row);
+      row = [];
+      field = '';
+    } else {
+      field += char;
+    }
+  }
+
+  if (quoted) {
+    throw new Error('Unterminated quoted field');
+  }
+  if (field !== '' || row.length > 0) {
+    row.push(field);
+    rows.push(row);
+  }
+  return rows;
+};
+
+// Records keyed by the header row's (trimmed) column names; blank lines are skipped
+export const parseCsvRecords = (text: string): Record<string, string>[] => {
+  const [header, ...rows] = parseCsv(text).filter(row => row.length > 1 || row[0].trim() !== '');
+  if (!header) return [];
+  const columns = header.map(column => column.trim());
+  return rows.map(row => Object.fromEntries(columns.map((column, index) => [column, row[index] ?? ''])));
+};
@@ -1,3 +1,5 @@
+import { timeSync } from './request-timing';
+
 export const mapOrderStatus = (fulfillmentStatus: string): string => {
   const statusMap: Record<string, string> = {
     'pending': 'pending',
@@ -22,13 +24,68 @@ export const reverseMapOrderStatus = (status: string): string => {
   return reverseMap[status.toLowerCase()] || status;
 };
 
+// Statuses a status update may set, as the API names them
+export const ORDER_STATUSES = ['pending', 'accepted', 'ready', 'dispatched', 'completed', 'cancelled'];
+
+export const isOrderStatus = (status: unknown): status is string =>
+  typeof status === 'string' && ORDER_STATUSES.includes(status);
+
 export const parseJsonField = (field: any): any => {
   if (typeof field === 'string') {
     try {
-      return JSON.parse(field);
+      return timeSync('parse', () => JSON.parse(field));
     } catch {
       return field;
     }
   }
   return field;
 };
+
+
+// Keyset pagination cursor for order lists: the (created_at, order_id) of the
+// last row on a page, base64url-encoded so clients treat it as opaque.
+export const encodeOrderCursor = (createdAt: Date, orderId: number): string => {
+  return Buffer.from(`${new Date(createdAt).getTime()}:${orderId}`).toString('base64url');
+};
+
+export const decodeOrderCursor = (cursor: string): { createdAt: Date; orderId: number } | null => {
+  const match = /^(\d+):(\d+)$/.exec(Buffer.from(cursor, 'base64url').toString());
+  if (!match) {
+    return null;
+  }
+  return { createdAt: new Date(parseInt(match[1], 10)), orderId: parseInt(match[2], 10) };
+};
+
+// Delta sync position "<sync_version>.<order_id>": the last status change and
+// the newest order a client has seen (see migrations/004_order_sync_versions.sql)
+export const encodeSyncVersion = (version: number, orderId: number): string => `${version}.${orderId}`;
+
+export const decodeSyncVersion = (value: string): { version: number; orderId: number } | null => {
+  const match = /^(\d+)\.(\d+)$/.exec(value);
+  if (!match) {
+    return null;
+  }
+  return { version: parseInt(match[1], 10), orderId: parseInt(match[2], 10) };
+};
+
+// Quantity and revenue per dish name in an order's product_details, using the
+// same field fallbacks the dashboard has always applied.
+export const tallyDishes = (productDetails: any): Map<string, { quantity: number; revenue: number }> => {
+  const tally = new Map<string, { quantity: number; revenue: number }>();
+  const items = parseJsonField(productDetails);
+
+  if (Array.isArray(items)) {
+    items.forEach((item: any) => {
+      const dishName = item.dish_name || item.name || 'Unknown';
+      const quantity = parseInt(item.quantity) || 1;
+      const price = parseFloat(item.selling_price || item.unit_price || item.price) || 0;
+
+      const entry = tally.get(dishName) || { quantity: 0, revenue: 0 };
+      entry.quantity += quantity;
+      entry.revenue += price * quantity;
+      tally.set(dishName, entry);
+    });
+  }
+
+  return tally;
+};
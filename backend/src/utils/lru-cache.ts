@@ -0,0 +1,60 @@
+// Bounded map with least-recently-used eviction and a per-entry TTL. A Map
+// keeps insertion order, so re-inserting on every hit puts the oldest entry first.
+export class LruCache<K, V> {
+  private entries = new Map<K, { value: V; expiresAt: number }>();
+  hits = 0;
+  misses = 0;
+  evictions = 0;
+
+  constructor(private maxEntries: number, private ttlMs: number) {}
+
+  get enabled(): boolean {
+    return this.maxEntries > 0 && this.ttlMs > 0;
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry || entry.expiresAt <= Date.now()) {
+      if (entry) this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key: K, value: V): void {
+    if (!this.enabled) return;
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+    if (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value as K);
+      this.evictions++;
+    }
+  }
+
+  delete(key: K): boolean {
+    return this.entries.delete(key);
+  }
+
+  keys(): K[] {
+    return [...this.entries.keys()];
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      size: this.entries.size,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRatio: lookups ? this.hits / lookups : 0
+    };
+  }
+}
@@ -0,0 +1,81 @@
+import bcrypt from 'bcrypt';
+import crypto from 'crypto';
+import { timeAsync } from './request-timing';
+
+// bcrypt work factor for new hashes; hashes at any other cost are upgraded on
+// the next successful login. Each step doubles the time per hash.
+export const BCRYPT_COST = parseInt(process.env.BCRYPT_COST || '10', 10);
+
+// bcrypt's async API runs on the libuv threadpool (UV_THREADPOOL_SIZE, 4 by
+// default), which zlib compression and fs also use. At most this many hashes
+// run at once, so a burst of logins queues here instead of in front of them.
+export const PASSWORD_HASH_CONCURRENCY = parseInt(process.env.PASSWORD_HASH_CONCURRENCY || '2', 10);
+
+const LEGACY_SHA256 = /^[0-9a-f]{64}$/i;
+
+export interface PasswordCheck {
+  valid: boolean;
+  // Stored hash is legacy SHA-256 or bcrypt at another cost
+  needsRehash: boolean;
+}
+
+// FIFO limit on concurrently running hash operations
+class HashLimiter {
+  private running = 0;
+  private waiting: (() => void)[] = [];
+  completed = 0;
+
+  constructor(private limit: number) {}
+
+  async run<T>(task: () => Promise<T>): Promise<T> {
+    if (this.running >= this.limit) {
+      await new Promise<void>(resolve => this.waiting.push(resolve));
+    } else {
+      this.running++;
+    }
+    try {
+      return await task();
+    } finally {
+      this.completed++;
+      const next = this.waiting.shift();
+      if (next) {
+        next();
+      } else {
+        this.running--;
+      }
+    }
+  }
+
+  stats() {
+    return { limit: this.limit, running: this.running, queued: this.waiting.length, completed: this.completed };
+  }
+}
+
+const limiter = new HashLimiter(Math.max(PASSWORD_HASH_CONCURRENCY, 1));
+
+export const hashPassword = (password: string): Promise<string> =>
+  limiter.run(() => bcrypt.hash(password, BCRYPT_COST));
+
+export const verifyPassword = async (password: string, storedHash: string): Promise<PasswordCheck> => {
+  if (LEGACY_SHA256.test(storedHash)) {
+    // Unsalted SHA-256 from before bcrypt; cheap, so it stays on the event loop
+    const digest = crypto.createHash('sha256').update(password).digest();
+    const valid = crypto.timingSafeEqual(digest, Buffer.from(storedHash, 'hex'));
+    return { valid, needsRehash: valid };
+  }
+
+  // Includes the wait for a hashing slot
+  const valid = await timeAsync('password', () => limiter.run(() => bcrypt.compare(password, storedHash)));
+  return { valid, needsRehash: valid && bcrypt.getRounds(storedHash) !== BCRYPT_COST };
+};
+
+// Hash compared against when the username does not exist, so unknown and
+// known usernames take the same time to reject
+let dummyHash: Promise<string> | null = null;
+
+export const rejectUnknownUser = async (password: string): Promise<void> => {
+  dummyHash = dummyHash || hashPassword(crypto.randomBytes(16).toString('hex'));
+  await verifyPassword(password, await dummyHash);
+};
+
+export const getPasswordHashingStats = () => ({ cost: BCRYPT_COST, ...limiter.stats() });
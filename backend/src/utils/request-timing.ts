@@ -0,0 +1,65 @@
+import { AsyncLocalStorage } from 'async_hooks';
+
+export interface SpanTotal {
+  ms: number;
+  count: number;
+}
+
+const elapsedMs = (since: bigint): number => Number(process.hrtime.bigint() - since) / 1e6;
+
+// Time spent per named span during one request. Spans with the same name add
+// up, and spans may nest (auth includes its principal lookup's db time) or
+// overlap (parallel queries), so they need not add up to the total.
+export class RequestTimer {
+  private readonly started = process.hrtime.bigint();
+  readonly spans = new Map<string, SpanTotal>();
+
+  add(name: string, ms: number): void {
+    const span = this.spans.get(name);
+    if (span) {
+      span.ms += ms;
+      span.count++;
+    } else {
+      this.spans.set(name, { ms, count: 1 });
+    }
+  }
+
+  totalMs(): number {
+    return elapsedMs(this.started);
+  }
+
+  // Server-Timing value, e.g. `db;dur=3.21;desc="3 calls", total;dur=4.02`
+  header(): string {
+    const entries = [...this.spans].map(([name, span]) =>
+      `${name};dur=${span.ms.toFixed(2)}${span.count > 1 ? `;desc="${span.count} calls"` : ''}`);
+    entries.push(`total;dur=${this.totalMs().toFixed(2)}`);
+    return entries.join(', ');
+  }
+}
+
+const storage = new AsyncLocalStorage<RequestTimer>();
+
+export const runWithTimer = <T>(timer: RequestTimer, fn: () => T): T => storage.run(timer, fn);
+
+// Outside a request (background jobs, startup) these just run fn
+export const timeSync = <T>(name: string, fn: () => T): T => {
+  const timer = storage.getStore();
+  if (!timer) return fn();
+  const started = process.hrtime.bigint();
+  try {
+    return fn();
+  } finally {
+    timer.add(name, elapsedMs(started));
+  }
+};
+
+export const timeAsync = async <T>(name: string, fn: () => Promise<T>): Promise<T> => {
+  const timer = storage.getStore();
+  if (!timer) return fn();
+  const started = process.hrtime.bigint();
+  try {
+    return await fn();
+  } finally {
+    timer.add(name, elapsedMs(started));
+  }
+};
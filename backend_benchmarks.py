@@ -0,0 +1,1022 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the GBC POS API
+Each subcommand seeds the fake backend in its own process (or targets an
+existing deployment via --base-url) and compares the old and new access paths
+of one change
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import secrets
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import time
+import threading
+import tracemalloc
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+from zoneinfo import ZoneInfo
+
+import requests
+
+from backend_test import (NEXT_STATUS, TRANSFER_ENCODINGS, TRANSFER_MODES, GBCPOSAPITester, SSEParser,
+                          parse_server_timing, percentile)
+from generate_orders import DEFAULT_PASSWORD, FIRST_RESTAURANT_USERNAME
+
+FAKE_BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_backend.py")
+# Bearer token for /stats: the deployment's with --base-url, else one handed to the fake backends
+OPS_TOKEN = os.environ.get("OPS_TOKEN") or secrets.token_hex(16)
+
+
+@contextmanager
+def fake_backend_process(orders: int, days: int = 365, restaurants: int = 1, dishes: int = 60,
+                         seed: int = 42, db_latency_ms: float = 0.0, extra_args: Optional[List[str]] = None,
+                         startup_timeout: float = 900.0) -> Iterator[str]:
+    """Run fake_backend.py in a child process so its work never shares our GIL; yields the base URL"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    command = [sys.executable, FAKE_BACKEND, "--port", str(port), "--orders", str(orders), "--days", str(days),
+               "--restaurants", str(restaurants), "--dishes", str(dishes), "--seed", str(seed),
+               "--db-latency-ms", str(db_latency_ms)] + (extra_args or [])
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, env={**os.environ, "OPS_TOKEN": OPS_TOKEN})
+    base_url = f"http://127.0.0.1:{port}/api"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"fake backend exited with code {process.returncode}")
+            try:
+                if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except requests.exceptions.ConnectionError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("fake backend did not start in time")
+            time.sleep(0.25)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def login(base_url: str, pool_size: int = 10, username: str = FIRST_RESTAURANT_USERNAME,
+          password: str = DEFAULT_PASSWORD) -> GBCPOSAPITester:
+    """Authenticated tester without the functional-suite logging"""
+    tester = GBCPOSAPITester(base_url, pool_size=pool_size, retries=0)
+    response = tester.make_request("POST", "/auth/login", {"username": username, "password": password})
+    response.raise_for_status()
+    tester.token = response.json()["token"]
+    return tester
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def peak_memory(fn: Callable[[], Any]) -> float:
+    """Peak Python heap allocated while running fn, in MiB"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def print_table(title: str, columns: List[str], rows: List[List[Any]]):
+    print("\n" + "=" * 80)
+    print(f"📊 {title}")
+    print("=" * 80)
+    widths = [max(len(str(column)), *(len(str(row[index])) for row in rows)) for index, column in enumerate(columns)]
+    print("  ".join(str(column).rjust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
+
+
+def targets(args: argparse.Namespace, sizes: List[int], **backend_options: Any) -> Iterator[Any]:
+    """Yield (label, base_url) for --base-url, or for a fresh fake backend per dataset size"""
+    if args.base_url:
+        yield "remote", args.base_url
+        return
+    for size in sizes:
+        started = time.perf_counter()
+        print(f"🌱 Seeding fake backend with {size:,} orders...")
+        with fake_backend_process(size, **backend_options) as base_url:
+            print(f"   ready in {time.perf_counter() - started:.1f}s")
+            yield f"{size:,}", base_url
+
+
+# ----- pagination ---------------------------------------------------------
+
+def bench_pagination(args: argparse.Namespace) -> int:
+    """Full /orders/list versus one keyset page versus streaming every page"""
+    rows = []
+    for label, base_url in targets(args, args.sizes):
+        tester = login(base_url)
+
+        def full_list():
+            return tester.make_request("GET", "/orders/list?status=all").json()
+
+        def first_page():
+            return tester.make_request("GET", f"/orders/list?status=all&limit={args.page_size}").json()
+
+        def stream_all():
+            return sum(1 for _ in tester.iter_orders("all", page_size=args.stream_page_size))
+
+        total = stream_all()
+        if label == "remote" or total <= args.full_list_max:
+            full_ms = f"{measure(full_list, args.repeat):.0f}"
+            full_mib = f"{peak_memory(full_list):.1f}"
+            full_bytes = f"{len(tester.make_request('GET', '/orders/list?status=all').content) / 1e6:.1f}"
+        else:
+            full_ms = full_mib = full_bytes = "skipped"
+
+        page_bytes = len(tester.make_request("GET", f"/orders/list?status=all&limit={args.page_size}").content)
+        stream_ms = measure(stream_all, 1)
+        pages = -(-total // args.stream_page_size)
+        rows.append([
+            label, total, full_ms, full_bytes, full_mib,
+            f"{measure(first_page, args.repeat * 10):.1f}", f"{page_bytes / 1e3:.1f}",
+            f"{stream_ms:.0f}", f"{stream_ms / max(pages, 1):.1f}", f"{peak_memory(stream_all):.1f}",
+        ])
+
+    print_table(
+        f"ORDERS LIST: FULL vs PAGE OF {args.page_size} vs STREAMED PAGES OF {args.stream_page_size}",
+        ["orders", "rows", "full ms", "full MB", "full MiB heap", "page ms", "page KB",
+         "stream ms", "ms/page", "stream MiB heap"],
+        rows,
+    )
+    return 0
+
+
+# ----- top dishes ---------------------------------------------------------
+
+def bench_top_dishes(args: argparse.Namespace) -> int:
+    """Top dishes from a full scan of today's orders versus the dish_sales_daily rollup"""
+    def ranking(tester: GBCPOSAPITester) -> List[Any]:
+        return [(dish["name"], dish["orderCount"], round(dish["revenue"], 2))
+                for dish in tester.make_request("GET", "/dashboard/top-dishes").json()]
+
+    if args.base_url:
+        tester = login(args.base_url)
+        print_table("TOP DISHES", ["target", "ms"], [["remote", f"{measure(lambda: ranking(tester), args.repeat):.2f}"]])
+        return 0
+
+    rows = []
+    for size in args.sizes:
+        timings, rankings = {}, {}
+        for source in ("scan", "rollup"):
+            options = {"db_latency_ms": args.db_latency_ms, "extra_args": ["--top-dishes-source", source]}
+            for label, base_url in targets(args, [size], **options):
+                tester = login(base_url)
+                rankings[source] = ranking(tester)
+                timings[source] = measure(lambda: ranking(tester), args.repeat)
+        rows.append([label, f"{timings['scan']:.2f}", f"{timings['rollup']:.2f}",
+                     f"{timings['scan'] / timings['rollup']:.0f}x",
+                     "yes" if rankings["scan"] == rankings["rollup"] else "NO"])
+
+    print_table("TOP DISHES: FULL SCAN vs DAILY ROLLUP",
+                ["orders", "scan ms", "rollup ms", "speedup", "same ranking"], rows)
+    return 0 if all(row[-1] == "yes" for row in rows) else 1
+
+
+# ----- dashboard stats ranges ---------------------------------------------
+
+def bench_stats_range(args: argparse.Namespace) -> int:
+    """Dashboard stats for 1/30/365-day ranges from a scan of the orders versus the order_stats_daily rollup"""
+    zone = ZoneInfo(args.timezone)
+    today = datetime.now(zone).date()
+    ranges = [(days, (today - timedelta(days=days - 1)).isoformat(), today.isoformat()) for days in args.ranges]
+
+    def totals(tester: GBCPOSAPITester, start: str, end: str) -> Tuple[Any, ...]:
+        stats = tester.make_request("GET", f"/dashboard/stats?startDate={start}&endDate={end}").json()
+        return (stats["totalOrders"], round(stats["revenue"], 2), stats["activeOrders"], stats["completedOrders"])
+
+    if args.base_url:
+        tester = login(args.base_url)
+        print_table("DASHBOARD STATS RANGES", ["days", "ms", "orders"],
+                    [[days, f"{measure(lambda: totals(tester, start, end), args.repeat):.2f}",
+                      totals(tester, start, end)[0]] for days, start, end in ranges])
+        return 0
+
+    rows = []
+    for size in args.sizes:
+        timings: Dict[Tuple[str, int], float] = {}
+        results: Dict[Tuple[str, int], Tuple[Any, ...]] = {}
+        for source in ("scan", "rollup"):
+            # The response cache would answer every repeat after the first
+            options = {"db_latency_ms": args.db_latency_ms,
+                       "extra_args": ["--stats-source", source, "--timezone", args.timezone,
+                                      "--dashboard-cache-ttl-ms", "0"]}
+            for label, base_url in targets(args, [size], **options):
+                tester = login(base_url)
+                for days, start, end in ranges:
+                    results[source, days] = totals(tester, start, end)
+                    timings[source, days] = measure(lambda: totals(tester, start, end), args.repeat)
+        for days, _, _ in ranges:
+            rows.append([label, days, results["rollup", days][0], f"{timings['scan', days]:.2f}",
+                         f"{timings['rollup', days]:.2f}", f"{timings['scan', days] / timings['rollup', days]:.1f}x",
+                         "yes" if results["scan", days] == results["rollup", days] else "NO"])
+
+    print_table(f"DASHBOARD STATS: ORDER SCAN vs DAILY ROLLUP ({args.timezone} days)",
+                ["orders", "days", "in range", "scan ms", "rollup ms", "speedup", "same totals"], rows)
+    return 0 if all(row[-1] == "yes" for row in rows) else 1
+
+
+# ----- batch status updates -----------------------------------------------
+
+def bench_status_batch(args: argparse.Namespace) -> int:
+    """N single status PATCHes versus one batch PATCH of N orders"""
+    rows = []
+    for _, base_url in targets(args, [args.orders], db_latency_ms=args.db_latency_ms):
+        tester = login(base_url)
+        for size in args.batch_sizes:
+            order_numbers = [order["orderNumber"] for order in tester.iter_orders("all", page_size=size)][:size]
+            paths = [f"/orders/{quote(number, safe='')}/status" for number in order_numbers]
+            statuses = iter(["ready", "accepted"] * (args.repeat * 2))
+
+            def singles():
+                status = next(statuses)
+                for path in paths:
+                    tester.make_request("PATCH", path, {"status": status}).raise_for_status()
+
+            def batch():
+                status = next(statuses)
+                updates = [{"orderNumber": number, "status": status} for number in order_numbers]
+                response = tester.make_request("PATCH", "/orders/status", {"updates": updates})
+                response.raise_for_status()
+                if response.json()["updated"] != len(updates):
+                    raise RuntimeError(f"batch updated {response.json()['updated']} of {len(updates)} orders")
+
+            single_ms, batch_ms = measure(singles, args.repeat), measure(batch, args.repeat)
+            rows.append([size, f"{single_ms:.1f}", f"{batch_ms:.1f}", f"{single_ms / batch_ms:.1f}x"])
+
+    print_table(f"STATUS UPDATES: N SINGLE PATCHES vs ONE BATCH (db latency {args.db_latency_ms} ms)",
+                ["orders", "singles ms", "batch ms", "speedup"], rows)
+    return 0
+
+
+# ----- order stream fan-out ----------------------------------------------
+
+async def iter_body_lines(reader: asyncio.StreamReader, chunked: bool) -> AsyncIterator[str]:
+    """Lines of an HTTP/1.1 response body, de-chunking when needed"""
+    if not chunked:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield line.decode().rstrip("\r\n")
+    pending = b""
+    while True:
+        size = int((await reader.readline()).split(b";")[0], 16)
+        if size == 0:
+            return
+        pending += await reader.readexactly(size)
+        await reader.readexactly(2)
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode().rstrip("\r")
+
+
+async def order_stream_subscriber(base_url: str, token: str, connected: asyncio.Event,
+                                  received: Dict[Tuple[str, str], List[float]]):
+    """One raw-socket SSE subscription recording when each (order number, status) event arrives"""
+    url = urlsplit(base_url)
+    secure = url.scheme == "https"
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or (443 if secure else 80),
+                                                   ssl=ssl.create_default_context() if secure else None)
+    try:
+        writer.write((f"GET {url.path}/orders/stream HTTP/1.1\r\nHost: {url.netloc}\r\n"
+                      f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n").encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        if b" 200 " not in status_line:
+            raise RuntimeError(f"order stream returned {status_line.decode().strip()}")
+        chunked = False
+        while True:
+            header = (await reader.readline()).decode().strip().lower()
+            if not header:
+                break
+            chunked = chunked or header == "transfer-encoding: chunked"
+
+        connected.set()
+        parser = SSEParser()
+        async for line in iter_body_lines(reader, chunked):
+            event = parser.feed(line)
+            if event and event["event"] == "order":
+                data = json.loads(event["data"])
+                received.setdefault((data["orderNumber"], data["status"]), []).append(time.perf_counter())
+    finally:
+        writer.close()
+
+
+async def measure_fanout(base_url: str, token: str, tester: GBCPOSAPITester, subscribers: int,
+                         updates: int, connect_concurrency: int) -> List[Any]:
+    """Open `subscribers` streams, flip one order's status `updates` times and time every delivery"""
+    order_number = tester.make_request("GET", "/orders/list?status=all&limit=1").json()[0]["orderNumber"]
+    path = f"/orders/{quote(order_number, safe='')}/status"
+    loop = asyncio.get_running_loop()
+    received: Dict[Tuple[str, str], List[float]] = {}
+    gate = asyncio.Semaphore(connect_concurrency)
+
+    async def subscribe() -> asyncio.Task:
+        # Hold a slot only until the subscription has its response headers
+        connected = asyncio.Event()
+        async with gate:
+            task = asyncio.create_task(order_stream_subscriber(base_url, token, connected, received))
+            waiter = asyncio.create_task(connected.wait())
+            await asyncio.wait({task, waiter}, timeout=30, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+        if task.done():
+            task.result()
+        elif not connected.is_set():
+            raise RuntimeError("order stream subscription timed out")
+        return task
+
+    started = time.perf_counter()
+    tasks = await asyncio.gather(*(subscribe() for _ in range(subscribers)))
+    connect_s = time.perf_counter() - started
+
+    latencies, patch_ms, delivered = [], [], 0
+    statuses = ["ready", "accepted"]
+    for index in range(updates):
+        status = statuses[index % 2]
+        received.pop((order_number, status), None)
+        sent = time.perf_counter()
+        await loop.run_in_executor(None, lambda: tester.make_request("PATCH", path, {"status": status}))
+        patch_ms.append((time.perf_counter() - sent) * 1000)
+        deadline = time.perf_counter() + 10
+        while len(received.get((order_number, status), [])) < subscribers and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+        arrivals = received.get((order_number, status), [])
+        delivered += len(arrivals)
+        latencies.extend((arrival - sent) * 1000 for arrival in arrivals)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [subscribers, f"{connect_s:.1f}", f"{delivered / (subscribers * updates) * 100:.1f}",
+            f"{statistics.median(patch_ms):.1f}", f"{percentile(latencies, 50):.1f}",
+            f"{percentile(latencies, 95):.1f}", f"{percentile(latencies, 99):.1f}",
+            f"{max(latencies, default=0):.1f}"]
+
+
+def bench_order_stream(args: argparse.Namespace) -> int:
+    """Fan-out latency from a status PATCH to delivery on hundreds of concurrent order streams"""
+    rows = []
+    for _, base_url in targets(args, [args.orders]):
+        tester = login(base_url)
+        for subscribers in args.subscribers:
+            rows.append(asyncio.run(measure_fanout(base_url, tester.token, tester, subscribers, args.updates,
+                                                   args.connect_concurrency)))
+
+    print_table(f"ORDER STREAM FAN-OUT ({args.updates} status changes per run)",
+                ["subscribers", "connect s", "delivered %", "PATCH ms", "p50 ms", "p95 ms", "p99 ms", "max ms"],
+                rows)
+    return 0 if all(row[2] == "100.0" for row in rows) else 1
+
+
+# ----- orders list transfer modes ---------------------------------------
+
+def bench_list_transfer(args: argparse.Namespace) -> int:
+    """Bytes on the wire and time to first order for JSON/NDJSON, projected or not, per encoding"""
+    rows = []
+    for label, base_url in targets(args, args.sizes, db_latency_ms=args.db_latency_ms):
+        tester = login(base_url)
+        for mode, params in TRANSFER_MODES:
+            for encoding in TRANSFER_ENCODINGS:
+                runs = [tester.measure_order_transfer(params, encoding) for _ in range(args.repeat)]
+                result = runs[0]
+                rows.append([label, mode, result["encoding"], f"{result['wire_bytes'] / 1024:.0f}",
+                             f"{statistics.median(run['first_order_ms'] for run in runs):.1f}",
+                             f"{statistics.median(run['total_ms'] for run in runs):.1f}"])
+
+    print_table("ORDERS LIST TRANSFER (status=all)",
+                ["orders", "mode", "encoding", "wire KiB", "1st order ms", "total ms"], rows)
+    return 0
+
+
+# ----- authenticated principal cache ------------------------------------
+
+def hammer(tester: GBCPOSAPITester, path: str, workers: int, duration: float,
+           stop: Optional[threading.Event] = None) -> Tuple[int, List[float]]:
+    """GET path from `workers` threads for `duration` seconds (or until `stop` is set);
+    returns (requests, latencies in ms)"""
+    deadline = time.monotonic() + duration
+
+    def worker() -> List[float]:
+        samples = []
+        while time.monotonic() < deadline and not (stop and stop.is_set()):
+            started = time.perf_counter()
+            tester.make_request("GET", path).raise_for_status()
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = [sample for samples in pool.map(lambda _: worker(), range(workers)) for sample in samples]
+    return len(latencies), latencies
+
+
+def bench_auth_cache(args: argparse.Namespace) -> int:
+    """Authenticated request throughput with the restaurant principal cache off and on"""
+    variants = [("remote", None)] if args.base_url else [("cache off", ["--auth-cache-ttl-ms", "0"]),
+                                                          ("cache on", [])]
+    rows = []
+    for label, extra_args in variants:
+        if args.base_url:
+            base_url, backend = args.base_url, None
+        else:
+            backend = fake_backend_process(args.orders, db_latency_ms=args.db_latency_ms, extra_args=extra_args)
+            base_url = backend.__enter__()
+        try:
+            tester = login(base_url, pool_size=args.workers)
+            tester.make_request("GET", args.path).raise_for_status()
+            count, latencies = hammer(tester, args.path, args.workers, args.duration)
+            auth = requests.get(f"{base_url}/health", timeout=10).json().get("caches", {}).get("auth", {})
+            rows.append([label, f"{count / args.duration:.0f}", f"{percentile(latencies, 50):.2f}",
+                         f"{percentile(latencies, 95):.2f}", f"{percentile(latencies, 99):.2f}",
+                         f"{auth.get('hitRatio', 0) * 100:.1f}"])
+        finally:
+            if backend is not None:
+                backend.__exit__(None, None, None)
+
+    print_table(f"AUTHENTICATED GET {args.path} ({args.workers} workers, {args.duration:.0f}s, "
+                f"db latency {args.db_latency_ms} ms)",
+                ["variant", "req/s", "p50 ms", "p95 ms", "p99 ms", "auth hit %"], rows)
+    return 0
+
+
+# ----- login storm --------------------------------------------------------
+
+def wait_for_password_hashing(base_url: str, timeout: float = 30.0):
+    """Wait until background rehashes have drained from the password hashing pool"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        hashing = requests.get(f"{base_url}/stats", headers={"Authorization": f"Bearer {OPS_TOKEN}"},
+                               timeout=10).json().get("passwordHashing", {})
+        if not hashing.get("running") and not hashing.get("queued"):
+            return
+        time.sleep(0.05)
+
+
+def login_storm(base_url: str, clients: int, logins_per_client: int) -> Tuple[List[float], int, float]:
+    """Every client logs in at once (a shift change); returns (latencies in ms, failures, seconds)"""
+    barrier = threading.Barrier(clients)
+    body = {"username": FIRST_RESTAURANT_USERNAME, "password": DEFAULT_PASSWORD}
+
+    def client() -> Tuple[List[float], int]:
+        session = requests.Session()
+        samples, failures = [], 0
+        barrier.wait()
+        for _ in range(logins_per_client):
+            started = time.perf_counter()
+            response = session.post(f"{base_url}/auth/login", json=body, timeout=120)
+            samples.append((time.perf_counter() - started) * 1000)
+            failures += response.status_code != 200
+        return samples, failures
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda _: client(), range(clients)))
+    elapsed = time.perf_counter() - started
+    return [sample for samples, _ in results for sample in samples], sum(failures for _, failures in results), elapsed
+
+
+def bench_login_storm(args: argparse.Namespace) -> int:
+    """Concurrent logins: login p99 and what they cost the other endpoints served in the same window"""
+    if args.base_url:
+        variants = [("remote", None)]
+    else:
+        variants = [("sha256 (old)", ["--bcrypt-cost", "0"])] + [
+            (f"bcrypt {cost} x{args.hash_concurrency}",
+             ["--bcrypt-cost", str(cost), "--password-hash-concurrency", str(args.hash_concurrency)])
+            for cost in args.costs]
+
+    rows, failed = [], 0
+    for label, extra_args in variants:
+        if args.base_url:
+            base_url, backend = args.base_url, None
+        else:
+            backend = fake_backend_process(args.orders, db_latency_ms=args.db_latency_ms, extra_args=extra_args)
+            base_url = backend.__enter__()
+        try:
+            # The first login upgrades the seeded SHA-256 hash; measure steady state after it
+            tester = login(base_url, pool_size=args.bystanders)
+            wait_for_password_hashing(base_url)
+            tester.make_request("GET", args.path).raise_for_status()
+            _, baseline = hammer(tester, args.path, args.bystanders, args.baseline_seconds)
+
+            stop = threading.Event()
+            with ThreadPoolExecutor(max_workers=1) as background:
+                bystanders = background.submit(hammer, tester, args.path, args.bystanders, 3600.0, stop)
+                try:
+                    logins, failures, elapsed = login_storm(base_url, args.clients, args.logins_per_client)
+                finally:
+                    stop.set()
+                _, during = bystanders.result()
+            failed += failures
+
+            rows.append([
+                label, len(logins), failures, f"{len(logins) / elapsed:.0f}",
+                f"{percentile(logins, 50):.0f}", f"{percentile(logins, 99):.0f}",
+                f"{percentile(baseline, 50):.1f}", f"{percentile(baseline, 99):.1f}",
+                f"{percentile(during, 50):.1f}", f"{percentile(during, 99):.1f}",
+            ])
+        finally:
+            if backend is not None:
+                backend.__exit__(None, None, None)
+
+    print_table(f"LOGIN STORM: {args.clients} clients x {args.logins_per_client} logins, "
+                f"{args.bystanders} clients on GET {args.path}",
+                ["variant", "logins", "failed", "logins/s", "login p50", "login p99",
+                 "other p50", "other p99", "storm other p50", "storm other p99"], rows)
+    return 1 if failed else 0
+
+
+# ----- receipt rendering --------------------------------------------------
+
+def render_receipt_locally(order: Dict[str, Any], title: str) -> str:
+    """What receipt.service.js did on every print: lay the receipt out from the full order detail"""
+    placed_at = datetime.fromisoformat(str(order["createdAt"]).replace("Z", "+00:00")).strftime("%d/%m/%Y, %H:%M:%S")
+    rule = "-" * 44
+    lines = [title, "", f"Order                    {order['orderNumber']}", f"Date         {placed_at}", rule,
+             "Customer", f"Name                    {order['customer']['name']}",
+             f"Address          {order['customer']['address']}", rule]
+    for item in order["items"]:
+        name = item.get("dish_name") or item.get("name")
+        price = float(item.get("selling_price") or item.get("price") or 0) * int(item.get("quantity") or 1)
+        lines.append(f"{name} x{item.get('quantity')}           £{price:.2f}")
+        if item.get("notes"):
+            lines.append(f" (note: {item['notes']})")
+    lines += [rule, f"Total                       £{order['totalAmount']:.2f}", rule]
+    if order.get("notes"):
+        lines.append(f"Order note: {order['notes']}")
+    return "\n".join(lines)
+
+
+def print_burst(tester: GBCPOSAPITester, order_numbers: List[str], fetch: Callable[[str], int],
+                concurrency: int) -> Tuple[float, List[float], int]:
+    """Kitchen ticket and bag sticker for every order; returns (burst ms, per-order ms, bytes received)"""
+    def one(number: str) -> Tuple[float, int]:
+        started = time.perf_counter()
+        size = fetch(number)
+        return (time.perf_counter() - started) * 1000, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, order_numbers))
+    return (time.perf_counter() - started) * 1000, [ms for ms, _ in results], sum(size for _, size in results)
+
+
+def bench_receipts(args: argparse.Namespace) -> int:
+    """Print bursts right after accepting N orders: detail + client layout versus precomputed receipts"""
+    variants = [("detail + client layout", [], "detail"),
+                ("receipt, laid out per request", ["--receipt-cache-max", "0"], "receipt"),
+                ("receipt, prebuilt on status change", [], "receipt")]
+    if args.base_url:
+        variants = [(label, None, path) for label, _, path in variants if label != "receipt, laid out per request"]
+
+    rows = []
+    for label, extra_args, path in variants:
+        if args.base_url:
+            base_url, backend = args.base_url, None
+        else:
+            backend = fake_backend_process(args.orders, days=30, db_latency_ms=args.db_latency_ms,
+                                           extra_args=extra_args)
+            base_url = backend.__enter__()
+        try:
+            tester = login(base_url, pool_size=args.concurrency)
+            order_numbers = [order["orderNumber"] for order in tester.iter_orders("all", page_size=args.burst)]
+            order_numbers = order_numbers[:args.burst]
+
+            def fetch(number: str) -> int:
+                encoded = quote(number, safe="")
+                if path == "detail":
+                    # The old flow fetched the order once and laid out both receipts from it
+                    response = tester.make_request("GET", f"/orders/detail/{encoded}")
+                    response.raise_for_status()
+                    render_receipt_locally(response.json(), "Kitchen Receipt")
+                    render_receipt_locally(response.json(), "Delivery Receipt")
+                    return len(response.content)
+                response = tester.make_request("GET", f"/orders/{encoded}/receipt?kind=kitchen,bag")
+                response.raise_for_status()
+                for lines in response.json()["receipts"].values():
+                    "\n".join(lines)  # what the printer is sent
+                return len(response.content)
+
+            bursts, per_order, size = [], [], 0
+            for attempt in range(args.repeat):
+                # Accepting the orders is what triggers their prints; alternate so each is a real change
+                status = "accepted" if attempt % 2 == 0 else "ready"
+                updates = [{"orderNumber": number, "status": status} for number in order_numbers]
+                tester.make_request("PATCH", "/orders/status", {"updates": updates}).raise_for_status()
+                burst_ms, latencies, size = print_burst(tester, order_numbers, fetch, args.concurrency)
+                bursts.append(burst_ms)
+                per_order += latencies
+            receipts = requests.get(f"{base_url}/health", timeout=10).json().get("caches", {}).get("receipts", {})
+            rows.append([label, f"{statistics.median(bursts):.1f}", f"{percentile(per_order, 50):.2f}",
+                         f"{percentile(per_order, 99):.2f}", f"{size / len(order_numbers) / 1024:.1f}",
+                         f"{receipts.get('hitRatio', 0) * 100:.0f}" if path == "receipt" else "-"])
+        finally:
+            if backend is not None:
+                backend.__exit__(None, None, None)
+
+    print_table(f"PRINT BURST: kitchen ticket + bag sticker for {args.burst} orders just accepted "
+                f"({args.concurrency} at a time, db latency {args.db_latency_ms} ms)",
+                ["variant", "burst ms", "order p50 ms", "order p99 ms", "KiB/order", "cache hit %"], rows)
+    return 0
+
+
+# ----- bulk menu import ---------------------------------------------------
+
+def menu_import_rows(count: int, run: str) -> List[Dict[str, Any]]:
+    """A synthetic onboarding menu: `count` dishes spread over 12 sections"""
+    return [{"name": f"Import {run} Dish {index}", "price": round(3 + (index % 40) * 0.25, 2),
+             "description": f"Dish {index} of import {run}", "category": f"Section {index % 12}"}
+            for index in range(count)]
+
+
+def to_csv(rows: List[Dict[str, Any]], columns: List[str]) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def db_calls(response: requests.Response) -> int:
+    return parse_server_timing(response.headers.get("Server-Timing") or "").get("db", (0.0, 0))[1]
+
+
+def bench_menu_import(args: argparse.Namespace) -> int:
+    """Onboard N dishes and reprice them: one request per dish versus one bulk request (JSON and CSV)"""
+    rows = []
+    for _, base_url in targets(args, [args.orders], db_latency_ms=args.db_latency_ms):
+        tester = login(base_url, pool_size=args.concurrency)
+
+        def send(method: str, path: str, body: Any, csv_columns: Optional[List[str]] = None) -> requests.Response:
+            if csv_columns:
+                response = tester.make_request(method, path, to_csv(body["items"], csv_columns),
+                                               {"Content-Type": "text/csv"})
+            else:
+                response = tester.make_request(method, path, body)
+            response.raise_for_status()
+            return response
+
+        def per_item(requests_to_send: List[Tuple[str, str, Dict[str, Any]]]) -> Tuple[List[Any], int]:
+            """One request per dish, --concurrency at a time; (response bodies, db queries)"""
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                responses = list(pool.map(lambda request: send(*request), requests_to_send))
+            return [response.json() for response in responses], sum(db_calls(response) for response in responses)
+
+        def bulk(method: str, items: List[Dict[str, Any]], csv_columns: Optional[List[str]]) -> Tuple[List[Any], int]:
+            response = send(method, "/menu/items/bulk", {"items": items}, csv_columns)
+            result = response.json()
+            if result["failed"]:
+                raise RuntimeError(f"bulk {method} failed for {result['failed']} of {len(items)} dishes")
+            return [row["item"] for row in result["results"]], db_calls(response)
+
+        for size in args.dish_counts:
+            for variant, (create_columns, update_columns) in [("per item", (None, None)),
+                                                             ("bulk JSON", (None, None)),
+                                                             ("bulk CSV", (["name", "price", "description",
+                                                                            "category"], ["id", "price"]))]:
+                create_ms, update_ms, requests_sent, queries = [], [], 0, 0
+                for attempt in range(args.repeat):
+                    dishes = menu_import_rows(size, f"{len(rows)}.{attempt}")
+                    started = time.perf_counter()
+                    if variant == "per item":
+                        items, create_queries = per_item([("POST", "/menu/item", dish) for dish in dishes])
+                    else:
+                        items, create_queries = bulk("POST", dishes, create_columns)
+                    create_ms.append((time.perf_counter() - started) * 1000)
+
+                    repriced = [{"id": item["id"], "price": item["price"] + 1} for item in items]
+                    started = time.perf_counter()
+                    if variant == "per item":
+                        _, update_queries = per_item([("PUT", f"/menu/item/{dish['id']}", {"price": dish["price"]})
+                                                      for dish in repriced])
+                    else:
+                        _, update_queries = bulk("PATCH", repriced, update_columns)
+                    update_ms.append((time.perf_counter() - started) * 1000)
+                    requests_sent = 2 * size if variant == "per item" else 2
+                    queries = create_queries + update_queries
+
+                create_median, update_median = statistics.median(create_ms), statistics.median(update_ms)
+                rows.append([f"{size:,}", variant, f"{create_median:.0f}", f"{size / create_median * 1000:,.0f}",
+                             f"{update_median:.0f}", f"{requests_sent:,}", f"{queries:,}" if queries else "-"])
+
+    print_table(f"MENU IMPORT: create then reprice N dishes ({args.concurrency} per-item requests at a time, "
+                f"db latency {args.db_latency_ms} ms)",
+                ["dishes", "path", "create ms", "dishes/s", "reprice ms", "requests", "db queries"], rows)
+    return 0
+
+
+# ----- offline status queue and delta sync ---------------------------------
+
+def request_counted(tester: GBCPOSAPITester, method: str, path: str, body: Any = None) -> Tuple[Any, int]:
+    """JSON response of one request and its body bytes on the wire (gzip allowed, counted compressed)"""
+    response = tester.session.request(method, f"{tester.base_url}{path}", json=body, stream=True,
+                                      timeout=tester.timeout,
+                                      headers={"Authorization": f"Bearer {tester.token}", "Accept-Encoding": "gzip"})
+    raw = b"".join(response.raw.stream(16384, decode_content=False))
+    response.raise_for_status()
+    data = zlib.decompress(raw, wbits=31) if response.headers.get("Content-Encoding") == "gzip" else raw
+    return json.loads(data), len(raw)
+
+
+class FlakyLink:
+    """A tablet's connection just after an outage: each request may fail before
+    reaching the server (drop_rate) or reach it and lose its response on the way
+    back (lose_rate). Failed requests are retried after retry_delay seconds."""
+
+    def __init__(self, tester: GBCPOSAPITester, rng: random.Random, drop_rate: float, lose_rate: float,
+                 retry_delay: float):
+        self.tester = tester
+        self.rng = rng
+        self.drop_rate = drop_rate
+        self.lose_rate = lose_rate
+        self.retry_delay = retry_delay
+        self.requests = self.retries = self.bytes_up = self.bytes_down = 0
+
+    def call(self, method: str, path: str, body: Any = None) -> Any:
+        while True:
+            self.requests += 1
+            if self.rng.random() >= self.drop_rate:
+                if body is not None:
+                    self.bytes_up += len(json.dumps(body, separators=(",", ":")))
+                data, wire_bytes = request_counted(self.tester, method, path, body)
+                self.bytes_down += wire_bytes
+                if self.rng.random() >= self.lose_rate:
+                    return data
+            self.retries += 1
+            time.sleep(self.retry_delay)
+
+
+def replay_status_queue(link: FlakyLink, queue: List[Dict[str, Any]]) -> Counter:
+    """orderSyncService.flush: batches of at most one change per order, oldest first; outcome counts"""
+    outcomes: Counter = Counter()
+    while queue:
+        seen, batch = set(), []
+        for entry in queue:
+            if entry["orderNumber"] not in seen and len(batch) < 100:
+                seen.add(entry["orderNumber"])
+                batch.append(entry)
+        results = link.call("PATCH", "/orders/status", {"updates": batch})["results"]
+        queue[:] = [entry for entry in queue if entry not in batch]
+        for result in results:
+            outcomes["conflict" if result.get("conflict") else "unchanged" if result.get("unchanged")
+                     else "applied" if result["success"] else "failed"] += 1
+    return outcomes
+
+
+def pull_changes(link: FlakyLink, version: str) -> Tuple[Dict[str, Dict[str, Any]], str, str]:
+    """orderSyncService.pullChanges: (changed orders by number, next version, server time)"""
+    orders: Dict[str, Dict[str, Any]] = {}
+    while True:
+        changes = link.call("GET", f"/orders/changes?since={quote(version)}")
+        orders.update((order["orderNumber"], order) for order in changes["orders"])
+        version = changes["version"]
+        if not changes["hasMore"]:
+            return orders, version, changes["serverTime"]
+
+
+def parse_server_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def bench_offline_sync(args: argparse.Namespace) -> int:
+    """Reconnect after outages over a flaky link: replay queued status changes, then delta sync vs full refetch"""
+    rng = random.Random(args.seed)
+    link_options = (args.drop_rate, args.lose_rate, args.retry_delay_ms / 1000)
+    rows, inconsistent = [], 0
+    outcomes: Counter = Counter()
+    for label, base_url in targets(args, args.sizes, db_latency_ms=args.db_latency_ms,
+                                   extra_args=["--live-orders", str(args.live_orders)]):
+        tablet, counter = login(base_url), login(base_url)
+        # The version is taken before the list, as OrdersPage does
+        head = tablet.make_request("GET", "/orders/changes").json()
+        version = head["version"]
+        clock_offset = parse_server_time(head["serverTime"]) - datetime.now(timezone.utc)
+        local = {order["orderNumber"]: order for order in tablet.iter_orders("all", page_size=500)}
+
+        def queue_changes(order_numbers: List[str]) -> List[Dict[str, Any]]:
+            """Advance orders on the offline tablet, as OrdersPage does through orderSyncService.changeStatus"""
+            queued = []
+            for number in order_numbers:
+                status = local[number]["status"]
+                queued.append({"orderNumber": number, "fromStatus": status, "status": NEXT_STATUS[status],
+                               "changedAt": (datetime.now(timezone.utc) + clock_offset).isoformat()})
+                local[number] = dict(local[number], status=NEXT_STATUS[status])
+            return queued
+
+        def cancel_elsewhere(order_numbers: List[str]):
+            """Another device, online throughout, cancels orders"""
+            updates = [{"orderNumber": number, "status": "cancelled"} for number in order_numbers]
+            for start in range(0, len(updates), 100):
+                counter.make_request("PATCH", "/orders/status", {"updates": updates[start:start + 100]}) \
+                    .raise_for_status()
+
+        samples: Dict[str, List[Tuple[float, float, int, int, int]]] = {"delta sync": [], "full refetch": []}
+        for _ in range(args.outages):
+            active = [number for number, order in local.items() if order["status"] in NEXT_STATUS]
+            picked = rng.sample(active, min(len(active), args.offline_changes + args.server_changes))
+            mine, theirs = picked[:args.offline_changes], picked[args.offline_changes:]
+            overlap = mine[:int(len(mine) * args.overlap)]
+
+            # While the tablet is offline the other device cancels some of the orders
+            # it is about to advance (the tablet's later change wins), then more of
+            # them after it did (the server's later change wins: a conflict)
+            cancel_elsewhere(theirs + overlap[::2])
+            time.sleep(0.01)
+            queue = queue_changes(mine)
+            time.sleep(0.01)
+            cancel_elsewhere(overlap[1::2])
+
+            link = FlakyLink(tablet, rng, *link_options)
+            started = time.perf_counter()
+            outcomes += replay_status_queue(link, queue)
+            replay_s = time.perf_counter() - started
+            replay_requests, replay_retries = link.requests, link.retries
+
+            bytes_before = link.bytes_down
+            started = time.perf_counter()
+            changed, version, server_time = pull_changes(link, version)
+            delta_s = time.perf_counter() - started
+            clock_offset = parse_server_time(server_time) - datetime.now(timezone.utc)
+            local.update(changed)
+            samples["delta sync"].append((replay_s + delta_s, delta_s, link.bytes_down - bytes_before,
+                                          link.requests, link.retries))
+
+            full_link = FlakyLink(tablet, rng, *link_options)
+            started = time.perf_counter()
+            full = {order["orderNumber"]: order for order in full_link.call("GET", "/orders/list?status=all")}
+            full_s = time.perf_counter() - started
+            samples["full refetch"].append((replay_s + full_s, full_s, full_link.bytes_down,
+                                            replay_requests + full_link.requests, replay_retries + full_link.retries))
+
+            if {number: order["status"] for number, order in local.items()} != \
+                    {number: order["status"] for number, order in full.items()}:
+                inconsistent += 1
+            local = full
+
+        for path, runs in samples.items():
+            rows.append([label, path, f"{statistics.median(run[0] for run in runs) * 1000:.1f}",
+                         f"{statistics.median(run[1] for run in runs) * 1000:.1f}",
+                         f"{statistics.median(run[2] for run in runs) / 1024:.1f}",
+                         f"{statistics.median(run[3] for run in runs):.0f}",
+                         f"{statistics.median(run[4] for run in runs):.0f}"])
+
+    print_table(f"OFFLINE SYNC: reconnect after an outage ({args.offline_changes} queued changes, "
+                f"{args.server_changes} other and {int(args.offline_changes * args.overlap)} of the same orders changed elsewhere; "
+                f"{args.drop_rate:.0%} dropped, {args.lose_rate:.0%} lost responses; medians of {args.outages})",
+                ["orders", "path", "reconcile ms", "pull ms", "pull KiB", "requests", "retries"], rows)
+    print(f"\nReplayed changes: {outcomes['applied']} applied, {outcomes['unchanged']} unchanged "
+          f"(re-sent after a lost response), {outcomes['conflict']} conflicts (server change was later), "
+          f"{outcomes['failed']} failed")
+    print(f"Delta-synced list differed from the full refetch after {inconsistent} of {len(rows) // 2 * args.outages} "
+          f"outages")
+    return 0 if inconsistent == 0 and outcomes["failed"] == 0 else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GBC POS API performance benchmarks")
+    parser.add_argument("--base-url", help="benchmark an existing deployment instead of seeded fake backends")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    pagination = subparsers.add_parser("pagination", help=bench_pagination.__doc__)
+    pagination.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    pagination.add_argument("--page-size", type=int, default=50)
+    pagination.add_argument("--stream-page-size", type=int, default=500)
+    pagination.add_argument("--repeat", type=int, default=3)
+    pagination.add_argument("--full-list-max", type=int, default=200_000,
+                            help="skip the unpaginated request above this many orders (it needs GBs of RAM)")
+    pagination.set_defaults(func=bench_pagination)
+
+    top_dishes = subparsers.add_parser("top-dishes", help=bench_top_dishes.__doc__)
+    top_dishes.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    top_dishes.add_argument("--repeat", type=int, default=20)
+    top_dishes.add_argument("--db-latency-ms", type=float, default=0.0)
+    top_dishes.set_defaults(func=bench_top_dishes)
+
+    stats_range = subparsers.add_parser("stats-range", help=bench_stats_range.__doc__)
+    stats_range.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    stats_range.add_argument("--ranges", type=int, nargs="+", default=[1, 30, 365], help="range lengths in days")
+    stats_range.add_argument("--timezone", default="Asia/Kolkata",
+                             help="restaurant timezone; days are bucketed on its calendar")
+    stats_range.add_argument("--repeat", type=int, default=20)
+    stats_range.add_argument("--db-latency-ms", type=float, default=0.0)
+    stats_range.set_defaults(func=bench_stats_range)
+
+    status_batch = subparsers.add_parser("status-batch", help=bench_status_batch.__doc__)
+    status_batch.add_argument("--batch-sizes", type=int, nargs="+", default=[5, 20, 100])
+    status_batch.add_argument("--orders", type=int, default=10_000)
+    status_batch.add_argument("--repeat", type=int, default=5)
+    status_batch.add_argument("--db-latency-ms", type=float, default=1.0,
+                              help="simulated MySQL round-trip; the batch saves round-trips, not CPU")
+    status_batch.set_defaults(func=bench_status_batch)
+
+    order_stream = subparsers.add_parser("order-stream", help=bench_order_stream.__doc__)
+    order_stream.add_argument("--subscribers", type=int, nargs="+", default=[100, 300, 500])
+    order_stream.add_argument("--updates", type=int, default=20)
+    order_stream.add_argument("--orders", type=int, default=10_000)
+    order_stream.add_argument("--connect-concurrency", type=int, default=50,
+                              help="subscriptions opened at once")
+    order_stream.set_defaults(func=bench_order_stream)
+
+    list_transfer = subparsers.add_parser("list-transfer", help=bench_list_transfer.__doc__)
+    list_transfer.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    list_transfer.add_argument("--repeat", type=int, default=3)
+    list_transfer.add_argument("--db-latency-ms", type=float, default=0.0)
+    list_transfer.set_defaults(func=bench_list_transfer)
+
+    auth_cache = subparsers.add_parser("auth-cache", help=bench_auth_cache.__doc__)
+    auth_cache.add_argument("--path", default="/dashboard/stats",
+                            help="authenticated endpoint to hammer; the dashboard cache leaves auth as its only query")
+    auth_cache.add_argument("--workers", type=int, default=8)
+    auth_cache.add_argument("--duration", type=float, default=10.0, help="seconds per variant")
+    auth_cache.add_argument("--orders", type=int, default=10_000)
+    auth_cache.add_argument("--db-latency-ms", type=float, default=2.0,
+                            help="simulated MySQL round-trip; the cache saves one per request")
+    auth_cache.set_defaults(func=bench_auth_cache)
+
+    login_storm_parser = subparsers.add_parser("login-storm", help=bench_login_storm.__doc__)
+    login_storm_parser.add_argument("--clients", type=int, default=50, help="devices logging in at once")
+    login_storm_parser.add_argument("--logins-per-client", type=int, default=2)
+    login_storm_parser.add_argument("--costs", type=int, nargs="+", default=[10, 12], help="bcrypt costs to compare")
+    login_storm_parser.add_argument("--hash-concurrency", type=int, default=2,
+                                    help="PASSWORD_HASH_CONCURRENCY of the fake backend")
+    login_storm_parser.add_argument("--path", default="/orders/list?status=pending",
+                                    help="endpoint the other devices keep polling during the storm")
+    login_storm_parser.add_argument("--bystanders", type=int, default=4)
+    login_storm_parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    login_storm_parser.add_argument("--orders", type=int, default=10_000)
+    login_storm_parser.add_argument("--db-latency-ms", type=float, default=1.0)
+    login_storm_parser.set_defaults(func=bench_login_storm)
+
+    receipts = subparsers.add_parser("receipts", help=bench_receipts.__doc__)
+    receipts.add_argument("--burst", type=int, default=50, help="orders printed in one burst")
+    receipts.add_argument("--concurrency", type=int, default=1, help="prints fetched at once")
+    receipts.add_argument("--repeat", type=int, default=5)
+    receipts.add_argument("--orders", type=int, default=10_000)
+    receipts.add_argument("--db-latency-ms", type=float, default=1.0)
+    receipts.set_defaults(func=bench_receipts)
+
+    menu_import = subparsers.add_parser("menu-import", help=bench_menu_import.__doc__)
+    menu_import.add_argument("--dish-counts", type=int, nargs="+", default=[1_000, 10_000])
+    menu_import.add_argument("--concurrency", type=int, default=4,
+                             help="per-item requests in flight, like an onboarding script with a small pool")
+    menu_import.add_argument("--repeat", type=int, default=1)
+    menu_import.add_argument("--orders", type=int, default=1_000)
+    menu_import.add_argument("--db-latency-ms", type=float, default=1.0,
+                             help="simulated MySQL round-trip; the bulk path saves round-trips")
+    menu_import.set_defaults(func=bench_menu_import)
+
+    offline_sync = subparsers.add_parser("offline-sync", help=bench_offline_sync.__doc__)
+    offline_sync.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    offline_sync.add_argument("--outages", type=int, default=5)
+    offline_sync.add_argument("--offline-changes", type=int, default=20,
+                              help="status changes queued on the tablet per outage")
+    offline_sync.add_argument("--server-changes", type=int, default=20,
+                              help="other orders changed by another device per outage")
+    offline_sync.add_argument("--overlap", type=float, default=0.3,
+                              help="fraction of the queued orders the other device also changes")
+    offline_sync.add_argument("--drop-rate", type=float, default=0.2, help="requests failing before the server")
+    offline_sync.add_argument("--lose-rate", type=float, default=0.1,
+                              help="requests applied by the server whose response is lost")
+    offline_sync.add_argument("--retry-delay-ms", type=float, default=50.0)
+    offline_sync.add_argument("--live-orders", type=int, default=400,
+                              help="orders still in progress, for the tablet and the other device to change")
+    offline_sync.add_argument("--seed", type=int, default=7)
+    offline_sync.add_argument("--db-latency-ms", type=float, default=1.0)
+    offline_sync.set_defaults(func=bench_offline_sync)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
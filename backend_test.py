@@ -5,16 +5,362 @@ Tests all API endpoints with proper authentication and error handling
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 import json
+import os
+import secrets
 import sys
-from typing import Dict, Any, Optional
+import math
+import time
+import queue
+import random
+import re
+import socket
+import urllib.parse
+import zlib
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import argparse
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+
+try:
+    import brotli
+except ImportError:  # br responses are only requested when the brotli package is installed
+    brotli = None
+
+DEFAULT_BASE_URL = "https://restaurant-pos-12.preview.emergentagent.com/api"
+
+# Weighted read-only traffic mix used by load mode: (name, method, endpoint, weight).
+# Tablets mostly poll the pending queue, so it dominates the mix.
+LOAD_SCENARIOS = [
+    ("Orders List Pending", "GET", "/orders/list?status=pending", 8),
+    ("Orders List All", "GET", "/orders/list?status=all", 3),
+    ("Orders List Dispatched", "GET", "/orders/list?status=dispatched", 2),
+    ("Order Detail", "GET", "/orders/detail/{order_number}", 3),
+    ("Dashboard Stats", "GET", "/dashboard/stats", 2),
+    ("Dashboard Top Dishes", "GET", "/dashboard/top-dishes", 1),
+    ("Dashboard Frequent Customers", "GET", "/dashboard/frequent-customers", 1),
+    ("Menu Items", "GET", "/menu/items", 1),
+]
+
+# Functional suite schedule: (test method, tests it must run after, mutates server state).
+# Independent tests run concurrently; mutating tests never overlap one another and
+# start in the order listed here.
+TEST_PLAN = [
+    ("test_health_check", (), False),
+    ("test_login_valid_credentials", (), False),
+    ("test_login_invalid_credentials", (), False),
+    ("test_login_missing_fields", (), False),
+    ("test_protected_endpoint_without_token", (), False),
+    ("test_runtime_stats", ("test_login_valid_credentials",), False),
+    ("test_dashboard_stats", ("test_login_valid_credentials",), False),
+    ("test_dashboard_top_dishes", ("test_login_valid_credentials",), False),
+    ("test_dashboard_frequent_customers", ("test_login_valid_credentials",), False),
+    ("test_dashboard_stats_ranges", ("test_login_valid_credentials",), False),
+    # Counts HIT/MISS per endpoint, so no other dashboard read may interleave with it
+    ("test_dashboard_cache", ("test_dashboard_stats", "test_dashboard_top_dishes",
+                              "test_dashboard_frequent_customers", "test_dashboard_stats_ranges"), True),
+    ("test_orders_list_all", ("test_login_valid_credentials",), False),
+    ("test_orders_list_pending", ("test_login_valid_credentials",), False),
+    ("test_orders_list_dispatched", ("test_login_valid_credentials",), False),
+    ("test_orders_pagination", ("test_login_valid_credentials",), False),
+    ("test_orders_list_formats", ("test_login_valid_credentials",), False),
+    ("test_server_timing_and_metrics", ("test_login_valid_credentials",), False),
+    ("test_order_detail", ("test_login_valid_credentials",), False),
+    ("test_order_detail_nonexistent", ("test_login_valid_credentials",), False),
+    ("test_order_receipts", ("test_login_valid_credentials",), True),
+    ("test_menu_items", ("test_login_valid_credentials",), False),
+    ("test_add_menu_item", ("test_login_valid_credentials",), True),
+    ("test_update_menu_item", ("test_login_valid_credentials",), True),
+    ("test_menu_bulk_import", ("test_login_valid_credentials",), True),
+    ("test_order_status_update", ("test_login_valid_credentials",), True),
+    ("test_order_status_update_missing_status", ("test_login_valid_credentials",), False),
+    ("test_order_status_batch", ("test_login_valid_credentials",), True),
+    ("test_order_status_batch_validation", ("test_login_valid_credentials",), False),
+    ("test_order_delta_sync", ("test_login_valid_credentials",), True),
+    ("test_order_stream", ("test_login_valid_credentials",), True),
+]
+
+
+# Order list projection used by list views, and the transfer modes the tester compares
+LIST_VIEW_FIELDS = "orderNumber,status,totalAmount,createdAt"
+TRANSFER_MODES = [
+    ("json", {}),
+    ("json fields", {"fields": LIST_VIEW_FIELDS}),
+    ("ndjson", {"format": "ndjson"}),
+    ("ndjson fields", {"format": "ndjson", "fields": LIST_VIEW_FIELDS}),
+]
+TRANSFER_ENCODINGS = ["identity", "gzip"] + (["br"] if brotli else [])
+
+# Soak mode only fits a heap trend to at least this much steady-state time
+MIN_HEAP_TREND_SECONDS = 600
+
+
+# Next API status for each status an order can be advanced from
+NEXT_STATUS = {"pending": "accepted", "accepted": "ready", "ready": "dispatched", "dispatched": "completed"}
+
+
+class SSEParser:
+    """Incremental text/event-stream parser; feed() lines, get back complete events"""
 
-class GBCPOSAPITester:
     def __init__(self):
-        self.base_url = "https://restaurant-pos-12.preview.emergentagent.com/api"
+        self.fields: Dict[str, str] = {}
+        self.data: List[str] = []
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        if line == "":
+            if not self.data and "event" not in self.fields:
+                self.fields = {}
+                return None
+            event = {"id": self.fields.get("id"), "event": self.fields.get("event", "message"),
+                     "data": "\n".join(self.data)}
+            self.fields, self.data = {}, []
+            return event
+        if line.startswith(":"):
+            return None
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "data":
+            self.data.append(value)
+        else:
+            self.fields[name] = value
+        return None
+
+
+# Handshake timings of the connection opened by the current thread's last request.
+# Reused keep-alive connections never touch these, so they stay at zero.
+_connection_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Records the TCP connect duration of new connections"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        _connection_timings.connect = time.perf_counter() - start
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        handshake = time.perf_counter() - start
+        _connection_timings.tls = max(handshake - _connection_timings.connect, 0.0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Keep-alive connection pool whose connections report handshake timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def linear_slope(xs: List[float], ys: List[float]) -> float:
+    """Least-squares slope of ys over xs (0 when there are fewer than two points)"""
+    if len(xs) < 2:
+        return 0.0
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the spirit of HdrHistogram.
+
+    Values are recorded in whole microseconds. Each power-of-two range is split
+    into 2**(sub_bucket_bits - 1) linear slots, so every percentile is reported
+    within 1/2**(sub_bucket_bits - 1) of the true value at any magnitude, and
+    histograms from separate runs can be merged bucket by bucket.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        shift = max(value_us.bit_length() - self.sub_bucket_bits, 0)
+        return (shift << self.sub_bucket_bits) | (value_us >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        shift = index >> self.sub_bucket_bits
+        mantissa = index & ((1 << self.sub_bucket_bits) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        value_us = max(int(seconds * 1_000_000), 0)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum_us += value_us
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def value_at_percentile(self, pct: float) -> float:
+        """Latency in milliseconds at the given percentile (0 when empty)"""
+        if self.total == 0:
+            return 0.0
+        target = max(math.ceil(pct / 100.0 * self.total), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.total,
+            "mean_ms": (self.sum_us / self.total / 1000.0) if self.total else 0.0,
+            "p50_ms": self.value_at_percentile(50),
+            "p90_ms": self.value_at_percentile(90),
+            "p95_ms": self.value_at_percentile(95),
+            "p99_ms": self.value_at_percentile(99),
+            "max_ms": self.max_us / 1000.0
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "sum_us": self.sum_us,
+            "max_us": self.max_us,
+            "counts": {str(index): count for index, count in sorted(self.counts.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data.get("sub_bucket_bits", 7))
+        histogram.counts = {int(index): count for index, count in data.get("counts", {}).items()}
+        histogram.total = sum(histogram.counts.values())
+        histogram.sum_us = data.get("sum_us", 0)
+        histogram.max_us = data.get("max_us", 0)
+        return histogram
+
+
+# Path segments that identify a single record are collapsed so every order or
+# dish lands in the same histogram.
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/orders/detail/[^/]+$"), "/orders/detail/{n}"),
+    (re.compile(r"^/orders/[^/]+/status$"), "/orders/{n}/status"),
+    (re.compile(r"^/orders/[^/]+/receipt$"), "/orders/{n}/receipt"),
+    (re.compile(r"^/menu/item/[^/]+$"), "/menu/item/{id}"),
+]
+
+# Server-Timing spans the report breaks server time down into, in order
+SERVER_TIMING_SPANS = ("auth", "db", "pool", "parse", "serialize", "password")
+SERVER_TIMING_ENTRY = re.compile(r'^\s*([\w-]+)(?:;dur=([\d.]+))?(?:;desc="(\d+) calls")?')
+
+
+def parse_server_timing(header: str) -> Dict[str, Tuple[float, int]]:
+    """Server-Timing header -> {span: (ms, calls)}, e.g. 'db;dur=3.21;desc="3 calls"' -> {'db': (3.21, 3)}"""
+    spans = {}
+    for entry in header.split(","):
+        match = SERVER_TIMING_ENTRY.match(entry)
+        if match and match.group(2) is not None:
+            spans[match.group(1)] = (float(match.group(2)), int(match.group(3) or 1))
+    return spans
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """Histogram key for a request, e.g. 'GET /orders/list?status=pending'"""
+    path, _, query = endpoint.partition("?")
+    for pattern, template in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            path = template
+            break
+    params = urllib.parse.parse_qs(query)
+    status = params.get("status")
+    if status:
+        path = f"{path}?status={status[0]}"
+    if "limit" in params or "cursor" in params:
+        path += "&paged" if status else "?paged"
+    return f"{method.upper()} {path}"
+
+
+class GBCPOSAPITester:
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, pool_size: int = 10, retries: int = 3,
+                 backoff: float = 0.3, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
         self.token = None
         self.restaurant_id = None
         self.test_results = []
+        self.timeout = timeout
+        self.session = self.build_session(pool_size, retries, backoff)
+
+        # Per-endpoint latency histograms and the optional regression baseline
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.histograms_lock = threading.Lock()
+        self.baseline_in: Optional[str] = None
+        self.baseline_out: Optional[str] = None
+        self.p95_threshold = 0.20
+        self.p95_min_delta_ms = 2.0
+
+        # X-Cache HIT/MISS and 304 counts per endpoint, from the dashboard response cache
+        self.cache_counts: Dict[str, Dict[str, int]] = {}
+        self.min_cache_hit_ratio: Optional[float] = None
+
+        # Server-Timing per endpoint: server totals (ms) and summed span ms/calls
+        self.server_totals: Dict[str, List[float]] = {}
+        self.server_spans: Dict[str, Dict[str, List[float]]] = {}
+
+        # Soak mode drift limits over the steady-state samples
+        self.max_heap_growth_mb_per_hour = 50.0
+        self.max_pool_queue_growth = 2.0
+        self.soak_write_interval = 5.0
+        # The kitchen thread PATCHes real orders, so soak runs stay read-only unless allowed
+        self.soak_writes = False
+        # OPS_TOKEN of the backend under test, for /stats and /metrics
+        self.ops_token: Optional[str] = None
+
+        # Lookups shared by the tests that only need some existing row, fetched once per run
+        self.fixtures: Dict[str, Any] = {}
+        self.fixtures_lock = threading.Lock()
+        self.test_results_lock = threading.Lock()
+        self.wall_time: Optional[float] = None
+        self.transfer_results: Dict[Tuple[str, str], Dict[str, Any]] = {}
         
         # Test credentials
         self.username = "thecurryvault"
@@ -29,12 +375,36 @@ class GBCPOSAPITester:
             "message": message,
             "response_data": response_data
         }
-        self.test_results.append(result)
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
-        
-    def make_request(self, method: str, endpoint: str, data: Dict = None, headers: Dict = None) -> requests.Response:
-        """Make HTTP request with proper error handling"""
+        with self.test_results_lock:
+            self.test_results.append(result)
+            print(f"{status}: {test_name} - {message}")
+
+    @staticmethod
+    def build_session(pool_size: int, retries: int, backoff: float) -> requests.Session:
+        """Build a keep-alive session; only idempotent GETs are retried on 502/503/504"""
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def make_request(self, method: str, endpoint: str, data: Any = None, headers: Dict = None) -> requests.Response:
+        """Make HTTP request with proper error handling.
+
+        ``data`` is sent as JSON, or as-is when it is already a str/bytes body
+        (pass its Content-Type in ``headers``).
+
+        The returned response carries a ``timings`` dict (seconds) split into
+        connect, tls, first_byte (server wait) and total.
+        """
         url = f"{self.base_url}{endpoint}"
         default_headers = {"Content-Type": "application/json"}
         
@@ -43,24 +413,248 @@ class GBCPOSAPITester:
             
         if self.token and "Authorization" not in default_headers:
             default_headers["Authorization"] = f"Bearer {self.token}"
+
+        method = method.upper()
+        if method not in ("GET", "POST", "PATCH", "PUT"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
             
         try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=default_headers, timeout=30)
-            elif method.upper() == "POST":
-                response = requests.post(url, json=data, headers=default_headers, timeout=30)
-            elif method.upper() == "PATCH":
-                response = requests.patch(url, json=data, headers=default_headers, timeout=30)
-            elif method.upper() == "PUT":
-                response = requests.put(url, json=data, headers=default_headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-                
+            _connection_timings.connect = 0.0
+            _connection_timings.tls = 0.0
+            start = time.perf_counter()
+            response = self.session.request(
+                method,
+                url,
+                json=data if method != "GET" and not isinstance(data, (str, bytes)) else None,
+                data=data if isinstance(data, (str, bytes)) else None,
+                headers=default_headers,
+                timeout=self.timeout
+            )
+            total = time.perf_counter() - start
+
+            connect = _connection_timings.connect
+            tls = _connection_timings.tls
+            response.timings = {
+                "connect": connect,
+                "tls": tls,
+                "first_byte": max(response.elapsed.total_seconds() - connect - tls, 0.0),
+                "total": total
+            }
+            self.record_latency(method, endpoint, total)
+            self.record_cache(method, endpoint, response)
+            self.record_server_timing(method, endpoint, response)
             return response
         except requests.exceptions.RequestException as e:
             print(f"Request failed: {e}")
             raise
             
+    def record_latency(self, method: str, endpoint: str, seconds: float):
+        """Add a request's wall time to its endpoint histogram"""
+        key = endpoint_key(method, endpoint)
+        with self.histograms_lock:
+            if key not in self.histograms:
+                self.histograms[key] = LatencyHistogram()
+            self.histograms[key].record(seconds)
+
+    def record_cache(self, method: str, endpoint: str, response: requests.Response):
+        """Count X-Cache outcomes and 304 Not Modified answers per endpoint"""
+        outcome = response.headers.get("X-Cache")
+        if not outcome:
+            return
+        key = endpoint_key(method, endpoint)
+        with self.histograms_lock:
+            counts = self.cache_counts.setdefault(key, {"HIT": 0, "MISS": 0, "304": 0})
+            counts[outcome.upper()] = counts.get(outcome.upper(), 0) + 1
+            if response.status_code == 304:
+                counts["304"] += 1
+
+    def record_server_timing(self, method: str, endpoint: str, response: requests.Response):
+        """Add the response's Server-Timing spans to its endpoint's breakdown"""
+        spans = parse_server_timing(response.headers.get("Server-Timing") or "")
+        if "total" not in spans:
+            return
+        key = endpoint_key(method, endpoint)
+        with self.histograms_lock:
+            self.server_totals.setdefault(key, []).append(spans.pop("total")[0])
+            totals = self.server_spans.setdefault(key, {})
+            for name, (ms, calls) in spans.items():
+                total = totals.setdefault(name, [0.0, 0])
+                total[0] += ms
+                total[1] += calls
+
+    def print_server_timing_report(self):
+        """Print where the server time went per endpoint: mean ms per request in each span"""
+        if not self.server_totals:
+            return
+        print("\n🔬 SERVER TIMING (mean ms per request; spans nest and overlap, so they need not add up)")
+        print(f"{'Endpoint':<45} {'Count':>6} {'p50 ms':>7} "
+              + " ".join(f"{span:>9}" for span in SERVER_TIMING_SPANS) + f" {'queries':>7}")
+        for key, totals in sorted(self.server_totals.items()):
+            spans = self.server_spans.get(key, {})
+            count = len(totals)
+            cells = " ".join(f"{spans[span][0] / count:>9.2f}" if span in spans else f"{'-':>9}"
+                             for span in SERVER_TIMING_SPANS)
+            queries = spans["db"][1] / count if "db" in spans else 0.0
+            print(f"{key:<45} {count:>6} {percentile(totals, 50):>7.2f} {cells} {queries:>7.1f}")
+
+    def cache_hit_ratio(self) -> Optional[float]:
+        hits = sum(counts["HIT"] for counts in self.cache_counts.values())
+        lookups = hits + sum(counts["MISS"] for counts in self.cache_counts.values())
+        return hits / lookups if lookups else None
+
+    def print_cache_report(self) -> int:
+        """Print dashboard cache hit ratios; returns 1 when below --min-cache-hit-ratio"""
+        if not self.cache_counts:
+            return 0
+        print("\n🗄️  DASHBOARD CACHE")
+        print(f"{'Endpoint':<45} {'Hits':>6} {'Misses':>7} {'304s':>6} {'Hit %':>7}")
+        for key, counts in sorted(self.cache_counts.items()):
+            lookups = counts["HIT"] + counts["MISS"]
+            print(f"{key:<45} {counts['HIT']:>6} {counts['MISS']:>7} {counts['304']:>6} "
+                  f"{counts['HIT'] / lookups * 100 if lookups else 0:>7.1f}")
+
+        ratio = self.cache_hit_ratio()
+        if self.min_cache_hit_ratio is not None and ratio is not None and ratio < self.min_cache_hit_ratio:
+            print(f"  ❌ Hit ratio {ratio * 100:.1f}% is below {self.min_cache_hit_ratio * 100:.0f}%")
+            return 1
+        return 0
+
+    def write_baseline(self, path: str):
+        """Write the per-endpoint histograms as a JSON latency baseline"""
+        baseline = {
+            "version": 1,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "base_url": self.base_url,
+            "endpoints": {
+                key: {**histogram.summary(), "histogram": histogram.to_dict()}
+                for key, histogram in sorted(self.histograms.items())
+            }
+        }
+        with open(path, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"💾 Latency baseline written to {path}")
+
+    def compare_baseline(self, path: str) -> List[str]:
+        """Return a message for every endpoint whose p95 regressed past the threshold"""
+        with open(path) as f:
+            baseline = json.load(f)
+
+        regressions = []
+        for key, histogram in sorted(self.histograms.items()):
+            previous = baseline.get("endpoints", {}).get(key)
+            if not previous:
+                continue
+            old_p95 = previous["p95_ms"]
+            new_p95 = histogram.value_at_percentile(95)
+            if new_p95 > old_p95 * (1 + self.p95_threshold) and new_p95 - old_p95 >= self.p95_min_delta_ms:
+                regressions.append(f"{key}: p95 {old_p95:.1f} ms -> {new_p95:.1f} ms "
+                                   f"(+{(new_p95 / old_p95 - 1) * 100 if old_p95 else float('inf'):.0f}%)")
+        return regressions
+
+    def print_latency_report(self) -> int:
+        """Print per-endpoint latency percentiles and apply the baseline gate; returns regression count"""
+        print("\n⏱️  LATENCY BY ENDPOINT")
+        print(f"{'Endpoint':<45} {'Count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for key, histogram in sorted(self.histograms.items()):
+            stats = histogram.summary()
+            print(f"{key:<45} {stats['count']:>6} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+                  f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+
+        regressions = []
+        if self.baseline_in:
+            regressions = self.compare_baseline(self.baseline_in)
+            if regressions:
+                print(f"\n🐢 P95 REGRESSIONS vs {self.baseline_in} (threshold {self.p95_threshold * 100:.0f}%):")
+                for message in regressions:
+                    print(f"  ❌ {message}")
+            else:
+                print(f"\n✅ No p95 regressions vs {self.baseline_in}")
+
+        if self.baseline_out:
+            self.write_baseline(self.baseline_out)
+
+        return len(regressions)
+
+    def iter_orders(self, status: str = "all", page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream orders newest first, fetching pages lazily by following X-Next-Cursor"""
+        cursor = None
+        while True:
+            params = {"status": status, "limit": page_size}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.make_request("GET", f"/orders/list?{urllib.parse.urlencode(params)}")
+            response.raise_for_status()
+            yield from response.json()
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return
+
+    def measure_order_transfer(self, params: Dict[str, str], encoding: str) -> Dict[str, Any]:
+        """Fetch /orders/list counting body bytes as sent (still compressed) and the time to the first order.
+
+        NDJSON orders are usable line by line; a JSON array only once the
+        whole body is parsed, so its first order arrives with the last.
+        """
+        query = urllib.parse.urlencode({"status": "all", **params})
+        started = time.perf_counter()
+        response = self.session.get(f"{self.base_url}/orders/list?{query}", stream=True, timeout=self.timeout,
+                                    headers={"Authorization": f"Bearer {self.token}", "Accept-Encoding": encoding})
+        response.raise_for_status()
+        content_encoding = response.headers.get("Content-Encoding", "identity")
+        if content_encoding == "br":
+            decompress = brotli.Decompressor().process
+        elif content_encoding == "gzip":
+            decompress = zlib.decompressobj(wbits=31).decompress
+        else:
+            def decompress(chunk):
+                return chunk
+
+        ndjson = "ndjson" in response.headers.get("Content-Type", "")
+        wire_bytes = 0
+        first_order = None
+        body = bytearray()
+        for chunk in response.raw.stream(16384, decode_content=False):
+            wire_bytes += len(chunk)
+            body += decompress(chunk)
+            if ndjson and first_order is None and b"\n" in body:
+                first_order = time.perf_counter() - started
+        if ndjson:
+            orders = [json.loads(line) for line in body.splitlines() if line]
+        else:
+            orders = json.loads(body)
+        total = time.perf_counter() - started
+        return {"encoding": content_encoding, "wire_bytes": wire_bytes, "body_bytes": len(body),
+                "orders": len(orders), "first_order_ms": (first_order or total) * 1000, "total_ms": total * 1000,
+                "keys": sorted(orders[0]) if orders else []}
+
+    def fixture(self, name: str) -> Any:
+        """Shared read-only lookup, fetched by the first test that asks for it"""
+        loaders = {
+            "recent_orders": lambda: self.make_request("GET", "/orders/list?status=all&limit=50"),
+            "menu_items": lambda: self.make_request("GET", "/menu/items"),
+        }
+        with self.fixtures_lock:
+            if name not in self.fixtures:
+                response = loaders[name]()
+                response.raise_for_status()
+                self.fixtures[name] = response.json()
+            return self.fixtures[name]
+
+    def find_order_to_advance(self, statuses=("accepted", "ready", "pending")) -> Optional[Tuple[str, str, str]]:
+        """(order number, status, next status) for the newest order in the first listed status that has one"""
+        for current in statuses:
+            orders = self.make_request("GET", f"/orders/list?status={current}&limit=1").json()
+            if orders:
+                return orders[0]["orderNumber"], current, NEXT_STATUS[current]
+        return None
+
+    def restore_order_statuses(self, statuses: Dict[str, str]):
+        """Put orders a test changed back in their original status, leaving a shared backend as it was"""
+        if statuses:
+            self.make_request("PATCH", "/orders/status",
+                              {"updates": [{"orderNumber": order_number, "status": status}
+                                           for order_number, status in statuses.items()]})
+
     def test_health_check(self):
         """Test health check endpoint"""
         try:
@@ -76,6 +670,78 @@ class GBCPOSAPITester:
         except Exception as e:
             self.log_test("Health Check", False, f"Health check error: {str(e)}")
             
+    def ops_headers(self) -> Dict[str, str]:
+        """Authorization for the operator endpoints, in place of the restaurant token"""
+        return {"Authorization": f"Bearer {self.ops_token}"}
+
+    def test_runtime_stats(self):
+        """Test that /stats refuses restaurant tokens and serves its gauges with the ops token"""
+        try:
+            for label, headers in (("no token", {"Authorization": None}), ("restaurant token", {})):
+                response = self.make_request("GET", "/stats", headers=headers)
+                if response.status_code not in (401, 403):
+                    self.log_test("Runtime Stats", False, f"/stats with {label}: expected 401/403, "
+                                                          f"got {response.status_code}")
+                    return
+            if not self.ops_token:
+                self.log_test("Runtime Stats", True, "Refused without the ops token; no --ops-token to read it")
+                return
+
+            response = self.make_request("GET", "/stats", headers=self.ops_headers())
+            data = response.json() if response.status_code == 200 else {}
+            missing = [key for key in ("memory", "eventLoop", "pool") if key not in data]
+            if response.status_code != 200 or missing:
+                self.log_test("Runtime Stats", False, f"Status {response.status_code}, missing {missing}")
+                return
+            self.log_test("Runtime Stats", True,
+                          f"Refused restaurant tokens; event loop p99 {data['eventLoop']['p99Ms']:.1f} ms "
+                          f"over {data['eventLoop'].get('windowMs', 0) / 1000:.0f}s")
+        except Exception as e:
+            self.log_test("Runtime Stats", False, f"Runtime stats error: {str(e)}")
+
+    def test_server_timing_and_metrics(self):
+        """Test Server-Timing spans on an authenticated read and its route histogram at /metrics"""
+        if not self.token:
+            self.log_test("Server Timing", False, "No authentication token available")
+            return
+
+        try:
+            response = self.make_request("GET", "/orders/list?status=pending&limit=5")
+            spans = parse_server_timing(response.headers.get("Server-Timing") or "")
+            missing = [span for span in ("auth", "db", "total") if span not in spans]
+            if response.status_code != 200 or missing:
+                self.log_test("Server Timing", False,
+                              f"Status {response.status_code}, Server-Timing missing {missing}: "
+                              f"{response.headers.get('Server-Timing')!r}")
+                return
+
+            refused = self.make_request("GET", "/metrics")
+            if refused.status_code not in (401, 403):
+                self.log_test("Server Timing", False,
+                              f"/metrics with a restaurant token: expected 401/403, got {refused.status_code}")
+                return
+            if not self.ops_token:
+                self.log_test("Server Timing", True,
+                              f"total {spans['total'][0]:.2f} ms, auth {spans['auth'][0]:.2f} ms; "
+                              "/metrics refused without the ops token")
+                return
+
+            metrics = self.make_request("GET", "/metrics", headers=self.ops_headers())
+            series = 'http_request_duration_seconds_count{method="GET",route="/api/orders/list",status="200"}'
+            span_series = 'http_request_span_seconds_count{method="GET",route="/api/orders/list",span="db"}'
+            if metrics.status_code != 200 or series not in metrics.text or span_series not in metrics.text:
+                self.log_test("Server Timing", False,
+                              f"/metrics status {metrics.status_code} without the /api/orders/list histograms")
+                return
+            if "/orders/list?" in metrics.text or "#GBC" in metrics.text:
+                self.log_test("Server Timing", False, "/metrics labels carry raw URLs instead of route patterns")
+                return
+            self.log_test("Server Timing", True,
+                          f"total {spans['total'][0]:.2f} ms, auth {spans['auth'][0]:.2f} ms, "
+                          f"db {spans['db'][0]:.2f} ms over {spans['db'][1]} queries; /metrics has the route")
+        except Exception as e:
+            self.log_test("Server Timing", False, f"Server timing error: {str(e)}")
+
     def test_login_valid_credentials(self):
         """Test login with valid credentials"""
         try:
@@ -88,9 +754,11 @@ class GBCPOSAPITester:
             
             if response.status_code == 200:
                 data = response.json()
-                if "token" in data and "restaurant" in data:
+                # The Express AuthService returns the account as "user"; older backends used "restaurant"
+                account = data.get("restaurant") or data.get("user")
+                if "token" in data and account:
                     self.token = data["token"]
-                    self.restaurant_id = str(data["restaurant"]["id"])
+                    self.restaurant_id = str(account["id"])
                     
                     # Verify restaurant ID matches expected
                     if self.restaurant_id == self.expected_restaurant_id:
@@ -146,11 +814,8 @@ class GBCPOSAPITester:
     def test_protected_endpoint_without_token(self):
         """Test accessing protected endpoint without token"""
         try:
-            # Temporarily remove token
-            original_token = self.token
-            self.token = None
-            
-            response = self.make_request("GET", "/dashboard/stats")
+            # A None header is dropped by requests, so this one call goes out without the token
+            response = self.make_request("GET", "/dashboard/stats", headers={"Authorization": None})
             
             if response.status_code == 401:
                 self.log_test("Protected Endpoint No Token", True, 
@@ -158,9 +823,6 @@ class GBCPOSAPITester:
             else:
                 self.log_test("Protected Endpoint No Token", False, 
                             f"Expected 401, got {response.status_code}: {response.text}")
-                            
-            # Restore token
-            self.token = original_token
         except Exception as e:
             self.log_test("Protected Endpoint No Token", False, f"No token test error: {str(e)}")
             
@@ -183,6 +845,54 @@ class GBCPOSAPITester:
         except Exception as e:
             self.log_test("Dashboard Stats", False, f"Dashboard stats error: {str(e)}")
             
+    def test_dashboard_stats_ranges(self):
+        """Test local-day ranges: the daily series adds up to the range totals"""
+        if not self.token:
+            self.log_test("Dashboard Stats Ranges", False, "No authentication token available")
+            return
+
+        try:
+            response = self.make_request("GET", "/dashboard/stats")
+            if response.status_code != 200:
+                self.log_test("Dashboard Stats Ranges", False,
+                            f"Dashboard stats failed with status {response.status_code}: {response.text}")
+                return
+            zone = response.json().get("timezone") or "UTC"
+            today = datetime.now(ZoneInfo(zone)).date()
+            start, end = (today - timedelta(days=6)).isoformat(), today.isoformat()
+            problems = []
+
+            daily = self.make_request("GET", f"/dashboard/stats/daily?startDate={start}&endDate={end}")
+            totals = self.make_request("GET", f"/dashboard/stats?startDate={start}&endDate={end}")
+            if daily.status_code != 200 or totals.status_code != 200:
+                problems.append(f"daily {daily.status_code}, range {totals.status_code}")
+            else:
+                days = daily.json().get("days", [])
+                expected_dates = [(today - timedelta(days=6 - offset)).isoformat() for offset in range(7)]
+                if [day.get("date") for day in days] != expected_dates:
+                    problems.append(f"daily series dates {[day.get('date') for day in days]}")
+                range_totals = totals.json()
+                for field in ("totalOrders", "activeOrders", "completedOrders"):
+                    if sum(day.get(field, 0) for day in days) != range_totals.get(field):
+                        problems.append(f"{field} of the days does not add up to the range")
+                if abs(sum(day.get("revenue", 0) for day in days) - range_totals.get("revenue", 0)) > 0.01:
+                    problems.append("revenue of the days does not add up to the range")
+
+            reversed_range = self.make_request("GET", f"/dashboard/stats/daily?startDate={end}&endDate={start}")
+            if start != end and reversed_range.status_code != 400:
+                problems.append(f"reversed range returned {reversed_range.status_code}")
+            dishes = self.make_request("GET", f"/dashboard/top-dishes?startDate={start}&endDate={end}")
+            if dishes.status_code != 200 or not isinstance(dishes.json(), list):
+                problems.append(f"top dishes for the range returned {dishes.status_code}")
+
+            if problems:
+                self.log_test("Dashboard Stats Ranges", False, "; ".join(problems))
+            else:
+                self.log_test("Dashboard Stats Ranges", True,
+                            f"7 {zone} days add up to the range totals ({range_totals['totalOrders']} orders)")
+        except Exception as e:
+            self.log_test("Dashboard Stats Ranges", False, f"Dashboard stats ranges error: {str(e)}")
+
     def test_dashboard_top_dishes(self):
         """Test dashboard top dishes endpoint"""
         if not self.token:
@@ -221,6 +931,63 @@ class GBCPOSAPITester:
         except Exception as e:
             self.log_test("Dashboard Frequent Customers", False, f"Frequent customers error: {str(e)}")
             
+    def test_dashboard_cache(self):
+        """Test dashboard cache hits, ETag revalidation and invalidation by a status PATCH"""
+        if not self.token:
+            self.log_test("Dashboard Cache", False, "No authentication token available")
+            return
+
+        endpoints = ["/dashboard/stats", "/dashboard/top-dishes", "/dashboard/frequent-customers"]
+        restore: Dict[str, str] = {}
+        try:
+            for endpoint in endpoints:
+                self.make_request("GET", endpoint)
+            warm = {endpoint: self.make_request("GET", endpoint) for endpoint in endpoints}
+            outcomes = {endpoint: response.headers.get("X-Cache") for endpoint, response in warm.items()}
+            if not all(outcomes.values()):
+                self.log_test("Dashboard Cache", False, "Dashboard responses carry no X-Cache header")
+                return
+            if any(outcome != "HIT" for outcome in outcomes.values()):
+                self.log_test("Dashboard Cache", False, f"Repeated requests were not cache hits: {outcomes}")
+                return
+
+            stats_etag = warm["/dashboard/stats"].headers.get("ETag")
+            conditional = self.make_request("GET", "/dashboard/stats", headers={"If-None-Match": stats_etag})
+            if conditional.status_code != 304:
+                self.log_test("Dashboard Cache", False,
+                              f"If-None-Match with the current ETag returned {conditional.status_code}, expected 304")
+                return
+
+            # Each transition changes stats and top dishes but not completed-order customers
+            transition = self.find_order_to_advance()
+            if not transition:
+                self.log_test("Dashboard Cache", False, "No active orders available to test invalidation")
+                return
+            order_number, current, target = transition
+            encoded_order_number = urllib.parse.quote(order_number, safe='')
+            restore[order_number] = current
+            update_response = self.make_request("PATCH", f"/orders/{encoded_order_number}/status",
+                                                {"status": target})
+            if update_response.status_code != 200:
+                self.log_test("Dashboard Cache", False, f"Status update failed with {update_response.status_code}")
+                return
+
+            expected = {"/dashboard/stats": "MISS", "/dashboard/top-dishes": "MISS",
+                        "/dashboard/frequent-customers": "HIT"}
+            after = {endpoint: self.make_request("GET", endpoint) for endpoint in endpoints}
+            outcomes = {endpoint: response.headers.get("X-Cache") for endpoint, response in after.items()}
+            if outcomes != expected:
+                self.log_test("Dashboard Cache", False, f"After PATCH expected {expected}, got {outcomes}")
+                return
+
+            self.log_test("Dashboard Cache", True,
+                          f"Hits, 304 revalidation and PATCH invalidation behave as expected "
+                          f"(hit ratio so far {self.cache_hit_ratio() * 100:.0f}%)")
+        except Exception as e:
+            self.log_test("Dashboard Cache", False, f"Dashboard cache error: {str(e)}")
+        finally:
+            self.restore_order_statuses(restore)
+
     def test_orders_list_all(self):
         """Test orders list with status=all"""
         if not self.token:
@@ -281,6 +1048,349 @@ class GBCPOSAPITester:
         except Exception as e:
             self.log_test("Orders List Dispatched", False, f"Dispatched orders error: {str(e)}")
             
+    def test_orders_pagination(self):
+        """Test keyset pagination on the orders list"""
+        if not self.token:
+            self.log_test("Orders Pagination", False, "No authentication token available")
+            return
+            
+        try:
+            response = self.make_request("GET", "/orders/list?status=all&limit=5")
+            
+            if response.status_code != 200:
+                self.log_test("Orders Pagination", False, 
+                            f"First page failed with status {response.status_code}: {response.text}")
+                return
+            if len(response.json()) > 5:
+                self.log_test("Orders Pagination", False, 
+                            f"limit=5 ignored, got {len(response.json())} orders")
+                return
+
+            orders = list(islice(self.iter_orders("all", page_size=5), 15))
+            numbers = [order.get('orderNumber') for order in orders]
+            created = [order.get('createdAt') for order in orders]
+            
+            if len(set(numbers)) != len(numbers):
+                self.log_test("Orders Pagination", False, "Duplicate orders across pages")
+            elif created != sorted(created, reverse=True):
+                self.log_test("Orders Pagination", False, "Pages are not ordered newest first")
+            else:
+                self.log_test("Orders Pagination", True, 
+                            f"Streamed {len(orders)} orders across pages of 5 without duplicates")
+        except Exception as e:
+            self.log_test("Orders Pagination", False, f"Orders pagination error: {str(e)}")
+            
+    def test_orders_list_formats(self):
+        """Test field projection, NDJSON streaming and compression of the orders list"""
+        if not self.token:
+            self.log_test("Orders List Formats", False, "No authentication token available")
+            return
+
+        try:
+            unknown = self.make_request("GET", "/orders/list?status=all&limit=1&fields=orderNumber,bogus")
+            if unknown.status_code != 400:
+                self.log_test("Orders List Formats", False, f"Unknown field returned {unknown.status_code}, expected 400")
+                return
+
+            results = {(mode, encoding): self.measure_order_transfer(params, encoding)
+                       for mode, params in TRANSFER_MODES for encoding in TRANSFER_ENCODINGS}
+            self.transfer_results = results
+            counts = {result["orders"] for result in results.values()}
+            projected = [result["keys"] for (mode, _), result in results.items() if "fields" in mode]
+            compressed = [result["encoding"] for (_, encoding), result in results.items() if encoding != "identity"]
+            if len(counts) != 1:
+                self.log_test("Orders List Formats", False, f"Modes disagree on the order count: {sorted(counts)}")
+            elif any(keys and keys != sorted(LIST_VIEW_FIELDS.split(",")) for keys in projected):
+                self.log_test("Orders List Formats", False, f"Projection returned other fields: {projected[0]}")
+            elif counts != {0} and any(encoding == "identity" for encoding in compressed):
+                self.log_test("Orders List Formats", False, "Server ignored Accept-Encoding")
+            else:
+                full = results[("json", "identity")]["wire_bytes"]
+                smallest = min(results.values(), key=lambda result: result["wire_bytes"])
+                self.log_test("Orders List Formats", True,
+                              f"{counts.pop()} orders in every mode; smallest transfer "
+                              f"{smallest['wire_bytes'] / 1024:.1f} KiB vs {full / 1024:.1f} KiB plain JSON")
+        except Exception as e:
+            self.log_test("Orders List Formats", False, f"Orders list formats error: {str(e)}")
+
+    def print_transfer_report(self):
+        """Bytes on the wire and time to first order for each orders list mode"""
+        if not self.transfer_results:
+            return
+        print("\n📦 ORDERS LIST TRANSFER (status=all)")
+        print(f"{'Mode':<15} {'Encoding':<9} {'Orders':>7} {'Wire KiB':>9} {'Body KiB':>9} {'Ratio':>6} "
+              f"{'1st order ms':>13} {'Total ms':>9}")
+        for (mode, _), result in self.transfer_results.items():
+            ratio = result["body_bytes"] / result["wire_bytes"] if result["wire_bytes"] else 0
+            print(f"{mode:<15} {result['encoding']:<9} {result['orders']:>7} {result['wire_bytes'] / 1024:>9.1f} "
+                  f"{result['body_bytes'] / 1024:>9.1f} {ratio:>6.1f} {result['first_order_ms']:>13.1f} "
+                  f"{result['total_ms']:>9.1f}")
+
+    def test_order_status_batch(self):
+        """Test batch status update with per-item results for good and bad items"""
+        if not self.token:
+            self.log_test("Batch Order Status Update", False, "No authentication token available")
+            return
+
+        restore: Dict[str, str] = {}
+        try:
+            orders = self.make_request("GET", "/orders/list?status=all&limit=50").json()
+            candidates = [order for order in orders if order.get("status") in NEXT_STATUS][:3]
+            if not candidates:
+                self.log_test("Batch Order Status Update", False, "No active orders available for a batch update")
+                return
+
+            restore.update((order["orderNumber"], order["status"]) for order in candidates)
+            updates = [{"orderNumber": order["orderNumber"], "status": NEXT_STATUS[order["status"]]}
+                       for order in candidates]
+            updates.append({"orderNumber": "#DOES-NOT-EXIST", "status": "ready"})
+            updates.append({"orderNumber": candidates[0]["orderNumber"], "status": "ready"})
+            updates.append({"orderNumber": "#NO-STATUS"})
+            response = self.make_request("PATCH", "/orders/status", {"updates": updates})
+            if response.status_code != 200:
+                self.log_test("Batch Order Status Update", False,
+                              f"Batch update failed with status {response.status_code}: {response.text}")
+                return
+
+            data = response.json()
+            results = data.get("results", [])
+            good = results[:len(candidates)]
+            statuses = [(result.get("order") or {}).get("status") for result in good]
+            expected_errors = ["Order not found", "Order appears more than once in the batch", "Status is required"]
+            if (data.get("updated") != len(candidates) or data.get("failed") != 3
+                    or not all(result.get("success") for result in good)
+                    or statuses != [update["status"] for update in updates[:len(candidates)]]
+                    or [result.get("error") for result in results[len(candidates):]] != expected_errors):
+                self.log_test("Batch Order Status Update", False, f"Unexpected batch results: {data}")
+                return
+
+            self.log_test("Batch Order Status Update", True,
+                          f"{len(candidates)} orders updated in one request, 3 invalid items reported per item")
+        except Exception as e:
+            self.log_test("Batch Order Status Update", False, f"Batch update error: {str(e)}")
+        finally:
+            self.restore_order_statuses(restore)
+
+    def test_order_status_batch_validation(self):
+        """Test batch status update rejects empty and oversized batches, and unknown statuses per item"""
+        if not self.token:
+            self.log_test("Batch Order Status Validation", False, "No authentication token available")
+            return
+
+        try:
+            empty = self.make_request("PATCH", "/orders/status", {"updates": []})
+            oversized = self.make_request("PATCH", "/orders/status",
+                                          {"updates": [{"orderNumber": f"#X{i}", "status": "ready"}
+                                                       for i in range(101)]})
+            if empty.status_code != 400 or oversized.status_code != 400:
+                self.log_test("Batch Order Status Validation", False,
+                              f"Expected 400/400, got {empty.status_code}/{oversized.status_code}")
+                return
+
+            # Checked before the orders are looked up, so made-up order numbers do
+            unknown = self.make_request("PATCH", "/orders/status",
+                                        {"updates": [{"orderNumber": "#X1", "status": "shipped"},
+                                                     {"orderNumber": "#X2", "status": ["ready"]},
+                                                     {"orderNumber": "#X3", "status": "ready", "fromStatus": 1}]})
+            results = unknown.json().get("results", []) if unknown.status_code == 200 else []
+            errors = [result.get("error") or "" for result in results]
+            if len(errors) != 3 or not all(error.startswith("Status must be one of") for error in errors[:2]) \
+                    or "fromStatus" not in errors[2]:
+                self.log_test("Batch Order Status Validation", False,
+                              f"Unknown statuses: status {unknown.status_code}, results {results}")
+                return
+            self.log_test("Batch Order Status Validation", True,
+                          "Empty and oversized batches rejected with 400, unknown statuses per item")
+        except Exception as e:
+            self.log_test("Batch Order Status Validation", False, f"Batch validation error: {str(e)}")
+
+    def test_order_delta_sync(self):
+        """Test /orders/changes and idempotent, conflict-checked replays of offline status changes"""
+        if not self.token:
+            self.log_test("Order Delta Sync", False, "No authentication token available")
+            return
+
+        order = None
+        try:
+            invalid = self.make_request("GET", "/orders/changes?since=not-a-version")
+            head = self.make_request("GET", "/orders/changes").json()
+            orders = self.make_request("GET", "/orders/list?status=all&limit=50").json()
+            order = next((order for order in orders if order.get("status") in NEXT_STATUS), None)
+            if invalid.status_code != 400 or head.get("orders") != [] or not head.get("version"):
+                self.log_test("Order Delta Sync", False,
+                              f"Unexpected head/invalid responses: {invalid.status_code} {head}")
+                return
+            if order is None:
+                self.log_test("Order Delta Sync", False, "No active orders available to change")
+                return
+
+            # The same queued change replayed twice: applied once, then unchanged
+            replay = {"orderNumber": order["orderNumber"], "fromStatus": order["status"],
+                      "status": NEXT_STATUS[order["status"]], "changedAt": head["serverTime"]}
+            first, second = [self.make_request("PATCH", "/orders/status", {"updates": [replay]}).json()["results"][0]
+                             for _ in range(2)]
+            changes = self.make_request("GET", f"/orders/changes?since={head['version']}").json()
+            changed = {change["orderNumber"]: change for change in changes.get("orders", [])}
+            caught_up = self.make_request("GET", f"/orders/changes?since={changes.get('version')}").json()
+
+            # A change made before the server's, from a status the order has left, loses
+            stale = dict(replay, status="cancelled", changedAt="2000-01-01T00:00:00.000Z")
+            conflict = self.make_request("PATCH", "/orders/status", {"updates": [stale]}).json()["results"][0]
+
+            expected = replay["status"]
+            problems = []
+            if not first.get("success") or first.get("unchanged") or first["order"]["status"] != expected:
+                problems.append(f"first replay {first}")
+            if not second.get("success") or not second.get("unchanged"):
+                problems.append(f"second replay {second}")
+            if (changed.get(order["orderNumber"]) or {}).get("status") != expected or changes["version"] == head["version"]:
+                problems.append(f"changes since {head['version']}: {changes}")
+            if caught_up.get("orders") or caught_up.get("version") != changes.get("version"):
+                problems.append(f"changes since {changes.get('version')}: {caught_up}")
+            if not conflict.get("conflict") or conflict.get("success") or conflict["order"]["status"] != expected:
+                problems.append(f"stale replay {conflict}")
+            if problems:
+                self.log_test("Order Delta Sync", False, "; ".join(problems))
+                return
+
+            self.log_test("Order Delta Sync", True,
+                          f"{order['orderNumber']} synced as a {len(changes['orders'])}-order delta, "
+                          f"duplicate replay unchanged, stale replay rejected as a conflict")
+        except Exception as e:
+            self.log_test("Order Delta Sync", False, f"Delta sync error: {str(e)}")
+        finally:
+            # Leave the order active for the tests that need one
+            if order is not None:
+                self.make_request("PATCH", "/orders/status",
+                                  {"updates": [{"orderNumber": order["orderNumber"], "status": order["status"]}]})
+
+    def open_order_stream(self, last_event_id: Optional[str] = None,
+                          query_token: bool = False) -> Tuple[requests.Response, "queue.Queue"]:
+        """Open /orders/stream and parse its events into a queue on a reader thread.
+
+        With ``query_token`` the token goes in the query, as EventSource sends it.
+        """
+        headers, params = {"Accept": "text/event-stream"}, {}
+        if query_token:
+            params["access_token"] = self.token
+        else:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if last_event_id:
+            headers["Last-Event-ID"] = last_event_id
+        response = requests.get(f"{self.base_url}/orders/stream", headers=headers, params=params, stream=True,
+                                timeout=(self.timeout, 60))
+        response.raise_for_status()
+        events: "queue.Queue" = queue.Queue()
+
+        def read():
+            parser = SSEParser()
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    event = parser.feed(line)
+                    if event:
+                        events.put(event)
+            except (requests.exceptions.RequestException, AttributeError, ValueError):
+                pass
+
+        threading.Thread(target=read, daemon=True).start()
+        return response, events
+
+    @staticmethod
+    def close_order_stream(response: requests.Response):
+        """Close a stream whose reader thread is blocked in a read.
+
+        Closing the response alone waits for that read to return, i.e. for the
+        next heartbeat, so shut the socket down underneath it first.
+        """
+        sock = getattr(getattr(response.raw, "_connection", None), "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        response.close()
+
+    @staticmethod
+    def wait_for_event(events: "queue.Queue", predicate, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                event = events.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if predicate(event):
+                return event
+
+    def test_order_stream(self):
+        """Test the order event stream: push on PATCH and resume from Last-Event-ID"""
+        if not self.token:
+            self.log_test("Order Stream", False, "No authentication token available")
+            return
+
+        restore: Dict[str, str] = {}
+        try:
+            transition = self.find_order_to_advance()
+            if not transition:
+                self.log_test("Order Stream", False, "No active orders available to test the stream")
+                return
+            order_number, current, target = transition
+            restore[order_number] = current
+            path = f"/orders/{urllib.parse.quote(order_number, safe='')}/status"
+
+            def is_update(status):
+                def predicate(event):
+                    if event["event"] != "order":
+                        return False
+                    data = json.loads(event["data"])
+                    return data["orderNumber"] == order_number and data["status"] == status
+                return predicate
+
+            response, events = self.open_order_stream()
+            started = time.perf_counter()
+            self.make_request("PATCH", path, {"status": target})
+            pushed = self.wait_for_event(events, is_update(target))
+            push_ms = (time.perf_counter() - started) * 1000
+            self.close_order_stream(response)
+            if not pushed:
+                self.log_test("Order Stream", False, f"No event for {order_number} -> {target} within 5s")
+                return
+
+            # Miss one transition while disconnected, then resume from the last id seen
+            missed = NEXT_STATUS.get(target, "completed")
+            self.make_request("PATCH", path, {"status": missed})
+            response, events = self.open_order_stream(last_event_id=pushed["id"])
+            replayed = self.wait_for_event(events, is_update(missed))
+            self.close_order_stream(response)
+            if not replayed:
+                self.log_test("Order Stream", False, f"Resume from {pushed['id']} did not replay {missed}")
+                return
+
+            response, events = self.open_order_stream(last_event_id="stale.1", query_token=True)
+            reset = self.wait_for_event(events, lambda event: event["event"] == "reset")
+            self.close_order_stream(response)
+            if not reset:
+                self.log_test("Order Stream", False, "Unknown Last-Event-ID did not produce a reset event")
+                return
+
+            # Only the stream takes the token from the query
+            other = requests.get(f"{self.base_url}/orders/list", params={"access_token": self.token},
+                                 timeout=self.timeout)
+            if other.status_code != 401:
+                self.log_test("Order Stream", False,
+                              f"/orders/list accepted a query token (status {other.status_code})")
+                return
+
+            self.log_test("Order Stream", True,
+                          f"PATCH pushed in {push_ms:.0f} ms, missed event replayed, stale id reset, "
+                          "query token refused outside the stream")
+        except Exception as e:
+            self.log_test("Order Stream", False, f"Order stream error: {str(e)}")
+        finally:
+            self.restore_order_statuses(restore)
+
     def test_order_detail(self):
         """Test order detail endpoint with a real order number"""
         if not self.token:
@@ -288,36 +1398,98 @@ class GBCPOSAPITester:
             return
             
         try:
-            # First get orders list to find a real order number
-            response = self.make_request("GET", "/orders/list?status=all")
-            
-            if response.status_code == 200:
-                orders = response.json()
-                if isinstance(orders, list) and len(orders) > 0:
-                    # Use the first order's number
-                    order_number = orders[0].get('order_number') or orders[0].get('orderNumber')
-                    if order_number:
-                        # URL encode the order number (especially for # character)
-                        import urllib.parse
-                        encoded_order_number = urllib.parse.quote(order_number, safe='')
-                        detail_response = self.make_request("GET", f"/orders/detail/{encoded_order_number}")
-                        
-                        if detail_response.status_code == 200:
-                            detail_data = detail_response.json()
-                            self.log_test("Order Detail", True, 
-                                        f"Order detail retrieved for order {order_number}", detail_data)
-                        else:
-                            self.log_test("Order Detail", False, 
-                                        f"Order detail failed with status {detail_response.status_code}: {detail_response.text}")
+            # Use the newest order to get a real order number
+            orders = self.fixture("recent_orders")
+            if isinstance(orders, list) and len(orders) > 0:
+                order_number = orders[0].get('order_number') or orders[0].get('orderNumber')
+                if order_number:
+                    # URL encode the order number (especially for # character)
+                    encoded_order_number = urllib.parse.quote(order_number, safe='')
+                    detail_response = self.make_request("GET", f"/orders/detail/{encoded_order_number}")
+                    
+                    if detail_response.status_code == 200:
+                        detail_data = detail_response.json()
+                        self.log_test("Order Detail", True, 
+                                    f"Order detail retrieved for order {order_number}", detail_data)
                     else:
-                        self.log_test("Order Detail", False, "No order number found in orders list")
+                        self.log_test("Order Detail", False, 
+                                    f"Order detail failed with status {detail_response.status_code}: {detail_response.text}")
                 else:
-                    self.log_test("Order Detail", False, "No orders available to test detail endpoint")
+                    self.log_test("Order Detail", False, "No order number found in orders list")
             else:
-                self.log_test("Order Detail", False, "Could not retrieve orders list for detail test")
+                self.log_test("Order Detail", False, "No orders available to test detail endpoint")
         except Exception as e:
             self.log_test("Order Detail", False, f"Order detail error: {str(e)}")
             
+    def test_order_receipts(self):
+        """Test printer-ready receipts: kinds, line width, ETag revalidation and rebuild on a status change"""
+        if not self.token:
+            self.log_test("Order Receipts", False, "No authentication token available")
+            return
+
+        restore = None
+        try:
+            transition = self.find_order_to_advance()
+            if not transition:
+                self.log_test("Order Receipts", False, "No active orders available to test receipts")
+                return
+            order_number, _, target = transition
+            path = f"/orders/{urllib.parse.quote(order_number, safe='')}/receipt"
+
+            response = self.make_request("GET", path)
+            if response.status_code != 200:
+                self.log_test("Order Receipts", False, f"Receipt failed with status {response.status_code}")
+                return
+            payload = response.json()
+            if sorted(payload.get("receipts", {})) != ["bag", "customer", "kitchen"]:
+                self.log_test("Order Receipts", False, f"Expected kitchen, bag and customer receipts: {payload}")
+                return
+            too_wide = [line for lines in payload["receipts"].values() for line in lines
+                        if len(line) > payload["width"]]
+            if too_wide:
+                self.log_test("Order Receipts", False, f"Lines wider than {payload['width']}: {too_wide[:3]}")
+                return
+            if not any(order_number in line for line in payload["receipts"]["kitchen"]):
+                self.log_test("Order Receipts", False, "Kitchen ticket does not show the order number")
+                return
+
+            narrowed = self.make_request("GET", f"{path}?kind=kitchen,bag")
+            if sorted(narrowed.json().get("receipts", {})) != ["bag", "kitchen"]:
+                self.log_test("Order Receipts", False, f"kind=kitchen,bag returned {list(narrowed.json())}")
+                return
+            conditional = self.make_request("GET", f"{path}?kind=kitchen,bag",
+                                            headers={"If-None-Match": narrowed.headers.get("ETag", "")})
+            if conditional.status_code != 304:
+                self.log_test("Order Receipts", False,
+                              f"If-None-Match with the current ETag returned {conditional.status_code}, expected 304")
+                return
+            if self.make_request("GET", f"{path}?kind=menu").status_code != 400:
+                self.log_test("Order Receipts", False, "Unknown receipt kind was not rejected with 400")
+                return
+
+            restore = {"orderNumber": order_number, "status": payload["status"]}
+            if self.make_request("PATCH", f"/orders/{urllib.parse.quote(order_number, safe='')}/status",
+                                 {"status": target}).status_code != 200:
+                self.log_test("Order Receipts", False, "Status update failed")
+                return
+            rebuilt = self.make_request("GET", f"{path}?kind=kitchen,bag",
+                                        headers={"If-None-Match": narrowed.headers.get("ETag", "")})
+            if rebuilt.status_code != 200 or rebuilt.json().get("status") != target:
+                self.log_test("Order Receipts", False,
+                              f"After moving to {target} the receipt answered {rebuilt.status_code} "
+                              f"with status {rebuilt.json().get('status') if rebuilt.status_code == 200 else None}")
+                return
+
+            self.log_test("Order Receipts", True,
+                          f"{sum(len(lines) for lines in payload['receipts'].values())} lines for {order_number}, "
+                          f"304 revalidation and rebuild on status change")
+        except Exception as e:
+            self.log_test("Order Receipts", False, f"Order receipts error: {str(e)}")
+        finally:
+            # Leave the order active for the tests that need one
+            if restore is not None:
+                self.make_request("PATCH", "/orders/status", {"updates": [restore]})
+
     def test_order_detail_nonexistent(self):
         """Test order detail with non-existent order number"""
         if not self.token:
@@ -391,38 +1563,91 @@ class GBCPOSAPITester:
             return
             
         try:
-            # First get menu items to find one to update
-            response = self.make_request("GET", "/menu/items")
-            
-            if response.status_code == 200:
-                items = response.json()
-                if isinstance(items, list) and len(items) > 0:
-                    # Use the first item
-                    item_id = items[0].get('id')
-                    if item_id:
-                        update_data = {
-                            "price": 15.99,
-                            "is_available": False
-                        }
-                        
-                        update_response = self.make_request("PUT", f"/menu/item/{item_id}", update_data)
-                        
-                        if update_response.status_code == 200:
-                            update_result = update_response.json()
-                            self.log_test("Update Menu Item", True, 
-                                        f"Menu item {item_id} updated successfully", update_result)
-                        else:
-                            self.log_test("Update Menu Item", False, 
-                                        f"Update menu item failed with status {update_response.status_code}: {update_response.text}")
+            # Use the shared menu listing to find one to update
+            items = self.fixture("menu_items")
+            if isinstance(items, list) and len(items) > 0:
+                # Use the first item
+                item_id = items[0].get('id')
+                if item_id:
+                    update_data = {
+                        "price": 15.99,
+                        "is_available": False
+                    }
+                    
+                    update_response = self.make_request("PUT", f"/menu/item/{item_id}", update_data)
+                    
+                    if update_response.status_code == 200:
+                        update_result = update_response.json()
+                        self.log_test("Update Menu Item", True, 
+                                    f"Menu item {item_id} updated successfully", update_result)
                     else:
-                        self.log_test("Update Menu Item", False, "No item ID found in menu items")
+                        self.log_test("Update Menu Item", False, 
+                                    f"Update menu item failed with status {update_response.status_code}: {update_response.text}")
                 else:
-                    self.log_test("Update Menu Item", False, "No menu items available to test update")
+                    self.log_test("Update Menu Item", False, "No item ID found in menu items")
             else:
-                self.log_test("Update Menu Item", False, "Could not retrieve menu items for update test")
+                self.log_test("Update Menu Item", False, "No menu items available to test update")
         except Exception as e:
             self.log_test("Update Menu Item", False, f"Update menu item error: {str(e)}")
             
+    def test_menu_bulk_import(self):
+        """Test bulk menu create (JSON) and update (CSV) with per-row errors"""
+        if not self.token:
+            self.log_test("Menu Bulk Import", False, "No authentication token available")
+            return
+
+        try:
+            stamp = int(time.time() * 1000)
+            items = [
+                {"name": f"Bulk Test Dal {stamp}", "price": 7.5, "category": "Bulk Test"},
+                {"name": "", "price": 3},
+                {"name": f"Bulk Test Naan {stamp}", "price": "2.25", "category": "Bulk Test"},
+                {"name": f"Bulk Test Lassi {stamp}", "price": -1},
+            ]
+            response = self.make_request("POST", "/menu/items/bulk", {"items": items})
+            if response.status_code != 200:
+                self.log_test("Menu Bulk Import", False,
+                              f"Bulk create failed with status {response.status_code}: {response.text}")
+                return
+            created = response.json()
+            errors = {result["row"]: result.get("error") for result in created["results"] if not result["success"]}
+            if created["created"] != 2 or sorted(errors) != [2, 4]:
+                self.log_test("Menu Bulk Import", False, f"Expected rows 2 and 4 to fail: {created}")
+                return
+            dal, naan = created["results"][0]["item"], created["results"][2]["item"]
+            if (dal["price"], naan["price"], dal["isAvailable"]) != (7.5, 2.25, False):
+                self.log_test("Menu Bulk Import", False, f"Created items do not match the import: {dal}, {naan}")
+                return
+
+            # Price change across the section as a CSV upload, with a quoted comma and an unknown dish
+            csv_body = ("id,price,description,isAvailable\n"
+                        f"{dal['id']},8.00,\"Slow-cooked, smoky\",true\n"
+                        f"{naan['id']},2.50,,\n"
+                        "999999999,1.00,,\n")
+            response = self.make_request("PATCH", "/menu/items/bulk", csv_body, {"Content-Type": "text/csv"})
+            if response.status_code != 200:
+                self.log_test("Menu Bulk Import", False,
+                              f"Bulk update failed with status {response.status_code}: {response.text}")
+                return
+            updated = response.json()
+            results = updated["results"]
+            if updated["updated"] != 2 or results[2].get("error") != "Menu item not found":
+                self.log_test("Menu Bulk Import", False, f"Unexpected bulk update results: {updated}")
+                return
+            if (results[0]["item"]["price"], results[0]["item"]["description"], results[1]["item"]["price"],
+                    results[1]["item"]["description"]) != (8.0, "Slow-cooked, smoky", 2.5, ""):
+                self.log_test("Menu Bulk Import", False, f"CSV update not applied as sent: {results[:2]}")
+                return
+
+            bad = self.make_request("PATCH", "/menu/items/bulk", {"items": []})
+            if bad.status_code != 400:
+                self.log_test("Menu Bulk Import", False, f"Empty import returned {bad.status_code}, expected 400")
+                return
+            self.log_test("Menu Bulk Import", True,
+                          "2 of 4 JSON rows created, 2 of 3 CSV rows updated, invalid rows reported per row")
+        except Exception as e:
+            self.log_test("Menu Bulk Import", False, f"Menu bulk import error: {str(e)}")
+
     def test_order_status_update(self):
         """Test updating order status"""
         if not self.token:
@@ -472,76 +1697,72 @@ class GBCPOSAPITester:
             return
             
         try:
-            # Get any order to test with
-            response = self.make_request("GET", "/orders/list?status=all")
-            
-            if response.status_code == 200:
-                orders = response.json()
-                if isinstance(orders, list) and len(orders) > 0:
-                    order_number = orders[0].get('orderNumber')
-                    if order_number:
-                        import urllib.parse
-                        encoded_order_number = urllib.parse.quote(order_number, safe='')
-                        
-                        # Test with missing status field
-                        update_data = {}  # Missing status
-                        update_response = self.make_request("PATCH", f"/orders/{encoded_order_number}/status", update_data)
-                        
-                        if update_response.status_code == 400:
-                            self.log_test("Order Status Update Missing Status", True, 
-                                        "Correctly rejected status update with missing status field")
-                        else:
-                            self.log_test("Order Status Update Missing Status", False, 
-                                        f"Expected 400, got {update_response.status_code}: {update_response.text}")
+            # Any existing order will do
+            orders = self.fixture("recent_orders")
+            if isinstance(orders, list) and len(orders) > 0:
+                order_number = orders[0].get('orderNumber')
+                if order_number:
+                    encoded_order_number = urllib.parse.quote(order_number, safe='')
+                    
+                    # Test with missing status field
+                    update_data = {}  # Missing status
+                    update_response = self.make_request("PATCH", f"/orders/{encoded_order_number}/status", update_data)
+                    
+                    if update_response.status_code == 400:
+                        self.log_test("Order Status Update Missing Status", True, 
+                                    "Correctly rejected status update with missing status field")
                     else:
-                        self.log_test("Order Status Update Missing Status", False, "No order number found")
+                        self.log_test("Order Status Update Missing Status", False, 
+                                    f"Expected 400, got {update_response.status_code}: {update_response.text}")
                 else:
-                    self.log_test("Order Status Update Missing Status", False, "No orders available for test")
+                    self.log_test("Order Status Update Missing Status", False, "No order number found")
             else:
-                self.log_test("Order Status Update Missing Status", False, "Could not retrieve orders for test")
+                self.log_test("Order Status Update Missing Status", False, "No orders available for test")
         except Exception as e:
             self.log_test("Order Status Update Missing Status", False, f"Missing status test error: {str(e)}")
             
-    def run_all_tests(self):
-        """Run all API tests in sequence"""
+    def run_all_tests(self, workers: int = 8):
+        """Run all API tests, independent ones concurrently (see TEST_PLAN)"""
         print("🚀 Starting GBC POS API Testing...")
         print(f"🔗 Base URL: {self.base_url}")
         print(f"👤 Username: {self.username}")
+        print(f"🧵 Workers: {workers}")
         print("=" * 80)
-        
-        # Health check (no auth required)
-        self.test_health_check()
-        
-        # Authentication tests
-        self.test_login_valid_credentials()
-        self.test_login_invalid_credentials()
-        self.test_login_missing_fields()
-        self.test_protected_endpoint_without_token()
-        
-        # Dashboard tests (require auth)
-        self.test_dashboard_stats()
-        self.test_dashboard_top_dishes()
-        self.test_dashboard_frequent_customers()
-        
-        # Orders tests (require auth)
-        self.test_orders_list_all()
-        self.test_orders_list_pending()
-        self.test_orders_list_dispatched()
-        self.test_order_detail()
-        self.test_order_detail_nonexistent()
-        
-        # Menu tests (require auth)
-        self.test_menu_items()
-        self.test_add_menu_item()
-        self.test_update_menu_item()
-        
-        # Order status update tests (require auth)
-        self.test_order_status_update()
-        self.test_order_status_update_missing_status()
-        
+
+        started = time.perf_counter()
+        self.run_scheduled(TEST_PLAN, workers)
+        self.wall_time = time.perf_counter() - started
+
         # Print summary
-        self.print_summary()
-        
+        return self.print_summary()
+
+    def run_scheduled(self, plan, workers: int):
+        """Run each test once its dependencies finished, never two mutating tests at a time"""
+        waiting = list(plan)
+        done = set()
+        running: Dict[Future, Tuple[str, bool]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while waiting or running:
+                mutating = any(mutates for _, mutates in running.values())
+                for entry in list(waiting):
+                    name, requires, mutates = entry
+                    if len(running) >= workers:
+                        break
+                    if not done.issuperset(requires) or (mutates and mutating):
+                        # Mutations start in plan order, so none may overtake a blocked one
+                        if mutates:
+                            mutating = True
+                        continue
+                    waiting.remove(entry)
+                    running[pool.submit(getattr(self, name))] = (name, mutates)
+                    mutating = mutating or mutates
+                if not running:
+                    raise RuntimeError(f"unsatisfiable test dependencies: {[entry[0] for entry in waiting]}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done.add(running.pop(future)[0])
+                    future.result()
+
     def print_summary(self):
         """Print test summary"""
         print("\n" + "=" * 80)
@@ -554,19 +1775,360 @@ class GBCPOSAPITester:
         print(f"✅ Passed: {passed}")
         print(f"❌ Failed: {failed}")
         print(f"📈 Success Rate: {(passed/len(self.test_results)*100):.1f}%")
+        if self.wall_time is not None:
+            print(f"⏱️  Wall time: {self.wall_time:.2f}s")
         
         if failed > 0:
             print("\n🔍 FAILED TESTS:")
             for result in self.test_results:
                 if not result["success"]:
                     print(f"  ❌ {result['test']}: {result['message']}")
+
+        self.print_transfer_report()
+        self.print_server_timing_report()
+        regressions = self.print_latency_report() + self.print_cache_report()
                     
         print("\n" + "=" * 80)
         
         # Return exit code based on results
-        return 0 if failed == 0 else 1
+        return 0 if failed == 0 and regressions == 0 else 1
+
+    def resolve_load_scenarios(self) -> List[Tuple[str, str, str, int]]:
+        """LOAD_SCENARIOS with a real order number filled in (detail is dropped when there is none)"""
+        # Resolve a real order number once so detail requests hit an existing row
+        order_number = None
+        response = self.make_request("GET", "/orders/list?status=all&limit=1")
+        if response.status_code == 200:
+            orders = response.json()
+            if isinstance(orders, list) and len(orders) > 0:
+                order_number = orders[0].get('orderNumber')
+
+        scenarios = []
+        for name, method, endpoint, weight in LOAD_SCENARIOS:
+            if "{order_number}" in endpoint:
+                if not order_number:
+                    continue
+                endpoint = endpoint.format(order_number=urllib.parse.quote(order_number, safe=''))
+            scenarios.append((name, method, endpoint, weight))
+        return scenarios
+
+    def drive_traffic(self, scenarios: List[Tuple[str, str, str, int]], virtual_users: int, ramp_up: float,
+                      deadline: float, samples: List[Tuple[str, float, bool, Optional[Dict[str, float]]]],
+                      samples_lock: threading.Lock):
+        """Replay the weighted scenarios from `virtual_users` threads until `deadline` (perf_counter)"""
+        weights = [scenario[3] for scenario in scenarios]
+
+        def virtual_user(index: int):
+            # Stagger start times evenly across the ramp-up window
+            time.sleep(ramp_up * index / virtual_users)
+            rng = random.Random(index)
+            while time.perf_counter() < deadline:
+                name, method, endpoint, _ = rng.choices(scenarios, weights=weights)[0]
+                request_start = time.perf_counter()
+                timings = None
+                try:
+                    response = self.make_request(method, endpoint)
+                    ok = response.status_code < 400
+                    timings = response.timings
+                except requests.exceptions.RequestException:
+                    ok = False
+                elapsed = time.perf_counter() - request_start
+                with samples_lock:
+                    samples.append((name, elapsed, ok, timings))
+
+        with ThreadPoolExecutor(max_workers=virtual_users) as pool:
+            futures = [pool.submit(virtual_user, index) for index in range(virtual_users)]
+            for future in futures:
+                future.result()
+
+    def run_load_test(self, virtual_users: int = 30, ramp_up: float = 10.0, duration: float = 60.0):
+        """Replay the read-only endpoint scenarios concurrently from a pool of virtual users"""
+        print("🚀 Starting GBC POS API Load Test...")
+        print(f"🔗 Base URL: {self.base_url}")
+        print(f"👥 Virtual users: {virtual_users}, ramp-up: {ramp_up:.0f}s, duration: {duration:.0f}s")
+        print("=" * 80)
+
+        self.test_login_valid_credentials()
+        if not self.token:
+            print("❌ Cannot run load test without an authentication token")
+            return 1
+
+        scenarios = self.resolve_load_scenarios()
+        samples: List[Tuple[str, float, bool, Optional[Dict[str, float]]]] = []
+        started = time.perf_counter()
+        self.drive_traffic(scenarios, virtual_users, ramp_up, started + ramp_up + duration, samples,
+                           threading.Lock())
+
+        return self.print_load_report(samples, time.perf_counter() - started)
+
+    def run_soak_test(self, virtual_users: int = 10, ramp_up: float = 10.0, duration: float = 3600.0,
+                      sample_interval: float = 10.0, series_path: str = "soak_series.jsonl",
+                      warmup: Optional[float] = None):
+        """Hold a tablet traffic mix for `duration` while sampling /stats into a JSON-lines time series.
+
+        With `soak_writes` set, a kitchen thread also advances one order every
+        `soak_write_interval` seconds so status transactions hold pool
+        connections too. Fails on heap drift or a growing pool queue.
+        """
+        warmup = min(60.0, duration * 0.1) if warmup is None else warmup
+        print("🚀 Starting GBC POS API Soak Test...")
+        print(f"🔗 Base URL: {self.base_url}")
+        print(f"👥 Virtual users: {virtual_users}, duration: {duration:.0f}s, sample every {sample_interval:.0f}s, "
+              f"warm-up {warmup:.0f}s")
+        print(f"💾 Time series: {series_path}")
+        print("=" * 80)
+
+        if not self.ops_token:
+            print("❌ Soak mode samples /stats, which needs the backend's OPS_TOKEN (--ops-token)")
+            return 1
+        if not self.soak_writes:
+            print("✍️  Kitchen writes off: pass --allow-writes to advance orders on this backend")
+
+        self.test_login_valid_credentials()
+        if not self.token:
+            print("❌ Cannot run soak test without an authentication token")
+            return 1
+
+        scenarios = self.resolve_load_scenarios()
+        samples: List[Tuple[str, float, bool, Optional[Dict[str, float]]]] = []
+        samples_lock = threading.Lock()
+        series: List[Dict[str, Any]] = []
+        totals = {"requests": 0, "errors": 0}
+        started = time.perf_counter()
+        deadline = started + ramp_up + duration
+        stop = threading.Event()
+
+        def kitchen():
+            while not stop.wait(self.soak_write_interval):
+                transition = self.find_order_to_advance(("pending", "accepted", "ready", "dispatched"))
+                if transition:
+                    order_number, _, target = transition
+                    self.make_request("PATCH", f"/orders/{urllib.parse.quote(order_number, safe='')}/status",
+                                      {"status": target})
+
+        def sampler(out):
+            # Drain the samples every interval so hours of traffic do not pile up in memory;
+            # the per-endpoint histograms keep the whole-run percentiles
+            while not stop.wait(sample_interval):
+                with samples_lock:
+                    window = samples[:]
+                    samples.clear()
+                try:
+                    stats = requests.get(f"{self.base_url}/stats", headers=self.ops_headers(),
+                                         timeout=self.timeout).json()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    print(f"  ⚠️  /stats sample failed: {e}")
+                    continue
+                latencies = [elapsed * 1000 for _, elapsed, _, _ in window]
+                row = {
+                    "t": round(time.perf_counter() - started, 1),
+                    "requests": len(window),
+                    "errors": sum(1 for _, _, ok, _ in window if not ok),
+                    "p95_ms": round(percentile(latencies, 95), 2),
+                    "heap_used_mb": round(stats["memory"]["heapUsedMb"], 2),
+                    "rss_mb": round(stats["memory"]["rssMb"], 2),
+                    "event_loop_p99_ms": round(stats["eventLoop"]["p99Ms"], 2),
+                    "pool_active": stats["pool"]["active"],
+                    "pool_idle": stats["pool"]["idle"],
+                    "pool_queued": stats["pool"]["queued"],
+                }
+                series.append(row)
+                totals["requests"] += row["requests"]
+                totals["errors"] += row["errors"]
+                out.write(json.dumps(row) + "\n")
+                out.flush()
+                print(f"  t={row['t']:>7.0f}s  req={row['requests']:>6}  p95={row['p95_ms']:>7.1f} ms  "
+                      f"heap={row['heap_used_mb']:>7.1f} MB  loop p99={row['event_loop_p99_ms']:>6.1f} ms  "
+                      f"pool {row['pool_active']}/{row['pool_idle']}/{row['pool_queued']} (active/idle/queued)")
+
+        with open(series_path, "w") as out:
+            helpers = [threading.Thread(target=sampler, args=(out,), daemon=True)]
+            if self.soak_writes:
+                helpers.append(threading.Thread(target=kitchen, daemon=True))
+            for helper in helpers:
+                helper.start()
+            try:
+                self.drive_traffic(scenarios, virtual_users, ramp_up, deadline, samples, samples_lock)
+            finally:
+                stop.set()
+                for helper in helpers:
+                    helper.join()
+
+        wall_time = time.perf_counter() - started
+        failures = self.print_soak_report(series, ramp_up + warmup)
+        print(f"\n📈 Total: {totals['requests']} requests in {wall_time:.1f}s "
+              f"({totals['requests'] / wall_time:.1f} req/s), errors: {totals['errors']}")
+        self.print_server_timing_report()
+        regressions = self.print_latency_report() + self.print_cache_report()
+        print("\n" + "=" * 80)
+        return 0 if totals["requests"] and not totals["errors"] and not failures and not regressions else 1
+
+    def print_soak_report(self, series: List[Dict[str, Any]], steady_from: float) -> int:
+        """Fit trends over the steady-state samples; returns the number of failed checks"""
+        print("\n" + "=" * 80)
+        print("📊 SOAK TEST TRENDS")
+        print("=" * 80)
+        steady = [row for row in series if row["t"] >= steady_from]
+        if len(steady) < 4:
+            print(f"⚠️  Only {len(steady)} samples after warm-up; run longer to judge drift")
+            return 0
+
+        hours = [row["t"] / 3600 for row in steady]
+        quarter = max(len(steady) // 4, 1)
+        first, last = steady[:quarter], steady[-quarter:]
+
+        def mean(rows, key):
+            return sum(row[key] for row in rows) / len(rows)
+
+        span = steady[-1]["t"] - steady[0]["t"]
+        heap_slope = linear_slope(hours, [row["heap_used_mb"] for row in steady])
+        queue_growth = mean(last, "pool_queued") - mean(first, "pool_queued")
+        print(f"{'Metric':<22} {'first 25%':>10} {'last 25%':>10} {'slope/h':>10}")
+        for key in ("heap_used_mb", "rss_mb", "event_loop_p99_ms", "p95_ms", "pool_active", "pool_queued"):
+            slope = linear_slope(hours, [row[key] for row in steady])
+            print(f"{key:<22} {mean(first, key):>10.1f} {mean(last, key):>10.1f} {slope:>10.1f}")
+
+        failures = 0
+        if span < MIN_HEAP_TREND_SECONDS:
+            # GC sawtooth dominates shorter windows; an hourly rate fitted to it means nothing
+            print(f"⚠️  {span:.0f}s of steady state is too short to judge heap drift "
+                  f"(needs {MIN_HEAP_TREND_SECONDS // 60} min)")
+        elif heap_slope > self.max_heap_growth_mb_per_hour:
+            print(f"  ❌ Heap grows {heap_slope:.1f} MB/h (limit {self.max_heap_growth_mb_per_hour:.0f} MB/h)")
+            failures += 1
+        if queue_growth > self.max_pool_queue_growth:
+            print(f"  ❌ Pool queue grew by {queue_growth:.1f} waiting requests "
+                  f"(limit {self.max_pool_queue_growth:.0f})")
+            failures += 1
+        if not failures:
+            print(f"✅ No pool queue growth{'' if span < MIN_HEAP_TREND_SECONDS else ' or heap drift'} "
+                  f"over {len(steady)} steady-state samples")
+        return failures
+
+    def print_load_report(self, samples: List[Tuple[str, float, bool, Optional[Dict[str, float]]]], wall_time: float):
+        """Print throughput, error rate and latency percentiles per endpoint"""
+        print("\n" + "=" * 80)
+        print("📊 LOAD TEST SUMMARY")
+        print("=" * 80)
+
+        by_endpoint: Dict[str, List[Tuple[float, bool, Optional[Dict[str, float]]]]] = {}
+        for name, elapsed, ok, timings in samples:
+            by_endpoint.setdefault(name, []).append((elapsed, ok, timings))
+
+        print(f"{'Endpoint':<30} {'Reqs':>7} {'Req/s':>8} {'Err%':>6} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'TTFB p50':>9}")
+        for name, results in sorted(by_endpoint.items()):
+            latencies = [elapsed * 1000 for elapsed, _, _ in results]
+            first_bytes = [timings["first_byte"] * 1000 for _, _, timings in results if timings]
+            errors = sum(1 for _, ok, _ in results if not ok)
+            print(f"{name:<30} {len(results):>7} {len(results)/wall_time:>8.1f} "
+                  f"{errors/len(results)*100:>6.1f} {percentile(latencies, 50):>8.1f} "
+                  f"{percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f} "
+                  f"{percentile(first_bytes, 50):>9.1f}")
+
+        total_errors = sum(1 for _, _, ok, _ in samples if not ok)
+        latencies = [elapsed * 1000 for _, elapsed, _, _ in samples]
+        handshakes = [timings for _, _, _, timings in samples if timings and timings["connect"] > 0]
+        print("-" * 80)
+        print(f"📈 Total: {len(samples)} requests in {wall_time:.1f}s "
+              f"({len(samples)/wall_time:.1f} req/s), errors: {total_errors} "
+              f"({(total_errors/len(samples)*100) if samples else 0:.1f}%)")
+        print(f"⏱️  Latency p50/p95/p99: {percentile(latencies, 50):.1f} / "
+              f"{percentile(latencies, 95):.1f} / {percentile(latencies, 99):.1f} ms")
+        if handshakes:
+            print(f"🔌 New connections: {len(handshakes)}, avg connect "
+                  f"{sum(t['connect'] for t in handshakes)/len(handshakes)*1000:.1f} ms, avg TLS "
+                  f"{sum(t['tls'] for t in handshakes)/len(handshakes)*1000:.1f} ms")
+
+        self.print_server_timing_report()
+        regressions = self.print_latency_report() + self.print_cache_report()
+        print("\n" + "=" * 80)
+
+        return 0 if samples and total_errors == 0 and regressions == 0 else 1
 
 if __name__ == "__main__":
-    tester = GBCPOSAPITester()
-    exit_code = tester.run_all_tests()
+    from fake_backend import FakeBackend, add_seed_arguments, build_store
+
+    parser = argparse.ArgumentParser(description="GBC POS API tests")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API base URL including /api")
+    parser.add_argument("--local", action="store_true",
+                        help="start the seeded fake backend in-process and test against it "
+                             "(for load tests run fake_backend.py as its own process instead)")
+    parser.add_argument("--load", action="store_true",
+                        help="run the concurrent load test instead of the functional suite")
+    parser.add_argument("--soak", action="store_true",
+                        help="hold a tablet traffic mix for --duration while sampling /stats for drift")
+    parser.add_argument("--users", type=int, default=30, help="number of virtual users in load and soak mode")
+    parser.add_argument("--ramp-up", type=float, default=10.0,
+                        help="seconds over which virtual users are started")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="seconds of full load after ramp-up")
+    parser.add_argument("--pool-size", type=int, default=None,
+                        help="keep-alive connections per host (defaults to 10, or --users in load mode)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="functional tests run concurrently (1 runs them one by one in plan order)")
+    parser.add_argument("--retries", type=int, default=3, help="retries for idempotent GET requests")
+    parser.add_argument("--backoff", type=float, default=0.3, help="retry backoff factor in seconds")
+    parser.add_argument("--write-baseline", metavar="PATH",
+                        help="write per-endpoint latency histograms to a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="fail when p95 regresses against this JSON baseline")
+    parser.add_argument("--p95-threshold", type=float, default=0.20,
+                        help="allowed relative p95 increase over the baseline (0.20 = 20%%)")
+    parser.add_argument("--p95-min-delta-ms", type=float, default=2.0,
+                        help="ignore p95 increases smaller than this many milliseconds")
+    parser.add_argument("--min-cache-hit-ratio", type=float, default=None,
+                        help="fail when the dashboard cache hit ratio is below this (0.9 = 90%%)")
+    soak = parser.add_argument_group("soak mode (with --soak)")
+    soak.add_argument("--sample-interval", type=float, default=10.0, help="seconds between /stats samples")
+    soak.add_argument("--soak-out", default="soak_series.jsonl", metavar="PATH",
+                      help="JSON-lines time series of the samples")
+    soak.add_argument("--warmup", type=float, default=None,
+                      help="seconds after ramp-up excluded from trends (default: 10%% of --duration, at most 60)")
+    soak.add_argument("--allow-writes", action="store_true",
+                      help="let the kitchen thread advance real orders (always on with --local)")
+    soak.add_argument("--write-interval", type=float, default=5.0,
+                      help="seconds between order status advances by the kitchen thread")
+    soak.add_argument("--max-heap-growth", type=float, default=50.0,
+                      help="fail when heapUsed trends upward faster than this many MB per hour")
+    soak.add_argument("--max-pool-queue-growth", type=float, default=2.0,
+                      help="fail when the mean pool queue of the last quarter exceeds the first by this much")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="with --local, append the run's request traces to PATH for traffic_replay.py")
+    parser.add_argument("--ops-token", default=os.environ.get("OPS_TOKEN"),
+                        help="the backend's OPS_TOKEN for /stats and /metrics "
+                             "(default $OPS_TOKEN; --local makes its own)")
+    add_seed_arguments(parser.add_argument_group("local backend seeding (with --local)"))
+    args = parser.parse_args()
+
+    base_url = args.base_url
+    backend = None
+    ops_token = args.ops_token
+    if args.local:
+        ops_token = ops_token or secrets.token_hex(16)
+        backend = FakeBackend(build_store(args), capture_path=args.capture, ops_token=ops_token).start()
+        base_url = backend.base_url
+
+    pool_size = args.pool_size or (args.users if args.load or args.soak else 10)
+    tester = GBCPOSAPITester(base_url, pool_size=pool_size, retries=args.retries, backoff=args.backoff)
+    tester.baseline_in = args.baseline
+    tester.baseline_out = args.write_baseline
+    tester.p95_threshold = args.p95_threshold
+    tester.p95_min_delta_ms = args.p95_min_delta_ms
+    tester.min_cache_hit_ratio = args.min_cache_hit_ratio
+    tester.max_heap_growth_mb_per_hour = args.max_heap_growth
+    tester.max_pool_queue_growth = args.max_pool_queue_growth
+    tester.soak_write_interval = args.write_interval
+    tester.soak_writes = args.local or args.allow_writes
+    tester.ops_token = ops_token
+    if args.soak:
+        exit_code = tester.run_soak_test(args.users, args.ramp_up, args.duration, args.sample_interval,
+                                         args.soak_out, args.warmup)
+    elif args.load:
+        exit_code = tester.run_load_test(args.users, args.ramp_up, args.duration)
+    else:
+        exit_code = tester.run_all_tests(args.workers)
+
+    if backend:
+        backend.stop()
     sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,2381 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GBC POS Express API
+Serves the routes of backend/src/server.ts from an in-process store seeded with
+MySQL-shaped restaurants, dishes and order_management rows, so backend_test.py
+and the load modes run offline
+"""
+
+import argparse
+import base64
+import bisect
+import csv
+import hashlib
+import hmac
+import io
+import json
+import os
+import queue
+import re
+import secrets
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, parse_qsl, unquote, urlencode, urlsplit
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from generate_orders import (DEFAULT_PASSWORD, FIRST_RESTAURANT_ID, FIRST_RESTAURANT_USERNAME, VEG_WORDS,
+                             OrderHistoryGenerator, add_generator_arguments, generator_from_args)
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the brotli package is installed
+    brotli = None
+
+try:
+    import bcrypt
+except ImportError:  # passwords are hashed with PBKDF2 at an equivalent cost instead
+    bcrypt = None
+
+JWT_SECRET = "gbc-pos-jwt-secret-key-2024"
+
+# Mirrors mapOrderStatus / reverseMapOrderStatus in backend/src/utils/helpers.ts
+STATUS_MAP = {
+    "pending": "pending",
+    "approved": "accepted",
+    "ready": "ready",
+    "dispatched": "dispatched",
+    "completed": "completed",
+    "cancelled": "cancelled",
+}
+REVERSE_STATUS_MAP = {value: key for key, value in STATUS_MAP.items()}
+
+# Column stamped by OrderService.updateOrderStatus for each API status
+STATUS_TIMESTAMPS = {
+    "accepted": "approved_at",
+    "ready": "ready_at",
+    "dispatched": "dispatched_at",
+    "completed": "delivery_date",
+    "cancelled": "cancelled_at",
+}
+
+MAX_ORDER_PAGE_SIZE = 500
+MAX_STATUS_BATCH_SIZE = 100
+
+# menu.service.ts bulk imports: dishes per request and per multi-row statement
+MAX_MENU_IMPORT_ROWS = 10000
+MENU_IMPORT_CHUNK = 500
+MENU_TEXT_FIELDS = {"description": "description", "imagePath": "primary_image", "category": "menu_section"}
+TRUE_VALUES = ("true", "1", "yes", "y")
+FALSE_VALUES = ("false", "0", "no", "n")
+DEFAULT_ORDER_PAGE_SIZE = 50
+
+# compressResponses in backend/src/middleware/compression.ts
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = re.compile(r"^(application/(json|x-ndjson)|text/(plain|html|csv))\b", re.I)
+NDJSON = "application/x-ndjson"
+
+TOP_DISH_STATUSES = ("approved", "ready", "dispatched", "completed")
+ACTIVE_STATUSES = ("approved", "ready", "dispatched")
+
+# daily-stats.service.ts
+DEFAULT_TIMEZONE = "UTC"
+MAX_DAILY_RANGE_DAYS = 366
+LOCAL_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def map_order_status(fulfillment_status: str) -> str:
+    return STATUS_MAP.get(fulfillment_status.lower(), fulfillment_status)
+
+
+def reverse_map_order_status(status: str) -> str:
+    return REVERSE_STATUS_MAP.get(status.lower(), status)
+
+
+def order_sort_key(order: Dict[str, Any]) -> Tuple[int, int]:
+    """Ascending key for lists kept in ORDER BY created_at DESC, order_id DESC order"""
+    return -int(order["created_at"].timestamp() * 1000), -order["order_id"]
+
+
+def tally_dishes(product_details: Any) -> Dict[str, List[float]]:
+    """Quantity and revenue per dish name, like tallyDishes in backend/src/utils/helpers.ts"""
+    tally: Dict[str, List[float]] = {}
+    items = parse_json_field(product_details)
+    for item in items if isinstance(items, list) else []:
+        name = item.get("dish_name") or item.get("name") or "Unknown"
+        quantity = int(item.get("quantity") or 1)
+        price = float(item.get("selling_price") or item.get("unit_price") or item.get("price") or 0)
+        entry = tally.setdefault(name, [0, 0.0])
+        entry[0] += quantity
+        entry[1] += price * quantity
+    return tally
+
+
+def parse_local_date(value: Any) -> Optional[date]:
+    """isLocalDate: a YYYY-MM-DD restaurant-local day, or None"""
+    if not isinstance(value, str) or not LOCAL_DATE.match(value):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def restaurant_zone(restaurant: Dict[str, Any]) -> ZoneInfo:
+    """restaurantTimezone: the restaurant's IANA zone, falling back to DEFAULT_TIMEZONE"""
+    try:
+        return ZoneInfo(restaurant.get("timezone") or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def order_counters(status: str, amount: float) -> Tuple[float, int, int]:
+    """How one order in a status counts towards its day: (revenue, active, completed)"""
+    return (0.0 if status == "cancelled" else amount,
+            1 if status in ACTIVE_STATUSES else 0,
+            1 if status == "completed" else 0)
+
+
+def iter_days(start: date, end: date) -> Iterator[date]:
+    """daysBetween: every day from start to end inclusive"""
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def map_order_items(product_details: Any) -> List[Any]:
+    items = parse_json_field(product_details)
+    return items if isinstance(items, list) else []
+
+
+# ORDER_FIELDS in order.service.ts: API order field -> row mapping
+ORDER_FIELDS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "orderNumber": lambda order: order["order_number"],
+    "status": lambda order: map_order_status(order["fulfillment_status"]),
+    "customer": lambda order: {
+        "name": order["customer"],
+        "email": order["customer_email"],
+        "phone": order["customer_phone"],
+        "address": order["customer_address"],
+    },
+    "totalAmount": lambda order: float(order["total_amount"] or 0),
+    "createdAt": lambda order: order["created_at"],
+    "approvedAt": lambda order: order["approved_at"],
+    "readyAt": lambda order: order["ready_at"],
+    "dispatchedAt": lambda order: order["dispatched_at"],
+    "completedAt": lambda order: order["delivery_date"],
+    "cancelledAt": lambda order: order["cancelled_at"],
+    "cancelledBy": lambda order: "restaurant" if order["cancelled_at"] else None,
+    "cancellationReason": lambda order: order["cancel_reason"],
+    "notes": lambda order: order["kitchen_notes"],
+    "items": lambda order: map_order_items(order["product_details"]),
+    "deliveryMethod": lambda order: order["delivery_method"],
+}
+ORDER_LIST_FIELDS = list(ORDER_FIELDS)
+
+
+def parse_csv_records(text: str) -> List[Dict[str, str]]:
+    """parseCsvRecords in utils/csv.ts: records keyed by the trimmed header row; blank lines skipped"""
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    try:
+        rows = [row for row in csv.reader(io.StringIO(text, newline=""), strict=True)
+                if len(row) > 1 or (row and row[0].strip())]
+    except csv.Error as error:
+        raise ValueError(str(error))
+    if not rows:
+        return []
+    columns = [column.strip() for column in rows[0]]
+    return [{column: row[index] if index < len(row) else "" for index, column in enumerate(columns)}
+            for row in rows[1:]]
+
+
+def menu_item_columns(item: Any, creating: bool) -> Tuple[Dict[str, Any], Optional[str]]:
+    """menuItemColumns in menu.service.ts: (dishes columns an import row sets, error)"""
+    if not isinstance(item, dict):
+        return {}, "Menu item must be an object"
+    columns: Dict[str, Any] = {}
+
+    def is_set(value: Any) -> bool:
+        return value is not None and value != ""
+
+    if is_set(item.get("name")):
+        name = str(item["name"]).strip()
+        if not name:
+            return {}, "Name must not be blank"
+        if len(name) > 255:
+            return {}, "Name must be at most 255 characters"
+        columns["name"] = name
+    elif creating:
+        return {}, "Name is required"
+
+    if is_set(item.get("price")):
+        try:
+            price = float(str(item["price"]).strip())
+        except ValueError:
+            price = -1.0
+        if isinstance(item["price"], bool) or not 0 <= price < float("inf"):
+            return {}, f"Invalid price: {item['price']}"
+        columns["selling_price"] = f"{price:.2f}"
+
+    for field, column in MENU_TEXT_FIELDS.items():
+        value = item.get(field)
+        if not is_set(value):
+            continue
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            return {}, f"{field} must be text"
+        columns[column] = str(value)
+
+    if not creating and is_set(item.get("isAvailable")):
+        flag = str(item["isAvailable"]).strip().lower()
+        if flag not in TRUE_VALUES and flag not in FALSE_VALUES:
+            return {}, f"Invalid isAvailable: {item['isAvailable']}"
+        columns["availability_status"] = "available" if flag in TRUE_VALUES else "unavailable"
+    return columns, None
+
+
+def parse_order_fields(value: Optional[str]) -> Tuple[List[str], List[str]]:
+    """parseOrderFields: (known fields, unknown fields) of a ?fields= value"""
+    if not value:
+        return ORDER_LIST_FIELDS, []
+    requested = list(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    return [field for field in requested if field in ORDER_FIELDS], [f for f in requested if f not in ORDER_FIELDS]
+
+
+# receipt.service.ts: printer-ready lines for 58mm paper
+RECEIPT_WIDTH = 32
+RECEIPT_KINDS = ("kitchen", "bag", "customer")
+RECEIPT_HEADER = [line for line in os.environ.get("RECEIPT_HEADER",
+                                                  "GENERAL BILIMORIA'S|20 CANTEEN 23|ESTD LONDON UK").split("|") if line]
+RECEIPT_RULE = "-" * RECEIPT_WIDTH
+
+
+def receipt_center(text: str) -> str:
+    line = text[:RECEIPT_WIDTH]
+    return " " * ((RECEIPT_WIDTH - len(line)) // 2) + line
+
+
+def receipt_columns(left: str, right: str) -> str:
+    """Left text and right-aligned value on one line; the left side is cut short to fit"""
+    left = left[:max(RECEIPT_WIDTH - len(right) - 1, 0)]
+    return left + " " * (RECEIPT_WIDTH - len(left) - len(right)) + right
+
+
+def receipt_wrap(text: str, lead: str = "", indent: Optional[str] = None) -> List[str]:
+    """Word-wrap to the paper width: the first line starts with lead, the rest with indent"""
+    indent = lead if indent is None else indent
+    lines: List[str] = []
+    prefix, line = lead, ""
+    for word in text.split():
+        if line and len(prefix) + len(line) + 1 + len(word) > RECEIPT_WIDTH:
+            lines.append(prefix + line)
+            prefix, line = indent, word
+        else:
+            line = f"{line} {word}" if line else word
+        while len(prefix) + len(line) > RECEIPT_WIDTH:
+            room = RECEIPT_WIDTH - len(prefix)
+            lines.append(prefix + line[:room])
+            prefix, line = indent, line[room:]
+    if line:
+        lines.append(prefix + line)
+    return lines
+
+
+def receipt_items(product_details: Any) -> List[Dict[str, Any]]:
+    """product_details entries, with the same field fallbacks as tally_dishes"""
+    items = []
+    for item in map_order_items(product_details):
+        bundle = item.get("bundle_items") or item.get("bundleItems")
+        items.append({
+            "name": str(item.get("dish_name") or item.get("name") or "Unknown"),
+            "quantity": int(item.get("quantity") or 1),
+            "price": float(item.get("selling_price") or item.get("unit_price") or item.get("price") or 0),
+            "notes": item.get("notes") or item.get("special_instructions") or "",
+            "extras": [f"{extra.get('dish_name') or extra.get('name')} x{int(extra.get('quantity') or 1)}"
+                       for extra in bundle] if isinstance(bundle, list) else [],
+        })
+    return items
+
+
+def build_receipts(order: Dict[str, Any], restaurant: Dict[str, Any]) -> Dict[str, Any]:
+    """buildReceipts: kitchen ticket, bag sticker and customer receipt for one order"""
+    items = receipt_items(order["product_details"])
+    placed_at = order["created_at"].astimezone(restaurant_zone(restaurant)).strftime("%d/%m/%Y %H:%M")
+    method = str(order["delivery_method"] or "").upper()
+    item_count = sum(item["quantity"] for item in items)
+
+    kitchen = [receipt_center("KITCHEN"), receipt_center(order["order_number"]),
+               receipt_columns(method, placed_at), RECEIPT_RULE]
+    for item in items:
+        kitchen += receipt_wrap(f"{item['quantity']} x {item['name']}", "", "    ")
+        for extra in item["extras"]:
+            kitchen += receipt_wrap(f"+ {extra}", "  ", "    ")
+        if item["notes"]:
+            kitchen += receipt_wrap(f"! {item['notes']}", "  ", "    ")
+    kitchen.append(RECEIPT_RULE)
+    if order["kitchen_notes"]:
+        kitchen += receipt_wrap(f"NOTE: {order['kitchen_notes']}", "", "  ") + [RECEIPT_RULE]
+    kitchen.append(receipt_columns("Items", str(item_count)))
+
+    bag = [receipt_center(order["order_number"]), receipt_center(str(order["customer"] or "Guest")),
+           receipt_center(method)]
+    if order["delivery_method"] == "delivery" and order["customer_address"]:
+        bag += receipt_wrap(str(order["customer_address"]))
+    bag += [RECEIPT_RULE, receipt_columns(f"{item_count} items", placed_at)]
+
+    customer = [receipt_center(line) for line in RECEIPT_HEADER] + [
+        "", receipt_center(restaurant.get("username") or ""), RECEIPT_RULE,
+        receipt_columns("Order", order["order_number"]), receipt_columns("Date", placed_at), RECEIPT_RULE]
+    for item in items:
+        customer.append(receipt_columns(f"{item['name']} x{item['quantity']}",
+                                        f"£{item['price'] * item['quantity']:.2f}"))
+        for extra in item["extras"]:
+            customer += receipt_wrap(f"+ {extra}", " ", "   ")
+    customer += [RECEIPT_RULE, receipt_columns("Total", f"£{float(order['total_amount'] or 0):.2f}")]
+    if order["payment_method"]:
+        customer.append(receipt_columns("Payment", f"{order['payment_method']} ({order['payment_status'] or 'unpaid'})"))
+    customer += [RECEIPT_RULE, receipt_center("Thank you for ordering!"), receipt_center("See you again online!")]
+
+    return {"orderNumber": order["order_number"], "status": map_order_status(order["fulfillment_status"]),
+            "width": RECEIPT_WIDTH, "receipts": {"kitchen": kitchen, "bag": bag, "customer": customer}}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """req.acceptsEncodings('br', 'gzip', 'identity'), ignoring q-values other than q=0"""
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        offered[name.strip().lower()] = params.replace(" ", "") not in ("q=0", "q=0.0")
+    for encoding in ("br", "gzip"):
+        if offered.get(encoding) and (encoding == "gzip" or brotli is not None):
+            return encoding
+    return None
+
+
+class StreamCompressor:
+    """Incremental gzip or br body with a flush per batch, like zlib's flush() in compressResponses"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self.compressor = brotli.Compressor(quality=4)
+        else:
+            self.compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self.compressor.process(data) + self.compressor.flush()
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.finish() if self.encoding == "br" else self.compressor.flush()
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    return zlib.compress(body, 6, wbits=31)
+
+
+def encode_order_cursor(order: Dict[str, Any]) -> str:
+    """Same opaque cursor as encodeOrderCursor in backend/src/utils/helpers.ts"""
+    raw = f"{int(order['created_at'].timestamp() * 1000)}:{order['order_id']}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_sync_version(value: str) -> Optional[Tuple[int, int]]:
+    """decodeSyncVersion: "<sync_version>.<order_id>" -> (sync_version, order_id)"""
+    match = re.fullmatch(r"(\d+)\.(\d+)", value)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def parse_changed_at(value: Any) -> Optional[datetime]:
+    """new Date(changedAt) for a replayed status change: epoch ms or an ISO string"""
+    try:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(value / 1000, timezone.utc)
+        parsed = datetime.fromisoformat(str(value))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def decode_order_cursor(cursor: str) -> Optional[Tuple[int, int]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except ValueError:
+        return None
+    match = re.fullmatch(r"(\d+):(\d+)", raw)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+# utils/request-timing.ts: spans of the request being served by the current thread
+_request_timers = threading.local()
+
+
+class RequestTimer:
+    """Time spent per named span during one request; same-named spans add up"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}
+
+    def add(self, name: str, ms: float):
+        span = self.spans.setdefault(name, [0.0, 0])
+        span[0] += ms
+        span[1] += 1
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def header(self) -> str:
+        """Server-Timing value, e.g. 'db;dur=3.21;desc="3 calls", total;dur=4.02'"""
+        entries = [f"{name};dur={ms:.2f}" + (f';desc="{count} calls"' if count > 1 else "")
+                   for name, (ms, count) in self.spans.items()]
+        entries.append(f"total;dur={self.total_ms():.2f}")
+        return ", ".join(entries)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return getattr(_request_timers, "timer", None)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """timeSync/timeAsync: add the block's duration to the current request's span; no-op outside requests"""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, (time.perf_counter() - started) * 1000)
+
+
+def parse_json_field(field: Any) -> Any:
+    if isinstance(field, str):
+        try:
+            with timed("parse"):
+                return json.loads(field)
+        except ValueError:
+            return field
+    return field
+
+
+def to_json_default(value: Any) -> Any:
+    """Serialize datetimes the way Express serializes JS Date objects"""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    with timed("serialize"):
+        return json.dumps(value, default=to_json_default, separators=(",", ":")).encode()
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def sign_token(restaurant_id: int, secret: str = JWT_SECRET) -> str:
+    """HS256 JWT with the same claims AuthService.login issues"""
+    header = _b64url(dumps({"alg": "HS256", "typ": "JWT"}))
+    payload = _b64url(dumps({"restaurant_id": restaurant_id, "iat": int(time.time())}))
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def verify_token(token: str, secret: str = JWT_SECRET) -> Optional[Dict[str, Any]]:
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64url(expected), signature):
+            return None
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except ValueError:
+        return None
+
+
+# utils/password.ts
+DEFAULT_BCRYPT_COST = 10
+DEFAULT_PASSWORD_HASH_CONCURRENCY = 2
+LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$", re.I)
+# PBKDF2 iterations per bcrypt round, so the fallback costs about what bcrypt does
+PBKDF2_ITERATIONS_PER_ROUND = 128
+
+
+class PasswordHasher:
+    """Salted KDF on a bounded pool of worker threads, like bcrypt on the libuv threadpool.
+
+    Legacy unsalted SHA-256 hashes still verify and report that they need a
+    rehash, as do hashes at another cost. Without the bcrypt package the KDF
+    is PBKDF2-SHA256 with 2**cost * PBKDF2_ITERATIONS_PER_ROUND iterations.
+    ``cost=0`` keeps the old SHA-256 comparison and never rehashes.
+    """
+
+    def __init__(self, cost: int = DEFAULT_BCRYPT_COST, concurrency: int = DEFAULT_PASSWORD_HASH_CONCURRENCY):
+        self.cost = cost
+        self.concurrency = max(concurrency, 1)
+        self.workers = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="password-hash")
+        self.lock = threading.Lock()
+        self.running = self.queued = self.completed = 0
+        self.dummy_hash: Optional[str] = None
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self.lock:
+            self.queued += 1
+
+        def task():
+            with self.lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                with self.lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        return self.workers.submit(task)
+
+    def _hash(self, password: str) -> str:
+        if bcrypt is not None:
+            return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.cost)).decode()
+        salt = secrets.token_hex(16)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(),
+                                     2 ** self.cost * PBKDF2_ITERATIONS_PER_ROUND)
+        return f"$pbkdf2-sha256${self.cost:02d}${salt}${digest.hex()}"
+
+    def _verify(self, password: str, stored: str) -> Tuple[bool, int]:
+        """(valid, cost of the stored hash)"""
+        if stored.startswith("$pbkdf2-sha256$"):
+            _, _, cost, salt, expected = stored.split("$")
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(),
+                                         2 ** int(cost) * PBKDF2_ITERATIONS_PER_ROUND)
+            return hmac.compare_digest(digest.hex(), expected), int(cost)
+        if bcrypt is None:
+            raise ValueError("bcrypt hash stored but the bcrypt package is not installed")
+        return bcrypt.checkpw(password.encode(), stored.encode()), int(stored.split("$")[2])
+
+    def hash(self, password: str) -> str:
+        return self.run(self._hash, password).result()
+
+    def verify(self, password: str, stored: str) -> Tuple[bool, bool]:
+        """verifyPassword: (valid, needs rehash)"""
+        if LEGACY_SHA256.match(stored):
+            valid = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored.lower())
+            return valid, valid and self.cost > 0
+        valid, cost = self.run(self._verify, password, stored).result()
+        return valid, valid and cost != self.cost
+
+    def reject_unknown_user(self, password: str):
+        """rejectUnknownUser: spend a verification so unknown usernames are not faster to reject"""
+        if self.cost <= 0:
+            return
+        if self.dummy_hash is None:
+            self.dummy_hash = self.hash(secrets.token_hex(16))
+        self.verify(password, self.dummy_hash)
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"cost": self.cost, "limit": self.concurrency, "running": self.running,
+                    "queued": self.queued, "completed": self.completed}
+
+    def close(self):
+        self.workers.shutdown(wait=False, cancel_futures=True)
+
+
+# middleware/traffic-capture.ts
+SECRET_QUERY_PARAMS = ("access_token", "token")
+SECRET_BODY_FIELDS = re.compile(r"pass(word)?|token|secret|authorization", re.I)
+PERSONAL_BODY_FIELDS = re.compile(r"^(name|phone|mobile(_number)?|email|address|customer(_name)?)$", re.I)
+REDACTED = "[redacted]"
+
+
+def sanitize_url(url: str) -> str:
+    path, _, query = url.partition("?")
+    params = [(key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+              if key not in SECRET_QUERY_PARAMS]
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def sanitize_body(value: Any, key: str = "") -> Any:
+    """Keep the shape and replay-relevant fields of a body; redact secrets and personal values"""
+    if isinstance(value, list):
+        return [sanitize_body(item, key) for item in value]
+    if isinstance(value, dict):
+        return {field: sanitize_body(item, field) for field, item in value.items()}
+    if SECRET_BODY_FIELDS.search(key) or PERSONAL_BODY_FIELDS.match(key):
+        return REDACTED
+    return value
+
+
+class TrafficCapture:
+    """captureTraffic: one sanitized JSON line per request, appended to ``path``"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a", buffering=1)
+
+    def record(self, started_at: float, method: str, url: str, status: int, seconds: float, size: int,
+               body: Any = None, aborted: bool = False):
+        entry: Dict[str, Any] = {"t": int(started_at * 1000), "m": method, "p": sanitize_url(url), "s": status,
+                                 "ms": round(seconds * 1000, 3), "b": size}
+        if method != "GET" and body:
+            entry["body"] = sanitize_body(body)
+        if aborted:
+            entry["a"] = 1
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class FakeConnectionPool:
+    """Bookkeeping of the mysql2 pool (connectionLimit, waitForConnections, queueLimit: 0)"""
+
+    def __init__(self, limit: int = 10):
+        self.limit = limit
+        self.condition = threading.Condition()
+        self.total = self.active = self.queued = 0
+
+    def acquire(self):
+        with self.condition:
+            self.queued += 1
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.queued -= 1
+            self.active += 1
+            self.total = max(self.total, self.active)
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def stats(self) -> Dict[str, int]:
+        with self.condition:
+            return {"limit": self.limit, "total": self.total, "active": self.active,
+                    "idle": self.total - self.active, "queued": self.queued}
+
+
+class FakeStore:
+    """In-memory restaurants, dishes and order_management tables.
+
+    Rows keep their MySQL column names and shapes (DECIMAL as string,
+    product_details as a JSON string) and are mapped to API responses with the
+    same rules the TypeScript services use. ``db_latency`` adds a simulated
+    round-trip per query so DB-bound behaviour can be reproduced locally; the
+    round-trip holds one of ``connection_limit`` simulated pool connections.
+    ``top_dishes_source`` and ``stats_source`` pick between the
+    dish_sales_daily / order_stats_daily rollups and the old scans of
+    order_management, so benchmarks can compare the two. Both rollups are
+    bucketed by each restaurant's local day; seeded restaurants get
+    ``timezone``. Orders are rolled up as soon as they are added (the API's
+    background rollup trails inserts by up to DAILY_STATS_ROLLUP_MS).
+    """
+
+    def __init__(self, db_latency: float = 0.0, top_dishes_source: str = "rollup", connection_limit: int = 10,
+                 stats_source: str = "rollup", timezone_name: str = DEFAULT_TIMEZONE,
+                 password_hasher: Optional[PasswordHasher] = None):
+        self.db_latency = db_latency
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.pool = FakeConnectionPool(connection_limit)
+        self.top_dishes_source = top_dishes_source
+        self.stats_source = stats_source
+        self.timezone_name = timezone_name
+        self.lock = threading.RLock()
+        self.restaurants: Dict[int, Dict[str, Any]] = {}
+        self.dishes: Dict[int, Dict[str, Any]] = {}
+        # Newest first, matching ORDER BY created_at DESC
+        self.orders_by_restaurant: Dict[int, List[Dict[str, Any]]] = {}
+        self.orders_by_number: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        # dish_sales_daily: (restaurant_id, sales_date) -> dish name -> [quantity, revenue]
+        self.dish_sales: Dict[Tuple[int, date], Dict[str, List[float]]] = {}
+        # order_stats_daily: restaurant_id -> stats_date -> [total, revenue, active, completed]
+        self.order_stats: Dict[int, Dict[date, List[float]]] = {}
+        # order_sync_versions: restaurant_id -> last version handed out, and each
+        # restaurant's (sync_version, order) stamps in version order (stale ones skipped)
+        self.sync_versions: Dict[int, int] = {}
+        self.sync_log: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        self.next_dish_id = 1
+        self.next_order_id = 1
+        self.query_count = 0
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.deactivation_listeners: List[Callable[[int], None]] = []
+
+    def query(self):
+        """Account for one database round-trip"""
+        self.query_count += 1
+        with timed("db"):
+            if self.db_latency:
+                with timed("pool"):
+                    self.pool.acquire()
+                try:
+                    time.sleep(self.db_latency)
+                finally:
+                    self.pool.release()
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """orderEvents.subscribe: called with every created/status order event"""
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    def publish(self, event_type: str, order: Dict[str, Any], previous_status: Optional[str]):
+        event = {"type": event_type, "restaurantId": order["restaurant_id"], "orderId": order["order_id"],
+                 "orderNumber": order["order_number"], "previousStatus": previous_status,
+                 "status": order["fulfillment_status"]}
+        for listener in list(self.listeners):
+            listener(event)
+
+    # ----- seeding -------------------------------------------------------
+
+    def add_dish(self, restaurant_id: int, name: str, price: float, section: str,
+                 available: bool = True, created_at: Optional[datetime] = None) -> Dict[str, Any]:
+        dish = {
+            "dish_id": self.next_dish_id,
+            "restaurant_id": restaurant_id,
+            "name": name,
+            "slug": re.sub(r"[^a-z0-9]+", "-", name.lower()) + f"-{self.next_dish_id}",
+            "selling_price": f"{price:.2f}",
+            "description": f"{name} from the {section.lower()} menu",
+            "primary_image": "",
+            "availability_status": "available" if available else "unavailable",
+            "menu_section": section,
+            "is_active": 1 if available else 0,
+            "is_deleted": 0,
+            "created_at": created_at or datetime.now(timezone.utc),
+            "food_type": "veg" if any(word in name for word in VEG_WORDS) else "non-veg",
+        }
+        self.dishes[dish["dish_id"]] = dish
+        self.next_dish_id += 1
+        return dish
+
+    def add_order(self, row: Dict[str, Any]):
+        """Insert an order_management row, keeping the per-restaurant list sorted newest first"""
+        row.setdefault("order_id", self.next_order_id)
+        row.setdefault("order_number", f"#GBC{row['order_id']}")
+        self.next_order_id = max(self.next_order_id, row["order_id"] + 1)
+        orders = self.orders_by_restaurant.setdefault(row["restaurant_id"], [])
+        if not orders or row["created_at"] >= orders[0]["created_at"]:
+            orders.insert(0, row)
+        else:
+            # Backdated insert; rare outside of imports
+            orders.append(row)
+            orders.sort(key=order_sort_key)
+        self.orders_by_number[(row["restaurant_id"], row["order_number"])] = row
+        self.roll_up_order(row)
+        self.publish("created", row, None)
+
+    def local_date(self, order: Dict[str, Any]) -> date:
+        """The restaurant-local day an order belongs to"""
+        zone = restaurant_zone(self.restaurants.get(order["restaurant_id"], {}))
+        return order["created_at"].astimezone(zone).date()
+
+    def roll_up_order(self, order: Dict[str, Any]):
+        """DailyStatsService.rollUpNewOrders for one order, in its current status"""
+        self.apply_order_stats(order, order["fulfillment_status"], 1, count_order=True)
+        if order["fulfillment_status"] in TOP_DISH_STATUSES:
+            self.apply_dish_sales(order, 1)
+
+    def apply_order_stats(self, order: Dict[str, Any], status: str, sign: int, count_order: bool = False):
+        """Add (sign=1) or remove (sign=-1) an order in a status from its day's stats"""
+        day = self.order_stats.setdefault(order["restaurant_id"], {}).setdefault(self.local_date(order),
+                                                                                 [0, 0.0, 0, 0])
+        revenue, active, completed = order_counters(status, float(order["total_amount"]))
+        day[0] += sign if count_order else 0
+        day[1] += sign * revenue
+        day[2] += sign * active
+        day[3] += sign * completed
+
+    def apply_dish_sales(self, order: Dict[str, Any], sign: int):
+        """Add (sign=1) or remove (sign=-1) an order's dishes from its day's rollup"""
+        day = self.dish_sales.setdefault((order["restaurant_id"], self.local_date(order)), {})
+        for name, (quantity, revenue) in tally_dishes(order["product_details"]).items():
+            entry = day.setdefault(name, [0, 0.0])
+            entry[0] += sign * quantity
+            entry[1] += sign * revenue
+
+    def seed(self, generator: OrderHistoryGenerator):
+        """Load restaurants, dishes and orders from a synthetic history generator"""
+        for row in generator.restaurant_rows():
+            row.setdefault("timezone", self.timezone_name)
+            self.restaurants[row["id"]] = row
+            self.orders_by_restaurant.setdefault(row["id"], [])
+        for row in generator.dish_rows():
+            self.dishes[row["dish_id"]] = row
+            self.next_dish_id = max(self.next_dish_id, row["dish_id"] + 1)
+        # Rows arrive oldest first; append, then flip each list to newest first
+        for row in generator.order_rows():
+            self.orders_by_restaurant[row["restaurant_id"]].append(row)
+            self.orders_by_number[(row["restaurant_id"], row["order_number"])] = row
+            self.next_order_id = row["order_id"] + 1
+            self.roll_up_order(row)
+        for orders in self.orders_by_restaurant.values():
+            orders.reverse()
+
+    # ----- services ------------------------------------------------------
+
+    @staticmethod
+    def order_to_json(order: Dict[str, Any], fields: List[str] = ORDER_LIST_FIELDS) -> Dict[str, Any]:
+        """OrderService.getOrders row mapping"""
+        return {field: ORDER_FIELDS[field](order) for field in fields}
+
+    def order_json_bytes(self, order: Dict[str, Any], fields: List[str] = ORDER_LIST_FIELDS) -> bytes:
+        """Serialized list entry; the full one is cached on the row until the row changes"""
+        if fields is not ORDER_LIST_FIELDS:
+            return dumps(self.order_to_json(order, fields))
+        cached = order.get("_json")
+        if cached is None:
+            cached = dumps(self.order_to_json(order))
+            order["_json"] = cached
+        return cached
+
+    def authenticate(self, restaurant_id: int) -> Optional[Dict[str, Any]]:
+        self.query()
+        return self.restaurants.get(restaurant_id)
+
+    def login(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        self.query()
+        restaurant = next((r for r in self.restaurants.values() if r["username"] == username), None)
+        if restaurant is None:
+            self.password_hasher.reject_unknown_user(password)
+            return None
+        if restaurant["status"] != "approved" or not restaurant["is_active"]:
+            raise PermissionError("Restaurant account is not active or approved")
+        stored = restaurant["password_hash"]
+        with timed("password"):
+            valid, needs_rehash = self.password_hasher.verify(password, stored)
+        if not valid:
+            return None
+        if needs_rehash:
+            # Off the response path, like AuthService.rehash
+            self.password_hasher.run(self.rehash_password, restaurant, password, stored)
+        return {
+            "token": sign_token(restaurant["id"]),
+            "user": {
+                "id": restaurant["id"],
+                "username": restaurant["username"],
+                "email": restaurant["email"],
+                "status": restaurant["status"],
+                "restaurant_id": restaurant["id"],
+            },
+        }
+
+    def rehash_password(self, restaurant: Dict[str, Any], password: str, verified_hash: str):
+        """UPDATE ... SET password_hash = ? WHERE id = ? AND password_hash = <the verified hash>"""
+        upgraded = self.password_hasher._hash(password)
+        self.query()
+        with self.lock:
+            if restaurant["password_hash"] == verified_hash:
+                restaurant["password_hash"] = upgraded
+
+    def set_restaurant_active(self, restaurant_id: int, active: bool):
+        """Admin-side (de)activation; the API's principal cache learns about it on its next refresh"""
+        with self.lock:
+            self.restaurants[restaurant_id]["is_active"] = 1 if active else 0
+        if not active:
+            for listener in list(self.deactivation_listeners):
+                listener(restaurant_id)
+
+    def list_orders(self, restaurant_id: int, status: Optional[str]) -> List[Dict[str, Any]]:
+        self.query()
+        orders = self.orders_by_restaurant.get(restaurant_id, [])
+        if status and status != "all":
+            db_status = reverse_map_order_status(status)
+            orders = [order for order in orders if order["fulfillment_status"] == db_status]
+        return orders
+
+    def list_orders_page(self, restaurant_id: int, status: Optional[str], limit: int,
+                         after: Optional[Tuple[int, int]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """OrderService.getOrdersPage: keyset page after (created_at ms, order_id), newest first"""
+        self.query()
+        orders = self.orders_by_restaurant.get(restaurant_id, [])
+        page_size = min(max(limit, 1), MAX_ORDER_PAGE_SIZE)
+        start = 0
+        if after:
+            # The list is sorted descending, so search on the negated key
+            start = bisect.bisect_right(orders, (-after[0], -after[1]), key=order_sort_key)
+        db_status = reverse_map_order_status(status) if status and status != "all" else None
+
+        page = []
+        for order in islice(orders, start, None):
+            if db_status is None or order["fulfillment_status"] == db_status:
+                page.append(order)
+                if len(page) > page_size:
+                    break
+        if len(page) > page_size:
+            page = page[:page_size]
+            return page, encode_order_cursor(page[-1])
+        return page, None
+
+    def iter_order_pages(self, restaurant_id: int, status: Optional[str]) -> Iterator[List[Dict[str, Any]]]:
+        """OrderService.streamOrders: keyset pages of MAX_ORDER_PAGE_SIZE until the list runs out"""
+        after = None
+        while True:
+            page, next_cursor = self.list_orders_page(restaurant_id, status, MAX_ORDER_PAGE_SIZE, after)
+            yield page
+            if not next_cursor:
+                return
+            after = decode_order_cursor(next_cursor)
+
+    def get_order_detail(self, restaurant_id: int, order_number: str) -> Optional[Dict[str, Any]]:
+        self.query()
+        order = self.orders_by_number.get((restaurant_id, order_number))
+        if order is None:
+            return None
+        detail = self.order_to_json(order)
+        detail["paymentMethod"] = order["payment_method"]
+        detail["paymentStatus"] = order["payment_status"]
+        return detail
+
+    def get_order_receipts(self, restaurant_id: int, order_number: str) -> Optional[Dict[str, Any]]:
+        """ReceiptService build: one read of the order joined with its restaurant"""
+        self.query()
+        order = self.orders_by_number.get((restaurant_id, order_number))
+        if order is None:
+            return None
+        return build_receipts(order, self.restaurants.get(restaurant_id, {}))
+
+    def get_order_changes(self, restaurant_id: int, since: Optional[Tuple[int, int]], limit: int,
+                          fields: List[str] = ORDER_LIST_FIELDS) -> Dict[str, Any]:
+        """OrderService.getOrderChanges: the sync_version and order_id scans, or just the head version"""
+        now = datetime.now(timezone.utc)
+        if since is None:
+            self.query()
+            with self.lock:
+                version = f"{self.sync_versions.get(restaurant_id, 0)}.{self.next_order_id - 1}"
+            return {"orders": [], "version": version, "serverTime": now, "hasMore": False}
+
+        page_size = min(max(limit, 1), MAX_ORDER_PAGE_SIZE)
+        # The sync_version scan and the order_id scan
+        self.query()
+        self.query()
+        with self.lock:
+            log = self.sync_log.get(restaurant_id, [])
+            start = bisect.bisect_right(log, since[0], key=lambda entry: entry[0])
+            changed = []
+            for version, order in islice(log, start, None):
+                if order["sync_version"] == version:
+                    changed.append(order)
+                    if len(changed) > page_size:
+                        break
+            created = sorted((order for order in self.orders_by_restaurant.get(restaurant_id, [])
+                              if order["order_id"] > since[1]), key=lambda order: order["order_id"])[:page_size + 1]
+        has_more = len(changed) > page_size or len(created) > page_size
+        changed, created = changed[:page_size], created[:page_size]
+        by_id = {order["order_id"]: order for order in created + changed}
+        return {
+            "orders": [self.order_to_json(order, fields) for order in by_id.values()],
+            "version": f"{changed[-1]['sync_version'] if changed else since[0]}."
+                       f"{created[-1]['order_id'] if created else since[1]}",
+            "serverTime": now,
+            "hasMore": has_more,
+        }
+
+    def reserve_sync_version(self, order: Dict[str, Any]):
+        """Stamp a status change with the restaurant's next sync version (caller holds the lock)"""
+        restaurant_id = order["restaurant_id"]
+        version = self.sync_versions.get(restaurant_id, 0) + 1
+        self.sync_versions[restaurant_id] = version
+        order["sync_version"] = version
+        self.sync_log.setdefault(restaurant_id, []).append((version, order))
+
+    @staticmethod
+    def replay_outcome(order: Dict[str, Any], item: Dict[str, Any]) -> str:
+        """OrderService.replayOutcome: apply, unchanged or conflict for a replayed offline change"""
+        if item.get("fromStatus") is None:
+            return "apply"
+        status = map_order_status(order["fulfillment_status"])
+        if status == map_order_status(reverse_map_order_status(item["status"])):
+            return "unchanged"
+        if status == map_order_status(reverse_map_order_status(item["fromStatus"])):
+            return "apply"
+        changed_at = parse_changed_at(item.get("changedAt"))
+        server_changed_at = order.get("status_changed_at")
+        if changed_at is not None and (server_changed_at is None or changed_at > server_changed_at):
+            return "apply"
+        return "conflict"
+
+    def apply_status(self, order: Dict[str, Any], status: str, cancellation_reason: Optional[str]) -> Set[str]:
+        """Write one status change to a locked row; returns the rollup tables it changed"""
+        previous = order["fulfillment_status"]
+        order["fulfillment_status"] = reverse_map_order_status(status)
+        order["status_changed_at"] = datetime.now(timezone.utc)
+        self.reserve_sync_version(order)
+        rollups = set()
+        if order["fulfillment_status"] != previous:
+            self.apply_order_stats(order, previous, -1)
+            self.apply_order_stats(order, order["fulfillment_status"], 1)
+            rollups.add("order_stats_daily")
+        counted = order["fulfillment_status"] in TOP_DISH_STATUSES
+        if counted != (previous in TOP_DISH_STATUSES):
+            self.apply_dish_sales(order, 1 if counted else -1)
+            rollups.add("dish_sales_daily")
+        column = STATUS_TIMESTAMPS.get(status)
+        if column:
+            order[column] = datetime.now(timezone.utc)
+        if status == "cancelled" and cancellation_reason:
+            order["cancel_reason"] = cancellation_reason
+        order.pop("_json", None)
+        return rollups
+
+    def update_order_status(self, restaurant_id: int, order_number: str, status: str,
+                            cancellation_reason: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        # BEGIN, watermark, SELECT ... FOR UPDATE, sync version, UPDATE, COMMIT (+ one INSERT per
+        # changed rollup), then the read-back
+        for _ in range(6):
+            self.query()
+        with self.lock:
+            order = self.orders_by_number.get((restaurant_id, order_number))
+            if order is not None:
+                previous = order["fulfillment_status"]
+                for _ in self.apply_status(order, status, cancellation_reason):
+                    self.query()
+        if order is not None:
+            self.publish("status", order, previous)
+        return self.get_order_detail(restaurant_id, order_number)
+
+    def update_order_statuses(self, restaurant_id: int, items: List[Any]) -> List[Dict[str, Any]]:
+        """OrderService.updateOrderStatuses: one transaction, per-item results"""
+        results: List[Dict[str, Any]] = []
+        valid = []
+        seen = set()
+        for item in items:
+            order_number = item.get("orderNumber") if isinstance(item, dict) else None
+            results.append({"orderNumber": order_number, "success": False})
+            if not isinstance(order_number, str) or not order_number:
+                results[-1]["error"] = "Order number is required"
+            elif not item.get("status"):
+                results[-1]["error"] = "Status is required"
+            elif not isinstance(item["status"], str) or item["status"] not in REVERSE_STATUS_MAP:
+                results[-1]["error"] = f"Status must be one of: {', '.join(REVERSE_STATUS_MAP)}"
+            elif item.get("fromStatus") is not None and not isinstance(item["fromStatus"], str):
+                results[-1]["error"] = "fromStatus must be a string"
+            elif order_number in seen:
+                results[-1]["error"] = "Order appears more than once in the batch"
+            else:
+                seen.add(order_number)
+                valid.append((len(results) - 1, item))
+        if not valid:
+            return results
+
+        # BEGIN, watermark, SELECT ... FOR UPDATE, COMMIT
+        for _ in range(4):
+            self.query()
+        applied, found, groups, rollups = [], [], set(), set()
+        with self.lock:
+            for index, item in valid:
+                order = self.orders_by_number.get((restaurant_id, item["orderNumber"]))
+                if order is None:
+                    results[index]["error"] = "Order not found"
+                    continue
+                found.append((index, order))
+                outcome = self.replay_outcome(order, item)
+                if outcome == "unchanged":
+                    results[index] = {"orderNumber": order["order_number"], "success": True, "unchanged": True}
+                    continue
+                if outcome == "conflict":
+                    results[index] = {"orderNumber": order["order_number"], "success": False, "conflict": True,
+                                      "error": "Order status was changed after this update was made"}
+                    continue
+                groups.add((item["status"], item.get("cancellationReason")))
+                applied.append((index, order, order["fulfillment_status"]))
+                rollups |= self.apply_status(order, item["status"], item.get("cancellationReason"))
+        # Sync versions, one UPDATE per distinct status, one INSERT per changed rollup, one read-back
+        for _ in range((1 if applied else 0) + len(groups) + len(rollups) + (1 if found else 0)):
+            self.query()
+
+        for index, order, previous in applied:
+            self.publish("status", order, previous)
+            results[index] = {"orderNumber": order["order_number"], "success": True}
+        for index, order in found:
+            detail = self.order_to_json(order)
+            detail["paymentMethod"] = order["payment_method"]
+            detail["paymentStatus"] = order["payment_status"]
+            results[index]["order"] = detail
+        return results
+
+    def get_stats(self, restaurant_id: int, start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+        """DashboardService.getStats: local YYYY-MM-DD ranges (or none) from the rollup, datetimes by scan"""
+        self.query()
+        ranged = bool(start_date and end_date)
+        start, end = parse_local_date(start_date), parse_local_date(end_date)
+        if ranged and (start is None or end is None):
+            window = parse_mysql_datetime(start_date), parse_mysql_datetime(end_date)
+            totals = self.scan_stats(restaurant_id, lambda order: window[0] <= order["created_at"] <= window[1])
+        elif self.stats_source == "scan":
+            totals = self.scan_stats(restaurant_id, (lambda order: start <= self.local_date(order) <= end)
+                                     if ranged else (lambda order: True))
+        else:
+            totals = [0, 0.0, 0, 0]
+            with self.lock:
+                days = self.order_stats.get(restaurant_id, {})
+                if ranged:
+                    # The primary key range read: one row per day in the range
+                    rows = [days[day] for day in iter_days(start, end) if day in days]
+                else:
+                    rows = list(days.values())
+                for row in rows:
+                    for index, value in enumerate(row):
+                        totals[index] += value
+        return {
+            "totalOrders": int(totals[0]),
+            "revenue": round(totals[1], 2),
+            "activeOrders": int(totals[2]),
+            "completedOrders": int(totals[3]),
+            "avgPrepTime": 0,
+            "avgRating": 4.5,
+            "timezone": self.restaurants[restaurant_id].get("timezone") or DEFAULT_TIMEZONE,
+            "startDate": start_date if ranged else None,
+            "endDate": end_date if ranged else None,
+        }
+
+    def scan_stats(self, restaurant_id: int, include: Callable[[Dict[str, Any]], bool]) -> List[float]:
+        """The old aggregate over every order_management row of the restaurant"""
+        totals = [0, 0.0, 0, 0]
+        for order in self.orders_by_restaurant.get(restaurant_id, []):
+            if include(order):
+                revenue, active, completed = order_counters(order["fulfillment_status"], float(order["total_amount"]))
+                totals[0] += 1
+                totals[1] += revenue
+                totals[2] += active
+                totals[3] += completed
+        return totals
+
+    def get_daily_stats(self, restaurant_id: int, start: date, end: date) -> Dict[str, Any]:
+        """DashboardService.getDailyStats: one zero-filled entry per local day"""
+        self.query()
+        with self.lock:
+            days = self.order_stats.get(restaurant_id, {})
+            rows = [(day, list(days.get(day, [0, 0.0, 0, 0]))) for day in iter_days(start, end)]
+        return {
+            "timezone": self.restaurants[restaurant_id].get("timezone") or DEFAULT_TIMEZONE,
+            "days": [{"date": day.isoformat(), "totalOrders": int(row[0]), "revenue": round(row[1], 2),
+                      "activeOrders": int(row[2]), "completedOrders": int(row[3])} for day, row in rows],
+        }
+
+    def get_top_dishes(self, restaurant_id: int, start: date, end: date) -> List[Dict[str, Any]]:
+        self.query()
+        dishes: Dict[str, List[float]] = {}
+        if self.top_dishes_source == "scan":
+            # The old query: DATE(created_at) = CURDATE() cannot use the index, so
+            # MySQL reads every order of the restaurant and parses its JSON
+            for order in self.orders_by_restaurant.get(restaurant_id, []):
+                if order["fulfillment_status"] not in TOP_DISH_STATUSES or not start <= self.local_date(order) <= end:
+                    continue
+                for name, (quantity, revenue) in tally_dishes(order["product_details"]).items():
+                    entry = dishes.setdefault(name, [0, 0.0])
+                    entry[0] += quantity
+                    entry[1] += revenue
+        else:
+            with self.lock:
+                for day in iter_days(start, end):
+                    for name, (quantity, revenue) in self.dish_sales.get((restaurant_id, day), {}).items():
+                        entry = dishes.setdefault(name, [0, 0.0])
+                        entry[0] += quantity
+                        entry[1] += revenue
+        ranked = sorted(((name, entry) for name, entry in dishes.items() if entry[0] > 0),
+                        key=lambda dish: (-dish[1][0], dish[0]))[:5]
+        return [{"rank": index + 1, "name": name, "orderCount": quantity, "revenue": round(revenue, 2)}
+                for index, (name, (quantity, revenue)) in enumerate(ranked)]
+
+    def get_frequent_customers(self, restaurant_id: int) -> List[Dict[str, Any]]:
+        self.query()
+        customers: Dict[str, Dict[str, Any]] = {}
+        for order in self.orders_by_restaurant.get(restaurant_id, []):
+            if order["fulfillment_status"] != "completed" or order["customer"] is None:
+                continue
+            entry = customers.setdefault(order["customer"], {"customer": order["customer"], "orderCount": 0,
+                                                             "totalSpent": 0.0})
+            entry["orderCount"] += 1
+            entry["totalSpent"] += float(order["total_amount"])
+        ranked = sorted(customers.values(), key=lambda customer: customer["orderCount"], reverse=True)[:5]
+        result = []
+        for index, customer in enumerate(ranked):
+            data = parse_json_field(customer["customer"])
+            name = data.get("name") or data.get("customer_name") if isinstance(data, dict) else None
+            phone = data.get("phone") or data.get("mobile_number") if isinstance(data, dict) else None
+            result.append({
+                "rank": index + 1,
+                "name": name or "Unknown Customer",
+                "phone": phone or "N/A",
+                "orderCount": customer["orderCount"],
+                "totalSpent": round(customer["totalSpent"], 2),
+            })
+        return result
+
+    @staticmethod
+    def dish_to_json(dish: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": dish["dish_id"],
+            "name": dish["name"],
+            "price": float(dish["selling_price"] or 0),
+            "description": dish["description"],
+            "imagePath": dish["primary_image"],
+            "isAvailable": dish["availability_status"] == "available",
+            "category": dish["menu_section"],
+        }
+
+    def get_menu_items(self, restaurant_id: int) -> List[Dict[str, Any]]:
+        self.query()
+        dishes = sorted((dish for dish in self.dishes.values()
+                         if dish["restaurant_id"] == restaurant_id and not dish["is_deleted"]),
+                        key=lambda dish: (dish["menu_section"], dish["name"]))
+        return [{
+            "id": dish["dish_id"],
+            "name": dish["name"],
+            "price": float(dish["selling_price"] or 0),
+            "description": dish["description"],
+            "imagePath": dish["primary_image"],
+            "isAvailable": dish["availability_status"] == "available" and dish["is_active"] == 1,
+            "category": dish["menu_section"],
+            "createdAt": dish["created_at"],
+            "foodType": dish["food_type"],
+        } for dish in dishes]
+
+    def add_menu_item(self, restaurant_id: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        self.query()
+        with self.lock:
+            dish = self.add_dish(restaurant_id, item["name"], float(item.get("price") or 0),
+                                 item.get("category") or "Uncategorized", available=False)
+            dish["description"] = item.get("description") or ""
+            dish["primary_image"] = item.get("imagePath") or ""
+        self.query()
+        return self.dish_to_json(dish)
+
+    def update_menu_item(self, restaurant_id: int, dish_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
+        field_mapping = {
+            "name": "name",
+            "price": "selling_price",
+            "description": "description",
+            "imagePath": "primary_image",
+            "isAvailable": "availability_status",
+            "category": "menu_section",
+        }
+        changes = {}
+        for key, value in updates.items():
+            column = field_mapping.get(key)
+            if column == "availability_status":
+                changes[column] = "available" if value else "unavailable"
+            elif column == "selling_price":
+                changes[column] = f"{float(value):.2f}"
+            elif column:
+                changes[column] = value
+        if not changes:
+            raise ValueError("No valid fields to update")
+
+        self.query()
+        dish = self.dishes.get(dish_id)
+        if dish is not None and dish["restaurant_id"] == restaurant_id:
+            dish.update(changes)
+        self.query()
+        if dish is None or dish["restaurant_id"] != restaurant_id:
+            raise LookupError(f"Dish {dish_id} not found")
+        return self.dish_to_json(dish)
+
+    def create_menu_items(self, restaurant_id: int, items: List[Any]) -> List[Dict[str, Any]]:
+        """MenuService.createMenuItems: one transaction, an INSERT and a read-back per chunk"""
+        results: List[Dict[str, Any]] = []
+        valid = []
+        for index, item in enumerate(items):
+            columns, error = menu_item_columns(item, creating=True)
+            results.append({"row": index + 1, "success": False})
+            if error:
+                results[-1]["error"] = error
+            else:
+                valid.append((index, columns))
+        if not valid:
+            return results
+
+        # BEGIN and COMMIT, plus INSERT and SELECT per chunk
+        chunks = -(-len(valid) // MENU_IMPORT_CHUNK)
+        for _ in range(2 + 2 * chunks):
+            self.query()
+        with self.lock:
+            for index, columns in valid:
+                dish = self.add_dish(restaurant_id, columns["name"], float(columns.get("selling_price") or 0),
+                                     columns.get("menu_section") or "Uncategorized", available=False)
+                dish["description"] = columns.get("description") or ""
+                dish["primary_image"] = columns.get("primary_image") or ""
+                results[index] = {"row": index + 1, "success": True, "item": self.dish_to_json(dish)}
+        return results
+
+    def update_menu_items(self, restaurant_id: int, items: List[Any]) -> List[Dict[str, Any]]:
+        """MenuService.updateMenuItems: one transaction, a locking read, an UPDATE and a read-back per chunk"""
+        results: List[Dict[str, Any]] = []
+        valid = []
+        seen = set()
+        for index, item in enumerate(items):
+            results.append({"row": index + 1, "success": False})
+            raw_id = item.get("id") if isinstance(item, dict) else None
+            try:
+                dish_id = int(str(raw_id).strip()) if raw_id is not None and not isinstance(raw_id, bool) else 0
+            except ValueError:
+                dish_id = 0
+            if dish_id <= 0:
+                results[-1]["error"] = "A numeric id is required"
+                continue
+            columns, error = menu_item_columns(item, creating=False)
+            if error:
+                results[-1]["error"] = error
+            elif not columns:
+                results[-1]["error"] = "No valid fields to update"
+            elif dish_id in seen:
+                results[-1]["error"] = "Menu item appears more than once in the import"
+            else:
+                seen.add(dish_id)
+                valid.append((index, dish_id, columns))
+        if not valid:
+            return results
+
+        chunks = -(-len(valid) // MENU_IMPORT_CHUNK)
+        for _ in range(2 + 3 * chunks):
+            self.query()
+        with self.lock:
+            for index, dish_id, columns in valid:
+                dish = self.dishes.get(dish_id)
+                if dish is None or dish["restaurant_id"] != restaurant_id or dish["is_deleted"]:
+                    results[index]["error"] = "Menu item not found"
+                    continue
+                dish.update(columns)
+                results[index] = {"row": index + 1, "success": True, "item": self.dish_to_json(dish)}
+        return results
+
+
+def parse_mysql_datetime(value: str) -> datetime:
+    """Parse the date strings MySQL accepts in BETWEEN (date or datetime, optional ISO 'T'/'Z')"""
+    value = value.strip().replace("T", " ").rstrip("Z")
+    for fmt in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value}")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# (method, pattern, handler, auth middleware or None, Express route path for metric labels)
+Route = Tuple[str, "re.Pattern[str]", Callable[..., Any], Optional[Callable[..., Any]], str]
+
+
+def etagged(value: Any) -> Tuple[bytes, str]:
+    """Serialized body and its weak ETag (sha1, base64url), as the API computes them"""
+    body = dumps(value)
+    return body, 'W/"' + base64.urlsafe_b64encode(hashlib.sha1(body).digest()).rstrip(b"=").decode() + '"'
+
+
+def affected_dashboard_kinds(event: Dict[str, Any]) -> List[str]:
+    """Cached dashboard responses an order event can change (affectedKinds in dashboard-cache.service.ts)"""
+    statuses = {event["status"], event["previousStatus"]}
+    kinds = ["stats"]
+    if statuses & set(TOP_DISH_STATUSES):
+        kinds.append("top-dishes")
+    if "completed" in statuses:
+        kinds.append("frequent-customers")
+    return kinds
+
+
+class DashboardCache:
+    """Per-restaurant cache of serialized dashboard responses: bounded LRU with TTL and event invalidation"""
+
+    def __init__(self, ttl: float, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        # (restaurant id, key) -> (body, etag, expiry)
+        self.entries: "OrderedDict[Tuple[int, str], Tuple[bytes, str, float]]" = OrderedDict()
+        # Bumped by every invalidation; a load only lands if its restaurant's is unchanged
+        self.generations: Dict[int, int] = {}
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def generation(self, restaurant_id: int) -> int:
+        return self.generations.get(restaurant_id, 0)
+
+    def get(self, restaurant_id: int, key: str) -> Optional[Tuple[bytes, str, float]]:
+        with self.lock:
+            entry = self.entries.get((restaurant_id, key))
+            if entry is None or entry[2] <= time.monotonic():
+                self.entries.pop((restaurant_id, key), None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end((restaurant_id, key))
+            self.hits += 1
+            return entry
+
+    def set(self, restaurant_id: int, key: str, value: Any, generation: int) -> Tuple[bytes, str, float]:
+        entry = (*etagged(value), time.monotonic() + self.ttl)
+        if self.ttl > 0 and self.max_entries > 0:
+            with self.lock:
+                if self.generation(restaurant_id) == generation:
+                    self.entries[(restaurant_id, key)] = entry
+                    self.entries.move_to_end((restaurant_id, key))
+                    if len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+                        self.evictions += 1
+        return entry
+
+    def invalidate(self, restaurant_id: int, kinds: Optional[List[str]] = None):
+        with self.lock:
+            self.generations[restaurant_id] = self.generation(restaurant_id) + 1
+            for entry_key in [entry_key for entry_key in self.entries if entry_key[0] == restaurant_id
+                              and (kinds is None or entry_key[1].split("|")[0] in kinds)]:
+                del self.entries[entry_key]
+                self.invalidations += 1
+
+    def on_order_event(self, event: Dict[str, Any]):
+        self.invalidate(event["restaurantId"], affected_dashboard_kinds(event))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hitRatio": self.hits / lookups if lookups else 0, "invalidations": self.invalidations}
+
+
+class ReceiptCache:
+    """ReceiptService: serialized receipts per order, rebuilt in the background on every order event"""
+
+    def __init__(self, store: FakeStore, max_entries: int = 2000, ttl: float = 12 * 60 * 60):
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # (restaurant id, order number) -> (payload, serialized selections, expiry)
+        self.entries: "OrderedDict[Tuple[int, str], Tuple[Dict[str, Any], Dict[str, Tuple[bytes, str]], float]]" = \
+            OrderedDict()
+        # Bumped by every event for an order; cleared whenever no build is in flight
+        self.generations: Dict[Tuple[int, str], int] = {}
+        self.in_flight = 0
+        self.hits = self.misses = self.evictions = self.builds = 0
+        self.prebuilder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="receipts")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, restaurant_id: int, order_number: str, kinds: List[str]) -> Optional[Tuple[bytes, str]]:
+        """Serialized payload narrowed to kinds (all three when empty)"""
+        key = (restaurant_id, order_number)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.entries.pop(key, None)
+                self.misses += 1
+                entry = None
+        if entry is None:
+            entry = self.build(restaurant_id, order_number)
+            if entry is None:
+                return None
+        payload, bodies, _ = entry
+        selected = [kind for kind in RECEIPT_KINDS if kind in kinds] if kinds else list(RECEIPT_KINDS)
+        selection = ",".join(selected)
+        if selection not in bodies:
+            bodies[selection] = etagged({**payload, "receipts": {kind: payload["receipts"][kind] for kind in selected}})
+        return bodies[selection]
+
+    def build(self, restaurant_id: int, order_number: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], float]]:
+        key = (restaurant_id, order_number)
+        with self.lock:
+            generation = self.generations.get(key, 0)
+            self.in_flight += 1
+        try:
+            payload = self.store.get_order_receipts(restaurant_id, order_number)
+            if payload is None:
+                return None
+            built = (payload, {}, time.monotonic() + self.ttl)
+            with self.lock:
+                self.builds += 1
+                if self.enabled and self.generations.get(key, 0) == generation:
+                    self.entries[key] = built
+                    self.entries.move_to_end(key)
+                    if len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+                        self.evictions += 1
+            return built
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                if not self.in_flight:
+                    self.generations.clear()
+
+    def on_order_event(self, event: Dict[str, Any]):
+        key = (event["restaurantId"], event["orderNumber"])
+        with self.lock:
+            self.generations[key] = self.generations.get(key, 0) + 1
+            self.entries.pop(key, None)
+        if self.enabled:
+            self.prebuilder.submit(self.build, *key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hitRatio": self.hits / lookups if lookups else 0, "builds": self.builds}
+
+    def close(self):
+        self.prebuilder.shutdown(wait=False)
+
+
+class PrincipalCache:
+    """LRU + TTL cache of authenticated restaurants (principal-cache.service.ts)"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[int, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, restaurant_id: int) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.entries.get(restaurant_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self.entries.pop(restaurant_id, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(restaurant_id)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, restaurant_id: int, restaurant: Dict[str, Any]):
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[restaurant_id] = (restaurant, time.monotonic() + self.ttl)
+            self.entries.move_to_end(restaurant_id)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def evict(self, restaurant_id: int):
+        with self.lock:
+            self.entries.pop(restaurant_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hitRatio": self.hits / lookups if lookups else 0}
+
+
+class LagMonitor:
+    """Stand-in for monitorEventLoopDelay: how late a 10 ms sleep wakes up.
+
+    The fake has no event loop, but an oversubscribed GIL delays this thread
+    the way a busy loop delays Node timers. Covers the last `window` seconds;
+    reads do not reset it.
+    """
+
+    def __init__(self, interval: float = 0.01, window: float = 60.0):
+        self.interval = interval
+        self.window = window
+        self.lock = threading.Lock()
+        self.delays: Deque[Tuple[float, float]] = deque()
+        self.running = True
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        while self.running:
+            started = time.perf_counter()
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            delay = (now - started - self.interval) * 1000
+            with self.lock:
+                self.delays.append((now, max(delay, 0.0)))
+                self.prune(now)
+
+    def prune(self, now: float):
+        while self.delays and self.delays[0][0] < now - self.window:
+            self.delays.popleft()
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            self.prune(time.perf_counter())
+            delays = sorted(delay for _, delay in self.delays)
+        window_ms = self.window * 1000
+        if not delays:
+            return {"windowMs": window_ms, "meanMs": 0, "p99Ms": 0, "maxMs": 0}
+        return {"windowMs": window_ms, "meanMs": sum(delays) / len(delays),
+                "p99Ms": delays[min(len(delays) - 1, int(len(delays) * 0.99))], "maxMs": delays[-1]}
+
+    def close(self):
+        self.running = False
+
+
+def resident_memory_mb() -> float:
+    """Current RSS on Linux; the fake has no separate heap figure, so it stands in for heapUsed too"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+class OrderStream:
+    """Per-restaurant Server-Sent Events fan-out with Last-Event-ID replay (order-stream.service.ts)"""
+
+    def __init__(self, buffer_size: int = 256, heartbeat: float = 25.0):
+        self.boot_id = secrets.token_hex(4)
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.subscribers: Dict[int, List[queue.Queue]] = {}
+        self.buffers: Dict[int, deque] = {}
+        self.evicted: Dict[int, int] = {}
+
+    def on_order_event(self, event: Dict[str, Any]):
+        data = {"type": event["type"], "orderId": event["orderId"], "orderNumber": event["orderNumber"],
+                "status": map_order_status(event["status"]),
+                "previousStatus": map_order_status(event["previousStatus"]) if event["previousStatus"] else None,
+                "timestamp": datetime.now(timezone.utc)}
+        with self.lock:
+            self.seq += 1
+            frame = f"id: {self.boot_id}.{self.seq}\nevent: order\ndata: ".encode() + dumps(data) + b"\n\n"
+            buffer = self.buffers.setdefault(event["restaurantId"], deque())
+            buffer.append((self.seq, frame))
+            if len(buffer) > self.buffer_size:
+                self.evicted[event["restaurantId"]] = buffer.popleft()[0]
+            for subscriber in self.subscribers.get(event["restaurantId"], []):
+                subscriber.put(frame)
+
+    def subscribe(self, restaurant_id: int, last_event_id: Optional[str]) -> Tuple[queue.Queue, List[bytes]]:
+        """Register a subscriber; returns its queue and the frames to replay first"""
+        subscriber: queue.Queue = queue.Queue()
+        with self.lock:
+            replay = []
+            if last_event_id:
+                boot_id, _, seq_text = last_event_id.partition(".")
+                if (boot_id != self.boot_id or not seq_text.isdigit()
+                        or int(seq_text) < self.evicted.get(restaurant_id, 0)):
+                    replay.append(b"event: reset\ndata: {}\n\n")
+                else:
+                    replay.extend(frame for seq, frame in self.buffers.get(restaurant_id, ()) if seq > int(seq_text))
+            self.subscribers.setdefault(restaurant_id, []).append(subscriber)
+        return subscriber, replay
+
+    def subscriber_count(self) -> int:
+        with self.lock:
+            return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    def unsubscribe(self, restaurant_id: int, subscriber: queue.Queue):
+        with self.lock:
+            self.subscribers[restaurant_id].remove(subscriber)
+
+    def close(self):
+        """Ask every open stream to finish"""
+        with self.lock:
+            for subscribers in self.subscribers.values():
+                for subscriber in subscribers:
+                    subscriber.put(None)
+
+
+# services/metrics.service.ts; Prometheus' default buckets, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Dict[str, Any]) -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in labels.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative histogram per label set, rendered in the Prometheus text format"""
+
+    def __init__(self, name: str, help_text: str, bounds: Tuple[float, ...] = DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.bounds = bounds
+        self.series: Dict[Tuple[Tuple[str, Any], ...], List[Any]] = {}
+
+    def observe(self, labels: Dict[str, Any], value: float):
+        series = self.series.setdefault(tuple(labels.items()), [[0] * len(self.bounds), 0.0, 0])
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (buckets, total, count) in self.series.items():
+            labels = dict(key)
+            for bound, bucket in zip(self.bounds, buckets):
+                lines.append(f"{self.name}_bucket{format_labels({**labels, 'le': bound})} {bucket}")
+            lines.append(f"{self.name}_bucket{format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+        return lines
+
+
+class Metrics:
+    """Per-route request and span histograms served at /api/metrics"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_duration = Histogram("http_request_duration_seconds",
+                                          "Time from the request arriving to the last byte of the response")
+        self.span_duration = Histogram("http_request_span_seconds", "Time one request spent in a span "
+                                       "(auth, db, parse, serialize, ...), summed within the request")
+
+    def observe_request(self, method: str, route: str, status: int, timer: RequestTimer):
+        with self.lock:
+            self.request_duration.observe({"method": method, "route": route, "status": status},
+                                          timer.total_ms() / 1000)
+            for span, (ms, _) in timer.spans.items():
+                self.span_duration.observe({"method": method, "route": route, "span": span}, ms / 1000)
+
+    def render(self, pool: Dict[str, int]) -> str:
+        with self.lock:
+            lines = self.request_duration.render() + self.span_duration.render()
+        lines += ["# HELP db_pool_connections mysql2 pool connections by state",
+                  "# TYPE db_pool_connections gauge"]
+        lines += [f'db_pool_connections{{state="{state}"}} {pool[state]}' for state in ("active", "idle", "queued")]
+        rss = int(resident_memory_mb() * 1024 * 1024)
+        lines += ["# HELP process_resident_memory_bytes Resident set size",
+                  "# TYPE process_resident_memory_bytes gauge", f"process_resident_memory_bytes {rss}"]
+        return "\n".join(lines) + "\n"
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler dispatching to the FakeStore like the Express routers"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "GBCPOSFake/1.0"
+    # Headers and body go out as separate writes; without this Nagle + delayed ACK add ~40 ms
+    disable_nagle_algorithm = True
+    store: FakeStore
+    dashboard_cache: DashboardCache
+    order_stream: OrderStream
+    principal_cache: PrincipalCache
+    receipt_cache: ReceiptCache
+    lag_monitor: LagMonitor
+    capture: Optional[TrafficCapture] = None
+    metrics: Metrics
+    # SERVER_TIMING=0 keeps the spans out of the response headers
+    server_timing = True
+    # OPS_TOKEN for /api/stats and /api/metrics; None switches them off
+    ops_token: Optional[str] = None
+    started_at: float
+    routes: List[Route] = []
+    # What the traffic capture records about the current request
+    response_status = 0
+    response_bytes = 0
+    request_body: Any = None
+    client_gone = False
+    route_label = "unmatched"
+
+    def log_message(self, format: str, *args: Any):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, PATCH, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length)
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "Invalid JSON body")
+        self.request_body = body
+        return body if isinstance(body, dict) else {}
+
+    def send_response(self, code: int, message: Optional[str] = None):
+        self.response_status = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        """timeRequests: spans so far go out as Server-Timing (streams only report what preceded their headers)"""
+        timer = current_timer()
+        if timer is not None and self.server_timing:
+            self.send_header("Server-Timing", timer.header())
+        super().end_headers()
+
+    def send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = b"" if status == 304 else payload if isinstance(payload, bytes) else dumps(payload)
+        encoding = negotiate_encoding(self.headers.get("Accept-Encoding") or "")
+        if encoding and self.command != "HEAD" and status not in (204, 304) and len(body) >= MIN_COMPRESS_BYTES:
+            body = compress_body(body, encoding)
+        else:
+            encoding = None
+        self.send_response(status)
+        if status != 304 and "Content-Type" not in (headers or {}):
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.response_bytes += len(body)
+
+    def header_token(self) -> Optional[str]:
+        parts = (self.headers.get("Authorization") or "").split(" ")
+        return parts[1] if len(parts) > 1 else None
+
+    def authenticate(self, query: Dict[str, str]) -> Dict[str, Any]:
+        """authenticateToken middleware"""
+        return self.authenticate_token(self.header_token())
+
+    def authenticate_stream(self, query: Dict[str, str]) -> Dict[str, Any]:
+        """authenticateStreamToken middleware"""
+        # EventSource cannot set headers, so the order stream alone also takes the token from the query
+        return self.authenticate_token(self.header_token() or query.get("access_token"))
+
+    def authenticate_ops(self, query: Dict[str, str]) -> None:
+        """authenticateOpsToken middleware: the OPS_TOKEN bearer token, not a restaurant's"""
+        if not self.ops_token:
+            raise ApiError(403, "Ops endpoints are disabled")
+        token = self.header_token()
+        if not token:
+            raise ApiError(401, "Access token required")
+        if not hmac.compare_digest(token.encode(), self.ops_token.encode()):
+            raise ApiError(403, "Invalid ops token")
+
+    def authenticate_token(self, token: Optional[str]) -> Dict[str, Any]:
+        if not token:
+            raise ApiError(401, "Access token required")
+        with timed("auth"):
+            claims = verify_token(token)
+            if claims is None:
+                raise ApiError(403, "Invalid or expired token")
+            restaurant_id = claims.get("restaurant_id")
+            restaurant = self.principal_cache.get(restaurant_id)
+            if restaurant is None:
+                restaurant = self.store.authenticate(restaurant_id)
+                if restaurant is None:
+                    raise ApiError(401, "Invalid token")
+                if restaurant["status"] == "approved" and restaurant["is_active"]:
+                    self.principal_cache.set(restaurant_id, restaurant)
+        return restaurant
+
+    def dispatch(self, method: str):
+        started_at, timer = time.time(), RequestTimer()
+        self.response_status, self.response_bytes, self.request_body, self.client_gone = 0, 0, None, False
+        self.route_label = "unmatched"
+        _request_timers.timer = timer
+        try:
+            self.route_request(method)
+        finally:
+            _request_timers.timer = None
+            self.metrics.observe_request(method, self.route_label, self.response_status, timer)
+            if self.capture is not None:
+                self.capture.record(started_at, method, self.path, self.response_status,
+                                    timer.total_ms() / 1000, self.response_bytes, self.request_body,
+                                    self.client_gone)
+
+    def route_request(self, method: str):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        try:
+            for route_method, pattern, handler, auth, route_path in self.routes:
+                match = pattern.match(url.path)
+                if route_method != method or not match:
+                    continue
+                self.route_label = route_path
+                restaurant = auth(self, query) if auth else None
+                params = {key: unquote(value) for key, value in match.groupdict().items()}
+                # Handlers return (status, payload), (status, payload, extra headers),
+                # or None when they wrote the response themselves
+                result = handler(self, restaurant, params, query)
+                if result is not None:
+                    status, payload, *headers = result
+                    self.send_json(status, payload, headers[0] if headers else None)
+                return
+            self.send_json(404, {"error": "Route not found"})
+        except ApiError as error:
+            self.send_json(error.status, {"error": error.message})
+        except Exception as error:
+            print(f"Unhandled error: {error!r}", file=sys.stderr)
+            self.send_json(500, {"error": "Internal server error"})
+
+    # ----- route handlers ------------------------------------------------
+
+    def health(self, restaurant, params, query):
+        return 200, {"status": "ok", "timestamp": datetime.now(timezone.utc),
+                     "caches": {"auth": self.principal_cache.stats(), "dashboard": self.dashboard_cache.stats(),
+                                "receipts": self.receipt_cache.stats()}}
+
+    def runtime_stats(self, restaurant, params, query):
+        rss = resident_memory_mb()
+        return 200, {"timestamp": datetime.now(timezone.utc), "uptimeSeconds": time.monotonic() - self.started_at,
+                     "memory": {"rssMb": rss, "heapUsedMb": rss, "heapTotalMb": rss, "externalMb": 0},
+                     "eventLoop": self.lag_monitor.stats(), "pool": self.store.pool.stats(),
+                     "orderStreamSubscribers": self.order_stream.subscriber_count(),
+                     "passwordHashing": self.store.password_hasher.stats()}
+
+    def metrics_text(self, restaurant, params, query):
+        return 200, self.metrics.render(self.store.pool.stats()).encode(), \
+            {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+    def login(self, restaurant, params, query):
+        body = self.read_body()
+        if not isinstance(body.get("username"), str) or not isinstance(body.get("password"), str) \
+                or not body["username"] or not body["password"]:
+            raise ApiError(400, "Username and password are required")
+        try:
+            result = self.store.login(body["username"], body["password"])
+        except PermissionError as error:
+            restaurant = next((r for r in self.store.restaurants.values() if r["username"] == body["username"]), None)
+            if restaurant:
+                self.principal_cache.evict(restaurant["id"])
+            raise ApiError(403, str(error))
+        if result is None:
+            raise ApiError(401, "Invalid username or password")
+        return 200, result
+
+    def send_cached(self, restaurant_id: int, key: str, load: Callable[[], Any]):
+        """sendCached in dashboard.routes.ts: cached body, ETag and 304 on a matching If-None-Match"""
+        entry = self.dashboard_cache.get(restaurant_id, key)
+        headers = {"X-Cache": "HIT" if entry else "MISS", "Cache-Control": "private, no-cache"}
+        if entry is None:
+            generation = self.dashboard_cache.generation(restaurant_id)
+            entry = self.dashboard_cache.set(restaurant_id, key, load(), generation)
+        body, headers["ETag"] = entry[:2]
+        if_none_match = self.headers.get("If-None-Match") or ""
+        if entry[1] in (tag.strip() for tag in if_none_match.split(",")):
+            return 304, b"", headers
+        return 200, body, headers
+
+    @staticmethod
+    def local_range(query: Dict[str, str]) -> Tuple[date, date]:
+        """localRangeError in dashboard.routes.ts"""
+        start, end = parse_local_date(query.get("startDate")), parse_local_date(query.get("endDate"))
+        if start is None or end is None:
+            raise ApiError(400, "startDate and endDate must be YYYY-MM-DD dates")
+        if start > end:
+            raise ApiError(400, "startDate must not be after endDate")
+        return start, end
+
+    def dashboard_stats(self, restaurant, params, query):
+        start_date, end_date = query.get("startDate"), query.get("endDate")
+        start, end = parse_local_date(start_date), parse_local_date(end_date)
+        if start and end and start > end:
+            raise ApiError(400, "startDate must not be after endDate")
+        try:
+            return self.send_cached(restaurant["id"], f"stats|{start_date or ''}|{end_date or ''}",
+                                    lambda: self.store.get_stats(restaurant["id"], start_date, end_date))
+        except ValueError:
+            raise ApiError(500, "Failed to fetch dashboard stats")
+
+    def dashboard_daily_stats(self, restaurant, params, query):
+        start, end = self.local_range(query)
+        if (end - start).days + 1 > MAX_DAILY_RANGE_DAYS:
+            raise ApiError(400, f"Ranges are limited to {MAX_DAILY_RANGE_DAYS} days")
+        return self.send_cached(restaurant["id"], f"stats|daily|{start}|{end}",
+                                lambda: self.store.get_daily_stats(restaurant["id"], start, end))
+
+    def dashboard_top_dishes(self, restaurant, params, query):
+        if "startDate" not in query and "endDate" not in query:
+            today = datetime.now(restaurant_zone(restaurant)).date().isoformat()
+            query = dict(query, startDate=today, endDate=today)
+        start, end = self.local_range(query)
+        return self.send_cached(restaurant["id"], f"top-dishes|{start}|{end}",
+                                lambda: self.store.get_top_dishes(restaurant["id"], start, end))
+
+    def dashboard_frequent_customers(self, restaurant, params, query):
+        return self.send_cached(restaurant["id"], "frequent-customers|",
+                                lambda: self.store.get_frequent_customers(restaurant["id"]))
+
+    def orders_list(self, restaurant, params, query):
+        headers = {}
+        fields, unknown = parse_order_fields(query.get("fields"))
+        if unknown or not fields:
+            raise ApiError(400, f"Unknown order field(s): {', '.join(unknown) or '(none requested)'}")
+        accept = self.headers.get("Accept") or ""
+        ndjson = query.get("format") == "ndjson" or (NDJSON in accept and "application/json" not in accept)
+        if "limit" in query or "cursor" in query:
+            after = decode_order_cursor(query["cursor"]) if query.get("cursor") else None
+            if query.get("cursor") and after is None:
+                raise ApiError(400, "Invalid cursor")
+            try:
+                limit = int(query.get("limit", DEFAULT_ORDER_PAGE_SIZE))
+            except ValueError:
+                limit = 1
+            orders, next_cursor = self.store.list_orders_page(restaurant["id"], query.get("status"), limit, after)
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
+            if ndjson:
+                return self.send_ndjson([orders], fields, headers)
+        elif ndjson:
+            return self.send_ndjson(self.store.iter_order_pages(restaurant["id"], query.get("status")), fields)
+        else:
+            orders = self.store.list_orders(restaurant["id"], query.get("status"))
+        body = b"[" + b",".join(self.store.order_json_bytes(order, fields) for order in orders) + b"]"
+        return 200, body, headers
+
+    def send_ndjson(self, pages, fields: List[str], headers: Optional[Dict[str, str]] = None):
+        """Chunked NDJSON, one chunk per page, compressed and flushed page by page"""
+        encoding = negotiate_encoding(self.headers.get("Accept-Encoding") or "")
+        compressor = StreamCompressor(encoding) if encoding else None
+        self.send_response(200)
+        self.send_header("Content-Type", f"{NDJSON}; charset=utf-8")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            for orders in pages:
+                if not orders:
+                    continue
+                data = b"\n".join(self.store.order_json_bytes(order, fields) for order in orders) + b"\n"
+                self.write_chunk(compressor.compress(data) if compressor else data)
+            if compressor:
+                self.write_chunk(compressor.finish())
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            self.close_connection = self.client_gone = True
+        return None
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.response_bytes += len(data)
+
+    def orders_stream(self, restaurant, params, query):
+        last_event_id = self.headers.get("Last-Event-ID") or query.get("lastEventId")
+        subscriber, replay = self.order_stream.subscribe(restaurant["id"], last_event_id)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache, no-transform")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.write_chunk(b"retry: 3000\n\n" + b"".join(replay))
+            while True:
+                try:
+                    frame = subscriber.get(timeout=self.order_stream.heartbeat)
+                except queue.Empty:
+                    frame = b": ping\n\n"
+                if frame is None:
+                    self.wfile.write(b"0\r\n\r\n")
+                    break
+                self.write_chunk(frame)
+        except OSError:
+            self.client_gone = True
+        finally:
+            self.order_stream.unsubscribe(restaurant["id"], subscriber)
+            self.close_connection = True
+        return None
+
+    def order_detail(self, restaurant, params, query):
+        order = self.store.get_order_detail(restaurant["id"], params["orderNumber"])
+        if order is None:
+            raise ApiError(404, "Order not found")
+        return 200, order
+
+    def order_receipt(self, restaurant, params, query):
+        kinds = [kind.strip() for kind in (query.get("kind") or "").split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in RECEIPT_KINDS]
+        if unknown:
+            raise ApiError(400, f"Unknown receipt kind(s): {', '.join(unknown)}")
+        receipt = self.receipt_cache.get(restaurant["id"], params["orderNumber"], kinds)
+        if receipt is None:
+            raise ApiError(404, "Order not found")
+        body, etag = receipt
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in (tag.strip() for tag in (self.headers.get("If-None-Match") or "").split(",")):
+            return 304, b"", headers
+        return 200, body, headers
+
+    def orders_changes(self, restaurant, params, query):
+        fields, unknown = parse_order_fields(query.get("fields"))
+        if unknown or not fields:
+            raise ApiError(400, f"Unknown order field(s): {', '.join(unknown) or '(none requested)'}")
+        since = decode_sync_version(query["since"]) if query.get("since") else None
+        if query.get("since") and since is None:
+            raise ApiError(400, "Invalid version")
+        try:
+            limit = int(query.get("limit", MAX_ORDER_PAGE_SIZE))
+        except ValueError:
+            limit = 1
+        if "orderNumber" not in fields:
+            fields = ["orderNumber", *fields]
+        return 200, self.store.get_order_changes(restaurant["id"], since, limit, fields)
+
+    def order_status_batch(self, restaurant, params, query):
+        updates = self.read_body().get("updates")
+        if not isinstance(updates, list) or not updates:
+            raise ApiError(400, "updates must be a non-empty array")
+        if len(updates) > MAX_STATUS_BATCH_SIZE:
+            raise ApiError(400, f"At most {MAX_STATUS_BATCH_SIZE} updates per batch")
+        results = self.store.update_order_statuses(restaurant["id"], updates)
+        updated = sum(1 for result in results if result["success"])
+        return 200, {"updated": updated, "failed": len(results) - updated, "results": results}
+
+    def order_status(self, restaurant, params, query):
+        body = self.read_body()
+        if not body.get("status"):
+            raise ApiError(400, "Status is required")
+        return 200, self.store.update_order_status(restaurant["id"], params["orderNumber"],
+                                                   body["status"], body.get("cancellationReason"))
+
+    def menu_items(self, restaurant, params, query):
+        return 200, self.store.get_menu_items(restaurant["id"])
+
+    def menu_add(self, restaurant, params, query):
+        body = self.read_body()
+        if not body.get("name"):
+            raise ApiError(500, "Failed to add menu item")
+        return 201, self.store.add_menu_item(restaurant["id"], body)
+
+    def read_import_items(self) -> List[Any]:
+        """importItems in menu.routes.ts: {"items": [...]} as JSON, or a text/csv upload"""
+        if (self.headers.get("Content-Type") or "").split(";")[0].strip().lower() != "text/csv":
+            items = self.read_body().get("items")
+            if not isinstance(items, list):
+                raise ApiError(400, "items must be a non-empty array")
+            return items
+        length = int(self.headers.get("Content-Length") or 0)
+        text = self.rfile.read(length).decode("utf-8") if length else ""
+        if not text:
+            raise ApiError(400, "CSV body is required")
+        self.request_body = text
+        try:
+            return parse_csv_records(text)
+        except ValueError as error:
+            raise ApiError(400, f"Invalid CSV: {error}")
+
+    def send_import(self, restaurant_id: int, apply: Callable[[int, List[Any]], List[Dict[str, Any]]],
+                    succeeded: str):
+        items = self.read_import_items()
+        if not items:
+            raise ApiError(400, "items must be a non-empty array")
+        if len(items) > MAX_MENU_IMPORT_ROWS:
+            raise ApiError(400, f"At most {MAX_MENU_IMPORT_ROWS} items per import")
+        results = apply(restaurant_id, items)
+        count = sum(1 for result in results if result["success"])
+        return 200, {succeeded: count, "failed": len(results) - count, "results": results}
+
+    def menu_bulk_add(self, restaurant, params, query):
+        return self.send_import(restaurant["id"], self.store.create_menu_items, "created")
+
+    def menu_bulk_update(self, restaurant, params, query):
+        return self.send_import(restaurant["id"], self.store.update_menu_items, "updated")
+
+    def menu_update(self, restaurant, params, query):
+        body = self.read_body()
+        try:
+            return 200, self.store.update_menu_item(restaurant["id"], int(params["itemId"]), body)
+        except (ValueError, LookupError):
+            raise ApiError(500, "Failed to update menu item")
+
+
+def route(method: str, path: str, handler: Callable[..., Any], requires_auth: bool = True,
+          auth: Callable[..., Any] = FakeAPIHandler.authenticate) -> Route:
+    pattern = re.sub(r":(\w+)", r"(?P<\1>[^/]+)", path)
+    return method, re.compile(f"^/api{pattern}$"), handler, auth if requires_auth else None, f"/api{path}"
+
+
+FakeAPIHandler.routes = [
+    route("GET", "/health", FakeAPIHandler.health, requires_auth=False),
+    route("GET", "/stats", FakeAPIHandler.runtime_stats, auth=FakeAPIHandler.authenticate_ops),
+    route("GET", "/metrics", FakeAPIHandler.metrics_text, auth=FakeAPIHandler.authenticate_ops),
+    route("POST", "/auth/login", FakeAPIHandler.login, requires_auth=False),
+    route("GET", "/dashboard/stats", FakeAPIHandler.dashboard_stats),
+    route("GET", "/dashboard/stats/daily", FakeAPIHandler.dashboard_daily_stats),
+    route("GET", "/dashboard/top-dishes", FakeAPIHandler.dashboard_top_dishes),
+    route("GET", "/dashboard/frequent-customers", FakeAPIHandler.dashboard_frequent_customers),
+    route("GET", "/orders/list", FakeAPIHandler.orders_list),
+    route("GET", "/orders/changes", FakeAPIHandler.orders_changes),
+    route("GET", "/orders/stream", FakeAPIHandler.orders_stream, auth=FakeAPIHandler.authenticate_stream),
+    route("GET", "/orders/detail/:orderNumber", FakeAPIHandler.order_detail),
+    route("GET", "/orders/:orderNumber/receipt", FakeAPIHandler.order_receipt),
+    route("PATCH", "/orders/status", FakeAPIHandler.order_status_batch),
+    route("PATCH", "/orders/:orderNumber/status", FakeAPIHandler.order_status),
+    route("GET", "/menu/items", FakeAPIHandler.menu_items),
+    route("POST", "/menu/item", FakeAPIHandler.menu_add),
+    route("PUT", "/menu/item/:itemId", FakeAPIHandler.menu_update),
+    route("POST", "/menu/items/bulk", FakeAPIHandler.menu_bulk_add),
+    route("PATCH", "/menu/items/bulk", FakeAPIHandler.menu_bulk_update),
+]
+
+
+class FakeHTTPServer(ThreadingHTTPServer):
+    # Hundreds of order stream subscribers connect at once; the default backlog of 5 drops SYNs
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class FakeBackend:
+    """Runs the fake API on a background thread; usable as a context manager"""
+
+    def __init__(self, store: Optional[FakeStore] = None, host: str = "127.0.0.1", port: int = 0,
+                 verbose: bool = False, dashboard_cache_ttl: float = 30.0, auth_cache_ttl: float = 60.0,
+                 auth_cache_max: int = 1000, capture_path: Optional[str] = None, receipt_cache_max: int = 2000,
+                 server_timing: bool = True, dashboard_cache_max: int = 1000, ops_token: Optional[str] = None):
+        self.store = store or FakeStore()
+        self.dashboard_cache = DashboardCache(dashboard_cache_ttl, dashboard_cache_max)
+        self.receipt_cache = ReceiptCache(self.store, receipt_cache_max)
+        self.order_stream = OrderStream()
+        self.principal_cache = PrincipalCache(auth_cache_max, auth_cache_ttl)
+        self.lag_monitor = LagMonitor()
+        self.capture = TrafficCapture(capture_path) if capture_path else None
+        self.metrics = Metrics()
+        self.store.deactivation_listeners.append(self.principal_cache.evict)
+        self.store.subscribe(self.dashboard_cache.on_order_event)
+        self.store.subscribe(self.order_stream.on_order_event)
+        self.store.subscribe(self.receipt_cache.on_order_event)
+        handler = type("BoundFakeAPIHandler", (FakeAPIHandler,),
+                       {"store": self.store, "dashboard_cache": self.dashboard_cache,
+                        "order_stream": self.order_stream, "principal_cache": self.principal_cache,
+                        "receipt_cache": self.receipt_cache,
+                        "lag_monitor": self.lag_monitor, "capture": self.capture, "metrics": self.metrics,
+                        "server_timing": server_timing, "ops_token": ops_token, "started_at": time.monotonic()})
+        self.server = FakeHTTPServer((host, port), handler)
+        self.server.verbose = verbose
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "FakeBackend":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.order_stream.close()
+        self.lag_monitor.close()
+        self.receipt_cache.close()
+        self.store.password_hasher.close()
+        self.server.shutdown()
+        self.server.server_close()
+        if self.capture:
+            self.capture.close()
+
+    def __enter__(self) -> "FakeBackend":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any):
+        self.stop()
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser):
+    """Seeding options shared by every tool that starts a local backend"""
+    add_generator_arguments(parser)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0,
+                        help="simulated database round-trip per query")
+    parser.add_argument("--db-connection-limit", type=int, default=10,
+                        help="simulated mysql2 pool size; queries beyond it wait for a connection")
+    parser.add_argument("--top-dishes-source", choices=["rollup", "scan"], default="rollup",
+                        help="serve top dishes from the dish_sales_daily rollup or the old full scan")
+    parser.add_argument("--stats-source", choices=["rollup", "scan"], default="rollup",
+                        help="serve dashboard stats from the order_stats_daily rollup or a scan of the orders")
+    parser.add_argument("--bcrypt-cost", type=int, default=DEFAULT_BCRYPT_COST,
+                        help="BCRYPT_COST; 0 keeps the unsalted SHA-256 logins without rehashing")
+    parser.add_argument("--password-hash-concurrency", type=int, default=DEFAULT_PASSWORD_HASH_CONCURRENCY,
+                        help="PASSWORD_HASH_CONCURRENCY: password hashes running at once")
+    parser.add_argument("--timezone", default=DEFAULT_TIMEZONE,
+                        help="restaurants.timezone of the seeded restaurants (IANA name)")
+
+
+def build_store(args: argparse.Namespace) -> FakeStore:
+    store = FakeStore(db_latency=args.db_latency_ms / 1000.0, top_dishes_source=args.top_dishes_source,
+                      connection_limit=args.db_connection_limit, stats_source=args.stats_source,
+                      timezone_name=args.timezone,
+                      password_hasher=PasswordHasher(args.bcrypt_cost, args.password_hash_concurrency))
+    store.seed(generator_from_args(args))
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the GBC POS API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--dashboard-cache-ttl-ms", type=float, default=30000.0,
+                        help="DASHBOARD_CACHE_TTL_MS; 0 disables the dashboard response cache")
+    parser.add_argument("--dashboard-cache-max", type=int, default=1000,
+                        help="DASHBOARD_CACHE_MAX: cached dashboard responses across all restaurants")
+    parser.add_argument("--auth-cache-ttl-ms", type=float, default=60000.0,
+                        help="AUTH_CACHE_TTL_MS; 0 disables the authenticated restaurant cache")
+    parser.add_argument("--capture", metavar="FILE",
+                        help="TRAFFIC_CAPTURE_FILE: append sanitized request traces for traffic_replay.py")
+    parser.add_argument("--receipt-cache-max", type=int, default=2000,
+                        help="RECEIPT_CACHE_MAX; 0 lays receipts out on every request")
+    parser.add_argument("--no-server-timing", action="store_true",
+                        help="SERVER_TIMING=0: leave Server-Timing out of responses (/api/metrics still records)")
+    parser.add_argument("--ops-token", default=os.environ.get("OPS_TOKEN"),
+                        help="OPS_TOKEN: bearer token for /api/stats and /api/metrics "
+                             "(default $OPS_TOKEN; unset disables them)")
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    backend = FakeBackend(build_store(args), args.host, args.port, args.verbose,
+                          dashboard_cache_ttl=args.dashboard_cache_ttl_ms / 1000.0,
+                          auth_cache_ttl=args.auth_cache_ttl_ms / 1000.0, capture_path=args.capture,
+                          receipt_cache_max=args.receipt_cache_max, server_timing=not args.no_server_timing,
+                          dashboard_cache_max=args.dashboard_cache_max, ops_token=args.ops_token)
+    total_orders = sum(len(orders) for orders in backend.store.orders_by_restaurant.values())
+    print(f"🌱 Seeded {len(backend.store.restaurants)} restaurants, {len(backend.store.dishes)} dishes, "
+          f"{total_orders} orders in {time.perf_counter() - started:.1f}s")
+    print(f"🔗 API Base: {backend.base_url}")
+    print(f"👤 Login: {FIRST_RESTAURANT_USERNAME} / {DEFAULT_PASSWORD} (restaurant {FIRST_RESTAURANT_ID})")
+    try:
+        backend.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.server.server_close()
+        if backend.capture:
+            backend.capture.close()
@@ -80,9 +80,9 @@ const Dashboard = () => {
     try {
       setLoading(true);
       
-      // Format dates for API
-      const startDate = dateRange.from ? format(dateRange.from, 'yyyy-MM-dd 00:00:00') : null;
-      const endDate = dateRange.to ? format(dateRange.to, 'yyyy-MM-dd 23:59:59') : null;
+      // Inclusive local days, answered from the daily stats rollup
+      const startDate = dateRange.from ? format(dateRange.from, 'yyyy-MM-dd') : null;
+      const endDate = dateRange.to ? format(dateRange.to, 'yyyy-MM-dd') : null;
       
       // Fetch dashboard stats
       const statsData = await orderService.getDashboardStats(restaurantId, startDate, endDate);
@@ -1,10 +1,11 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Card, CardContent } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { orderService } from '@/services/order.service';
+import { orderSyncService } from '@/services/orderSync.service';
 import { printerService } from '@/services/printer.service';
 import { useAuth } from '@/context/AuthContext';
 import { formatCurrency, formatRelativeTime } from '@/utils/helpers';
@@ -13,14 +14,54 @@ import { notifyNewOrder, requestNotificationPermission } from '@/utils/notificat
 import { Clock, Phone, MapPin, Package, Printer } from 'lucide-react';
 import { toast } from 'sonner';
 
+// Transform API data to match component expectations
+const transformOrder = (order) => ({
+  id: order.orderNumber,
+  customerName: order.customer?.name || 'Guest',
+  customerPhone: order.customer?.phone || '',
+  deliveryAddress: order.customer?.address || '',
+  status: order.status,
+  total: parseFloat(order.totalAmount) || 0,
+  subtotal: parseFloat(order.totalAmount) || 0,
+  tax: 0,
+  deliveryFee: 0,
+  items: (order.items || []).map(item => ({
+    name: item.dish_name || 'Item',
+    quantity: item.quantity || 1,
+    price: parseFloat(item.unit_price || item.selling_price || 0),
+    modifiers: item.customizations
+      ? Object.entries(item.customizations).map(([key, arr]) => {
+          return `${key}: ${Array.isArray(arr) ? arr.join(', ') : arr}`;
+        })
+      : []
+  })),
+  createdAt: order.createdAt,
+  acceptedAt: order.approvedAt,
+  readyAt: order.readyAt,
+  dispatchedAt: order.dispatchedAt,
+  prepTime: null
+});
+
+const byNewest = (a, b) => new Date(b.createdAt) - new Date(a.createdAt);
+
+// Orders per page of the list; older pages load on request
+const ORDER_PAGE_SIZE = 100;
+
 const OrdersPage = () => {
   const { user } = useAuth();
   const restaurantId = user?.restaurant_id;
   const navigate = useNavigate();
   const [orders, setOrders] = useState([]);
-  const [knownOrderIds, setKnownOrderIds] = useState(new Set());
+  const knownOrderIds = useRef(new Set());
+  // Delta sync position of the list on screen (see orderSyncService.pullChanges)
+  const syncVersion = useRef(null);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState(ORDER_STATUS.ALL);
+  // Cursor of the next, older page of the list (null once it is all loaded)
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Bumped by every full load, so a page requested before it is not appended
+  const listLoads = useRef(0);
 
   useEffect(() => {
     if (restaurantId) {
@@ -29,61 +70,46 @@ const OrdersPage = () => {
       // Request notification permission on mount
       requestNotificationPermission();
       
-      // Auto-refresh orders every 30 seconds
+      // New orders and status changes are pushed over the order stream; each
+      // event pulls just the orders that changed since the last sync
+      const subscription = orderService.subscribeToOrders(() => syncOrders(activeTab));
+
+      // Fall back to syncing every 30 seconds while the stream is down, and
+      // replay status changes made offline as soon as the connection is back
       const interval = setInterval(() => {
-        fetchOrders(activeTab);
+        if (!subscription.isOpen()) syncOrders(activeTab);
       }, 30000);
+      const stopListening = orderSyncService.onReconnect(() => syncOrders(activeTab));
       
-      return () => clearInterval(interval);
+      return () => {
+        clearInterval(interval);
+        stopListening();
+        subscription.close();
+      };
     }
   }, [activeTab, restaurantId]);
 
   const fetchOrders = async (status) => {
     if (!restaurantId) return;
     
+    listLoads.current += 1;
     try {
       setLoading(true);
+      // Send changes queued in an earlier session first, then take the sync
+      // version before the list so later syncs pick up anything in between
+      await orderSyncService.flush(restaurantId);
+      syncVersion.current = (await orderSyncService.pullChanges(null)).version;
+
       const statusFilter = status === ORDER_STATUS.ALL ? null : status;
-      const response = await orderService.getOrders(restaurantId, statusFilter, 100);
-      
-      // Backend returns a plain array of orders (not response.orders)
-      const orderList = Array.isArray(response) ? response : (response.orders || []);
-      
-      // Transform API data to match component expectations
-      const transformedOrders = orderList.map(order => {
-        return {
-          id: order.orderNumber,
-          customerName: order.customer?.name || 'Guest',
-          customerPhone: order.customer?.phone || '',
-          deliveryAddress: order.customer?.address || '',
-          status: order.status,
-          total: parseFloat(order.totalAmount) || 0,
-          subtotal: parseFloat(order.totalAmount) || 0,
-          tax: 0,
-          deliveryFee: 0,
-          items: (order.items || []).map(item => ({
-            name: item.dish_name || 'Item',
-            quantity: item.quantity || 1,
-            price: parseFloat(item.unit_price || item.selling_price || 0),
-            modifiers: item.customizations
-              ? Object.entries(item.customizations).map(([key, arr]) => {
-                  return `${key}: ${Array.isArray(arr) ? arr.join(', ') : arr}`;
-                })
-              : []
-          })),
-          createdAt: order.createdAt,
-          acceptedAt: order.approvedAt,
-          readyAt: order.readyAt,
-          dispatchedAt: order.dispatchedAt,
-          prepTime: null
-        };
-      });
+      const response = await orderService.getOrders(restaurantId, statusFilter, ORDER_PAGE_SIZE);
+      const transformedOrders = response.orders.map(transformOrder);
+      setNextCursor(response.nextCursor);
       
       // Check for new orders and notify (only if we had previous data)
-      if (knownOrderIds.size > 0) {
+      if (knownOrderIds.current.size > 0) {
         const newOrders = transformedOrders.filter(order => 
           order.status === 'pending' && 
-          !knownOrderIds.has(order.id)
+          !knownOrderIds.current.has(order.id)
         );
         
         // Notify for each genuinely new order
@@ -93,28 +119,111 @@ const OrdersPage = () => {
       }
       
       // Update known order IDs
-      const currentOrderIds = new Set(transformedOrders.map(o => o.id));
-      setKnownOrderIds(currentOrderIds);
+      knownOrderIds.current = new Set(transformedOrders.map(o => o.id));
       setOrders(transformedOrders);
     } catch (error) {
       console.error('Error fetching orders:', error);
+      syncVersion.current = null;
       toast.error('Failed to load orders');
       setOrders([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  // Append the next, older page; orders the delta sync already added are kept once
+  const loadMoreOrders = async () => {
+    if (!nextCursor || loadingMore) return;
+    const load = listLoads.current;
+
+    try {
+      setLoadingMore(true);
+      const statusFilter = activeTab === ORDER_STATUS.ALL ? null : activeTab;
+      const response = await orderService.getOrders(restaurantId, statusFilter, ORDER_PAGE_SIZE, nextCursor);
+      if (load !== listLoads.current) return;
+      const older = response.orders.map(transformOrder);
+      older.forEach(order => knownOrderIds.current.add(order.id));
+      setOrders(current => {
+        const shownIds = new Set(current.map(order => order.id));
+        return [...current, ...older.filter(order => !shownIds.has(order.id))].sort(byNewest);
+      });
+      setNextCursor(response.nextCursor);
+    } catch (error) {
+      console.error('Error loading more orders:', error);
+      toast.error('Failed to load more orders');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Replay queued status changes, then merge in what changed on the server
+  // since the last sync instead of reloading the whole list
+  const syncOrders = async (status) => {
+    const { conflicts } = await orderSyncService.flush(restaurantId);
+    conflicts.forEach(result => {
+      toast.error(result.rejected
+        ? `Order ${result.orderNumber} could not be updated: ${result.error}`
+        : `Order ${result.orderNumber} was updated on another device`);
+    });
+
+    if (!syncVersion.current) {
+      fetchOrders(status);
+      return;
+    }
+    try {
+      const { orders: changed, version } = await orderSyncService.pullChanges(syncVersion.current);
+      syncVersion.current = version;
+      mergeOrders(changed.map(transformOrder), status);
+    } catch (error) {
+      // Offline: keep showing the list we have and try again on the next event
+      console.error('Error syncing orders:', error);
+    }
+  };
+
+  const mergeOrders = (changed, status) => {
+    if (changed.length === 0) return;
+
+    changed
+      .filter(order => order.status === 'pending' && !knownOrderIds.current.has(order.id))
+      .forEach(order => notifyNewOrder(order.id, order.customerName, order.total));
+    changed.forEach(order => knownOrderIds.current.add(order.id));
+
+    // Changed orders that left this tab drop out of it
+    const changedIds = new Set(changed.map(order => order.id));
+    const shown = changed.filter(order => status === ORDER_STATUS.ALL || order.status === status);
+    setOrders(current => [...shown, ...current.filter(order => !changedIds.has(order.id))].sort(byNewest));
+  };
+
+  // Status changes show at once and go through the offline queue: sent now,
+  // or replayed when the connection is back (or the restaurant logs in again)
+  const changeStatus = async (orderId, status, cancellationReason) => {
+    const order = orders.find(o => o.id === orderId);
+    setOrders(current => current.map(o => (o.id === orderId ? { ...o, status } : o)));
+
+    const { result } = await orderSyncService.changeStatus(
+      restaurantId, orderId, order?.status, status, cancellationReason
+    );
+    if (result?.conflict && !result.rejected) {
+      toast.error(`Order ${orderId} was updated on another device`);
+    } else if (result && !result.success) {
+      // Put back the status the order had before the change was shown
+      setOrders(current => current.map(o => (o.id === orderId && order ? { ...o, status: order.status } : o)));
+      throw new Error(result.error);
+    }
+    if (result?.order) {
+      mergeOrders([transformOrder(result.order)], activeTab);
+    }
+    return { queued: !result };
+  };
 
   const handleAcceptOrder = async (orderId, e) => {
     if (e) e.stopPropagation();
     if (!restaurantId) return;
     
     try {
-      await orderService.updateOrderStatus(restaurantId, orderId, 'approved', user?.username || 'pos_app');
-      toast.success('Order accepted successfully');
-      // Refresh orders
-      fetchOrders(activeTab);
+      const { queued } = await changeStatus(orderId, 'accepted');
+      toast.success(queued ? 'Order accepted, will sync when back online' : 'Order accepted successfully');
     } catch (error) {
       console.error('Error accepting order:', error);
       toast.error('Failed to accept order');
@@ -129,10 +238,8 @@ const OrdersPage = () => {
     const reason = 'Restaurant declined';
     
     try {
-      await orderService.updateOrderStatus(restaurantId, orderId, 'cancelled', user?.username || 'pos_app');
-      toast.success('Order declined');
-      // Refresh orders
-      fetchOrders(activeTab);
+      const { queued } = await changeStatus(orderId, 'cancelled', reason);
+      toast.success(queued ? 'Order declined, will sync when back online' : 'Order declined');
     } catch (error) {
       console.error('Error declining order:', error);
       toast.error('Failed to decline order');
@@ -144,10 +251,8 @@ const OrdersPage = () => {
     if (!restaurantId) return;
     
     try {
-      await orderService.updateOrderStatus(restaurantId, orderId, 'ready', user?.username || 'pos_app');
-      toast.success('Order marked as ready');
-      // Refresh orders
-      fetchOrders(activeTab);
+      const { queued } = await changeStatus(orderId, 'ready');
+      toast.success(queued ? 'Order marked as ready, will sync when back online' : 'Order marked as ready');
     } catch (error) {
       console.error('Error marking order ready:', error);
       toast.error('Failed to mark order as ready');
@@ -159,10 +264,8 @@ const OrdersPage = () => {
     if (!restaurantId) return;
     
     try {
-      await orderService.updateOrderStatus(restaurantId, orderId, 'dispatched', user?.username || 'pos_app');
-      toast.success('Order dispatched');
-      // Refresh orders
-      fetchOrders(activeTab);
+      const { queued } = await changeStatus(orderId, 'dispatched');
+      toast.success(queued ? 'Order dispatched, will sync when back online' : 'Order dispatched');
     } catch (error) {
       console.error('Error dispatching order:', error);
       toast.error('Failed to dispatch order');
@@ -364,6 +467,16 @@ const OrdersPage = () => {
                   </CardContent>
                 </Card>
               ))}
+              {nextCursor && (
+                <Button
+                  variant="outline"
+                  onClick={loadMoreOrders}
+                  disabled={loadingMore}
+                  data-testid="load-more-orders"
+                >
+                  {loadingMore ? 'Loading...' : 'Load older orders'}
+                </Button>
+              )}
             </div>
           )}
         </TabsContent>
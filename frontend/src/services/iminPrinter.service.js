@@ -23,6 +23,7 @@ class IminPrinterService {
     this.config = {
       paperWidth: 80, // mm (80mm thermal paper)
       fontSize: 28,
+      lineFontSize: 24, // 32 characters per line, the width of backend receipt lines
       textAlignment: 0, // 0=left, 1=center, 2=right
       barCodeHeight: 162,
       barCodeWidth: 2,
@@ -447,6 +448,57 @@ class IminPrinterService {
     }
   }
 
+  /**
+   * Print receipt lines laid out by the backend (GET /orders/:orderNumber/receipt)
+   * Sent as a single text block, so the printer gets one call instead of one per line
+   */
+  async printLines(lines) {
+    try {
+      if (this.isPrinterAvailable()) {
+        await this.printer.enterPrinterBuffer(false);
+      }
+
+      await this.setAlignment(0);
+      await this.setTextSize(this.config.lineFontSize);
+      await this.setTextStyle(false);
+      await this.printText(`${lines.join('\n')}\n`);
+      await this.feedPaper(2);
+      await this.cutPaper(false);
+
+      if (this.isPrinterAvailable()) {
+        await this.printer.commitPrinterBuffer();
+      }
+
+      return { success: true, mock: !this.isPrinterAvailable() };
+    } catch (error) {
+      console.error('[iMin Printer] Print lines error:', error);
+
+      if (this.isPrinterAvailable()) {
+        try {
+          await this.printer.exitPrinterBuffer(false);
+        } catch (e) {
+          console.error('[iMin Printer] Error exiting buffer:', e);
+        }
+      }
+
+      return { success: false, error: error.message };
+    }
+  }
+
+  /**
+   * Print the backend's lines for an order's receipt, or lay it out locally
+   * when they cannot be fetched (older backend, offline)
+   */
+  async printOrderReceipt(order, kind, type) {
+    try {
+      const lines = await orderService.getOrderReceipt(order.orderNumber, kind);
+      return await this.printLines(lines);
+    } catch (error) {
+      console.warn(`[iMin Printer] Falling back to local ${type} receipt layout:`, error.message);
+      return await this.printReceipt(this.formatOrderForReceipt(order, type));
+    }
+  }
+
   /**
    * Print test page
    */
@@ -482,24 +534,21 @@ class IminPrinterService {
    * Print kitchen receipt (wrapper for printReceipt with kitchen type)
    */
   async printKitchenReceipt(order) {
-    const receiptData = this.formatOrderForReceipt(order, 'kitchen');
-    return await this.printReceipt(receiptData);
+    return await this.printOrderReceipt(order, 'kitchen', 'kitchen');
   }
 
   /**
    * Print delivery receipt (wrapper for printReceipt with delivery type)
    */
   async printDeliveryReceipt(order) {
-    const receiptData = this.formatOrderForReceipt(order, 'delivery');
-    return await this.printReceipt(receiptData);
+    return await this.printOrderReceipt(order, 'bag', 'delivery');
   }
 
   /**
    * Print customer receipt
    */
   async printCustomerReceipt(order) {
-    const receiptData = this.formatOrderForReceipt(order, 'customer');
-    return await this.printReceipt(receiptData);
+    return await this.printOrderReceipt(order, 'customer', 'customer');
   }
 
   /**
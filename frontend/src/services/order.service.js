@@ -1,20 +1,57 @@
-import { apiClient } from './api';
+import { apiClient, getBackendUrl } from './api';
 
 export const orderService = {
-  // Get all orders with optional status filter
-  getOrders: async (restaurantId, status = null, limit = 100) => {
+  // Get the newest orders with optional status filter, one page at a time
+  getOrders: async (restaurantId, status = null, limit = 100, cursor = null) => {
     try {
       const params = {};
       if (status) params.status = status;
+      if (limit) params.limit = limit;
+      if (cursor) params.cursor = cursor;
       // Backend gets restaurant ID from JWT token, no need to send it
       const response = await apiClient.get('/orders/list', { params });
-      return { orders: response.data }; // Wrap in orders object for compatibility
+      // Wrap in orders object for compatibility; pass nextCursor back to load older orders
+      return { orders: response.data, nextCursor: response.headers['x-next-cursor'] || null };
     } catch (error) {
       console.error('getOrders error:', error);
       throw new Error(error.response?.data?.error || error.response?.data?.message || 'Failed to fetch orders');
     }
   },
 
+  // Orders created or changed since a sync version: { orders, version,
+  // serverTime, hasMore }. Without one, just the current version.
+  getOrderChanges: async (since = null) => {
+    try {
+      const response = await apiClient.get('/orders/changes', { params: since ? { since } : {} });
+      return response.data;
+    } catch (error) {
+      console.error('getOrderChanges error:', error);
+      throw new Error(error.response?.data?.error || error.response?.data?.message || 'Failed to fetch order changes');
+    }
+  },
+
+  // Subscribe to pushed order events (new orders and status changes). EventSource
+  // reconnects on its own and resumes from the last event id it received; a
+  // 'reset' event means events were missed and the list should be refetched.
+  subscribeToOrders: (onEvent, onReset = onEvent) => {
+    const token = localStorage.getItem('auth_token');
+    const source = new EventSource(
+      `${getBackendUrl()}/api/orders/stream?access_token=${encodeURIComponent(token || '')}`
+    );
+    source.addEventListener('order', (event) => {
+      try {
+        onEvent(JSON.parse(event.data));
+      } catch (error) {
+        console.error('Order stream event error:', error);
+      }
+    });
+    source.addEventListener('reset', () => onReset(null));
+    return {
+      close: () => source.close(),
+      isOpen: () => source.readyState === EventSource.OPEN
+    };
+  },
+
   // Get order by order number
   getOrderByNumber: async (restaurantId, orderNumber) => {
     try {
@@ -29,6 +66,19 @@ export const orderService = {
     }
   },
 
+  // Printer-ready lines for one receipt ('kitchen', 'bag' or 'customer'), laid
+  // out by the backend when the order last changed status; 32 characters wide (58mm)
+  getOrderReceipt: async (orderNumber, kind) => {
+    try {
+      const encodedOrderNumber = encodeURIComponent(orderNumber);
+      const response = await apiClient.get(`/orders/${encodedOrderNumber}/receipt`, { params: { kind } });
+      return response.data.receipts[kind];
+    } catch (error) {
+      console.error('getOrderReceipt error:', error);
+      throw new Error(error.response?.data?.error || error.response?.data?.message || 'Failed to fetch receipt');
+    }
+  },
+
   // Accept order
   acceptOrder: async (orderId, prepTime) => {
     try {
@@ -65,6 +115,18 @@ export const orderService = {
     }
   },
 
+  // Update several orders in one request, e.g. marking a batch as ready.
+  // updates: [{ orderNumber, status, cancellationReason }]; returns per-order results.
+  // Replays of offline changes also send fromStatus and changedAt (see orderSync.service)
+  updateOrderStatuses: async (updates) => {
+    try {
+      const response = await apiClient.patch('/orders/status', { updates });
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.error || error.response?.data?.message || 'Failed to update order statuses');
+    }
+  },
+
   // Get dashboard statistics
   getDashboardStats: async (restaurantId, startDate = null, endDate = null) => {
     try {
@@ -0,0 +1,152 @@
+import { orderService } from './order.service';
+
+const MAX_REPLAY_BATCH = 100;
+
+// Server time minus local time, as of the last delta sync. Queued changes are
+// stamped in server time so the backend can order them against its own.
+let clockOffsetMs = 0;
+
+// Answers to the changes whose changeStatus call is still waiting, by entry id.
+// Filled by whichever replay sends the change, which may be an earlier one.
+const answered = new Map();
+
+// One queue per restaurant: a tablet shared by several restaurants only
+// replays a restaurant's changes while that restaurant is logged in
+const queueKey = (restaurantId) => `order_status_queue:${restaurantId}`;
+
+const readQueue = (restaurantId) => {
+  try {
+    return JSON.parse(localStorage.getItem(queueKey(restaurantId))) || [];
+  } catch {
+    return [];
+  }
+};
+
+const writeQueue = (restaurantId, queue) => localStorage.setItem(queueKey(restaurantId), JSON.stringify(queue));
+
+const settle = (outcome, entry, result) => {
+  if (answered.has(entry.id)) answered.set(entry.id, result);
+  outcome.results.push(result);
+  if (result.conflict) outcome.conflicts.push(result);
+};
+
+// Send queued changes, oldest first and at most one per order per request so an
+// order's later changes are replayed after its earlier ones. Every answered
+// change leaves the queue: applied, already applied (unchanged), lost to a newer
+// change on the server (conflict) or for an order that no longer exists.
+//
+// A request that never reached the server (offline) leaves the queue as it is
+// for the next attempt, and so does a 401: the changes are replayed once the
+// restaurant has logged in again. When the server refuses a request outright,
+// the batch is retried one change at a time and the changes it still refuses
+// are dropped and reported as conflicts, so one bad change cannot hold up the
+// rest of the queue.
+const replayQueue = async (restaurantId) => {
+  const outcome = { results: [], conflicts: [], offline: false };
+  let batchSize = MAX_REPLAY_BATCH;
+  while (true) {
+    const seen = new Set();
+    const batch = readQueue(restaurantId)
+      .filter(entry => !seen.has(entry.orderNumber) && seen.add(entry.orderNumber))
+      .slice(0, batchSize);
+    if (batch.length === 0) return outcome;
+
+    let response;
+    try {
+      response = await orderService.updateOrderStatuses(
+        batch.map(({ orderNumber, fromStatus, status, cancellationReason, changedAt }) => ({
+          orderNumber, fromStatus, status, cancellationReason, changedAt
+        }))
+      );
+    } catch (error) {
+      console.error('Order status replay error:', error);
+      if (!error.response) {
+        outcome.offline = true;
+        return outcome;
+      }
+      if (error.response.status === 401) return outcome;
+      if (batch.length > 1) {
+        batchSize = 1;
+        continue;
+      }
+      writeQueue(restaurantId, readQueue(restaurantId).filter(entry => entry.id !== batch[0].id));
+      settle(outcome, batch[0], {
+        orderNumber: batch[0].orderNumber,
+        success: false,
+        conflict: true,
+        rejected: true,
+        error: error.response.data?.error || `Request failed with status ${error.response.status}`
+      });
+      continue;
+    }
+
+    const sent = new Set(batch.map(entry => entry.id));
+    writeQueue(restaurantId, readQueue(restaurantId).filter(entry => !sent.has(entry.id)));
+    // Results come back in the order the changes were sent
+    response.results.forEach((result, index) => settle(outcome, batch[index], result));
+  }
+};
+
+let flushing = Promise.resolve();
+
+export const orderSyncService = {
+  // Queue a status change made on this tablet and try to send it straight away.
+  // fromStatus is the status the order had on screen when it was changed.
+  // Resolves to the replay outcome plus this change's own result, which is
+  // null while the change is still queued.
+  changeStatus: async (restaurantId, orderNumber, fromStatus, status, cancellationReason) => {
+    const id = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    const queue = readQueue(restaurantId);
+    queue.push({
+      id,
+      orderNumber,
+      fromStatus,
+      status,
+      cancellationReason,
+      changedAt: new Date(Date.now() + clockOffsetMs).toISOString()
+    });
+    answered.set(id, null);
+    writeQueue(restaurantId, queue);
+    try {
+      const outcome = await orderSyncService.flush(restaurantId);
+      return { ...outcome, result: answered.get(id) };
+    } finally {
+      answered.delete(id);
+    }
+  },
+
+  // Replay a restaurant's queued changes; calls made while a replay is running
+  // wait for it and then replay whatever was queued meanwhile
+  flush: (restaurantId) => {
+    const run = flushing.then(() => replayQueue(restaurantId));
+    flushing = run.catch(() => {});
+    return run;
+  },
+
+  pendingCount: (restaurantId) => readQueue(restaurantId).length,
+
+  // Orders created or changed since version, following hasMore, and the version
+  // to continue from. Without a version only the current one is returned: take
+  // it before loading the full list so nothing in between is missed.
+  pullChanges: async (version) => {
+    // An order changed again between pages comes back once, as it is now
+    const orders = new Map();
+    let changes;
+    do {
+      changes = await orderService.getOrderChanges(version);
+      clockOffsetMs = new Date(changes.serverTime).getTime() - Date.now();
+      changes.orders.forEach(order => {
+        orders.delete(order.orderNumber);
+        orders.set(order.orderNumber, order);
+      });
+      version = changes.version;
+    } while (changes.hasMore);
+    return { orders: [...orders.values()], version };
+  },
+
+  // Called when the browser regains connectivity; returns an unsubscribe function
+  onReconnect: (callback) => {
+    window.addEventListener('online', callback);
+    return () => window.removeEventListener('online', callback);
+  }
+};
@@ -1,7 +1,18 @@
 // Receipt generation service following EXACT formats provided
 import { formatCurrency } from '@/utils/helpers';
+import { orderService } from './order.service';
 
 export const receiptService = {
+
+  // Receipt lines prepared by the backend, or null to lay the receipt out here
+  fetchReceiptLines: async (order, kind) => {
+    try {
+      return await orderService.getOrderReceipt(order.orderNumber, kind);
+    } catch (error) {
+      console.warn(`Falling back to local ${kind} receipt layout:`, error.message);
+      return null;
+    }
+  },
   
   // Generate Kitchen Receipt - EXACT format from image 2
   generateKitchenReceipt: (order, restaurant) => {
@@ -162,7 +173,8 @@ Total                       ${formatCurrency(order.total)}
         address: "Restaurant Address"
       };
       
-      const receipt = receiptService.generateKitchenReceipt(order, restaurant);
+      const lines = await receiptService.fetchReceiptLines(order, 'kitchen');
+      const receipt = lines ? lines.join('\n') : receiptService.generateKitchenReceipt(order, restaurant);
       
       // For web testing - show in console and create download
       console.log('=== KITCHEN RECEIPT ===');
@@ -207,7 +219,8 @@ Total                       ${formatCurrency(order.total)}
         address: "Restaurant Address"
       };
       
-      const receipt = receiptService.generateDeliveryReceipt(order, restaurant);
+      const lines = await receiptService.fetchReceiptLines(order, 'bag');
+      const receipt = lines ? lines.join('\n') : receiptService.generateDeliveryReceipt(order, restaurant);
       
       // For web testing - show in console and create download
       console.log('DELIVERY RECEIPT:\n' + receipt);
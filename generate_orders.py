@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Synthetic order history generator for GBC POS scale testing
+Streams realistic restaurants, dishes and order_management rows as bulk SQL or
+CSV files without holding the history in memory. Output is deterministic for a
+given seed and end time, so benchmark datasets can be rebuilt exactly.
+"""
+
+import argparse
+import bisect
+import csv
+import hashlib
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_PASSWORD = "Password@123"
+FIRST_RESTAURANT_ID = 196
+FIRST_RESTAURANT_USERNAME = "thecurryvault"
+
+MENU_SECTIONS = ["Starters", "Curries", "Tandoor", "Biryani", "Breads", "Sides", "Desserts", "Drinks"]
+DISH_WORDS = ["Butter", "Chicken", "Lamb", "Paneer", "Tikka", "Masala", "Korma", "Saag", "Madras",
+              "Vindaloo", "Dal", "Aloo", "Gobi", "Naan", "Samosa", "Bhaji", "Jalfrezi", "Rogan"]
+VEG_WORDS = ("Paneer", "Dal", "Aloo", "Gobi", "Saag")
+FIRST_NAMES = ["Aisha", "Ben", "Chloe", "Dev", "Ella", "Farhan", "Grace", "Hari", "Isla", "Jack",
+               "Kiran", "Leo", "Maya", "Noah", "Olivia", "Priya", "Ravi", "Sara", "Tom", "Zara"]
+LAST_NAMES = ["Ahmed", "Brown", "Clarke", "Das", "Evans", "Khan", "Patel", "Singh", "Smith", "Taylor"]
+STREETS = ["High Street", "Station Road", "Church Lane", "Park Avenue", "Mill Road", "King Street"]
+KITCHEN_NOTES = [None, None, None, None, "No onions", "Extra spicy", "Mild please", "Nut allergy"]
+CANCEL_REASONS = ["Customer request", "Item unavailable", "Restaurant busy", "Payment failed"]
+
+# Share of a day's orders placed in each hour (lunch and dinner peaks)
+HOURLY_WEIGHTS = [0.2, 0.1, 0.05, 0.02, 0.02, 0.05, 0.2, 0.5, 0.8, 0.9, 1.2, 2.5,
+                  4.0, 3.5, 1.8, 1.2, 1.5, 3.0, 5.5, 6.5, 5.0, 3.0, 1.5, 0.6]
+HOURLY_CUM_WEIGHTS = list(accumulate(HOURLY_WEIGHTS))
+# Monday .. Sunday volume multipliers
+WEEKDAY_WEIGHTS = [0.8, 0.85, 0.9, 1.0, 1.35, 1.5, 1.2]
+
+RESTAURANT_COLUMNS = ["id", "username", "email", "password_hash", "status", "is_active", "created_at"]
+DISH_COLUMNS = ["dish_id", "restaurant_id", "name", "slug", "selling_price", "description", "primary_image",
+                "availability_status", "menu_section", "is_active", "is_deleted", "created_at", "food_type"]
+ORDER_COLUMNS = ["order_id", "restaurant_id", "order_number", "fulfillment_status", "customer",
+                 "customer_email", "customer_phone", "customer_address", "total_amount", "created_at",
+                 "approved_at", "ready_at", "dispatched_at", "delivery_date", "cancelled_at", "cancel_reason",
+                 "kitchen_notes", "product_details", "delivery_method", "payment_method", "payment_status"]
+
+
+class OrderHistoryGenerator:
+    """Deterministic, streaming source of MySQL-shaped rows.
+
+    Orders are produced oldest first, one day at a time, so memory stays
+    proportional to a single day's volume. Dish popularity follows a Zipf
+    distribution, customers are drawn from a power-law pool so a minority
+    orders repeatedly, and statuses depend on the order's age at ``end``.
+    """
+
+    def __init__(self, restaurants: int = 1, dishes: int = 40, orders: int = 1000, days: int = 90,
+                 seed: int = 42, end: Optional[datetime] = None, live_orders: int = 5,
+                 customers: Optional[int] = None, zipf_exponent: float = 1.1):
+        self.restaurants = restaurants
+        self.dishes = dishes
+        self.orders = orders
+        self.days = max(days, 1)
+        self.seed = seed
+        self.end = (end or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        # Whole calendar days, the last of which is the (partial) current day
+        self.start = (self.end - timedelta(days=self.days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.live_orders = live_orders
+        self.customers = customers or max(orders // max(restaurants, 1) // 4, 10)
+        self.zipf_exponent = zipf_exponent
+        self.restaurant_ids = [FIRST_RESTAURANT_ID + index for index in range(restaurants)]
+        self._menus: Dict[int, List[Dict[str, Any]]] = {}
+
+    def _rng(self, *scope: Any) -> random.Random:
+        """Independent stream per scope so changing one table never reshuffles another"""
+        return random.Random(f"{self.seed}:" + ":".join(str(part) for part in scope))
+
+    # ----- restaurants and dishes ---------------------------------------
+
+    def restaurant_rows(self) -> Iterator[Dict[str, Any]]:
+        password_hash = hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()
+        for restaurant_id in self.restaurant_ids:
+            username = (FIRST_RESTAURANT_USERNAME if restaurant_id == FIRST_RESTAURANT_ID
+                        else f"restaurant{restaurant_id}")
+            yield {
+                "id": restaurant_id,
+                "username": username,
+                "email": f"orders@{username}.example",
+                "password_hash": password_hash,
+                "status": "approved",
+                "is_active": 1,
+                "created_at": self.start - timedelta(days=30),
+            }
+
+    def menu(self, restaurant_id: int) -> List[Dict[str, Any]]:
+        """Dish rows for one restaurant (small, so cached for order generation)"""
+        if restaurant_id in self._menus:
+            return self._menus[restaurant_id]
+
+        rng = self._rng("menu", restaurant_id)
+        combos = len(DISH_WORDS) * (len(DISH_WORDS) - 1)
+        first_dish_id = self.restaurant_ids.index(restaurant_id) * self.dishes + 1
+        menu = []
+        for index, combo in enumerate(rng.sample(range(combos), k=min(self.dishes, combos))
+                                      + list(range(combos, self.dishes))):
+            first, second = divmod(combo % combos, len(DISH_WORDS) - 1)
+            second += second >= first
+            name = f"{DISH_WORDS[first]} {DISH_WORDS[second]}"
+            if combo >= combos:
+                name += f" {combo // combos + 1}"
+            dish_id = first_dish_id + index
+            section = rng.choice(MENU_SECTIONS)
+            available = rng.random() > 0.08
+            menu.append({
+                "dish_id": dish_id,
+                "restaurant_id": restaurant_id,
+                "name": name,
+                "slug": name.lower().replace(" ", "-") + f"-{dish_id}",
+                "selling_price": f"{round(rng.uniform(2.5, 18.0) * 2) / 2 - 0.01:.2f}",
+                "description": f"{name} from the {section.lower()} menu",
+                "primary_image": "",
+                "availability_status": "available" if available else "unavailable",
+                "menu_section": section,
+                "is_active": 1 if available else 0,
+                "is_deleted": 0,
+                "created_at": self.start - timedelta(days=rng.randint(1, 30)),
+                "food_type": "veg" if any(word in name for word in VEG_WORDS) else "non-veg",
+            })
+        self._menus[restaurant_id] = menu
+        return menu
+
+    def dish_rows(self) -> Iterator[Dict[str, Any]]:
+        for restaurant_id in self.restaurant_ids:
+            yield from self.menu(restaurant_id)
+
+    # ----- customers ----------------------------------------------------
+
+    @staticmethod
+    def customer(restaurant_id: int, customer_id: int) -> Dict[str, str]:
+        """Customer attributes derived from the id, so the pool never has to be stored"""
+        mixed = (customer_id * 2654435761 + restaurant_id * 40503) & 0xFFFFFFFF
+        first = FIRST_NAMES[mixed % len(FIRST_NAMES)]
+        last = LAST_NAMES[(mixed // 20) % len(LAST_NAMES)]
+        initial = chr(ord("A") + (mixed // 200) % 26)
+        return {
+            "name": f"{first} {initial}. {last}",
+            "email": f"{first.lower()}.{last.lower()}{customer_id}@example.com",
+            "phone": f"07{(mixed * 7919) % 1_000_000_000:09d}",
+            "address": f"{customer_id % 200 + 1} {STREETS[(mixed // 5200) % len(STREETS)]}",
+        }
+
+    # ----- orders -------------------------------------------------------
+
+    def _daily_counts(self) -> List[int]:
+        """Split the historical order total across days by weekday weight (largest remainder)"""
+        historical = max(self.orders - self.live_orders * self.restaurants, 0)
+        weights = [WEEKDAY_WEIGHTS[(self.start + timedelta(days=day)).weekday()] for day in range(self.days)]
+        total_weight = sum(weights)
+        shares = [historical * weight / total_weight for weight in weights]
+        counts = [int(share) for share in shares]
+        by_remainder = sorted(range(self.days), key=lambda day: shares[day] - counts[day], reverse=True)
+        for day in by_remainder[:historical - sum(counts)]:
+            counts[day] += 1
+        return counts
+
+    def _timestamps(self, rng: random.Random, day: int, count: int) -> List[datetime]:
+        day_start = self.start + timedelta(days=day)
+        # The last three hours belong to the live orders
+        cutoff = self.end - timedelta(hours=3)
+        stamps = []
+        for _ in range(count):
+            hour = bisect.bisect(HOURLY_CUM_WEIGHTS, rng.random() * HOURLY_CUM_WEIGHTS[-1])
+            stamp = day_start + timedelta(hours=hour, seconds=rng.randrange(3600))
+            if stamp > cutoff:
+                stamp = day_start + timedelta(seconds=rng.uniform(0, max((cutoff - day_start).total_seconds(), 0)))
+            stamps.append(min(stamp, cutoff))
+        return sorted(stamps)
+
+    def _order(self, rng: random.Random, restaurant_id: int, created_at: datetime,
+               dish_cum_weights: List[float]) -> Dict[str, Any]:
+        menu = self.menu(restaurant_id)
+        picks = {bisect.bisect(dish_cum_weights, rng.random() * dish_cum_weights[-1])
+                 for _ in range(rng.choices((1, 2, 3, 4, 5), (30, 35, 20, 10, 5))[0])}
+        items = []
+        for index in sorted(picks):
+            dish = menu[min(index, len(menu) - 1)]
+            items.append({
+                "dish_id": dish["dish_id"],
+                "dish_name": dish["name"],
+                "quantity": rng.choices((1, 2, 3), (75, 20, 5))[0],
+                "selling_price": dish["selling_price"],
+            })
+        total = sum(float(item["selling_price"]) * item["quantity"] for item in items)
+
+        # Low ids are drawn far more often, giving a long tail of one-off customers
+        customer_id = int(self.customers * rng.random() ** 3) + 1
+        customer = self.customer(restaurant_id, customer_id)
+
+        age = self.end - created_at
+        if age < timedelta(minutes=20):
+            status = rng.choices(("pending", "approved", "ready"), (60, 30, 10))[0]
+        elif age < timedelta(hours=3):
+            status = rng.choices(("approved", "ready", "dispatched", "completed", "cancelled"),
+                                 (20, 20, 20, 35, 5))[0]
+        else:
+            status = "cancelled" if rng.random() < 0.04 else "completed"
+
+        row = {
+            "order_id": 0,
+            "restaurant_id": restaurant_id,
+            "order_number": "",
+            "fulfillment_status": status,
+            "customer": customer["name"],
+            "customer_email": customer["email"],
+            "customer_phone": customer["phone"],
+            "customer_address": customer["address"],
+            "total_amount": f"{total:.2f}",
+            "created_at": created_at,
+            "approved_at": None,
+            "ready_at": None,
+            "dispatched_at": None,
+            "delivery_date": None,
+            "cancelled_at": None,
+            "cancel_reason": None,
+            "kitchen_notes": rng.choice(KITCHEN_NOTES),
+            "product_details": json.dumps(items),
+            "delivery_method": "delivery" if rng.random() < 0.6 else "collection",
+            "payment_method": "card" if rng.random() < 0.8 else "cash",
+            "payment_status": "paid",
+        }
+        if status == "cancelled":
+            row["cancelled_at"] = created_at + timedelta(minutes=rng.randint(1, 15))
+            row["cancel_reason"] = rng.choice(CANCEL_REASONS)
+        elif status != "pending":
+            row["approved_at"] = created_at + timedelta(minutes=rng.randint(1, 5))
+            if status in ("ready", "dispatched", "completed"):
+                row["ready_at"] = row["approved_at"] + timedelta(minutes=rng.randint(10, 30))
+            if status in ("dispatched", "completed") and row["delivery_method"] == "delivery":
+                row["dispatched_at"] = row["ready_at"] + timedelta(minutes=rng.randint(1, 10))
+            if status == "completed":
+                row["delivery_date"] = row["ready_at"] + timedelta(minutes=rng.randint(10, 40))
+        return row
+
+    def order_rows(self) -> Iterator[Dict[str, Any]]:
+        """All orders across restaurants, oldest first, with sequential order ids"""
+        dish_weights = {}
+        for restaurant_id in self.restaurant_ids:
+            menu = self.menu(restaurant_id)
+            ranks = list(range(1, len(menu) + 1))
+            self._rng("popularity", restaurant_id).shuffle(ranks)
+            dish_weights[restaurant_id] = list(accumulate(1.0 / rank ** self.zipf_exponent for rank in ranks))
+
+        next_order_id = 1
+        counts = self._daily_counts()
+        streams = {restaurant_id: self._rng("orders", restaurant_id) for restaurant_id in self.restaurant_ids}
+        for day in range(self.days + 1):
+            per_restaurant = []
+            for position, restaurant_id in enumerate(self.restaurant_ids):
+                rng = streams[restaurant_id]
+                if day < self.days:
+                    # Spread the day's total over restaurants, earlier ones taking the remainder
+                    count = counts[day] // self.restaurants + (position < counts[day] % self.restaurants)
+                    stamps = self._timestamps(rng, day, count)
+                else:
+                    # Roughly 40% of live orders are fresh enough to still be pending
+                    stamps = sorted(self.end - timedelta(seconds=rng.uniform(0, 20 * 60) if rng.random() < 0.4
+                                                         else rng.uniform(20 * 60, 3 * 3600))
+                                    for _ in range(self.live_orders))
+                per_restaurant.append([self._order(rng, restaurant_id, stamp, dish_weights[restaurant_id])
+                                       for stamp in stamps])
+
+            for row in heapq.merge(*per_restaurant, key=lambda order: order["created_at"]):
+                row["order_id"] = next_order_id
+                row["order_number"] = f"#GBC{next_order_id}"
+                next_order_id += 1
+                yield row
+
+
+def format_value(value: Any) -> Optional[str]:
+    """Column value as MySQL text (naive UTC DATETIME for timestamps)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def sql_literal(value: Any) -> str:
+    text = format_value(value)
+    if text is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return text
+    return "'" + text.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def write_sql(path: str, table: str, columns: Sequence[str], rows: Iterable[Dict[str, Any]],
+              batch_size: int = 1000) -> int:
+    """Write rows as multi-row INSERT statements; returns the row count"""
+    count = 0
+    with open(path, "w") as f:
+        f.write(f"-- {table}: generated by generate_orders.py\n")
+        column_list = ", ".join(columns)
+        batch: List[str] = []
+        for row in rows:
+            batch.append("(" + ", ".join(sql_literal(row[column]) for column in columns) + ")")
+            count += 1
+            if len(batch) >= batch_size:
+                f.write(f"INSERT INTO {table} ({column_list}) VALUES\n" + ",\n".join(batch) + ";\n")
+                batch = []
+        if batch:
+            f.write(f"INSERT INTO {table} ({column_list}) VALUES\n" + ",\n".join(batch) + ";\n")
+    return count
+
+
+def write_csv(path: str, columns: Sequence[str], rows: Iterable[Dict[str, Any]]) -> int:
+    """Write rows as CSV with a header; NULL is written as \\N for LOAD DATA INFILE"""
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["\\N" if row[column] is None else format_value(row[column]) for column in columns])
+            count += 1
+    return count
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser):
+    """Dataset shape options shared by the generator and the tools built on it"""
+    parser.add_argument("--restaurants", type=int, default=1, help="restaurants (the first is the test account)")
+    parser.add_argument("--dishes", type=int, default=40, help="dishes per restaurant")
+    parser.add_argument("--orders", type=int, default=1000, help="orders across all restaurants")
+    parser.add_argument("--days", type=int, default=90, help="days of order history")
+    parser.add_argument("--live-orders", type=int, default=5,
+                        help="orders per restaurant from the last three hours, most still in progress")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for reproducible data")
+
+
+def generator_from_args(args: argparse.Namespace, end: Optional[datetime] = None) -> OrderHistoryGenerator:
+    return OrderHistoryGenerator(restaurants=args.restaurants, dishes=args.dishes, orders=args.orders,
+                                 days=args.days, seed=args.seed, end=end, live_orders=args.live_orders)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic GBC POS order history")
+    add_generator_arguments(parser)
+    parser.add_argument("--end", help="end of the history as YYYY-MM-DD[THH:MM] UTC (default: now); "
+                                      "fix it to make runs byte-for-byte reproducible")
+    parser.add_argument("--format", choices=("sql", "csv"), default="sql")
+    parser.add_argument("--out-dir", default="generated_data")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per INSERT statement")
+    args = parser.parse_args()
+
+    end = None
+    if args.end:
+        end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc)
+    generator = generator_from_args(args, end)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    tables = [
+        ("restaurants", RESTAURANT_COLUMNS, generator.restaurant_rows()),
+        ("dishes", DISH_COLUMNS, generator.dish_rows()),
+        ("order_management", ORDER_COLUMNS, generator.order_rows()),
+    ]
+    print(f"🌱 Generating {args.orders} orders for {args.restaurants} restaurants over {args.days} days "
+          f"(seed {args.seed}, end {generator.end:%Y-%m-%d %H:%M} UTC)")
+    for table, columns, rows in tables:
+        started = time.perf_counter()
+        path = os.path.join(args.out_dir, f"{table}.{args.format}")
+        if args.format == "sql":
+            count = write_sql(path, table, columns, rows, args.batch_size)
+        else:
+            count = write_csv(path, columns, rows)
+        elapsed = time.perf_counter() - started
+        print(f"  ✅ {path}: {count} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+    sys.exit(0)
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Query plan benchmark and index advisor for the GBC POS MySQL access paths
+Runs each query the backend services issue against a seeded database, captures
+EXPLAIN ANALYZE, and reports rows examined versus rows returned, optionally
+before and after the indexes in backend/migrations/002_order_management_indexes.sql
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from generate_orders import (DISH_COLUMNS, FIRST_RESTAURANT_ID, ORDER_COLUMNS, RESTAURANT_COLUMNS,
+                             add_generator_arguments, format_value, generator_from_args)
+
+try:
+    import pymysql
+except ImportError:  # only needed once the tool connects
+    pymysql = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INDEX_MIGRATION = os.path.join(ROOT, "backend", "migrations", "002_order_management_indexes.sql")
+
+# Columns selected by OrderService (ORDER_LIST_COLUMNS / ORDER_DETAIL_COLUMNS)
+ORDER_LIST_COLUMNS = """order_id, order_number, fulfillment_status, customer, customer_email, customer_phone,
+  total_amount, created_at, approved_at, ready_at, dispatched_at, delivery_date, cancelled_at,
+  cancel_reason, kitchen_notes, product_details, delivery_method, customer_address"""
+ORDER_DETAIL_COLUMNS = ORDER_LIST_COLUMNS + ", payment_method, payment_status"
+
+STATS_SELECT = """SELECT COUNT(*) as totalOrders,
+  COALESCE(SUM(CASE WHEN fulfillment_status != 'cancelled' THEN total_amount ELSE 0 END), 0) as revenue,
+  COUNT(CASE WHEN fulfillment_status IN ('approved', 'ready', 'dispatched') THEN 1 END) as activeOrders,
+  COUNT(CASE WHEN fulfillment_status = 'completed' THEN 1 END) as completedOrders
+FROM order_management"""
+
+HANDLER_READS = ("Handler_read_first", "Handler_read_key", "Handler_read_last", "Handler_read_next",
+                 "Handler_read_prev", "Handler_read_rnd", "Handler_read_rnd_next")
+
+NON_SARGABLE = re.compile(r"\b(DATE|YEAR|MONTH|DAY|HOUR)\s*\(\s*(\w+\.)?(created_at)\s*\)", re.IGNORECASE)
+
+
+class PlannedQuery(NamedTuple):
+    name: str
+    source: str
+    sql: str
+    params: Callable[[Dict[str, Any]], Tuple]
+    # Name of the query this one rewrites, for before/after pairs in the report
+    rewrite_of: Optional[str] = None
+
+
+def restaurant(ctx: Dict[str, Any]) -> Tuple:
+    return (ctx["restaurant_id"],)
+
+
+QUERIES: List[PlannedQuery] = [
+    PlannedQuery("auth.login", "AuthService.login",
+                 "SELECT * FROM restaurants WHERE username = %s", lambda ctx: (ctx["username"],)),
+    PlannedQuery("auth.token", "authenticateToken",
+                 "SELECT id, username, email, status, is_active FROM restaurants WHERE id = %s", restaurant),
+    PlannedQuery("orders.list_all", "OrderService.getOrders",
+                 f"SELECT {ORDER_LIST_COLUMNS} FROM order_management WHERE restaurant_id = %s "
+                 "ORDER BY created_at DESC", restaurant),
+    PlannedQuery("orders.list_pending", "OrderService.getOrders",
+                 f"SELECT {ORDER_LIST_COLUMNS} FROM order_management WHERE restaurant_id = %s "
+                 "AND fulfillment_status = %s ORDER BY created_at DESC",
+                 lambda ctx: (ctx["restaurant_id"], "pending")),
+    PlannedQuery("orders.page_first", "OrderService.getOrdersPage",
+                 f"SELECT {ORDER_LIST_COLUMNS} FROM order_management WHERE restaurant_id = %s "
+                 "ORDER BY created_at DESC, order_id DESC LIMIT 51", restaurant),
+    PlannedQuery("orders.page_deep_completed", "OrderService.getOrdersPage",
+                 f"SELECT {ORDER_LIST_COLUMNS} FROM order_management WHERE restaurant_id = %s "
+                 "AND fulfillment_status = %s AND (created_at < %s OR (created_at = %s AND order_id < %s)) "
+                 "ORDER BY created_at DESC, order_id DESC LIMIT 51",
+                 lambda ctx: (ctx["restaurant_id"], "completed", ctx["cursor_created_at"],
+                              ctx["cursor_created_at"], ctx["cursor_order_id"])),
+    PlannedQuery("orders.detail", "OrderService.getOrderDetail",
+                 f"SELECT {ORDER_DETAIL_COLUMNS} FROM order_management "
+                 "WHERE restaurant_id = %s AND order_number = %s",
+                 lambda ctx: (ctx["restaurant_id"], ctx["order_number"])),
+    PlannedQuery("orders.batch_lock", "OrderService.updateOrderStatuses",
+                 "SELECT order_id, order_number, fulfillment_status, product_details, created_at "
+                 "FROM order_management WHERE restaurant_id = %s AND order_number IN %s",
+                 lambda ctx: (ctx["restaurant_id"], tuple(ctx["batch_order_numbers"]))),
+    PlannedQuery("events.new_orders", "orderEvents watcher",
+                 "SELECT order_id, restaurant_id, order_number, fulfillment_status FROM order_management "
+                 "WHERE order_id > %s ORDER BY order_id LIMIT 500", lambda ctx: (ctx["watermark"],)),
+    PlannedQuery("dashboard.stats_all", "DashboardService.getStats",
+                 f"{STATS_SELECT} WHERE restaurant_id = %s", restaurant),
+    PlannedQuery("dashboard.stats_today_legacy", "DATE() filter (non-sargable)",
+                 f"{STATS_SELECT} WHERE restaurant_id = %s AND DATE(created_at) = CURDATE()", restaurant),
+    PlannedQuery("dashboard.stats_today", "DashboardService.getStats (range)",
+                 f"{STATS_SELECT} WHERE restaurant_id = %s AND created_at BETWEEN %s AND %s",
+                 lambda ctx: (ctx["restaurant_id"], ctx["today_start"], ctx["today_end"]),
+                 rewrite_of="dashboard.stats_today_legacy"),
+    PlannedQuery("dashboard.top_dishes_legacy", "getTopDishes before the rollup",
+                 "SELECT product_details FROM order_management WHERE restaurant_id = %s "
+                 "AND fulfillment_status IN ('approved', 'ready', 'dispatched', 'completed') "
+                 "AND DATE(created_at) = CURDATE() ORDER BY created_at DESC", restaurant),
+    PlannedQuery("dashboard.top_dishes_range", "sargable rewrite of the legacy scan",
+                 "SELECT product_details FROM order_management WHERE restaurant_id = %s "
+                 "AND fulfillment_status IN ('approved', 'ready', 'dispatched', 'completed') "
+                 "AND created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY "
+                 "ORDER BY created_at DESC", restaurant, rewrite_of="dashboard.top_dishes_legacy"),
+    PlannedQuery("dashboard.top_dishes_rollup", "DishSalesService.getTopDishes",
+                 "SELECT dish_name, quantity, revenue FROM dish_sales_daily WHERE restaurant_id = %s "
+                 "AND sales_date = CURDATE() AND quantity > 0 ORDER BY quantity DESC, dish_name LIMIT 5",
+                 restaurant, rewrite_of="dashboard.top_dishes_legacy"),
+    PlannedQuery("dashboard.frequent_customers", "DashboardService.getFrequentCustomers",
+                 "SELECT customer, COUNT(*) as orderCount, SUM(total_amount) as totalSpent "
+                 "FROM order_management WHERE restaurant_id = %s AND fulfillment_status IN ('completed') "
+                 "AND customer IS NOT NULL GROUP BY customer ORDER BY orderCount DESC LIMIT 5", restaurant),
+    PlannedQuery("menu.items", "MenuService.getMenuItems",
+                 "SELECT dish_id, name, selling_price, description, primary_image, availability_status, "
+                 "menu_section, is_active, created_at, food_type FROM dishes "
+                 "WHERE restaurant_id = %s AND is_deleted = 0 ORDER BY menu_section, name", restaurant),
+]
+
+
+def load_env(path: str) -> Dict[str, str]:
+    """KEY=VALUE pairs from a dotenv file, like the backend's dotenv.config()"""
+    values: Dict[str, str] = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip().strip("'\"")
+    return values
+
+
+def connect(args: argparse.Namespace):
+    if pymysql is None:
+        sys.exit("❌ query_advisor.py needs PyMySQL: pip install pymysql")
+    return pymysql.connect(host=args.host, port=args.port, user=args.user, password=args.password,
+                           database=args.database, autocommit=True, charset="utf8mb4")
+
+
+def split_statements(sql: str) -> List[str]:
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def migration_indexes(path: str = INDEX_MIGRATION) -> List[Tuple[str, str]]:
+    """(table, index name) for every ADD INDEX in the migration"""
+    with open(path) as f:
+        sql = f.read()
+    return [(table, index) for table, index in
+            re.findall(r"ALTER TABLE\s+(\w+)\s+ADD INDEX\s+(\w+)", sql, re.IGNORECASE)]
+
+
+class QueryAdvisor:
+    """Runs the query catalog and turns plans and handler counters into a report"""
+
+    def __init__(self, connection, repeat: int = 5, ratio_threshold: float = 10.0):
+        self.connection = connection
+        self.repeat = repeat
+        self.ratio_threshold = ratio_threshold
+        self.explain_analyze = True
+
+    def fetch(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return list(cursor.fetchall())
+
+    def handler_reads(self) -> int:
+        rows = self.fetch("SHOW SESSION STATUS WHERE Variable_name IN %s", (HANDLER_READS,))
+        return sum(int(value) for _, value in rows)
+
+    def indexes(self, table: str) -> Dict[str, List[str]]:
+        """Index name -> column list for a table"""
+        result: Dict[str, List[str]] = {}
+        with self.connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute(f"SHOW INDEX FROM {table}")
+            for row in cursor.fetchall():
+                result.setdefault(row["Key_name"], []).append(row["Column_name"])
+        return result
+
+    def context(self, restaurant_id: int) -> Dict[str, Any]:
+        """Parameter values taken from the seeded data so every query returns realistic rows"""
+        username = self.fetch("SELECT username FROM restaurants WHERE id = %s", (restaurant_id,))
+        newest = self.fetch("SELECT order_number FROM order_management WHERE restaurant_id = %s "
+                            "ORDER BY created_at DESC LIMIT 20", (restaurant_id,))
+        deep = self.fetch("SELECT created_at, order_id FROM order_management WHERE restaurant_id = %s "
+                          "AND fulfillment_status = 'completed' ORDER BY created_at DESC, order_id DESC "
+                          "LIMIT 1 OFFSET 1000", (restaurant_id,))
+        watermark = self.fetch("SELECT COALESCE(MAX(order_id), 0) FROM order_management")
+        today = self.fetch("SELECT CURDATE()")[0][0]
+        return {
+            "restaurant_id": restaurant_id,
+            "username": username[0][0] if username else "",
+            "order_number": newest[0][0] if newest else "",
+            "batch_order_numbers": [row[0] for row in newest] or [""],
+            "cursor_created_at": deep[0][0] if deep else datetime(1970, 1, 1),
+            "cursor_order_id": deep[0][1] if deep else 0,
+            "watermark": max(int(watermark[0][0]) - 100, 0),
+            "today_start": f"{today} 00:00:00",
+            "today_end": f"{today} 23:59:59",
+        }
+
+    def plan(self, sql: str, params: Tuple) -> str:
+        if self.explain_analyze:
+            try:
+                return "\n".join(row[0] for row in self.fetch("EXPLAIN ANALYZE " + sql, params))
+            except pymysql.err.MySQLError:
+                # MariaDB and MySQL < 8.0.18 have no EXPLAIN ANALYZE; fall back to the estimated plan
+                self.explain_analyze = False
+        with self.connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute("EXPLAIN " + sql, params)
+            return "\n".join(f"{row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                             f"rows={row.get('rows')} extra={row.get('Extra')}" for row in cursor.fetchall())
+
+    def run_query(self, query: PlannedQuery, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        params = query.params(ctx)
+        try:
+            self.fetch(query.sql, params)  # warm the buffer pool
+            timings = []
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                returned = len(self.fetch(query.sql, params))
+                timings.append((time.perf_counter() - started) * 1000)
+
+            # Handler_read_* deltas count rows the storage engine handed to the server;
+            # SHOW STATUS itself adds a few, so subtract an empty measurement
+            first = self.handler_reads()
+            before = self.handler_reads()
+            overhead = before - first
+            self.fetch(query.sql, params)
+            examined = max(self.handler_reads() - before - overhead, 0)
+            plan = self.plan(query.sql, params)
+        except pymysql.err.MySQLError as error:
+            return {"name": query.name, "source": query.source, "error": str(error.args[-1])}
+
+        return {
+            "name": query.name,
+            "source": query.source,
+            "rewrite_of": query.rewrite_of,
+            "ms": statistics.median(timings),
+            "returned": returned,
+            "examined": examined,
+            "access": access_path(plan),
+            "plan": plan,
+            "advice": self.advise(query, plan, examined, returned),
+        }
+
+    def advise(self, query: PlannedQuery, plan: str, examined: int, returned: int) -> List[str]:
+        advice = []
+        match = NON_SARGABLE.search(query.sql)
+        if match:
+            advice.append(f"{match.group(0)} hides created_at from the index; use "
+                          f"created_at >= day AND created_at < day + INTERVAL 1 DAY")
+        if re.search(r"Table scan on (order_management|dishes)|type=ALL", plan):
+            advice.append("full table scan")
+        if re.search(r"\bSort\b|Using filesort", plan) and "LIMIT" in query.sql.upper():
+            advice.append("sorts before LIMIT; an index ending in the ORDER BY columns avoids it")
+        if returned and examined / returned > self.ratio_threshold and examined > 1000:
+            advice.append(f"examines {examined / returned:.0f}x the rows it returns")
+        if advice:
+            suggestion = suggest_index(query.sql)
+            if suggestion:
+                table, columns = suggestion
+                covered = [name for name, existing in self.indexes(table).items()
+                           if existing[:len(columns)] == columns]
+                advice.append(f"covered by {covered[0]}" if covered else
+                              f"suggest INDEX ({', '.join(columns)}) ON {table}")
+        return advice
+
+    def run(self, ctx: Dict[str, Any], names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        selected = [query for query in QUERIES if not names or query.name in names]
+        return [self.run_query(query, ctx) for query in selected]
+
+    # ----- index migration ------------------------------------------------
+
+    def drop_migration_indexes(self):
+        for table, index in migration_indexes():
+            if index in self.indexes(table):
+                self.fetch(f"ALTER TABLE {table} DROP INDEX {index}")
+
+    def apply_migration_indexes(self):
+        with open(INDEX_MIGRATION) as f:
+            statements = split_statements(f.read())
+        existing = {table: self.indexes(table) for table, _ in migration_indexes()}
+        for statement in statements:
+            match = re.search(r"ALTER TABLE\s+(\w+)\s+ADD INDEX\s+(\w+)", statement, re.IGNORECASE)
+            if match and match.group(2) in existing.get(match.group(1), {}):
+                continue
+            self.fetch(statement)
+        self.fetch("ANALYZE TABLE order_management, dishes")
+
+    # ----- seeding --------------------------------------------------------
+
+    def seed(self, args: argparse.Namespace, batch_size: int = 1000) -> int:
+        """Insert generated rows into the existing restaurants, dishes and order_management tables"""
+        generator = generator_from_args(args)
+        total = 0
+        for table, columns, rows in (("restaurants", RESTAURANT_COLUMNS, generator.restaurant_rows()),
+                                     ("dishes", DISH_COLUMNS, generator.dish_rows()),
+                                     ("order_management", ORDER_COLUMNS, generator.order_rows())):
+            sql = (f"INSERT IGNORE INTO {table} ({', '.join(columns)}) "
+                   f"VALUES ({', '.join(['%s'] * len(columns))})")
+            batch = []
+            with self.connection.cursor() as cursor:
+                for row in rows:
+                    batch.append([format_value(row[column]) for column in columns])
+                    if len(batch) >= batch_size:
+                        total += cursor.executemany(sql, batch)
+                        batch = []
+                if batch:
+                    total += cursor.executemany(sql, batch)
+        self.fetch("ANALYZE TABLE restaurants, dishes, order_management")
+        return total
+
+
+def access_path(plan: str) -> str:
+    """Short description of how the main table is read"""
+    for pattern in (r"(Table scan on \w+)", r"(Covering index \w+ (?:lookup|scan) on \w+ using \w+)",
+                    r"(Index (?:range scan|lookup|scan) on \w+ using \w+)", r"(Single-row index lookup on \w+ using \w+)",
+                    r"type=(\w+) key=(\w+)"):
+        match = re.search(pattern, plan)
+        if match:
+            return " ".join(group for group in match.groups() if group)
+    return plan.splitlines()[0][:60] if plan else ""
+
+
+def suggest_index(sql: str) -> Optional[Tuple[str, List[str]]]:
+    """Equality columns, then one range column, then ORDER BY columns, for the main table"""
+    table = re.search(r"\bFROM\s+(\w+)", sql, re.IGNORECASE)
+    where = re.search(r"\bWHERE\s+(.*?)(\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", sql, re.IGNORECASE | re.DOTALL)
+    if not table or not where:
+        return None
+    clause = NON_SARGABLE.sub(r"\3", where.group(1))
+    columns: List[str] = []
+    for column in re.findall(r"\b(\w+)\s*(?:=\s*(?:%s|'[^']*'|\d+|CURDATE\(\))|IN\s*(?:\(|%s))", clause, re.IGNORECASE):
+        if column.lower() not in ("and", "or") and column not in columns:
+            columns.append(column)
+    ranges = re.findall(r"\b(\w+)\s*(?:<|>|<=|>=|BETWEEN)\s", clause, re.IGNORECASE)
+    if ranges and ranges[0] not in columns:
+        columns.append(ranges[0])
+    order = re.search(r"\bORDER BY\s+(.*?)(\bLIMIT\b|$)", sql, re.IGNORECASE | re.DOTALL)
+    if order and not re.search(r"\bGROUP BY\b", sql, re.IGNORECASE):
+        for part in order.group(1).split(","):
+            column = part.strip().split()[0]
+            if re.fullmatch(r"\w+", column) and column not in columns and column != "order_id":
+                columns.append(column)
+    return (table.group(1), columns) if columns else None
+
+
+def print_report(results: List[Dict[str, Any]], title: str):
+    print("\n" + "=" * 100)
+    print(f"🔎 {title}")
+    print("=" * 100)
+    print(f"{'Query':<32} {'ms':>8} {'returned':>9} {'examined':>9} {'ratio':>7}  Access path")
+    for result in results:
+        if "error" in result:
+            print(f"{result['name']:<32} ❌ {result['error']}")
+            continue
+        ratio = result["examined"] / max(result["returned"], 1)
+        print(f"{result['name']:<32} {result['ms']:>8.2f} {result['returned']:>9} {result['examined']:>9} "
+              f"{ratio:>7.1f}  {result['access']}")
+        for advice in result["advice"]:
+            print(f"{'':<32} ⚠️  {advice}")
+
+
+def print_comparison(before: List[Dict[str, Any]], after: List[Dict[str, Any]]):
+    print("\n" + "=" * 100)
+    print("📊 BEFORE vs AFTER INDEXES")
+    print("=" * 100)
+    print(f"{'Query':<32} {'ms before':>10} {'ms after':>9} {'speedup':>8} {'examined before':>16} "
+          f"{'examined after':>15}")
+    after_by_name = {result["name"]: result for result in after}
+    for old in before:
+        new = after_by_name.get(old["name"])
+        if "error" in old or not new or "error" in new:
+            continue
+        print(f"{old['name']:<32} {old['ms']:>10.2f} {new['ms']:>9.2f} "
+              f"{old['ms'] / max(new['ms'], 1e-3):>7.1f}x {old['examined']:>16} {new['examined']:>15}")
+
+    rewrites = [result for result in after if result.get("rewrite_of") and "error" not in result]
+    if rewrites:
+        print("\n✏️  SARGABLE REWRITES (after indexes)")
+        for rewrite in rewrites:
+            original = after_by_name.get(rewrite["rewrite_of"])
+            if original and "error" not in original:
+                print(f"  {original['name']} -> {rewrite['name']}: {original['ms']:.2f} -> {rewrite['ms']:.2f} ms, "
+                      f"examined {original['examined']} -> {rewrite['examined']}")
+
+
+def main() -> int:
+    env = load_env(os.path.join(ROOT, "backend", ".env"))
+    parser = argparse.ArgumentParser(description="Query plan benchmark and index advisor for GBC POS")
+    parser.add_argument("--host", default=os.environ.get("MYSQL_HOST", env.get("MYSQL_HOST", "127.0.0.1")))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MYSQL_PORT", env.get("MYSQL_PORT", "3306"))))
+    parser.add_argument("--user", default=os.environ.get("MYSQL_USER", env.get("MYSQL_USER", "root")))
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PASSWORD", env.get("MYSQL_PASSWORD", "")))
+    parser.add_argument("--database", default=os.environ.get("MYSQL_DATABASE", env.get("MYSQL_DATABASE")))
+    parser.add_argument("--restaurant-id", type=int, default=FIRST_RESTAURANT_ID)
+    parser.add_argument("--query", action="append", dest="queries", metavar="NAME",
+                        help="only run this catalog entry (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed executions per query")
+    parser.add_argument("--ratio-threshold", type=float, default=10.0,
+                        help="flag queries examining more than this many rows per row returned")
+    parser.add_argument("--before-after", action="store_true",
+                        help="drop the migration's indexes, measure, add them back and measure again "
+                             "(seeded databases only: it rebuilds indexes)")
+    parser.add_argument("--apply-indexes", action="store_true", help="add any missing migration indexes first")
+    parser.add_argument("--seed-data", action="store_true",
+                        help="insert generated rows into the existing tables before measuring")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    add_generator_arguments(parser.add_argument_group("generated data (with --seed-data)"))
+    args = parser.parse_args()
+
+    advisor = QueryAdvisor(connect(args), repeat=args.repeat, ratio_threshold=args.ratio_threshold)
+    if args.seed_data:
+        started = time.perf_counter()
+        print(f"🌱 Inserted {advisor.seed(args):,} rows in {time.perf_counter() - started:.1f}s")
+
+    report: Dict[str, Any] = {"created_at": datetime.now(timezone.utc).isoformat(), "database": args.database}
+    if args.before_after:
+        advisor.drop_migration_indexes()
+        report["before"] = advisor.run(advisor.context(args.restaurant_id), args.queries)
+        print_report(report["before"], "WITHOUT MIGRATION INDEXES")
+        started = time.perf_counter()
+        advisor.apply_migration_indexes()
+        print(f"\n🛠️  Built migration indexes in {time.perf_counter() - started:.1f}s")
+
+    if args.apply_indexes:
+        advisor.apply_migration_indexes()
+    report["after"] = advisor.run(advisor.context(args.restaurant_id), args.queries)
+    print_report(report["after"], "WITH MIGRATION INDEXES" if args.before_after else "CURRENT SCHEMA")
+    if args.before_after:
+        print_comparison(report["before"], report["after"])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\n💾 Report written to {args.json}")
+
+    flagged = sum(1 for result in report["after"] if result.get("advice"))
+    print(f"\n{'⚠️ ' if flagged else '✅'} {flagged} of {len(report['after'])} queries have advice")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Replay captured GBC POS traffic
+Re-issues the request traces written by the API's captureTraffic middleware
+(TRAFFIC_CAPTURE_FILE) or fake_backend.py --capture against any base URL at
+1x, 10x or as fast as possible, keeping the original inter-arrival times, and
+diffs the replay's latency distribution per endpoint against the original's.
+
+Record a local trace with:
+    python3 backend_test.py --local --load --capture trace.jsonl
+and replay it with:
+    python3 traffic_replay.py trace.jsonl --local --speed 10
+
+Captured latencies are measured inside the server. Replay latencies are
+measured by this client unless the target records its own trace of the
+replay (--local does; see --server-trace), which compares like with like.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from backend_benchmarks import fake_backend_process
+from backend_test import DEFAULT_BASE_URL, GBCPOSAPITester, endpoint_key, percentile
+from generate_orders import DEFAULT_PASSWORD, FIRST_RESTAURANT_USERNAME
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+# Long-lived Server-Sent Events; their "latency" is how long a tablet stayed connected
+STREAM_PATHS = ("/orders/stream",)
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Trace entries in arrival order; unreadable lines (e.g. a torn last line) are skipped"""
+    entries = []
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and {"t", "m", "p", "ms"} <= entry.keys():
+                entries.append(entry)
+    entries.sort(key=lambda entry: entry["t"])
+    return entries
+
+
+def api_path(path: str) -> str:
+    """Captured URLs include the /api mount point; base URLs end with it"""
+    return path[4:] if path.startswith("/api/") else path
+
+
+def ks_distance(a: List[float], b: List[float]) -> float:
+    """Two-sample Kolmogorov-Smirnov statistic: largest gap between the two latency CDFs"""
+    if not a or not b:
+        return 0.0
+    a, b = sorted(a), sorted(b)
+    i = j = 0
+    distance = 0.0
+    while i < len(a) and j < len(b):
+        value = min(a[i], b[j])
+        while i < len(a) and a[i] <= value:
+            i += 1
+        while j < len(b) and b[j] <= value:
+            j += 1
+        distance = max(distance, abs(i / len(a) - j / len(b)))
+    return distance
+
+
+class Replayer:
+    """Open-loop replay: each request is issued at its scheduled offset whether or not
+    earlier ones have finished, so a slow target cannot slow the arrival rate down"""
+
+    def __init__(self, base_url: str, entries: List[Dict[str, Any]], speed: Optional[float], workers: int,
+                 username: str, password: str):
+        self.base_url = base_url
+        self.entries = entries
+        self.speed = speed
+        self.workers = workers
+        self.credentials = {"username": username, "password": password}
+        self.tester = GBCPOSAPITester(base_url, pool_size=workers, retries=0)
+        self.results: List[Dict[str, Any]] = []
+        self.results_lock = threading.Lock()
+
+    def login(self):
+        response = self.tester.make_request("POST", "/auth/login", self.credentials)
+        response.raise_for_status()
+        self.tester.token = response.json()["token"]
+
+    def send(self, entry: Dict[str, Any], due: float):
+        started = time.perf_counter()
+        method, path = entry["m"], api_path(entry["p"])
+        body = entry.get("body")
+        headers = {"Authorization": f"Bearer {self.tester.token}"}
+        if path.startswith("/auth/login"):
+            body, headers = self.credentials, {}
+        result = {"entry": entry, "lag_ms": (started - due) * 1000, "status": 0, "bytes": 0}
+        try:
+            response = self.tester.session.request(method, f"{self.base_url}{path}", json=body, headers=headers,
+                                                   timeout=self.tester.timeout)
+            result["status"] = response.status_code
+            result["bytes"] = len(response.content)
+        except requests.exceptions.RequestException as error:
+            result["error"] = str(error)
+        result["ms"] = (time.perf_counter() - started) * 1000
+        with self.results_lock:
+            self.results.append(result)
+
+    def run(self) -> float:
+        """Replay every entry; returns the wall time in seconds"""
+        first = self.entries[0]["t"]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for entry in self.entries:
+                due = started + ((entry["t"] - first) / 1000.0 / self.speed if self.speed else 0.0)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, entry, due)
+        return time.perf_counter() - started
+
+
+def latencies_by_endpoint(entries: Iterator[Tuple[Dict[str, Any], float]]) -> Dict[str, List[float]]:
+    groups: Dict[str, List[float]] = {}
+    for entry, latency in entries:
+        groups.setdefault(endpoint_key(entry["m"], api_path(entry["p"])), []).append(latency)
+    return groups
+
+
+def change(original: float, replay: float) -> str:
+    return f"{(replay - original) / original * 100:+.0f}%" if original > 0 else "n/a"
+
+
+def print_report(entries: List[Dict[str, Any]], results: List[Dict[str, Any]], replay_latencies: Dict[str, List[float]],
+                 wall: float, speed: Optional[float], latency_source: str):
+    original = latencies_by_endpoint((entry, entry["ms"]) for entry in entries)
+    statuses: Dict[str, List[bool]] = {}
+    for result in results:
+        key = endpoint_key(result["entry"]["m"], api_path(result["entry"]["p"]))
+        statuses.setdefault(key, []).append(result["status"] == result["entry"].get("s"))
+
+    span = max((entries[-1]["t"] - entries[0]["t"]) / 1000.0, 1e-9)
+    errors = sum(1 for result in results if "error" in result)
+    lags = [result["lag_ms"] for result in results]
+    print("\n" + "=" * 80)
+    print(f"🔁 REPLAY ({'max speed' if speed is None else f'{speed:g}x'}, replay latency from {latency_source})")
+    print("=" * 80)
+    print(f"Requests: {len(results)} in {wall:.1f}s ({len(results) / max(wall, 1e-9):.1f} req/s; "
+          f"captured {len(entries) / span:.1f} req/s over {span:.1f}s)")
+    print(f"Schedule lag p50/p99: {percentile(lags, 50):.1f} / {percentile(lags, 99):.1f} ms"
+          + ("  ⚠️  requests started late: the target or the replayer (--workers) is saturated" if speed and percentile(lags, 99) > 100 else ""))
+    if errors:
+        print(f"❌ Transport errors: {errors}")
+
+    header = (f"{'Endpoint':<42} {'Count':>6} {'p50 orig':>9} {'p50 new':>8} {'p95 orig':>9} {'p95 new':>8} "
+              f"{'p99 orig':>9} {'p99 new':>8} {'Δp99':>6} {'KS D':>5} {'Same status':>11}")
+    print(header)
+    rows = sorted(set(original) | set(replay_latencies))
+    everything_original = [value for values in original.values() for value in values]
+    everything_replay = [value for values in replay_latencies.values() for value in values]
+    for key, before, after in [(key, original.get(key, []), replay_latencies.get(key, [])) for key in rows] \
+            + [("ALL", everything_original, everything_replay)]:
+        same = statuses.get(key) if key != "ALL" else [ok for oks in statuses.values() for ok in oks]
+        print(f"{key:<42} {len(after):>6} {percentile(before, 50):>9.1f} {percentile(after, 50):>8.1f} "
+              f"{percentile(before, 95):>9.1f} {percentile(after, 95):>8.1f} {percentile(before, 99):>9.1f} "
+              f"{percentile(after, 99):>8.1f} {change(percentile(before, 99), percentile(after, 99)):>6} "
+              f"{ks_distance(before, after):>5.2f} "
+              f"{(sum(same) / len(same) * 100 if same else 0):>10.0f}%")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay a captured GBC POS traffic trace")
+    parser.add_argument("trace", help="JSON-lines trace from TRAFFIC_CAPTURE_FILE or fake_backend.py --capture")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API base URL including /api")
+    parser.add_argument("--local", action="store_true", help="replay against a freshly seeded fake backend")
+    parser.add_argument("--orders", type=int, default=1000, help="orders to seed the local backend with")
+    parser.add_argument("--speed", default="1",
+                        help="time scale of the original inter-arrival times: 1, 10, ... or 'max'")
+    parser.add_argument("--workers", type=int, default=64, help="requests in flight at most")
+    parser.add_argument("--include-writes", action="store_true",
+                        help="also replay POST/PUT/PATCH (they change the target's data)")
+    parser.add_argument("--include-streams", action="store_true", help="also replay /orders/stream connections")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N requests")
+    parser.add_argument("--server-trace", metavar="PATH",
+                        help="the target's own capture of the replay; compare server-side latencies")
+    parser.add_argument("--username", default=FIRST_RESTAURANT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    args = parser.parse_args()
+
+    speed = None if args.speed == "max" else float(args.speed)
+    if speed is not None and speed <= 0:
+        parser.error("--speed must be positive or 'max'")
+
+    entries = [entry for entry in load_trace(args.trace)
+               if entry["m"] != "OPTIONS"
+               and (args.include_writes or entry["m"] not in WRITE_METHODS or api_path(entry["p"]) == "/auth/login")
+               and (args.include_streams or not api_path(entry["p"]).split("?")[0].endswith(STREAM_PATHS))]
+    entries = entries[:args.limit] if args.limit else entries
+    if not entries:
+        print("❌ Nothing to replay")
+        return 1
+    print(f"📼 {len(entries)} requests from {args.trace}")
+
+    server_trace = args.server_trace
+    backend = None
+    base_url = args.base_url
+    if args.local:
+        handle, server_trace = tempfile.mkstemp(prefix="replay-", suffix=".jsonl")
+        os.close(handle)
+        backend = fake_backend_process(args.orders, days=90, restaurants=1, dishes=40,
+                                       extra_args=["--capture", server_trace])
+        base_url = backend.__enter__()
+    try:
+        replayer = Replayer(base_url, entries, speed, args.workers, args.username, args.password)
+        replayer.login()
+        window = (time.time() * 1000, None)
+        wall = replayer.run()
+        window = (window[0], time.time() * 1000)
+    finally:
+        if backend is not None:
+            backend.__exit__(None, None, None)
+
+    if server_trace and os.path.exists(server_trace):
+        # Only what arrived during the replay: not its own login, nor other clients' traffic before or after
+        served = [entry for entry in load_trace(server_trace) if window[0] <= entry["t"] <= window[1]]
+        replay_latencies = latencies_by_endpoint((entry, entry["ms"]) for entry in served)
+        latency_source = "the server's trace"
+        if args.local:
+            os.unlink(server_trace)
+    else:
+        replay_latencies = latencies_by_endpoint((result["entry"], result["ms"]) for result in replayer.results)
+        latency_source = "this client"
+
+    print_report(entries, replayer.results, replay_latencies, wall, speed, latency_source)
+    return 1 if any("error" in result for result in replayer.results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())